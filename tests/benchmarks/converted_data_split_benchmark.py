@@ -0,0 +1,47 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Time of splitting a single snapshot with 10 000 telemetry keys (like a big OPC-UA device)
+into the objects with maximal payload size.
+
+Usage: python -m tests.benchmarks.converted_data_split_benchmark
+"""
+
+from time import perf_counter
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+
+KEYS_COUNT = 10_000
+MAX_PAYLOAD_SIZES = (8192, 65535)
+ITERATIONS = 10
+
+
+def main():
+    data = ConvertedData(device_name="Device A", device_type="default")
+    data.add_to_telemetry(TelemetryEntry({DatapointKey("ns=2;s=Node_%i" % i): i * 1.5 for i in range(KEYS_COUNT)},
+                                         ts=1000))
+    print("%-18s %12s %10s" % ("max payload size", "objects", "ms"))
+    for max_payload_size in MAX_PAYLOAD_SIZES:
+        started = perf_counter()
+        for _ in range(ITERATIONS):
+            split_data = data.convert_to_objects_with_maximal_size(max_payload_size)
+        elapsed = (perf_counter() - started) / ITERATIONS
+        print("%-18i %12i %10.2f" % (max_payload_size, len(split_data), elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Decoding time of the Modbus registers per tag: the pymodbus BinaryPayloadDecoder, created for every tag,
+compared to the compiled RegisterDecoder, and of a wide range tag decoded value by value and as a block.
+
+Usage: python -m tests.benchmarks.modbus_decoding_benchmark
+"""
+
+import logging
+from timeit import repeat
+
+from pymodbus.constants import Endian
+
+from thingsboard_gateway.connectors.modbus.register_decoder import RegisterDecoder
+
+try:
+    from pymodbus.payload import BinaryPayloadDecoder
+except ImportError:
+    BinaryPayloadDecoder = None
+
+NUMBER = 10_000
+REPEATS = 5
+WIDE_RANGE_REGISTERS_COUNT = 120
+TYPES = {
+    '16int': ('decode_16bit_int', [0xFF9C]),
+    '32float': ('decode_32bit_float', [0x4049, 0x0FDB]),
+    '64uint': ('decode_64bit_uint', [0x1234, 0x5678, 0x9ABC, 0xDEF0]),
+}
+
+
+def measure(function, number=NUMBER):
+    return min(repeat(function, number=number, repeat=REPEATS)) / number * 1_000_000
+
+
+def main():
+    # BinaryPayloadDecoder logs the deprecation warning on every call
+    logging.getLogger('pymodbus').setLevel(logging.CRITICAL)
+
+    print("%-10s %20s %20s" % ("type", "payload decoder, us", "register decoder, us"))
+    for value_type, (decoder_method, registers) in TYPES.items():
+        config = {'tag': value_type, 'type': value_type, 'functionCode': 3, 'objectsCount': len(registers)}
+        register_decoder = RegisterDecoder(config, Endian.LITTLE, Endian.BIG)
+        payload_decoder_time = float('nan')
+        if BinaryPayloadDecoder is not None:
+            payload_decoder_time = measure(lambda: getattr(BinaryPayloadDecoder.fromRegisters(
+                registers, byteorder=Endian.LITTLE, wordorder=Endian.BIG), decoder_method)())
+        print("%-10s %20.2f %20.2f" % (value_type, payload_decoder_time,
+                                       measure(lambda: register_decoder.decode(registers))))
+
+    registers = list(range(WIDE_RANGE_REGISTERS_COUNT))
+    config = {'tag': 'value_${address}', 'type': '32float', 'functionCode': 3, 'objectsCount': 2,
+              'address': '0-%i' % (WIDE_RANGE_REGISTERS_COUNT - 2)}
+    register_decoder = RegisterDecoder(config, Endian.LITTLE, Endian.BIG)
+    by_value_time = measure(lambda: [register_decoder.decode(registers[start:start + 2])
+                                     for start in range(0, WIDE_RANGE_REGISTERS_COUNT, 2)], NUMBER // 10)
+    block_time = measure(lambda: register_decoder.decode_block(registers), NUMBER // 10)
+    print()
+    print("%i registers of 32float: %.2f us value by value, %.2f us as a block" % (WIDE_RANGE_REGISTERS_COUNT,
+                                                                                   by_value_time, block_time))
+
+
+if __name__ == '__main__':
+    main()
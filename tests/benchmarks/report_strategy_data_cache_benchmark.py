@@ -0,0 +1,95 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Throughput of the report strategy data cache with 1, 4 and 16 producer threads.
+
+"1 shard, separate calls" mode uses a single shard of the current cache with the separate
+get/put/update_key_value/update_ts calls, that were used to filter datapoints before filter_and_update was added.
+It approximates the call pattern of the previous implementation, not the previous implementation itself.
+"sharded" mode uses the default shards count and the combined filter_and_update call.
+
+Usage: python -m tests.benchmarks.report_strategy_data_cache_benchmark
+"""
+
+import logging
+from threading import Thread, Barrier
+from time import perf_counter
+
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.report_strategy.report_strategy_data_cache import ReportStrategyDataCache
+
+DATAPOINTS_PER_THREAD = 100_000
+KEYS_PER_DEVICE = 50
+DEVICES_PER_THREAD = 20
+THREADS_COUNTS = (1, 4, 16)
+
+REPORT_STRATEGY = ReportStrategyConfig({"type": "ON_CHANGE"})
+KEYS = [DatapointKey("key_%i" % i) for i in range(KEYS_PER_DEVICE)]
+
+
+def separate_calls_producer(cache: ReportStrategyDataCache, thread_index, barrier: Barrier):
+    connector_id = "connector_%i" % thread_index
+    devices = ["device_%i_%i" % (thread_index, i) for i in range(DEVICES_PER_THREAD)]
+    barrier.wait()
+    for i in range(DATAPOINTS_PER_THREAD):
+        key = KEYS[i % KEYS_PER_DEVICE]
+        device_name = devices[i % DEVICES_PER_THREAD]
+        value = i % 7
+        record = cache.get(key, device_name, connector_id)
+        if record is None:
+            cache.put(key, value, device_name, "default", "connector", connector_id, REPORT_STRATEGY, True)
+            cache.update_ts(key, device_name, connector_id, i)
+        elif record.get_value() != value:
+            cache.update_key_value(key, device_name, connector_id, value)
+            cache.update_ts(key, device_name, connector_id, i)
+
+
+def sharded_producer(cache: ReportStrategyDataCache, thread_index, barrier: Barrier):
+    connector_id = "connector_%i" % thread_index
+    devices = ["device_%i_%i" % (thread_index, i) for i in range(DEVICES_PER_THREAD)]
+    barrier.wait()
+    for i in range(DATAPOINTS_PER_THREAD):
+        cache.filter_and_update(KEYS[i % KEYS_PER_DEVICE], i % 7, i, devices[i % DEVICES_PER_THREAD], "default",
+                                "connector", connector_id, REPORT_STRATEGY, True, i)
+
+
+def run(producer, cache_config, threads_count):
+    cache = ReportStrategyDataCache(cache_config, logging.getLogger("benchmark"))
+    barrier = Barrier(threads_count + 1)
+    threads = [Thread(target=producer, args=(cache, i, barrier), daemon=True) for i in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = perf_counter() - started
+    cache.stop()
+    return threads_count * DATAPOINTS_PER_THREAD / elapsed
+
+
+def main():
+    print("%-8s %32s %20s %8s" % ("threads", "1 shard, separate calls, dp/s", "sharded, dp/s", "ratio"))
+    for threads_count in THREADS_COUNTS:
+        separate_calls_throughput = run(separate_calls_producer, {"reportStrategyDataCacheShards": 1},
+                                        threads_count)
+        sharded_throughput = run(sharded_producer, {}, threads_count)
+        print("%-8i %32.0f %20.0f %8.2f" % (threads_count, separate_calls_throughput, sharded_throughput,
+                                            sharded_throughput / separate_calls_throughput))
+
+
+if __name__ == '__main__':
+    main()
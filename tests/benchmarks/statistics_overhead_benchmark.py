@@ -0,0 +1,74 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+"""
+Overhead of the statistics collection per message, converted by the JSON MQTT uplink converter:
+time of the decorated convert call compared to the conversion itself, with statistics disabled and enabled.
+
+Usage: python -m tests.benchmarks.statistics_overhead_benchmark
+"""
+
+from logging import getLogger
+from timeit import repeat
+
+from thingsboard_gateway.connectors.mqtt.json_mqtt_uplink_converter import JsonMqttUplinkConverter
+from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
+
+MESSAGES_COUNT = 20_000
+REPEATS = 5
+CONFIG = {
+    "topicFilter": "sensor/data",
+    "converter": {
+        "type": "json",
+        "deviceInfo": {
+            "deviceNameExpressionSource": "message",
+            "deviceNameExpression": "${serialNumber}",
+            "deviceProfileExpressionSource": "constant",
+            "deviceProfileExpression": "thermometer"
+        },
+        "attributes": [{"type": "string", "key": "model", "value": "${model}"}],
+        "timeseries": [{"type": "double", "key": "temperature", "value": "${temperature}"},
+                       {"type": "double", "key": "humidity", "value": "${humidity}"}]
+    }
+}
+MESSAGE = {"serialNumber": "SN-001", "model": "T1000", "temperature": 21.5, "humidity": 40.1}
+
+
+def measure(function):
+    return min(repeat(function, number=MESSAGES_COUNT, repeat=REPEATS)) / MESSAGES_COUNT * 1_000_000
+
+
+def main():
+    logger = getLogger("statistics_benchmark")
+    logger.setLevel("WARNING")
+    converter = JsonMqttUplinkConverter(CONFIG, logger)
+
+    conversion_time = measure(lambda: converter._convert_single_item("sensor/data", MESSAGE))
+
+    StatisticsService.disable_statistics()
+    disabled_time = measure(lambda: converter.convert("sensor/data", MESSAGE))
+
+    StatisticsService.enable_statistics()
+    enabled_time = measure(lambda: converter.convert("sensor/data", MESSAGE))
+    StatisticsService.merge_counters()
+    StatisticsService.disable_statistics()
+
+    print("%-22s %14s %14s" % ("statistics", "us/message", "overhead, us"))
+    print("%-22s %14.2f %14s" % ("none (conversion)", conversion_time, "-"))
+    print("%-22s %14.2f %14.2f" % ("disabled", disabled_time, disabled_time - conversion_time))
+    print("%-22s %14.2f %14.2f" % ("enabled", enabled_time, enabled_time - conversion_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+import asyncio
+from time import monotonic
+from types import SimpleNamespace
+from unittest import IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock
+
+from pymodbus.exceptions import ModbusIOException
+
+from thingsboard_gateway.connectors.modbus.entities.pipelined_tcp_client import AsyncModbusPipelinedTcpClient
+from thingsboard_gateway.connectors.modbus.modbus_connector import AsyncModbusConnector
+from thingsboard_gateway.connectors.modbus.utils import Utils
+
+RESPONSE_DELAY = 0.2
+
+
+class DelayedModbusTcpServer:
+    """
+    Answers to the read holding registers requests after the delay, so responses to the concurrent requests
+    are sent in the reversed order. Registers values are: unit id * 1000 + address.
+    """
+
+    def __init__(self):
+        self.server = None
+        self.port = None
+        self.max_concurrent_requests = 0
+        self.concurrent_requests = 0
+        self.silent_units = set()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.__handle_client, '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def __handle_client(self, reader, writer):
+        try:
+            while True:
+                header = await reader.readexactly(7)
+                body = await reader.readexactly(int.from_bytes(header[4:6], 'big') - 1)
+                asyncio.get_running_loop().create_task(self.__respond(writer, header, body))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def __respond(self, writer, header, body):
+        self.concurrent_requests += 1
+        self.max_concurrent_requests = max(self.max_concurrent_requests, self.concurrent_requests)
+        unit_id = header[6]
+        address = int.from_bytes(body[1:3], 'big')
+        count = int.from_bytes(body[3:5], 'big')
+        await asyncio.sleep(RESPONSE_DELAY * (1 - unit_id / 16))
+        self.concurrent_requests -= 1
+
+        if unit_id in self.silent_units:
+            return
+
+        if address >= 1000:
+            pdu = bytes([body[0] | 0x80, 2])
+        else:
+            pdu = bytes([body[0], count * 2]) + b''.join((unit_id * 1000 + address + offset).to_bytes(2, 'big')
+                                                          for offset in range(count))
+        writer.write(header[:4] + (len(pdu) + 1).to_bytes(2, 'big') + bytes([unit_id]) + pdu)
+
+
+class TestPipelinedTcpClient(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = DelayedModbusTcpServer()
+        await self.server.start()
+        self.client = AsyncModbusPipelinedTcpClient('127.0.0.1', self.server.port, timeout=1, retries=0,
+                                                    max_inflight_requests=8)
+        self.assertTrue(await self.client.connect())
+
+    async def asyncTearDown(self):
+        self.client.close()
+        await self.server.stop()
+
+    async def test_concurrent_requests_are_matched_by_transaction_id(self):
+        started = monotonic()
+        responses = await asyncio.gather(*(self.client.read_holding_registers(address=unit_id, count=2,
+                                                                                slave=unit_id)
+                                           for unit_id in range(1, 9)))
+
+        self.assertLess(monotonic() - started, RESPONSE_DELAY * 3)
+        self.assertEqual(self.server.max_concurrent_requests, 8)
+        for unit_id, response in zip(range(1, 9), responses):
+            self.assertEqual(response.dev_id, unit_id)
+            self.assertEqual(response.registers, [unit_id * 1000 + unit_id, unit_id * 1000 + unit_id + 1])
+
+    async def test_inflight_requests_are_limited(self):
+        self.client.max_inflight_requests = 2
+        self.client.close()
+        self.assertTrue(await self.client.connect())
+
+        await asyncio.gather(*(self.client.read_holding_registers(address=0, count=1, slave=unit_id)
+                               for unit_id in range(1, 7)))
+
+        self.assertEqual(self.server.max_concurrent_requests, 2)
+
+    async def test_exception_response_and_timeout(self):
+        self.server.silent_units.add(5)
+
+        exception_response, timeout_response, valid_response = await asyncio.gather(
+            self.client.read_holding_registers(address=1000, count=1, slave=1),
+            self.client.read_holding_registers(address=0, count=1, slave=5),
+            self.client.read_holding_registers(address=7, count=1, slave=2),
+            return_exceptions=True)
+
+        self.assertFalse(Utils.is_encoded_data_valid(exception_response))
+        self.assertIsInstance(timeout_response, ModbusIOException)
+        self.assertEqual(valid_response.registers, [2007])
+        self.assertEqual(self.client.inflight_requests_count, 0)
+
+
+class TestSharedMasterSettings(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.connector = AsyncModbusConnector.__new__(AsyncModbusConnector)
+        self.connector._master_connections = {}
+        self.connector._AsyncModbusConnector__log = MagicMock()
+
+    @staticmethod
+    def create_slave(device_name, pipeline_requests, max_inflight_requests=16, port=5021):
+        return SimpleNamespace(device_name=device_name, type='tcp', method='SOCKET', tls=None, host='127.0.0.1',
+                               port=port, timeout=1, retries=0, pipeline_requests=pipeline_requests,
+                               max_inflight_requests=max_inflight_requests)
+
+    def get_master(self, slave):
+        return self.connector._AsyncModbusConnector__get_master(slave)
+
+    async def test_connection_settings_are_taken_from_first_slave(self):
+        master = self.get_master(self.create_slave('Device A', True, 8))
+
+        self.assertIs(self.get_master(self.create_slave('Device B', True, 8)), master)
+        self.connector._AsyncModbusConnector__log.warning.assert_not_called()
+
+        self.assertIs(self.get_master(self.create_slave('Device C', False)), master)
+        self.assertIs(self.get_master(self.create_slave('Device D', True, 4)), master)
+        self.assertTrue(master.pipelined)
+        self.assertEqual(master.max_inflight_requests, 8)
+        self.assertEqual([call.args[4] for call in self.connector._AsyncModbusConnector__log.warning.call_args_list],
+                         ['Device C', 'Device D'])
+
+    async def test_not_pipelined_connection_ignores_max_inflight_requests(self):
+        master = self.get_master(self.create_slave('Device A', False, 8))
+
+        self.assertIs(self.get_master(self.create_slave('Device B', False, 4)), master)
+        self.assertIsNot(self.get_master(self.create_slave('Device C', True, port=5022)), master)
+        self.assertFalse(master.pipelined)
+        self.connector._AsyncModbusConnector__log.warning.assert_not_called()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+import logging
+from unittest import TestCase, main
+
+from pymodbus import ExceptionResponse
+from pymodbus.exceptions import ModbusIOException
+
+from thingsboard_gateway.connectors.modbus.bytes_modbus_uplink_converter import BytesModbusUplinkConverter
+from thingsboard_gateway.connectors.modbus.entities.bytes_uplink_converter_config import BytesUplinkConverterConfig
+from thingsboard_gateway.connectors.modbus.read_planner import ModbusReadPlanner, PlannedReadResponse
+
+LOGGER = logging.getLogger('Modbus read planner test')
+
+
+class FakeDevice:
+    """Device with register value equal to its address and coil value equal to the address parity."""
+
+    def __init__(self, unmapped_addresses=()):
+        self.requests = []
+        self.unmapped_addresses = set(unmapped_addresses)
+
+    def read(self, function_code, address, count):
+        self.requests.append((function_code, address, count))
+        if self.unmapped_addresses.intersection(range(address, address + count)):
+            return None
+
+        if function_code in (1, 2):
+            bits = [bool(current_address % 2) for current_address in range(address, address + count)]
+            return PlannedReadResponse(bits=bits + [False] * (-count % 8))
+
+        return PlannedReadResponse(registers=list(range(address, address + count)))
+
+
+class TestModbusReadPlanner(TestCase):
+
+    def setUp(self):
+        self.config = BytesUplinkConverterConfig(**{
+            'deviceName': 'Test device',
+            'unitId': 1,
+            'byteOrder': 'BIG',
+            'wordOrder': 'BIG',
+            'timeseries': [
+                {'tag': 'temperature', 'type': '16int', 'functionCode': 3, 'objectsCount': 1, 'address': 10},
+                {'tag': 'humidity', 'type': '16int', 'functionCode': 3, 'objectsCount': 1, 'address': 11},
+                {'tag': 'energy', 'type': '32int', 'functionCode': 3, 'objectsCount': 2, 'address': 14},
+                {'tag': 'input', 'type': '16int', 'functionCode': 4, 'objectsCount': 1, 'address': 12},
+                {'tag': 'coil', 'type': 'bits', 'functionCode': 1, 'objectsCount': 1, 'address': 3}
+            ],
+            'attributes': [
+                {'tag': 'serial', 'type': '16uint', 'functionCode': 3, 'objectsCount': 1, 'address': 12},
+                {'tag': 'far', 'type': '16uint', 'functionCode': 3, 'objectsCount': 1, 'address': 200},
+                {'tag': 'coils_${address}', 'type': 'bits', 'functionCode': 1, 'objectsCount': 1,
+                 'address': '5-7'}
+            ]
+        })
+        self.converter = BytesModbusUplinkConverter(self.config, LOGGER)
+
+    def read_with_plan(self, planner, device):
+        result = {'telemetry': {}, 'attributes': {}}
+        for read_block in planner.blocks:
+            read_block.slice_response(device.read(read_block.function_code, read_block.address, read_block.count),
+                                      result)
+        return result
+
+    def read_separately(self, device):
+        result = {'telemetry': {}, 'attributes': {}}
+        for config_section, config_key in (('attributes', 'attributes'), ('telemetry', 'timeseries')):
+            for config in getattr(self.config, config_section):
+                single_tag_config = BytesUplinkConverterConfig(deviceName='Test device', unitId=1,
+                                                               **{config_key: [config]})
+                for read_block in ModbusReadPlanner(single_tag_config).blocks:
+                    read_block.slice_response(device.read(read_block.function_code, read_block.address,
+                                                          read_block.count),
+                                              result)
+        return result
+
+    @staticmethod
+    def get_telemetry_values(converted_data):
+        values = {}
+        for telemetry_entry in converted_data.telemetry:
+            values.update(telemetry_entry.to_dict()['values'])
+        return values
+
+    def test_adjacent_ranges_are_merged(self):
+        planner = ModbusReadPlanner(self.config)
+
+        self.assertEqual([(block.function_code, block.address, block.count) for block in planner.blocks],
+                         [(1, 3, 1), (1, 5, 3), (3, 10, 3), (3, 14, 2), (3, 200, 1), (4, 12, 1)])
+
+    def test_ranges_within_gap_tolerance_are_merged(self):
+        planner = ModbusReadPlanner(self.config, gap_tolerance=1)
+
+        self.assertEqual([(block.function_code, block.address, block.count) for block in planner.blocks],
+                         [(1, 3, 5), (3, 10, 6), (3, 200, 1), (4, 12, 1)])
+
+    def test_protocol_and_configured_limits(self):
+        config = BytesUplinkConverterConfig(deviceName='Test device', unitId=1, timeseries=[
+            {'tag': 'wide_${address}', 'type': '16int', 'functionCode': 3, 'objectsCount': 1, 'address': '0-299'},
+            {'tag': 'coils_${address}', 'type': 'bits', 'functionCode': 2, 'objectsCount': 1, 'address': '0-2499'}
+        ])
+
+        planner = ModbusReadPlanner(config)
+        self.assertEqual([(block.function_code, block.address, block.count) for block in planner.blocks],
+                         [(2, 0, 2000), (2, 2000, 500), (3, 0, 125), (3, 125, 125), (3, 250, 50)])
+
+        planner = ModbusReadPlanner(config, max_objects_per_read=100)
+        self.assertEqual(max(block.count for block in planner.blocks), 100)
+        self.assertEqual(sum(block.count for block in planner.blocks), 2800)
+
+    def test_converted_data_is_the_same_as_for_separate_reads(self):
+        for gap_tolerance in (0, 1, 10, 200):
+            with self.subTest(gap_tolerance=gap_tolerance):
+                device = FakeDevice()
+                planned_data = self.read_with_plan(ModbusReadPlanner(self.config, gap_tolerance=gap_tolerance),
+                                                   device)
+                planned_requests_count = len(device.requests)
+
+                separate_data = self.read_separately(device)
+
+                self.assertLess(planned_requests_count, len(device.requests) - planned_requests_count)
+                planned_converted_data = self.converter.convert(None, [planned_data])
+                separate_converted_data = self.converter.convert(None, [separate_data])
+                self.assertEqual(planned_converted_data.attributes.to_dict(),
+                                 separate_converted_data.attributes.to_dict())
+                self.assertEqual(self.get_telemetry_values(planned_converted_data),
+                                 self.get_telemetry_values(separate_converted_data))
+
+    def test_isolated_ranges_are_not_merged(self):
+        device = FakeDevice(unmapped_addresses=[13])
+        planner = ModbusReadPlanner(self.config, gap_tolerance=1)
+        rejected_block = next(block for block in planner.blocks if block.address == 10)
+
+        result = self.read_with_plan(planner, device)
+        self.assertIsNone(result['telemetry']['energy'][0])
+
+        planner.isolate(rejected_block)
+        self.assertEqual([(block.function_code, block.address, block.count) for block in planner.blocks
+                          if block.function_code == 3],
+                         [(3, 10, 1), (3, 11, 1), (3, 12, 1), (3, 14, 2), (3, 200, 1)])
+
+        result = self.read_with_plan(planner, device)
+        self.assertEqual(result['telemetry']['energy'][0].registers, [14, 15])
+
+    def test_transient_errors_do_not_isolate_ranges(self):
+        planner = ModbusReadPlanner(self.config, gap_tolerance=1)
+        blocks = planner.blocks
+        coalesced_block = next(block for block in blocks if block.address == 10)
+
+        for response in (None, ModbusIOException('No response received'),
+                         ExceptionResponse(3, ExceptionResponse.SLAVE_BUSY)):
+            with self.subTest(response=response):
+                self.assertFalse(planner.isolate_if_rejected(coalesced_block, response))
+                self.assertIs(planner.blocks, blocks)
+
+        self.assertTrue(planner.isolate_if_rejected(coalesced_block,
+                                                    ExceptionResponse(3, ExceptionResponse.ILLEGAL_ADDRESS)))
+        self.assertNotIn((3, 10, 6), [(block.function_code, block.address, block.count)
+                                      for block in planner.blocks])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from unittest import TestCase, main
+
+from thingsboard_gateway.connectors.mqtt.topic_router import TopicRouter
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class TopicRouterTest(TestCase):
+
+    def setUp(self):
+        self.router = TopicRouter()
+
+    def add_topic_filter(self, topic_filter):
+        regex_topic = TBUtility.topic_to_regex(topic_filter)
+        self.router[regex_topic] = topic_filter
+        return regex_topic
+
+    def test_match_exact_topic(self):
+        key = self.add_topic_filter('sensor/data')
+
+        self.assertListEqual(self.router.match('sensor/data'), [key])
+        self.assertListEqual(self.router.match('sensor/data/temperature'), [])
+        self.assertListEqual(self.router.match('sensor'), [])
+
+    def test_match_single_level_wildcard(self):
+        key = self.add_topic_filter('sensor/+/data')
+
+        self.assertListEqual(self.router.match('sensor/SN-001/data'), [key])
+        self.assertListEqual(self.router.match('sensor/SN-001/other/data'), [])
+        self.assertListEqual(self.router.match('sensor/data'), [])
+
+    def test_match_multi_level_wildcard(self):
+        key = self.add_topic_filter('sensor/#')
+
+        self.assertListEqual(self.router.match('sensor/SN-001/data'), [key])
+        self.assertListEqual(self.router.match('sensor'), [key])
+        self.assertListEqual(self.router.match('device/SN-001'), [])
+
+    def test_system_topics_are_not_matched_by_first_level_wildcards(self):
+        self.add_topic_filter('#')
+        self.add_topic_filter('+/info')
+        key = self.add_topic_filter('$SYS/info')
+
+        self.assertListEqual(self.router.match('$SYS/info'), [key])
+
+    def test_match_shared_subscriptions(self):
+        shared_key = self.add_topic_filter('$share/gateway/sensor/+/data')
+        queue_key = self.add_topic_filter('$queue/sensor/SN-001/data')
+
+        self.assertListEqual(self.router.match('sensor/SN-001/data'), [shared_key, queue_key])
+        self.assertListEqual(self.router.match('$share/gateway/sensor/SN-001/data'), [])
+
+    def test_matched_keys_are_returned_in_insertion_order(self):
+        keys = [self.add_topic_filter(topic_filter)
+                for topic_filter in ('sensor/#', 'sensor/SN-001/data', 'sensor/+/data', '+/+/data')]
+
+        self.assertListEqual(self.router.match('sensor/SN-001/data'), keys)
+
+    def test_cached_result_is_reset_after_adding_topic_filter(self):
+        first_key = self.add_topic_filter('sensor/+')
+        self.assertListEqual(self.router.match('sensor/SN-001'), [first_key])
+
+        second_key = self.add_topic_filter('sensor/SN-001')
+        self.assertListEqual(self.router.match('sensor/SN-001'), [first_key, second_key])
+
+        self.router.clear()
+        self.assertListEqual(self.router.match('sensor/SN-001'), [])
+        self.assertDictEqual(self.router, {})
+
+
+if __name__ == '__main__':
+    main()
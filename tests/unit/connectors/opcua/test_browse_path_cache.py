@@ -0,0 +1,121 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import logging
+import socket
+from os import path
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock, patch
+
+from asyncua import Client, Server
+
+from thingsboard_gateway.connectors.opcua.browse_path_cache import BrowsePathCache
+from thingsboard_gateway.connectors.opcua.opcua_connector import OpcUaConnector
+
+LOGGER = logging.getLogger('OPC-UA browse path cache test')
+NAMESPACE_URI = 'http://thingsboard.io/test'
+TEMPERATURE_PATH = ['0:Objects', '2:MyObject', '2:Temperature']
+
+
+def get_free_port():
+    with socket.socket() as free_socket:
+        free_socket.bind(('127.0.0.1', 0))
+        return free_socket.getsockname()[1]
+
+
+class BrowsePathCacheTest(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        url = 'opc.tcp://127.0.0.1:%i/test/' % get_free_port()
+        self.server = Server()
+        await self.server.init()
+        self.server.set_endpoint(url)
+        namespace_index = await self.server.register_namespace(NAMESPACE_URI)
+        self.device_node = await self.server.nodes.objects.add_object(namespace_index, 'MyObject')
+        self.temperature_node = await self.device_node.add_variable(namespace_index, 'Temperature', 21.5)
+        await self.server.start()
+
+        self.client = Client(url)
+        await self.client.connect()
+        self.namespace_array = await self.client.get_namespace_array()
+
+        self.cache_directory = TemporaryDirectory()
+        self.cache_file_path = path.join(self.cache_directory.name, 'opcua', 'browse_paths.json')
+        self.cache = BrowsePathCache(self.cache_file_path, LOGGER)
+        self.cache.load('opc.tcp://server', self.namespace_array)
+
+    async def asyncTearDown(self):
+        await self.client.disconnect()
+        await self.server.stop()
+        self.cache_directory.cleanup()
+
+    async def test_paths_are_resolved_in_bulk_and_loaded_after_restart(self):
+        resolved_count = await self.cache.resolve(self.client, [TEMPERATURE_PATH, TEMPERATURE_PATH,
+                                                                ['0:Objects', '2:MyObject', '2:Missing'],
+                                                                ['Objects', 'MyObject']])
+        self.assertEqual(resolved_count, 1)
+        self.cache.save()
+
+        restarted_cache = BrowsePathCache(self.cache_file_path, LOGGER)
+        restarted_cache.load('opc.tcp://server', self.namespace_array)
+        cached_nodes = restarted_cache.get(TEMPERATURE_PATH, self.client.get_node)
+
+        self.assertEqual(cached_nodes[0][-1]['node'].nodeid, self.temperature_node.nodeid)
+        self.assertEqual(await cached_nodes[0][-1]['node'].read_value(), 21.5)
+
+    async def test_cache_is_dropped_when_namespaces_are_changed(self):
+        self.cache.put('Root\\.Objects\\.MyObject', [[{'path': '0:Objects', 'node': self.client.nodes.objects},
+                                                      {'path': '2:MyObject', 'node': self.device_node}]])
+        self.cache.save()
+
+        restarted_cache = BrowsePathCache(self.cache_file_path, LOGGER)
+        restarted_cache.load('opc.tcp://server', [*self.namespace_array, 'http://thingsboard.io/other'])
+
+        self.assertEqual(len(restarted_cache), 0)
+        self.assertIsNone(restarted_cache.get('Root\\.Objects\\.MyObject', self.client.get_node))
+
+    async def test_chains_with_not_qualified_names_are_not_cached(self):
+        self.cache.put(['Root', 'MyObject'], [['Root', {'path': '2:MyObject', 'node': self.device_node}]])
+
+        self.assertEqual(len(self.cache), 0)
+
+    async def test_refresh_drops_paths_resolved_to_other_nodes(self):
+        await self.cache.resolve(self.client, [TEMPERATURE_PATH])
+        self.cache.put(['0:Objects', '2:MyObject'], [['0:Objects', {'path': '2:MyObject', 'node': self.device_node}]])
+
+        await self.server.delete_nodes([self.temperature_node])
+        await self.device_node.add_variable(2, 'Temperature', 22.5)
+        invalidated_paths = await self.cache.refresh(self.client)
+
+        self.assertEqual(invalidated_paths, {BrowsePathCache.get_key(TEMPERATURE_PATH)})
+        self.assertIsNone(self.cache.get(TEMPERATURE_PATH, self.client.get_node))
+        self.assertIsNotNone(self.cache.get(['0:Objects', '2:MyObject'], self.client.get_node))
+
+    async def test_cache_file_of_connector_without_id_is_kept_after_restart(self):
+        gateway = MagicMock()
+        gateway.get_data_folder_path.return_value = self.cache_directory.name
+        cache_file_paths = set()
+        for _ in range(2):
+            with patch('thingsboard_gateway.connectors.opcua.opcua_connector.init_logger'):
+                connector = OpcUaConnector(gateway, {'server': {'url': 'localhost:4840', 'mapping': []}}, 'opcua')
+            cache_file_paths.add(connector._OpcUaConnector__browse_path_cache._BrowsePathCache__file_path)
+
+        self.assertEqual(len(cache_file_paths), 1)
+        self.assertEqual(cache_file_paths.pop().parent, Path(self.cache_directory.name, 'opcua'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import asyncio
+from queue import Empty, Queue
+from threading import Thread
+from unittest import main
+
+from asyncua.ua import DataValue, Variant
+
+from tests.unit.connectors.opcua.opcua_base_test import OpcUABaseTest
+from thingsboard_gateway.connectors.opcua.opcua_uplink_converter import OpcUaUplinkConverter
+
+READ_DELAY = 0.1
+
+
+class FakeReadClient:
+    """Returns the identifier of every node as its value after the delay, the last batch is answered first."""
+
+    def __init__(self, failed_batch_start_identifier=None):
+        self.batches = []
+        self.concurrent_reads = 0
+        self.max_concurrent_reads = 0
+        self.failed_batch_start_identifier = failed_batch_start_identifier
+
+    async def read_attributes(self, nodes):
+        self.batches.append(nodes)
+        self.concurrent_reads += 1
+        self.max_concurrent_reads = max(self.max_concurrent_reads, self.concurrent_reads)
+        await asyncio.sleep(READ_DELAY / len(self.batches))
+        self.concurrent_reads -= 1
+
+        if nodes[0].nodeid.Identifier == self.failed_batch_start_identifier:
+            raise ConnectionError('Read failed')
+
+        return [DataValue(Variant(node.nodeid.Identifier)) for node in nodes]
+
+
+class OpcUAPollingTest(OpcUABaseTest):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.connector._OpcUaConnector__data_to_convert = Queue(-1)
+        self.connector._OpcUaConnector__max_nodes_per_read = 3
+        self.connector._OpcUaConnector__max_concurrent_reads = 2
+        self.connector._OpcUaConnector__storage_backpressure = False
+        Thread.__init__(self.connector, name='OPC-UA test connector')
+        self.connector._OpcUaConnector__id = 'opcua-test'
+
+        for device_index in range(2):
+            device = self.create_fake_device('attribute_updates/opcua_config_attribute_update_full_path.json')
+            device.name = 'Device %i' % device_index
+            device.converter = OpcUaUplinkConverter({'device_name': device.name, 'device_type': 'default'},
+                                                    self.connector._OpcUaConnector__log)
+            self.connector._OpcUaConnector__device_nodes.append(device)
+
+    def get_converted_values(self):
+        self.connector._OpcUaConnector__gateway.send_to_storage.reset_mock()
+
+        while True:
+            try:
+                batch, values, received_ts, data_retrieving_started = \
+                    self.connector._OpcUaConnector__data_to_convert.get_nowait()
+            except Empty:
+                break
+            self.connector._OpcUaConnector__convert_retrieved_data(batch, values, received_ts,
+                                                                   data_retrieving_started)
+
+        converted_values = {}
+        for send_call in self.connector._OpcUaConnector__gateway.send_to_storage.call_args_list:
+            converted_data = send_call.args[2]
+            device_values = converted_values.setdefault(converted_data.device_name, {})
+            device_values.update(converted_data.attributes.to_dict())
+            for telemetry_entry in converted_data.telemetry:
+                device_values.update(telemetry_entry.to_dict()['values'])
+        return converted_values
+
+    async def test_batches_are_read_concurrently_and_routed_to_devices(self):
+        client = FakeReadClient()
+        self.connector._OpcUaConnector__client = client
+
+        await self.connector._OpcUaConnector__poll_nodes()
+
+        self.assertEqual([len(batch) for batch in client.batches], [3, 3, 2])
+        self.assertEqual(client.max_concurrent_reads, 2)
+        expected_values = {'Power': 14, 'Frequency': 13, 'Humidity': 16, 'Temperature': 15}
+        self.assertEqual(self.get_converted_values(), {'Device 0': expected_values, 'Device 1': expected_values})
+
+    async def test_failed_batch_does_not_shift_values_of_other_batches(self):
+        # The second batch contains the last node of the first device and the first two nodes of the second one
+        client = FakeReadClient(failed_batch_start_identifier=15)
+        self.connector._OpcUaConnector__client = client
+
+        await self.connector._OpcUaConnector__poll_nodes()
+
+        self.assertEqual(self.get_converted_values(), {
+            'Device 0': {'Power': 14, 'Frequency': 13, 'Humidity': 16},
+            'Device 1': {'Humidity': 16, 'Temperature': 15},
+        })
+
+
+if __name__ == '__main__':
+    main()
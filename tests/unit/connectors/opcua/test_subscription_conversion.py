@@ -0,0 +1,101 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from queue import Queue
+from threading import Thread
+from time import monotonic, sleep
+from types import SimpleNamespace
+from unittest import main
+from unittest.mock import patch
+
+from asyncua.ua import DataValue, Variant
+
+from tests.unit.connectors.opcua.opcua_base_test import OpcUABaseTest
+from thingsboard_gateway.connectors.opcua.opcua_uplink_converter import OpcUaUplinkConverter
+from thingsboard_gateway.gateway.constants import RECEIVED_TS_PARAMETER
+
+
+class OpcUASubscriptionConversionTest(OpcUABaseTest):
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        Thread.__init__(self.connector, name='OPC-UA test connector')
+        self.connector._OpcUaConnector__id = 'opcua-test'
+        self.connector._OpcUaConnector__stopped = False
+        self.connector._OpcUaConnector__storage_backpressure = False
+        self.connector._OpcUaConnector__sub_check_period_in_millis = 10
+        self.connector._OpcUaConnector__sub_data_max_batch_size = 1000
+        self.connector._OpcUaConnector__sub_data_min_batch_creation_time = 0.05
+        self.connector._OpcUaConnector__sub_data_to_convert = Queue(-1)
+        self.connector._OpcUaConnector__nodes_config_cache = {}
+
+        self.device = self.create_fake_device('attribute_updates/opcua_config_attribute_update_full_path.json')
+        self.device.converter_for_sub = OpcUaUplinkConverter({'device_name': self.device.name,
+                                                              'device_type': 'default'},
+                                                             self.connector._OpcUaConnector__log)
+        for node_config in self.device.nodes:
+            node_id = node_config['node'].nodeid
+            self.device.nodes_data_change_subscriptions[node_id] = {'subscription': 1, 'node': node_config['node'],
+                                                                    'nodes_configs': [node_config],
+                                                                    'conversion_plans': None}
+            self.connector._OpcUaConnector__nodes_config_cache[node_id] = [self.device]
+
+    async def asyncTearDown(self):
+        self.connector._OpcUaConnector__stopped = True
+        await super().asyncTearDown()
+
+    def convert_notifications(self, notifications):
+        for node, value, received_ts in notifications:
+            self.connector._OpcUaConnector__sub_data_to_convert.put(
+                (node, SimpleNamespace(monitored_item=SimpleNamespace(Value=value)), received_ts))
+
+        send_to_storage = self.connector._OpcUaConnector__gateway.send_to_storage
+        send_to_storage.reset_mock()
+        converter_thread = Thread(target=self.connector._OpcUaConnector__convert_sub_data, daemon=True)
+        converter_thread.start()
+        deadline = monotonic() + 5
+        while not self.connector._OpcUaConnector__sub_data_to_convert.empty() and monotonic() < deadline:
+            sleep(.01)
+        sleep(.1)
+        self.connector._OpcUaConnector__stopped = True
+        converter_thread.join(timeout=5)
+
+        return [converted_data for send_call in send_to_storage.call_args_list for converted_data in send_call.args[2]]
+
+    async def test_batch_of_notifications_is_converted_to_single_data_per_device(self):
+        nodes = {node_config['key']: node_config['node'] for node_config in self.device.nodes}
+
+        with patch.object(OpcUaUplinkConverter, 'get_conversion_plans',
+                          wraps=self.device.converter_for_sub.get_conversion_plans) as get_conversion_plans:
+            converted_data_list = self.convert_notifications([
+                (nodes['Humidity'], DataValue(Variant(40)), 1000),
+                (nodes['Temperature'], DataValue(Variant(21.5)), 1000),
+                (nodes['Power'], DataValue(Variant(7)), 1001),
+                (nodes['Humidity'], DataValue(Variant(41)), 1002),
+            ])
+
+        self.assertEqual(len(converted_data_list), 1)
+        converted_data = converted_data_list[0]
+        self.assertEqual(converted_data.device_name, self.DEVICE_NAME)
+        self.assertEqual(converted_data.attributes.to_dict(), {'Power': 7})
+        self.assertEqual([telemetry_entry.to_dict() for telemetry_entry in converted_data.telemetry],
+                         [{'ts': 1000, 'values': {'Humidity': 40, 'Temperature': 21.5}},
+                          {'ts': 1002, 'values': {'Humidity': 41}}])
+        self.assertEqual(converted_data.metadata[RECEIVED_TS_PARAMETER], 1000)
+        # Plans are prepared once for every subscribed node
+        self.assertEqual(get_conversion_plans.call_count, 3)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import asyncio
+import threading
+from time import monotonic
+from unittest import IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock, patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from thingsboard_gateway.connectors.request.request_connector import RequestConnector
+
+ENDPOINTS_COUNT = 200
+SUB_REQUEST_DELAY = 0.3
+
+
+class RequestConnectorPollingTest(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.client_ports = set()
+        self.sent_data = []
+        self.connector = None
+
+        app = web.Application()
+        app.add_routes([web.get('/device/{id}', self.get_device), web.get('/devices', self.get_devices),
+                        web.get('/devices/sub/{id}', self.get_sub_data),
+                        web.get('/devices/serial/{id}', self.get_serial_number),
+                        web.get('/devices/serials/{serial}', self.get_serial_data)])
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+    async def asyncTearDown(self):
+        if self.connector is not None:
+            self.connector.close()
+        await self.server.close()
+
+    async def get_device(self, request):
+        self.client_ports.add(request.transport.get_extra_info('peername')[1])
+        device_id = int(request.match_info['id'])
+        return web.json_response({'name': 'Device %i' % device_id, 'value': device_id})
+
+    async def get_devices(self, request):
+        return web.json_response([{'name': 'Device %i' % device_id, 'id': device_id} for device_id in range(5)])
+
+    async def get_sub_data(self, request):
+        await asyncio.sleep(SUB_REQUEST_DELAY)
+        return web.json_response({'extra': int(request.match_info['id']) * 10})
+
+    async def get_serial_number(self, request):
+        return web.json_response({'serial': 'SN-%s' % request.match_info['id']})
+
+    async def get_serial_data(self, request):
+        return web.json_response({'model': 'Model of %s' % request.match_info['serial']})
+
+    def start_connector(self, mapping, max_connections_per_host=10):
+        config = {
+            'name': 'Request test connector',
+            'host': str(self.server.make_url('')).rstrip('/'),
+            'SSLVerify': False,
+            'maxConnectionsPerHost': max_connections_per_host,
+            'security': {'type': 'anonymous'},
+            'mapping': mapping
+        }
+        gateway = MagicMock()
+        gateway.send_to_storage.side_effect = lambda name, connector_id, data: self.sent_data.append(
+            (monotonic(), data.device_name,
+             {key: value for entry in data.telemetry for key, value in entry.to_dict()['values'].items()}))
+        with patch('thingsboard_gateway.connectors.request.request_connector.init_logger', return_value=MagicMock()):
+            self.connector = RequestConnector(gateway, config, 'request')
+        self.connector.open()
+
+    @staticmethod
+    def get_mapping(url, telemetry, scan_period, **kwargs):
+        return {
+            'url': url, 'httpMethod': 'GET', 'timeout': 5, 'scanPeriod': scan_period,
+            'converter': {'type': 'json', 'deviceNameJsonExpression': '${name}', 'deviceTypeJsonExpression': 'default',
+                          'attributes': [], 'telemetry': telemetry},
+            **kwargs
+        }
+
+    async def wait_for(self, condition, timeout=10):
+        started = monotonic()
+        while not condition():
+            self.assertLess(monotonic() - started, timeout)
+            await asyncio.sleep(.05)
+
+    async def test_endpoints_are_polled_from_one_thread_over_pooled_connections(self):
+        thread_names = {thread.name for thread in threading.enumerate()}
+        self.start_connector([self.get_mapping('device/%i' % device_id,
+                                               [{'key': 'value', 'type': 'int', 'value': '${value}'}], .5)
+                              for device_id in range(ENDPOINTS_COUNT)], max_connections_per_host=4)
+
+        await self.wait_for(lambda: len(self.sent_data) >= ENDPOINTS_COUNT * 3)
+
+        new_thread_names = {thread.name for thread in threading.enumerate()} - thread_names
+        self.assertIn(self.connector.name, new_thread_names)
+        self.assertEqual([thread_name for thread_name in new_thread_names if thread_name.startswith('Request to')], [])
+        self.assertLessEqual(len(self.client_ports), 4)
+        self.assertEqual({device_name for _, device_name, _ in self.sent_data},
+                         {'Device %i' % device_id for device_id in range(ENDPOINTS_COUNT)})
+        self.assertIn(('Device 7', {'value': 7}), [(device_name, values) for _, device_name, values in self.sent_data])
+
+    async def test_sub_requests_are_sent_concurrently_if_enabled(self):
+        started = monotonic()
+        self.start_connector([self.get_mapping('devices', [{'key': 'extra', 'type': 'int', 'value': '${extra}'}], 60,
+                                               subRequests={'extra': {'url': 'sub/${id}'}},
+                                               concurrentSubRequests=True)])
+
+        await self.wait_for(lambda: len(self.sent_data) == 5)
+
+        self.assertLess(self.sent_data[-1][0] - started, SUB_REQUEST_DELAY * 3)
+        self.assertEqual([(device_name, values) for _, device_name, values in self.sent_data],
+                         [('Device %i' % device_id, {'extra': device_id * 10}) for device_id in range(5)])
+
+    async def test_sub_requests_are_sent_in_order_by_default(self):
+        self.start_connector([self.get_mapping('devices', [{'key': 'serial', 'type': 'string', 'value': '${serial}'},
+                                                           {'key': 'model', 'type': 'string', 'value': '${model}'}],
+                                               60, subRequests={'serial': {'url': 'serial/${id}'},
+                                                                'model': {'url': 'serials/${serial}'}})])
+
+        await self.wait_for(lambda: len(self.sent_data) == 5)
+
+        # The url of the second sub request uses the result of the first one
+        self.assertEqual([(device_name, values) for _, device_name, values in self.sent_data],
+                         [('Device %i' % device_id,
+                           {'serial': 'SN-%i' % device_id, 'model': 'Model of SN-%i' % device_id})
+                          for device_id in range(5)])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from copy import deepcopy
+from unittest import IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from thingsboard_gateway.connectors.rest.json_rest_uplink_converter import JsonRESTUplinkConverter
+from thingsboard_gateway.connectors.rest.rest_connector import AnonymousDataHandler
+
+ENDPOINT_CONFIG = {
+    'endpoint': '/devices',
+    'HTTPMethods': ['POST'],
+    'converter': {
+        'type': 'json',
+        'deviceInfo': {
+            'deviceNameExpressionSource': 'request',
+            'deviceNameExpression': '${deviceName}',
+            'deviceProfileExpressionSource': 'constant',
+            'deviceProfileExpression': 'thermometer'
+        },
+        'attributes': [{'type': 'string', 'key': 'model', 'value': '${model}'}],
+        'timeseries': [
+            {'type': 'double', 'key': 'temperature', 'value': '${temperature}', 'tsField': '${ts}'},
+            {'type': 'double', 'key': '${sensor}', 'value': '${humidity}', 'tsField': '${ts}'}
+        ]
+    }
+}
+
+
+class CountingConverter(JsonRESTUplinkConverter):
+    instances_count = 0
+
+    def __init__(self, config, logger):
+        CountingConverter.instances_count += 1
+        super().__init__(config, logger)
+
+
+class RESTBulkIngestionTest(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        CountingConverter.instances_count = 0
+        self.converted_data = []
+        self.endpoint = {'config': deepcopy(ENDPOINT_CONFIG), 'converter': CountingConverter}
+        handler = AnonymousDataHandler(lambda name, connector_id, data: self.converted_data.append(data),
+                                       'REST test connector', 'rest-test', self.endpoint, MagicMock(),
+                                       provider=MagicMock())
+
+        app = web.Application()
+        app.add_routes([web.post('/devices', handler)])
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = ClientSession()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+
+    async def post(self, **kwargs):
+        async with self.session.post(self.server.make_url('/devices'), **kwargs) as response:
+            return response.status
+
+    def get_converted_values(self):
+        return {converted_data.device_name: {
+            'type': converted_data.device_type,
+            'attributes': converted_data.attributes.to_dict(),
+            'telemetry': [telemetry_entry.to_dict() for telemetry_entry in converted_data.telemetry]
+        } for converted_data in self.converted_data}
+
+    async def test_json_array_is_converted_into_data_of_several_devices(self):
+        status = await self.post(json=[
+            {'deviceName': 'Device A', 'model': 'T1', 'temperature': 21.5, 'ts': 1000},
+            {'deviceName': 'Device B', 'temperature': 18, 'sensor': 'humidity', 'humidity': 40, 'ts': 1000},
+            {'deviceName': 'Device A', 'temperature': 22, 'ts': 2000},
+        ])
+
+        self.assertEqual(status, 200)
+        self.assertEqual(self.get_converted_values(), {
+            'Device A': {'type': 'thermometer', 'attributes': {'model': 'T1'},
+                         'telemetry': [{'ts': 1000, 'values': {'temperature': '21.5'}},
+                                       {'ts': 2000, 'values': {'temperature': '22'}}]},
+            'Device B': {'type': 'thermometer', 'attributes': {},
+                         'telemetry': [{'ts': 1000, 'values': {'temperature': '18', 'humidity': '40'}}]},
+        })
+
+    async def test_ndjson_body_is_converted_with_query_parameters(self):
+        status = await self.post(data='{"temperature": 21.5, "ts": 1000}\n\n{"temperature": 22, "ts": 2000}\n',
+                                 params={'deviceName': 'Device A'},
+                                 headers={'Content-Type': 'application/x-ndjson'})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(self.get_converted_values(), {
+            'Device A': {'type': 'thermometer', 'attributes': {},
+                         'telemetry': [{'ts': 1000, 'values': {'temperature': '21.5'}},
+                                       {'ts': 2000, 'values': {'temperature': '22'}}]},
+        })
+
+    async def test_converter_is_created_once_and_endpoint_config_is_not_changed(self):
+        for temperature in range(3):
+            await self.post(json={'deviceName': 'Device A', 'temperature': temperature, 'ts': 1000})
+
+        self.assertEqual(CountingConverter.instances_count, 1)
+        self.assertEqual(len(self.converted_data), 3)
+        self.assertEqual(self.endpoint['config'], ENDPOINT_CONFIG)
+
+
+if __name__ == '__main__':
+    main()
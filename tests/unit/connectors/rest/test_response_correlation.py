@@ -0,0 +1,160 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import asyncio
+from threading import Thread
+from unittest import IsolatedAsyncioTestCase, main
+from unittest.mock import MagicMock
+
+from aiohttp import ClientSession, TCPConnector, web
+from aiohttp.test_utils import TestServer
+
+from thingsboard_gateway.connectors.rest.json_rest_uplink_converter import JsonRESTUplinkConverter
+from thingsboard_gateway.connectors.rest.response_correlator import ResponseCorrelator
+from thingsboard_gateway.connectors.rest.rest_connector import AnonymousDataHandler
+
+CONCURRENT_REQUESTS = 500
+
+
+class RESTResponseCorrelationTest(IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.log = MagicMock()
+        self.correlator = ResponseCorrelator(self.log)
+        self.correlator.set_loop(asyncio.get_running_loop())
+        self.sent_devices = []
+        self.requested_attributes = []
+
+        app = web.Application()
+        app.add_routes([
+            web.post('/device', self.create_handler(self.get_data_endpoint(timeout=10))),
+            web.post('/timeout', self.create_handler(self.get_data_endpoint(timeout=.2))),
+            web.get('/attributes', self.create_handler(self.get_attribute_request_endpoint())),
+        ])
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = ClientSession(connector=TCPConnector(limit=0))
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+
+    def create_handler(self, endpoint):
+        return AnonymousDataHandler(self.send_to_storage, 'REST test connector', 'rest-test', endpoint, self.log,
+                                    provider=MagicMock(), response_correlator=self.correlator)
+
+    @staticmethod
+    def get_data_endpoint(timeout):
+        return {
+            'config': {
+                'endpoint': '/device',
+                'HTTPMethods': ['POST'],
+                'response': {'responseExpected': True, 'responseAttribute': 'result', 'timeout': timeout},
+                'converter': {
+                    'type': 'json',
+                    'deviceInfo': {
+                        'deviceNameExpressionSource': 'request',
+                        'deviceNameExpression': '${deviceName}',
+                        'deviceProfileExpressionSource': 'constant',
+                        'deviceProfileExpression': 'default'
+                    },
+                    'attributes': [],
+                    'timeseries': [{'type': 'double', 'key': 'temperature', 'value': '${temperature}'}]
+                }
+            },
+            'converter': JsonRESTUplinkConverter
+        }
+
+    def get_attribute_request_endpoint(self):
+        return {
+            'type': 'attributeRequest',
+            'function': self.request_attributes,
+            'config': {
+                'endpoint': '/attributes',
+                'HTTPMethods': ['GET'],
+                'deviceNameExpression': '${deviceName}',
+                'attributeNameExpression': '${attributes}',
+                'timeout': 10
+            }
+        }
+
+    def send_to_storage(self, connector_name, connector_id, converted_data):
+        self.sent_devices.append(converted_data.device_name)
+
+    def request_attributes(self, device_name, keys, callback):
+        self.requested_attributes.append((device_name, keys, callback))
+
+    async def wait_for(self, condition):
+        while not condition():
+            await asyncio.sleep(.01)
+
+    async def post(self, path, device_name):
+        async with self.session.post(self.server.make_url(path),
+                                     json={'deviceName': device_name, 'temperature': 21.5}) as response:
+            return response.status, await response.text()
+
+    async def test_concurrent_requests_get_responses_of_their_devices(self):
+        device_names = ['Device %i' % device_index for device_index in range(CONCURRENT_REQUESTS)]
+        requests = asyncio.gather(*(self.post('/device', device_name) for device_name in device_names))
+        await asyncio.wait_for(self.wait_for(lambda: len(self.sent_devices) == CONCURRENT_REQUESTS), 10)
+
+        # Responses come from the other thread in the reversed order
+        responding_thread = Thread(target=lambda: [self.correlator.complete(device_name, 'result', device_name + ' OK')
+                                                   for device_name in reversed(self.sent_devices)])
+        responding_thread.start()
+        responses = await asyncio.wait_for(requests, 10)
+        responding_thread.join()
+
+        self.assertEqual(responses, [(200, device_name + ' OK') for device_name in device_names])
+        self.assertEqual(self.correlator.pending_count, 0)
+
+    async def test_responses_of_the_same_device_are_passed_in_order_of_requests(self):
+        first_request = asyncio.ensure_future(self.post('/device', 'Device'))
+        await self.wait_for(lambda: len(self.sent_devices) == 1)
+        second_request = asyncio.ensure_future(self.post('/device', 'Device'))
+        await self.wait_for(lambda: len(self.sent_devices) == 2)
+
+        self.correlator.complete('Device', 'result', 'first')
+        self.correlator.complete('Device', 'result', 'second')
+
+        self.assertEqual(await first_request, (200, 'first'))
+        self.assertEqual(await second_request, (200, 'second'))
+
+    async def test_request_without_response_is_timed_out(self):
+        self.assertEqual(await self.post('/timeout', 'Device'), (408, ''))
+        self.assertEqual(self.correlator.pending_count, 0)
+
+        # Late response is dropped and does not go to the next request
+        self.correlator.complete('Device', 'result', 'late')
+        await asyncio.sleep(.05)
+        self.assertEqual(await self.post('/timeout', 'Device'), (408, ''))
+
+    async def test_attribute_responses_are_passed_by_request_id(self):
+        async def request_attributes(device_name):
+            async with self.session.get(self.server.make_url('/attributes'),
+                                        params={'deviceName': device_name, 'attributes': 'model'}) as response:
+                return response.status, await response.text()
+
+        requests = asyncio.gather(request_attributes('Device A'), request_attributes('Device B'))
+        await self.wait_for(lambda: len(self.requested_attributes) == 2)
+
+        for device_name, keys, callback in reversed(self.requested_attributes):
+            Thread(target=callback, args=({'device': device_name, 'value': device_name[-1]}, None)).start()
+
+        self.assertEqual(await requests, [(200, '{"device": "Device A", "value": "A"}'),
+                                          (200, '{"device": "Device B", "value": "B"}')])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import socket
+from time import monotonic, sleep
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+from thingsboard_gateway.connectors.socket.framing import DelimiterFrameDecoder, FixedLengthFrameDecoder, \
+    LengthPrefixFrameDecoder, get_frame_decoder_class
+from thingsboard_gateway.connectors.socket.socket_connector import SocketConnector
+
+CLIENTS_COUNT = 50
+
+
+def get_free_port():
+    with socket.socket() as free_socket:
+        free_socket.bind(('127.0.0.1', 0))
+        return free_socket.getsockname()[1]
+
+
+class FramingTests(TestCase):
+
+    def test_delimiter_frames_are_joined_from_chunks(self):
+        decoder = DelimiterFrameDecoder({'delimiter': '\r\n'})
+
+        self.assertEqual(decoder.feed(b'21.5\r'), [])
+        self.assertEqual(decoder.feed(b'\n22'), [b'21.5'])
+        self.assertEqual(decoder.feed(b'.5\r\n\r\n23.5\r\n'), [b'22.5', b'23.5'])
+
+    def test_fixed_length_frames(self):
+        decoder = FixedLengthFrameDecoder({'length': 3})
+
+        self.assertEqual(decoder.feed(b'abcd'), [b'abc'])
+        self.assertEqual(decoder.feed(b'efghi'), [b'def', b'ghi'])
+
+    def test_length_prefix_frames(self):
+        decoder = LengthPrefixFrameDecoder({'lengthFieldSize': 2})
+
+        self.assertEqual(decoder.feed(b'\x00\x03ab'), [])
+        self.assertEqual(decoder.feed(b'c\x00\x00\x00\x01d\x00'), [b'abc', b'', b'd'])
+
+        decoder = LengthPrefixFrameDecoder({'lengthFieldSize': 1, 'lengthIncludesHeader': True, 'maxFrameSize': 4})
+        self.assertEqual(decoder.feed(b'\x03ab'), [b'ab'])
+        with self.assertRaises(ValueError):
+            decoder.feed(b'\x05abcd')
+
+    def test_too_long_delimiter_frame_and_unknown_framing(self):
+        with self.assertRaises(ValueError):
+            DelimiterFrameDecoder({'maxFrameSize': 4}).feed(b'12345')
+        with self.assertRaises(ValueError):
+            get_frame_decoder_class({'type': 'unknown'})
+
+
+class SocketServerTests(TestCase):
+
+    def setUp(self):
+        self.port = get_free_port()
+        self.gateway = MagicMock()
+        self.config = {
+            'name': 'Socket test connector',
+            'socket': {'type': 'TCP', 'address': '127.0.0.1', 'port': self.port,
+                       'framing': {'type': 'delimiter', 'delimiter': '\n'}},
+            'devices': [{'address': '127.0.0.1:*', 'deviceName': 'Device', 'deviceType': 'default',
+                         'telemetry': [{'key': 'value', 'byteFrom': 0, 'byteTo': -1}],
+                         'attributes': []}]
+        }
+
+    def start_connector(self):
+        with patch('thingsboard_gateway.connectors.socket.socket_connector.init_logger', return_value=MagicMock()):
+            connector = SocketConnector(self.gateway, self.config, 'socket')
+        connector.open()
+        self.addCleanup(connector.close)
+        return connector
+
+    def wait_for_messages(self, count):
+        deadline = monotonic() + 10
+        while self.gateway.send_to_storage.call_count < count and monotonic() < deadline:
+            sleep(.05)
+
+    def get_sent_values(self):
+        return sorted(send_call.args[2].telemetry[0].to_dict()['values']['value']
+                      for send_call in self.gateway.send_to_storage.call_args_list)
+
+    def connect(self):
+        deadline = monotonic() + 10
+        while True:
+            try:
+                return socket.create_connection(('127.0.0.1', self.port))
+            except ConnectionRefusedError:
+                if monotonic() > deadline:
+                    raise
+                sleep(.05)
+
+    def test_fragmented_frames_from_many_clients(self):
+        self.start_connector()
+        clients = [self.connect() for _ in range(CLIENTS_COUNT)]
+
+        for client_index, client in enumerate(clients):
+            client.sendall(b'%i' % client_index)
+        for client_index, client in enumerate(clients):
+            client.sendall(b'.5\n%i.25\n' % client_index)
+        self.wait_for_messages(CLIENTS_COUNT * 2)
+        for client in clients:
+            client.close()
+
+        self.assertEqual(self.get_sent_values(),
+                         sorted(value for client_index in range(CLIENTS_COUNT)
+                                for value in ('%i.5' % client_index, '%i.25' % client_index)))
+
+    def test_udp_datagrams(self):
+        self.config['socket']['type'] = 'UDP'
+        self.start_connector()
+
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as client:
+            deadline = monotonic() + 10
+            while self.gateway.send_to_storage.call_count == 0 and monotonic() < deadline:
+                client.sendto(b'42', ('127.0.0.1', self.port))
+                sleep(.1)
+
+        self.assertEqual(self.get_sent_values()[0], '42')
+
+
+if __name__ == '__main__':
+    main()
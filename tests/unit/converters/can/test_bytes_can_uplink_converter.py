@@ -19,7 +19,8 @@ from random import randint, uniform, choice
 from string import ascii_lowercase
 
 from tests.unit.BaseUnitTest import BaseUnitTest
-from thingsboard_gateway.connectors.can.bytes_can_uplink_converter import BytesCanUplinkConverter
+from thingsboard_gateway.connectors.can.bytes_can_uplink_converter import BytesCanUplinkConverter, \
+    FRAME_DECODER_PARAMETER
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 
 
@@ -267,6 +268,42 @@ class BytesCanUplinkConverterTests(BaseUnitTest):
         self.assertEqual(tb_data.telemetry[0].to_dict()['values']["validVar"], bool_value)
         self.assertIsNone(tb_data.attributes.to_dict().get("invalidVar"))
 
+    def test_decoder_built_once_is_used_for_frames(self):
+        configs = {
+            'deviceName': 'Test Device',
+            'deviceType': 'default',
+            'configs': [
+                {
+                    "key": "intVar",
+                    "type": "int",
+                    "is_ts": True,
+                    "start": 0,
+                    "length": 2,
+                    "byteorder": "little",
+                    "signed": False,
+                    "expression": "value / 10",
+                    "strictEval": True
+                },
+                {
+                    "key": "rawVar",
+                    "type": "raw",
+                    "is_ts": False,
+                    "start": 2
+                }
+            ]
+        }
+
+        decoder = self.converter.build_decoder(configs)
+        configs[FRAME_DECODER_PARAMETER] = decoder
+        for int_value in (100, 215, 1000):
+            can_data = bytearray(int_value.to_bytes(2, "little")) + bytearray([0xab, 0x01])
+            tb_data = self.converter.convert(configs, can_data)
+            self.assertEqual(tb_data.telemetry[0].to_dict()['values']["intVar"], int_value / 10)
+            self.assertEqual(tb_data.attributes.to_dict()["rawVar"], "ab01")
+
+        self.assertIs(configs[FRAME_DECODER_PARAMETER], decoder)
+        self.assertIs(tb_data.telemetry[0].values.popitem()[0], decoder.values[0].datapoint_key)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,130 @@
+import logging
+from random import Random
+from unittest import TestCase, main
+
+from pymodbus.constants import Endian
+
+from thingsboard_gateway.connectors.modbus.bytes_modbus_uplink_converter import BytesModbusUplinkConverter
+from thingsboard_gateway.connectors.modbus.entities.bytes_uplink_converter_config import BytesUplinkConverterConfig
+from thingsboard_gateway.connectors.modbus.register_decoder import RegisterDecoder
+
+try:
+    from pymodbus.payload import BinaryPayloadDecoder
+except ImportError:
+    BinaryPayloadDecoder = None
+
+LOGGER = logging.getLogger('Modbus register decoder test')
+REGISTERS_DECODERS = {
+    '8int': ('decode_8bit_int', 1),
+    '8uint': ('decode_8bit_uint', 1),
+    '16int': ('decode_16bit_int', 1),
+    '16uint': ('decode_16bit_uint', 1),
+    '16float': ('decode_16bit_float', 1),
+    '32int': ('decode_32bit_int', 2),
+    '32uint': ('decode_32bit_uint', 2),
+    '32float': ('decode_32bit_float', 2),
+    '64int': ('decode_64bit_int', 4),
+    '64uint': ('decode_64bit_uint', 4),
+    '64float': ('decode_64bit_float', 4),
+}
+ORDERS = [(byte_order, word_order) for byte_order in (Endian.BIG, Endian.LITTLE)
+          for word_order in (Endian.BIG, Endian.LITTLE)]
+
+
+class TestRegisterDecoder(TestCase):
+
+    def setUp(self):
+        self.random = Random(42)
+
+    def get_registers(self, count):
+        return [self.random.randrange(0, 0x10000) for _ in range(count)]
+
+    def test_numeric_values_are_the_same_as_from_payload_decoder(self):
+        if BinaryPayloadDecoder is None:
+            self.skipTest('pymodbus BinaryPayloadDecoder is not available')
+
+        for value_type, (decoder_method, objects_count) in REGISTERS_DECODERS.items():
+            for byte_order, word_order in ORDERS:
+                for _ in range(20):
+                    registers = self.get_registers(objects_count)
+                    config = {'tag': 'value', 'type': value_type, 'functionCode': 3, 'objectsCount': objects_count}
+                    with self.subTest(value_type=value_type, byte_order=byte_order, word_order=word_order,
+                                      registers=registers):
+                        payload_decoder = BinaryPayloadDecoder.fromRegisters(registers, byteorder=byte_order,
+                                                                             wordorder=word_order)
+                        expected = getattr(payload_decoder, decoder_method)()
+                        decoded = RegisterDecoder(config, byte_order, word_order).decode(registers)
+                        if 'float' in value_type:
+                            if expected != expected:
+                                self.assertNotEqual(decoded, decoded)
+                                continue
+                            expected = float(round(expected, 6))
+                        self.assertEqual(decoded, expected)
+
+    def test_sized_types(self):
+        registers = [0x4049, 0x0FDB]
+
+        self.assertEqual(RegisterDecoder({'type': 'float', 'functionCode': 4, 'objectsCount': 2},
+                                         Endian.BIG, Endian.BIG).decode(registers), 3.141593)
+        self.assertEqual(RegisterDecoder({'type': 'int', 'functionCode': 4, 'objectsCount': 2},
+                                         Endian.BIG, Endian.BIG).decode(registers), 0x40490FDB)
+        self.assertEqual(RegisterDecoder({'type': 'long', 'functionCode': 4, 'objectsCount': 1},
+                                         Endian.BIG, Endian.BIG).decode([0xFFFE]), -2)
+        with self.assertRaises(ValueError):
+            RegisterDecoder({'type': 'int', 'functionCode': 4, 'objectsCount': 3},
+                            Endian.BIG, Endian.BIG).decode([1, 2, 3])
+
+    def test_divider_multiplier_and_variants(self):
+        self.assertEqual(RegisterDecoder({'type': '16int', 'functionCode': 3, 'divider': 10},
+                                         Endian.BIG, Endian.BIG).decode([0xFF9C]), -10.0)
+        self.assertEqual(RegisterDecoder({'type': '16uint', 'functionCode': 3, 'multiplier': 3},
+                                         Endian.BIG, Endian.BIG).decode([7]), 21)
+        self.assertEqual(RegisterDecoder({'type': '16uint', 'functionCode': 3, 'variants': {'1': 'on', '0': 'off'}},
+                                         Endian.BIG, Endian.BIG).decode([1]), 'on')
+
+    def test_strings_and_bits(self):
+        self.assertEqual(RegisterDecoder({'type': 'string', 'functionCode': 3, 'objectsCount': 2},
+                                         Endian.LITTLE, Endian.LITTLE).decode([0x6162, 0x6364]), 'abcd')
+        self.assertEqual(RegisterDecoder({'type': 'bytes', 'functionCode': 3, 'objectsCount': 2},
+                                         Endian.BIG, Endian.BIG).decode([0x6162, 0x6364]), '61626364')
+        self.assertTrue(RegisterDecoder({'type': 'bits', 'functionCode': 1, 'objectsCount': 1},
+                                        Endian.BIG, Endian.BIG).decode([True] + [False] * 7))
+        self.assertEqual(RegisterDecoder({'type': 'bits', 'functionCode': 1, 'objectsCount': 3},
+                                         Endian.BIG, Endian.BIG).decode([True, True, False] + [False] * 5),
+                         [False, True, True])
+        self.assertEqual(RegisterDecoder({'type': 'bits', 'functionCode': 3, 'objectsCount': 16, 'bit': 2},
+                                         Endian.BIG, Endian.BIG).decode([0x0400] + [0] * 15), 1)
+
+    def test_wide_range_block_is_decoded_as_separate_values(self):
+        registers = self.get_registers(21)
+
+        for byte_order, word_order in ORDERS:
+            for value_type in ('32float', '32int', '16int', '64uint'):
+                objects_count = REGISTERS_DECODERS[value_type][1]
+                config = {'tag': 'value_${address}', 'type': value_type, 'functionCode': 3,
+                          'objectsCount': objects_count, 'address': '0-19'}
+                decoder = RegisterDecoder(config, byte_order, word_order)
+                with self.subTest(value_type=value_type, byte_order=byte_order, word_order=word_order):
+                    expected = [decoder.decode(registers[start:start + objects_count])
+                                if start + objects_count <= len(registers) else None
+                                for start in range(0, len(registers), objects_count)]
+                    self.assertEqual(str(decoder.decode_block(registers)), str(expected))
+
+    def test_converter_uses_prerendered_key_names(self):
+        config = BytesUplinkConverterConfig(deviceName='Test device', unitId=7, byteOrder='BIG', wordOrder='BIG',
+                                            timeseries=[{'tag': 'temperature_${unitId}', 'type': '16int',
+                                                         'functionCode': 3, 'objectsCount': 1, 'address': '10-12'}])
+        converter = BytesModbusUplinkConverter(config, LOGGER)
+
+        class Response:
+            registers = [1, 2, 3]
+
+        result = converter.convert(None, [{'telemetry': {'temperature_${unitId}': [Response()]}, 'attributes': {}}])
+
+        self.assertEqual(result.telemetry[0].to_dict()['values'],
+                         {'temperature_7_10': 1, 'temperature_7_11': 2, 'temperature_7_12': 3})
+        self.assertEqual(config.telemetry[0]['tag'], 'temperature_${unitId}')
+
+
+if __name__ == '__main__':
+    main()
@@ -20,7 +20,7 @@ from random import randint, uniform, choice
 from string import ascii_lowercase
 
 from tests.unit.BaseUnitTest import BaseUnitTest
-from thingsboard_gateway.connectors.odbc.odbc_uplink_converter import OdbcUplinkConverter
+from thingsboard_gateway.connectors.odbc.odbc_uplink_converter import OdbcExpression, OdbcUplinkConverter
 
 
 class OdbcUplinkConverterTests(BaseUnitTest):
@@ -124,6 +124,39 @@ class OdbcUplinkConverterTests(BaseUnitTest):
         self.assertEqual(len(converted_data.attributes.values), 1)
         self.assertEqual(list(converted_data.attributes.values.keys())[0].key, config["attributes"][1]["name"])
 
+    def test_expressions_are_compiled_once(self):
+        config = {
+            "attributes": [],
+            "timeseries": [{"nameExpression": "key", "value": "stringValue + str(intValue)"}]
+        }
+        self.db_data["key"] = "someValue"
+        converter = OdbcUplinkConverter(self.log, config)
+        plan = converter.get_conversion_plan(config)
+
+        first_converted_data = converter.convert(config, self.db_data)
+        self.db_data["intValue"] += 1
+        second_converted_data = converter.convert(config, self.db_data)
+
+        self.assertIs(converter.get_conversion_plan(config), plan)
+        self.assertIsNot(converter.get_conversion_plan(dict(config)), plan)
+        self.assertEqual(list(first_converted_data.telemetry[0].values.items())[0][1],
+                         self.db_data["stringValue"] + str(self.db_data["intValue"] - 1))
+        self.assertEqual(list(second_converted_data.telemetry[0].values.items())[0][1],
+                         self.db_data["stringValue"] + str(self.db_data["intValue"]))
+
+    def test_column_name_expression_is_read_without_evaluation(self):
+        column_expression = OdbcExpression(" intValue ")
+        builtin_expression = OdbcExpression("len")
+
+        self.assertEqual(column_expression.column, "intValue")
+        self.assertEqual(column_expression.evaluate(self.db_data), self.db_data["intValue"])
+        self.assertIsNone(OdbcExpression("'ODBC ' + stringValue").column)
+        self.assertEqual(OdbcExpression("'ODBC ' + stringValue").evaluate(self.db_data),
+                         'ODBC ' + self.db_data["stringValue"])
+        self.assertIs(builtin_expression.evaluate(self.db_data), len)
+        with self.assertRaises(NameError):
+            OdbcExpression("unknownColumn").evaluate(self.db_data)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,63 @@
+import logging
+from datetime import datetime, timezone
+from unittest import TestCase, main
+
+from asyncua.ua import DataValue, StatusCode, Variant, VariantType
+from asyncua.ua.status_codes import StatusCodes
+
+from thingsboard_gateway.connectors.opcua.opcua_uplink_converter import OpcUaUplinkConverter
+
+LOGGER = logging.getLogger('OPC-UA uplink converter test')
+SOURCE_TIMESTAMP = datetime(2026, 1, 1, tzinfo=timezone.utc)
+NODES_CONFIGS = {
+    'temperature': [{'key': 'temperature', 'section': 'timeseries', 'timestampLocation': 'sourceTimestamp'},
+                    {'key': 'temperatureAttribute', 'section': 'attributes'}],
+    'state': [{'key': 'state', 'section': 'timeseries'}],
+    'serial': [{'key': 'serialNumber', 'section': 'attributes'}],
+}
+
+
+class OpcUaUplinkConverterTests(TestCase):
+
+    def setUp(self):
+        self.converter = OpcUaUplinkConverter({'device_name': 'Test device', 'device_type': 'default'}, LOGGER)
+        self.plans = {node: self.converter.get_conversion_plans(configs) for node, configs in NODES_CONFIGS.items()}
+
+    def test_batch_conversion_gives_the_same_data_as_conversion_by_notification(self):
+        notifications = [
+            ('temperature', DataValue(Variant(21.5), SourceTimestamp=SOURCE_TIMESTAMP)),
+            ('state', DataValue(Variant(None, VariantType.Null), StatusCode_=StatusCode(StatusCodes.BadNotReadable))),
+            ('serial', DataValue(Variant([1, 2]))),
+        ]
+
+        batch_converted_data = self.converter.convert_batch([(self.plans[node], value, 1000)
+                                                             for node, value in notifications])
+
+        attributes = {}
+        telemetry = {}
+        for node, value in notifications:
+            converted_data = self.converter.convert(NODES_CONFIGS[node], [value] * len(NODES_CONFIGS[node]))
+            attributes.update(converted_data.attributes.to_dict())
+            for telemetry_entry in converted_data.telemetry:
+                if telemetry_entry.ts != SOURCE_TIMESTAMP.timestamp() * 1000:
+                    telemetry_entry.ts = 1000
+                telemetry.setdefault(telemetry_entry.ts, {}).update(telemetry_entry.to_dict()['values'])
+
+        self.assertEqual(batch_converted_data.attributes.to_dict(), attributes)
+        self.assertEqual({telemetry_entry.ts: telemetry_entry.to_dict()['values']
+                          for telemetry_entry in batch_converted_data.telemetry}, telemetry)
+        self.assertEqual(attributes, {'temperatureAttribute': 21.5, 'serialNumber': ['1', '2']})
+        self.assertTrue(telemetry[1000]['state'].startswith('Bad status code: BadNotReadable'))
+        self.assertEqual(batch_converted_data.telemetry_datapoints_count, 2)
+
+    def test_values_received_at_different_time_are_kept(self):
+        converted_data = self.converter.convert_batch([(self.plans['state'], DataValue(Variant(1)), 1000),
+                                                       (self.plans['state'], DataValue(Variant(2)), 1001),
+                                                       (self.plans['state'], DataValue(Variant(3)), 1001)])
+
+        self.assertEqual([telemetry_entry.to_dict() for telemetry_entry in converted_data.telemetry],
+                         [{'ts': 1000, 'values': {'state': 1}}, {'ts': 1001, 'values': {'state': 3}}])
+
+
+if __name__ == '__main__':
+    main()
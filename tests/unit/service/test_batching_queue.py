@@ -0,0 +1,69 @@
+from queue import Empty, Full
+from threading import Thread, Timer
+from time import monotonic
+from unittest import TestCase, main
+
+from thingsboard_gateway.tb_utility.batching_queue import BatchingQueue, ShardedBatchingQueue
+
+
+class TestBatchingQueue(TestCase):
+
+    def test_get_batch_returns_available_items_in_order(self):
+        queue = BatchingQueue()
+        for i in range(5):
+            queue.put(i)
+
+        self.assertListEqual(queue.get_batch(3, 1), [0, 1, 2])
+        self.assertListEqual(queue.get_batch(3, 1), [3, 4])
+        self.assertTrue(queue.empty())
+
+    def test_get_batch_wakes_on_arrival(self):
+        queue = BatchingQueue()
+        Timer(0.05, queue.put, args=("item",)).start()
+
+        started = monotonic()
+        batch = queue.get_batch(10, 5)
+
+        self.assertListEqual(batch, ["item"])
+        self.assertLess(monotonic() - started, 1)
+
+    def test_get_batch_timeout(self):
+        queue = BatchingQueue()
+
+        self.assertListEqual(queue.get_batch(10, 0.01), [])
+        with self.assertRaises(Empty):
+            queue.get_nowait()
+
+    def test_bounded_queue(self):
+        queue = BatchingQueue(2)
+        queue.put(1)
+        queue.put_nowait(2)
+
+        self.assertTrue(queue.full())
+        with self.assertRaises(Full):
+            queue.put(3, timeout=0.01)
+
+        producer = Thread(target=queue.put, args=(3,))
+        producer.start()
+        self.assertListEqual(queue.get_batch(10, 1), [1, 2])
+        producer.join(1)
+        self.assertEqual(queue.get(timeout=1), 3)
+
+    def test_sharded_queue_keeps_order_of_items_with_the_same_key(self):
+        queue = ShardedBatchingQueue(4, lambda item: item[0])
+        for i in range(100):
+            queue.put(("Device %i" % (i % 10), i))
+
+        self.assertEqual(queue.qsize(), 100)
+        for shard in queue.shards:
+            items_by_key = {}
+            for key, value in shard.get_batch(100, 0):
+                items_by_key.setdefault(key, []).append(value)
+            for key, values in items_by_key.items():
+                self.assertListEqual(values, sorted(values))
+                self.assertEqual(len(values), 10)
+        self.assertTrue(queue.empty())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+from unittest import TestCase, main
+
+from orjson import dumps, OPT_NON_STR_KEYS
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class TestConvertedDataSplit(TestCase):
+
+    def test_entries_data_size_is_equal_to_encoded_size(self):
+        entries = {
+            DatapointKey("temperature"): 21.5,
+            DatapointKey("name"): "Device \"A\" \\ \n",
+            DatapointKey("unicode"): "температура",
+            DatapointKey(1): 1,
+            "enabled": True,
+            "disabled": False,
+            "empty": None,
+            "big": 18446744073709551615,
+            "negative": -9223372036854775808,
+            "small": 1e-7,
+            "nested": {"a": [1, 2, {"b": "c"}]},
+            "control": "\x00\x1f\x7f"
+        }
+        encoded_entries = {key.key if isinstance(key, DatapointKey) else key: value
+                           for key, value in entries.items()}
+
+        self.assertEqual(TBUtility.get_entries_data_size(entries),
+                         len(dumps(encoded_entries, option=OPT_NON_STR_KEYS)))
+        self.assertEqual(TBUtility.get_entries_data_size({}), 2)
+
+    def test_telemetry_entry_data_size(self):
+        telemetry_entry = TelemetryEntry({DatapointKey("temperature"): 21.5, DatapointKey("state"): "ok"}, ts=1000)
+
+        self.assertEqual(telemetry_entry.data_size, TBUtility.get_data_size(telemetry_entry.to_dict()))
+
+    def test_split_to_objects_with_maximal_size(self):
+        max_data_size = 1000
+        data = ConvertedData(device_name="Device A", device_type="default")
+        data.add_to_attributes({DatapointKey("attribute_%i" % i): "value_%i" % i for i in range(100)})
+        data.add_to_telemetry(TelemetryEntry({DatapointKey("key_%i" % i): i * 1.5 for i in range(1000)}, ts=1000))
+
+        split_data = data.convert_to_objects_with_maximal_size(max_data_size)
+
+        self.assertGreater(len(split_data), 1)
+        for converted_data in split_data:
+            self.assertLessEqual(converted_data.get_size(), max_data_size)
+        self.assertEqual(sum(len(converted_data.attributes) for converted_data in split_data), 100)
+        self.assertEqual(sum(converted_data.telemetry_datapoints_count for converted_data in split_data), 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+from logging import getLogger
+from unittest import TestCase, main
+
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.storage.event_codec import EventCodec, EVENT_FORMAT_JSON
+
+LOG = getLogger("TEST")
+
+
+class TestEventCodec(TestCase):
+
+    def setUp(self):
+        self.converted_data = ConvertedData(device_name="Device A", device_type="thermometer")
+        self.converted_data.add_to_telemetry(TelemetryEntry({DatapointKey("temperature"): 21.5,
+                                                             DatapointKey("state"): "ok"}, ts=1000))
+        self.converted_data.add_to_attributes(DatapointKey("model"), "T-1000")
+
+    def test_encode_converted_data_to_binary_record(self):
+        event = EventCodec.encode(self.converted_data)
+
+        self.assertTrue(EventCodec.is_binary(event))
+        self.assertDictEqual(EventCodec.decode(event), {
+            "deviceName": "Device A",
+            "deviceType": "thermometer",
+            "telemetry": [{"ts": 1000, "values": {"temperature": 21.5, "state": "ok"}}],
+            "attributes": {"model": "T-1000"}
+        })
+
+    def test_encode_converted_data_with_metadata(self):
+        self.converted_data.add_to_metadata({"receivedTs": 999})
+
+        self.assertNotIn("metadata", EventCodec.decode(EventCodec.encode(self.converted_data)))
+        self.assertDictEqual(EventCodec.decode(EventCodec.encode(self.converted_data, True))["metadata"],
+                             {"receivedTs": 999})
+
+    def test_encode_old_formatted_data(self):
+        data = {"deviceName": "Device B", "telemetry": {"ts": 1000, "values": {"humidity": 40}},
+                "attributes": [{"firmware": "1.0"}, {"serial": "SN-1"}]}
+
+        decoded_event = EventCodec.decode(EventCodec.encode(data))
+
+        self.assertEqual(decoded_event["deviceType"], "default")
+        self.assertListEqual(decoded_event["telemetry"], [{"ts": 1000, "values": {"humidity": 40}}])
+        self.assertDictEqual(decoded_event["attributes"], {"firmware": "1.0", "serial": "SN-1"})
+
+    def test_merge_binary_and_json_events_by_device(self):
+        json_event = EventCodec.encode(self.converted_data, event_format=EVENT_FORMAT_JSON)
+        binary_event = EventCodec.encode(self.converted_data)
+        other_device_event = EventCodec.encode({"deviceName": "Device B",
+                                                "telemetry": [{"ts": 2000, "values": {"humidity": 40}}]})
+        devices_data = {}
+
+        telemetry_dp_count, attribute_dp_count = EventCodec.merge_events_by_device(
+            [json_event, binary_event, b"broken event", other_device_event], devices_data, LOG)
+
+        self.assertEqual(telemetry_dp_count, 5)
+        self.assertEqual(attribute_dp_count, 2)
+        self.assertListEqual(list(devices_data), ["Device A", "Device B"])
+        self.assertEqual(len(devices_data["Device A"]["telemetry"]), 2)
+        self.assertDictEqual(devices_data["Device A"]["attributes"], {"model": "T-1000"})
+        self.assertDictEqual(devices_data["Device B"], {"telemetry": [{"ts": 2000, "values": {"humidity": 40}}],
+                                                        "attributes": {}})
+
+    def test_split_pre_rendered_telemetry(self):
+        telemetry_only_data = ConvertedData(device_name="Device A")
+        telemetry_only_data.add_to_telemetry(TelemetryEntry({DatapointKey("temperature"): 21.5}, ts=1000))
+        telemetry_only_event = EventCodec.encode(telemetry_only_data)
+        event_with_attributes = EventCodec.encode(self.converted_data)
+        telemetry_fragments = {}
+
+        events_to_decode, telemetry_dp_count = EventCodec.split_pre_rendered_telemetry(
+            [telemetry_only_event, event_with_attributes, telemetry_only_event], telemetry_fragments)
+
+        self.assertListEqual(events_to_decode, [event_with_attributes])
+        self.assertEqual(telemetry_dp_count, 2)
+        self.assertListEqual([dp_count for _, dp_count in telemetry_fragments["Device A"]], [1, 1])
+        self.assertEqual(b'[' + b','.join(fragment for fragment, _ in telemetry_fragments["Device A"]) + b']',
+                         b'[{"ts":1000,"values":{"temperature":21.5}},{"ts":1000,"values":{"temperature":21.5}}]')
+
+    def test_integers_larger_than_64_bit_are_decoded_exactly(self):
+        big_integer = 2 ** 64 + 1
+        data = ConvertedData(device_name="Device A")
+        data.add_to_telemetry(TelemetryEntry({DatapointKey("counter"): big_integer}, ts=1000))
+        data.add_to_attributes(DatapointKey("serial"), -big_integer)
+        event = EventCodec.encode(data)
+
+        decoded_event = EventCodec.decode(event)
+
+        self.assertIs(type(decoded_event["telemetry"][0]["values"]["counter"]), int)
+        self.assertEqual(decoded_event["telemetry"][0]["values"]["counter"], big_integer)
+        self.assertEqual(decoded_event["attributes"]["serial"], -big_integer)
+        self.assertEqual(EventCodec.decode(EventCodec.encode(self.converted_data))["telemetry"][0]["values"],
+                         {"temperature": 21.5, "state": "ok"})
+
+    def test_unknown_record_version_is_not_decoded(self):
+        event = bytearray(EventCodec.encode(self.converted_data))
+        event[1] = 99
+
+        with self.assertRaisesRegex(ValueError, "Unsupported event record version"):
+            EventCodec.decode(bytes(event))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+from unittest import TestCase, main
+
+from thingsboard_gateway.tb_utility.expression_template import ExpressionTemplate
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+def render_with_get_values(expression, data, expression_instead_none=False):
+    values = TBUtility.get_values(expression, data, expression_instead_none=expression_instead_none)
+    values_tags = TBUtility.get_values(expression, data, get_tag=True)
+    result = expression
+    for (value, value_tag) in zip(values, values_tags):
+        is_valid_value = "${" in expression and "}" in expression
+        result = result.replace('${' + str(value_tag) + '}', str(value)) if is_valid_value else value
+    return result
+
+
+class TestExpressionTemplate(TestCase):
+
+    def setUp(self):
+        self.data = {
+            "serialNumber": "SN-001",
+            "sensor type": "thermometer",
+            "temperature": 21.5,
+            "humidity": None,
+            "location": {"building": "A", "floor": 2},
+            "readings": [{"value": 10}, {"value": 20}]
+        }
+
+    def test_render_gives_same_result_as_get_values(self):
+        expressions = ["${serialNumber}", "Device ${serialNumber}", "${location.building}-${location.floor}",
+                       "${readings[1].value}", "${sensor type}", "${humidity}", "${missing}", "constant",
+                       "${serialNumber} ${serialNumber}", "broken ${expression", "${temperature} C"]
+
+        for expression in expressions:
+            for expression_instead_none in (False, True):
+                with self.subTest(expression=expression, expression_instead_none=expression_instead_none):
+                    self.assertEqual(ExpressionTemplate.compile(expression).render(self.data, expression_instead_none),
+                                     render_with_get_values(expression, self.data, expression_instead_none))
+
+    def test_get_value_keeps_value_type(self):
+        self.assertEqual(ExpressionTemplate.compile("${temperature}").get_value(self.data, "double"), 21.5)
+        self.assertEqual(ExpressionTemplate.compile("${temperature}").get_value(self.data), "21.5")
+        self.assertEqual(ExpressionTemplate.compile("${location.floor}").get_value(self.data, "int"), 2)
+        self.assertIsNone(ExpressionTemplate.compile("${missing}").get_value(self.data, "int"))
+        self.assertEqual(ExpressionTemplate.compile("${missing}").get_value(self.data, "int", True), "${missing}")
+        self.assertEqual(ExpressionTemplate.compile("constant").get_value(self.data, "int"), "constant")
+
+    def test_template_is_compiled_once(self):
+        self.assertIs(ExpressionTemplate.compile("${serialNumber}"), ExpressionTemplate.compile("${serialNumber}"))
+        self.assertTrue(ExpressionTemplate.compile(" ${serialNumber} ").is_single_placeholder)
+        self.assertFalse(ExpressionTemplate.compile("Device ${serialNumber}").is_single_placeholder)
+        self.assertFalse(ExpressionTemplate.compile("constant").has_placeholders)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from unittest import TestCase, main
+
+from thingsboard_gateway.gateway.constant_enums import DownlinkMessageType, Status
+from thingsboard_gateway.gateway.grpc_service.grpc_downlink_converter import GrpcDownlinkConverter
+from thingsboard_gateway.gateway.proto.messages_pb2 import ResponseStatus
+
+
+class GrpcResponseStatusTest(TestCase):
+
+    def setUp(self):
+        self.converter = GrpcDownlinkConverter()
+
+    def convert(self, status):
+        return self.converter.convert({'message_type': [DownlinkMessageType.Response]}, status)
+
+    def test_every_gateway_status_is_converted_to_response_status(self):
+        for status in Status:
+            with self.subTest(status=status):
+                self.assertIsNotNone(self.convert(status))
+
+    def test_backpressure_is_reported_as_success(self):
+        self.assertEqual(self.convert(Status.BACKPRESSURE).response.status, ResponseStatus.Value('SUCCESS'))
+        self.assertEqual(self.convert(Status.NOT_FOUND).response.status, ResponseStatus.Value('NOT_FOUND'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+from random import Random
+from time import time
+from unittest import TestCase, main
+
+from thingsboard_gateway.gateway.constants import LATENCY_STAGE_STORAGE_TO_PUBLISH
+from thingsboard_gateway.gateway.statistics.latency_histogram import LatencyHistogram, BUCKETS_COUNT
+from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
+from thingsboard_gateway.gateway.tb_gateway_service import TBGatewayService
+
+
+class TestLatencyHistogram(TestCase):
+
+    def test_small_latencies_are_exact(self):
+        histogram = LatencyHistogram()
+        for latency in range(1, 11):
+            histogram.record(latency)
+
+        self.assertDictEqual(histogram.get_statistics(),
+                             {"count": 10, "p50": 5, "p90": 9, "p99": 10, "p99.9": 10, "max": 10})
+
+    def test_percentiles_relative_error_is_bounded(self):
+        random = Random(42)
+        latencies = sorted(random.expovariate(1 / 200) for _ in range(10000))
+        histogram = LatencyHistogram()
+        for latency in latencies:
+            histogram.record(latency)
+
+        for percentile in (50, 90, 99):
+            expected = int(latencies[int(len(latencies) * percentile / 100) - 1])
+            self.assertAlmostEqual(histogram.get_percentile(percentile), expected, delta=expected * 0.07 + 1)
+
+    def test_bucket_boundaries(self):
+        for latency in (0, 31, 32, 33, 34, 1000, 65535, 2 ** 32 - 1):
+            index = LatencyHistogram.get_bucket_index(latency)
+            self.assertLess(index, BUCKETS_COUNT)
+            self.assertGreaterEqual(LatencyHistogram.get_bucket_highest_value(index), latency)
+            if index > 0:
+                self.assertLess(LatencyHistogram.get_bucket_highest_value(index - 1), latency)
+
+    def test_out_of_range_latencies_are_clamped(self):
+        histogram = LatencyHistogram()
+        histogram.record(-5)
+        histogram.record(2 ** 40)
+
+        self.assertEqual(histogram.total_count, 2)
+        self.assertEqual(histogram.get_percentile(50), 0)
+        self.assertEqual(histogram.get_percentile(100), 2 ** 32 - 1)
+
+    def test_statistics_service_records_latencies_only_when_enabled(self):
+        StatisticsService.clear_statistics()
+        StatisticsService.record_latency("MQTT Broker Connector", "receiveToConvert", 5)
+        self.assertDictEqual(StatisticsService.get_latency_statistics(), {})
+
+        StatisticsService.enable_statistics()
+        try:
+            StatisticsService.record_latency("MQTT Broker Connector", "receiveToConvert", 5)
+        finally:
+            StatisticsService.disable_statistics()
+
+        self.assertEqual(StatisticsService.get_latency_statistics()["MQTT Broker Connector"]["receiveToConvert"]["p99"],
+                         5)
+        StatisticsService.clear_statistics()
+
+    def test_storage_to_publish_latency_is_recorded_only_in_latency_debug_mode(self):
+        gateway = TBGatewayService.__new__(TBGatewayService)
+        devices_data_in_event_pack = {"Device A": {"telemetry": [
+            {"ts": 1000, "values": {"temperature": 21.5},
+             "metadata": {"connector": "MQTT Broker Connector", "putToStorageTs": int(time() * 1000) - 10}}
+        ], "attributes": {}}}
+
+        StatisticsService.clear_statistics()
+        StatisticsService.enable_statistics()
+        try:
+            gateway._TBGatewayService__latency_debug_mode = False
+            gateway._TBGatewayService__record_storage_to_publish_latency(devices_data_in_event_pack)
+            self.assertDictEqual(StatisticsService.get_latency_statistics(), {})
+
+            gateway._TBGatewayService__latency_debug_mode = True
+            gateway._TBGatewayService__record_storage_to_publish_latency(devices_data_in_event_pack)
+        finally:
+            StatisticsService.disable_statistics()
+
+        latency_statistics = StatisticsService.get_latency_statistics()["MQTT Broker Connector"]
+        self.assertEqual(list(latency_statistics), [LATENCY_STAGE_STORAGE_TO_PUBLISH])
+        self.assertGreaterEqual(latency_statistics[LATENCY_STAGE_STORAGE_TO_PUBLISH]["p50"], 10)
+        StatisticsService.clear_statistics()
+
+
+if __name__ == '__main__':
+    main()
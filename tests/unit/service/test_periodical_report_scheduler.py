@@ -0,0 +1,48 @@
+from unittest import TestCase, main
+
+from thingsboard_gateway.gateway.report_strategy.periodical_report_scheduler import PeriodicalReportScheduler
+
+
+class TestPeriodicalReportScheduler(TestCase):
+
+    def setUp(self):
+        self.scheduler = PeriodicalReportScheduler()
+
+    def test_pop_only_due_keys_in_deadline_order(self):
+        self.scheduler.schedule(('temperature', 'Device A', 'connector_1'), 300)
+        self.scheduler.schedule(('humidity', 'Device A', 'connector_1'), 100)
+        self.scheduler.schedule(('pressure', 'Device B', 'connector_1'), 200)
+
+        self.assertEqual(self.scheduler.pop_due(250), [('humidity', 'Device A', 'connector_1'),
+                                                       ('pressure', 'Device B', 'connector_1')])
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertEqual(self.scheduler.next_deadline(), 300)
+
+    def test_rescheduled_key_is_returned_once(self):
+        key = ('temperature', 'Device A', 'connector_1')
+        self.scheduler.schedule(key, 100)
+        self.scheduler.schedule(key, 500)
+
+        self.assertEqual(self.scheduler.pop_due(200), [])
+        self.assertEqual(self.scheduler.pop_due(500), [key])
+        self.assertEqual(self.scheduler.pop_due(1000), [])
+
+    def test_remove_by_connector_id(self):
+        self.scheduler.schedule(('temperature', 'Device A', 'connector_1'), 100)
+        self.scheduler.schedule(('temperature', 'Device B', 'connector_2'), 100)
+
+        self.scheduler.remove_by_connector_id('connector_1')
+
+        self.assertEqual(self.scheduler.pop_due(100), [('temperature', 'Device B', 'connector_2')])
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_clear(self):
+        self.scheduler.schedule(('temperature', 'Device A', 'connector_1'), 100)
+        self.scheduler.clear()
+
+        self.assertIsNone(self.scheduler.next_deadline())
+        self.assertEqual(self.scheduler.pop_due(100), [])
+
+
+if __name__ == '__main__':
+    main()
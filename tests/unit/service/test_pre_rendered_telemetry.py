@@ -0,0 +1,181 @@
+from queue import Queue
+from unittest import TestCase, main
+from unittest.mock import MagicMock
+
+from orjson import loads
+from tb_device_mqtt import RateLimit, TBPublishInfo
+
+from thingsboard_gateway.gateway.constants import GATEWAY_TELEMETRY_TOPIC
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.gateway.tb_client import TBClient
+from thingsboard_gateway.gateway.tb_gateway_service import TBGatewayService
+from thingsboard_gateway.storage.event_codec import EventCodec
+
+PAYLOAD = b'{"Device A":[{"ts":1000,"values":{"temperature":21.5,"humidity":40}}]}'
+
+
+class TestPublishPreRendered(TestCase):
+
+    def setUp(self):
+        self.tb_client = TBClient.__new__(TBClient)
+        self.tb_client.client = MagicMock()
+        self.tb_client.client._wait_for_rate_limit_released.return_value = None
+        self.set_rate_limits('', '')
+
+    def set_rate_limits(self, messages_rate_limit, datapoints_rate_limit):
+        self.messages_rate_limit = RateLimit(messages_rate_limit, percentage=100)
+        self.datapoints_rate_limit = RateLimit(datapoints_rate_limit, percentage=100)
+        self.tb_client.client._devices_connected_through_gateway_telemetry_messages_rate_limit = \
+            self.messages_rate_limit
+        self.tb_client.client._devices_connected_through_gateway_telemetry_datapoints_rate_limit = \
+            self.datapoints_rate_limit
+
+    @staticmethod
+    def get_remaining_tokens(rate_limit: RateLimit):
+        return [bucket.get_remaining_tokens() for bucket in rate_limit._rate_buckets.values()]
+
+    def test_payload_is_published_as_is_without_rate_limits(self):
+        result = self.tb_client.publish_pre_rendered(GATEWAY_TELEMETRY_TOPIC, PAYLOAD, 2, 1)
+
+        self.assertIsInstance(result, TBPublishInfo)
+        self.tb_client.client._client.publish.assert_called_once_with(GATEWAY_TELEMETRY_TOPIC, PAYLOAD, qos=1)
+        self.tb_client.client._wait_for_rate_limit_released.assert_not_called()
+        self.tb_client.client._wait_until_current_queued_messages_processed.assert_not_called()
+
+    def test_rate_limits_are_applied_for_datapoints_and_messages(self):
+        # Long windows are used, so the buckets are not refilled noticeably during the test
+        self.set_rate_limits('10:3600,100:7200', '1000:3600')
+
+        self.tb_client.publish_pre_rendered(GATEWAY_TELEMETRY_TOPIC, PAYLOAD, 2, 1)
+        self.tb_client.publish_pre_rendered(GATEWAY_TELEMETRY_TOPIC, PAYLOAD, 5, 1)
+
+        self.assertEqual([round(tokens) for tokens in self.get_remaining_tokens(self.datapoints_rate_limit)], [993])
+        self.assertEqual([round(tokens) for tokens in self.get_remaining_tokens(self.messages_rate_limit)], [8, 98])
+        self.assertEqual([call.kwargs['amount'] for call
+                          in self.tb_client.client._wait_for_rate_limit_released.call_args_list], [2, 5])
+        self.assertEqual(self.tb_client.client._wait_until_current_queued_messages_processed.call_count, 2)
+        self.assertEqual(self.tb_client.client._client.publish.call_count, 2)
+
+    def test_payload_is_not_published_if_rate_limit_is_not_released(self):
+        self.set_rate_limits('10:3600', '1000:3600')
+        rate_limited = TBPublishInfo(MagicMock())
+        self.tb_client.client._wait_for_rate_limit_released.return_value = rate_limited
+
+        self.assertIs(self.tb_client.publish_pre_rendered(GATEWAY_TELEMETRY_TOPIC, PAYLOAD, 2, 1), rate_limited)
+        self.tb_client.client._client.publish.assert_not_called()
+        self.assertEqual([round(tokens) for tokens in self.get_remaining_tokens(self.messages_rate_limit)], [10])
+
+    def test_max_datapoints_per_message(self):
+        self.assertEqual(self.tb_client.get_max_datapoints_per_message(), 0)
+
+        self.set_rate_limits('10:1', '50:1,1000:60')
+        self.assertEqual(self.tb_client.get_max_datapoints_per_message(), 50)
+
+
+class TestSendPreRenderedTelemetry(TestCase):
+
+    def setUp(self):
+        self.gateway = TBGatewayService.__new__(TBGatewayService)
+        self.gateway.tb_client = MagicMock()
+        self.gateway.tb_client.get_max_datapoints_per_message.return_value = 0
+        self.gateway.tb_client.publish_pre_rendered.side_effect = lambda topic, payload, dp_count, qos: \
+            (payload, dp_count)
+        self.gateway.get_max_payload_size_bytes = lambda: 1000
+        self.gateway.gw_send_telemetry = MagicMock(return_value='sent by client')
+        self.gateway.quality_of_service = 1
+        self.gateway._published_events = Queue()
+        self.gateway._TBGatewayService__renamed_devices = {}
+
+    def send(self, events):
+        telemetry_fragments = {}
+        events_to_decode, _ = EventCodec.split_pre_rendered_telemetry(events, telemetry_fragments)
+        self.assertEqual(events_to_decode, [])
+        self.gateway._TBGatewayService__send_pre_rendered_telemetry_data(telemetry_fragments)
+        self.assertEqual(telemetry_fragments, {})
+        published = []
+        while not self.gateway._published_events.empty():
+            published.append(self.gateway._published_events.get_nowait())
+        return published
+
+    @staticmethod
+    def create_event(device_name, ts, values):
+        data = ConvertedData(device_name)
+        data.add_to_telemetry(TelemetryEntry({DatapointKey(key): value for key, value in values.items()}, ts))
+        return EventCodec.encode(data)
+
+    def test_fragments_are_joined_into_one_payload(self):
+        published = self.send([self.create_event('Device A', 1000, {'temperature': 21.5}),
+                               self.create_event('Device A', 2000, {'temperature': 22.0, 'humidity': 40}),
+                               self.create_event('Device B', 1000, {'temperature': 19.0})])
+
+        self.assertEqual(published, [
+            (b'{"Device A":[{"ts":1000,"values":{"temperature":21.5}},'
+             b'{"ts":2000,"values":{"temperature":22.0,"humidity":40}}]}', 3),
+            (b'{"Device B":[{"ts":1000,"values":{"temperature":19.0}}]}', 1)
+        ])
+        self.gateway.gw_send_telemetry.assert_not_called()
+
+    def test_renamed_device_name_is_used(self):
+        self.gateway._TBGatewayService__renamed_devices = {'Device A': 'Device "A"'}
+
+        published = self.send([self.create_event('Device A', 1000, {'temperature': 21.5})])
+
+        self.assertEqual(loads(published[0][0]), {'Device "A"': [{'ts': 1000, 'values': {'temperature': 21.5}}]})
+
+    def test_payload_is_split_by_max_datapoints_count(self):
+        self.gateway.tb_client.get_max_datapoints_per_message.return_value = 3
+        events = [self.create_event('Device A', ts, {'temperature': ts, 'humidity': ts}) for ts in range(1, 5)]
+
+        published = self.send(events)
+
+        self.assertEqual([dp_count for _, dp_count in published], [2, 2, 2, 2])
+        self.assertEqual([entry['ts'] for payload, _ in published for entry in loads(payload)['Device A']],
+                         [1, 2, 3, 4])
+
+        self.gateway.tb_client.get_max_datapoints_per_message.return_value = 4
+        published = self.send(events)
+        self.assertEqual([dp_count for _, dp_count in published], [4, 4])
+
+    def test_payload_is_split_by_max_payload_size(self):
+        events = [self.create_event('Device A', ts, {'temperature': 21.5}) for ts in range(1000, 1010)]
+        fragment_size = len(b'{"ts":1000,"values":{"temperature":21.5}}')
+        empty_payload_size = len(b'{"Device A":[]}')
+        self.gateway.get_max_payload_size_bytes = lambda: empty_payload_size + 3 * (fragment_size + 1)
+
+        published = self.send(events)
+
+        self.assertEqual([dp_count for _, dp_count in published], [3, 3, 3, 1])
+        for payload, _ in published:
+            self.assertLessEqual(len(payload), self.gateway.get_max_payload_size_bytes())
+        self.assertEqual([entry['ts'] for payload, _ in published for entry in loads(payload)['Device A']],
+                         list(range(1000, 1010)))
+
+    def test_oversize_fragment_is_sent_by_client(self):
+        self.gateway.get_max_payload_size_bytes = lambda: 60
+        big_int = 2 ** 70
+        small_event = self.create_event('Device A', 1000, {'temperature': 21.5})
+        big_event = self.create_event('Device A', 2000, {'counter': big_int, 'description': 'x' * 40})
+
+        published = self.send([small_event, big_event])
+
+        self.assertEqual(published, ['sent by client',
+                                     (b'{"Device A":[{"ts":1000,"values":{"temperature":21.5}}]}', 1)])
+        self.gateway.gw_send_telemetry.assert_called_once_with('Device A', [
+            {'ts': 2000, 'values': {'counter': big_int, 'description': 'x' * 40}}])
+        self.assertIsInstance(self.gateway.gw_send_telemetry.call_args.args[1][0]['values']['counter'], int)
+
+    def test_fragment_with_too_many_datapoints_is_sent_by_client(self):
+        self.gateway.tb_client.get_max_datapoints_per_message.return_value = 1
+
+        published = self.send([self.create_event('Device A', 1000, {'temperature': 21.5, 'humidity': 40})])
+
+        self.assertEqual(published, ['sent by client'])
+        self.gateway.gw_send_telemetry.assert_called_once_with('Device A', [
+            {'ts': 1000, 'values': {'temperature': 21.5, 'humidity': 40}}])
+        self.gateway.tb_client.publish_pre_rendered.assert_not_called()
+
+
+if __name__ == '__main__':
+    main()
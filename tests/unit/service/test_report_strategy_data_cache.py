@@ -0,0 +1,153 @@
+import logging
+from time import monotonic, sleep
+from unittest import TestCase, main
+
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.report_strategy.report_strategy_data_cache import ReportStrategyDataCache
+
+LOGGER = logging.getLogger('Report strategy data cache test')
+KEY = DatapointKey('temperature')
+DEVICE_NAME = 'Test device'
+CONNECTOR_ID = 'connector_1'
+
+
+class TestReportStrategyDataCache(TestCase):
+
+    def setUp(self):
+        self.cache = ReportStrategyDataCache({}, LOGGER)
+
+    def tearDown(self):
+        self.cache.stop()
+
+    def filter_and_update(self, report_strategy, value, ts=1000, is_telemetry=True, current_time=0,
+                          device_name=DEVICE_NAME, connector_id=CONNECTOR_ID):
+        return self.cache.filter_and_update(KEY, value, ts, device_name, 'default', 'Test connector', connector_id,
+                                            report_strategy, is_telemetry, current_time)
+
+    def test_on_received(self):
+        report_strategy = ReportStrategyConfig({'type': 'ON_RECEIVED'})
+
+        self.assertEqual(self.filter_and_update(report_strategy, 21.5, ts=1000), (True, True))
+        self.assertEqual(self.filter_and_update(report_strategy, 21.5, ts=2000), (True, False))
+        self.assertEqual(self.filter_and_update(report_strategy, 22.0, ts=3000), (True, False))
+
+        record = self.cache.get(KEY, DEVICE_NAME, CONNECTOR_ID)
+        self.assertEqual(record.get_value(), 21.5)
+        self.assertEqual(record.get_ts(), 3000)
+
+    def test_on_change(self):
+        report_strategy = ReportStrategyConfig({'type': 'ON_CHANGE'})
+
+        self.assertEqual(self.filter_and_update(report_strategy, 21.5, ts=1000), (True, True))
+        self.assertEqual(self.filter_and_update(report_strategy, 21.5005, ts=2000), (False, False))
+        self.assertEqual(self.filter_and_update(report_strategy, 22.0, ts=3000), (True, False))
+        self.assertEqual(self.filter_and_update(report_strategy, 22.0, ts=4000), (False, False))
+
+        record = self.cache.get(KEY, DEVICE_NAME, CONNECTOR_ID)
+        self.assertEqual(record.get_value(), 22.0)
+        self.assertEqual(record.get_ts(), 3000)
+
+    def test_on_change_attribute_has_no_ts(self):
+        report_strategy = ReportStrategyConfig({'type': 'ON_CHANGE'})
+
+        self.assertEqual(self.filter_and_update(report_strategy, 'v1', is_telemetry=False), (True, True))
+        self.assertEqual(self.filter_and_update(report_strategy, 'v2', is_telemetry=False), (True, False))
+
+        record = self.cache.get(KEY, DEVICE_NAME, CONNECTOR_ID)
+        self.assertFalse(record.is_telemetry())
+        self.assertIsNone(record.get_ts())
+
+    def test_on_report_period(self):
+        report_strategy = ReportStrategyConfig({'type': 'ON_REPORT_PERIOD', 'reportPeriod': 1000})
+
+        self.assertEqual(self.filter_and_update(report_strategy, 21.5, current_time=5000), (True, True))
+        self.assertEqual(self.filter_and_update(report_strategy, 22.0, current_time=5100), (False, False))
+        self.assertEqual(self.filter_and_update(report_strategy, 22.0, current_time=5200), (False, False))
+
+        record = self.cache.get(KEY, DEVICE_NAME, CONNECTOR_ID)
+        self.assertEqual(record.get_value(), 22.0)
+        self.assertFalse(record.should_be_reported_by_period(5100))
+        self.assertTrue(record.should_be_reported_by_period(5000 + report_strategy.report_period))
+
+    def test_on_change_or_report_period(self):
+        report_strategy = ReportStrategyConfig({'type': 'ON_CHANGE_OR_REPORT_PERIOD', 'reportPeriod': 1000})
+
+        self.assertEqual(self.filter_and_update(report_strategy, 21.5, current_time=5000), (True, True))
+        self.assertEqual(self.filter_and_update(report_strategy, 21.5, current_time=5100), (False, False))
+        self.assertEqual(self.filter_and_update(report_strategy, 22.0, current_time=5200), (True, False))
+
+        record = self.cache.get(KEY, DEVICE_NAME, CONNECTOR_ID)
+        self.assertEqual(record.get_value(), 22.0)
+        self.assertEqual(record.next_report_time(), 5000 + report_strategy.report_period - 50)
+
+    def test_new_record_is_created_for_every_device_and_connector(self):
+        report_strategy = ReportStrategyConfig({'type': 'ON_CHANGE'})
+
+        self.assertEqual(self.filter_and_update(report_strategy, 1), (True, True))
+        self.assertEqual(self.filter_and_update(report_strategy, 1, device_name='Other device'), (True, True))
+        self.assertEqual(self.filter_and_update(report_strategy, 1, connector_id='connector_2'), (True, True))
+        self.assertEqual(self.filter_and_update(report_strategy, 1), (False, False))
+        self.assertEqual(len(self.cache), 3)
+
+    def test_expired_record_is_replaced_by_new_one(self):
+        report_strategy = ReportStrategyConfig({'type': 'ON_CHANGE', 'ttl': 10})
+
+        self.assertEqual(self.filter_and_update(report_strategy, 21.5), (True, True))
+        self.cache._ReportStrategyDataCache__data_cache_current_ts = monotonic() + 11
+
+        self.assertEqual(self.filter_and_update(report_strategy, 21.5), (True, True))
+
+    def test_cleanup_removes_expired_records(self):
+        self.cache.stop()
+        self.cache = ReportStrategyDataCache({'reportStrategyDataCacheCleanupInterval': 0}, LOGGER)
+        expiring_strategy = ReportStrategyConfig({'type': 'ON_CHANGE', 'ttl': 1})
+        not_expiring_strategy = ReportStrategyConfig({'type': 'ON_CHANGE', 'ttl': 0})
+        on_received_strategy = ReportStrategyConfig({'type': 'ON_RECEIVED', 'ttl': 1})
+
+        self.filter_and_update(expiring_strategy, 1, device_name='Expiring device')
+        self.filter_and_update(not_expiring_strategy, 1, device_name='Not expiring device')
+        self.filter_and_update(on_received_strategy, 1, device_name='On received device')
+
+        deadline = monotonic() + 5
+        while len(self.cache) == 3 and monotonic() < deadline:
+            sleep(0.1)
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get(KEY, 'Expiring device', CONNECTOR_ID))
+        self.assertIsNotNone(self.cache.get(KEY, 'Not expiring device', CONNECTOR_ID))
+
+    def test_shards_count_is_configurable(self):
+        for configured_shards_count, expected_shards_count in ((None, 16), (1, 1), (0, 1), (5, 8), (64, 64)):
+            with self.subTest(shards=configured_shards_count):
+                config = {}
+                if configured_shards_count is not None:
+                    config['reportStrategyDataCacheShards'] = configured_shards_count
+                cache = ReportStrategyDataCache(config, LOGGER)
+                try:
+                    self.assertEqual(len(cache._shards), expected_shards_count)
+                    self.assertEqual(len(cache._locks), expected_shards_count)
+                finally:
+                    cache.stop()
+
+    def test_records_of_all_shards_are_accessible(self):
+        report_strategy = ReportStrategyConfig({'type': 'ON_CHANGE'})
+        device_names = ['Device %i' % i for i in range(100)]
+        for device_name in device_names:
+            self.filter_and_update(report_strategy, 1, device_name=device_name)
+            self.filter_and_update(report_strategy, 1, device_name=device_name, connector_id='connector_2')
+
+        self.assertEqual(len(self.cache), 200)
+        self.assertGreater(sum(1 for shard in self.cache._shards if shard), 1)
+        self.assertTrue(all(self.cache.get(KEY, device_name, CONNECTOR_ID) for device_name in device_names))
+
+        self.cache.delete_all_records_for_connector_by_connector_id(CONNECTOR_ID)
+        self.assertEqual(len(self.cache), 100)
+        self.assertIsNone(self.cache.get(KEY, device_names[0], CONNECTOR_ID))
+
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+import logging
+from queue import Queue
+from threading import Event
+from unittest import TestCase, main
+from unittest.mock import MagicMock, patch
+
+from thingsboard_gateway.gateway.constant_enums import Status
+from thingsboard_gateway.gateway.constants import CONNECTOR_PARAMETER, SEND_TO_STORAGE_TS_PARAMETER
+from thingsboard_gateway.gateway.device_filter import DeviceFilter
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
+from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
+from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
+from thingsboard_gateway.gateway.report_strategy.report_strategy_service import ReportStrategyService
+from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
+from thingsboard_gateway.gateway.tb_gateway_service import TBGatewayService
+
+LOGGER = logging.getLogger('Report strategy service test')
+CONNECTOR_NAME = 'Test connector'
+CONNECTOR_ID = 'connector_1'
+ON_CHANGE_REPORT_STRATEGY = ReportStrategyConfig({'type': 'ON_CHANGE'})
+
+
+def create_data(device_name, telemetry=None, attributes=None, ts=1000, metadata=None):
+    data = ConvertedData(device_name, metadata=metadata)
+    if telemetry:
+        data.add_to_telemetry(TelemetryEntry(telemetry, ts))
+    if attributes:
+        data.add_to_attributes(attributes)
+    return data
+
+
+class TestReportStrategyServiceBatch(TestCase):
+
+    def setUp(self):
+        self.services = []
+
+    def tearDown(self):
+        for service, gateway in self.services:
+            service.stop_event.set()
+            gateway.stop_event.set()
+            service._report_strategy_data_cache.stop()
+
+    def create_service(self, report_strategy_type='ON_RECEIVED'):
+        gateway = MagicMock()
+        gateway.stop_event = Event()
+        send_data_queue = Queue()
+        service = ReportStrategyService({'reportStrategy': {'type': report_strategy_type}}, gateway,
+                                        send_data_queue, LOGGER)
+        self.services.append((service, gateway))
+        return service, send_data_queue
+
+    @staticmethod
+    def get_sent_data(send_data_queue: Queue):
+        sent_data = {}
+        while not send_data_queue.empty():
+            connector_name, connector_id, data = send_data_queue.get_nowait()
+            sent_data[data.device_name] = (connector_name, connector_id, data)
+        return sent_data
+
+    def test_data_of_the_same_device_is_merged(self):
+        service, send_data_queue = self.create_service()
+
+        service.filter_data_batch_and_send([
+            create_data('Device A', telemetry={'temperature': 21.5}, ts=1000),
+            create_data('Device B', telemetry={'temperature': 19.0}),
+            create_data('Device A', telemetry={'humidity': 40}, attributes={'serial': 'A1'}, ts=2000)
+        ], CONNECTOR_NAME, CONNECTOR_ID)
+
+        sent_data = self.get_sent_data(send_data_queue)
+        self.assertEqual(set(sent_data), {'Device A', 'Device B'})
+        connector_name, connector_id, device_a_data = sent_data['Device A']
+        self.assertEqual((connector_name, connector_id), (CONNECTOR_NAME, CONNECTOR_ID))
+        self.assertEqual([(entry.ts, {key.key: value for key, value in entry.values.items()})
+                          for entry in device_a_data.telemetry],
+                         [(1000, {'temperature': 21.5}), (2000, {'humidity': 40})])
+        self.assertEqual(device_a_data.attributes.to_dict(), {'serial': 'A1'})
+
+    def test_dict_data_is_accepted_in_batch(self):
+        service, send_data_queue = self.create_service()
+
+        service.filter_data_batch_and_send([
+            {'deviceName': 'Device A', 'deviceType': 'thermometer',
+             'telemetry': [{'ts': 1000, 'values': {'temperature': 21.5}}], 'attributes': {'serial': 'A1'}}
+        ], CONNECTOR_NAME, CONNECTOR_ID)
+
+        _, _, data = self.get_sent_data(send_data_queue)['Device A']
+        self.assertEqual(data.device_type, 'thermometer')
+        self.assertEqual(data.telemetry_datapoints_count, 1)
+        self.assertEqual(data.attributes.to_dict(), {'serial': 'A1'})
+
+    def test_devices_without_data_to_report_are_dropped(self):
+        service, send_data_queue = self.create_service('ON_CHANGE')
+        batch = [create_data('Device A', telemetry={'temperature': 21.5}, attributes={'serial': 'A1'}),
+                 create_data('Device B', telemetry={'temperature': 19.0})]
+
+        service.filter_data_batch_and_send(batch, CONNECTOR_NAME, CONNECTOR_ID)
+        self.assertEqual(set(self.get_sent_data(send_data_queue)), {'Device A', 'Device B'})
+
+        service.filter_data_batch_and_send([
+            create_data('Device A', telemetry={'temperature': 21.5}, attributes={'serial': 'A1'}),
+            create_data('Device B', telemetry={'temperature': 20.0}),
+            create_data('Device C')
+        ], CONNECTOR_NAME, CONNECTOR_ID)
+
+        sent_data = self.get_sent_data(send_data_queue)
+        self.assertEqual(set(sent_data), {'Device B'})
+        self.assertEqual(sent_data['Device B'][2].telemetry[0].to_dict()['values'], {'temperature': 20.0})
+
+    def test_batch_and_single_item_paths_keep_metadata_and_keys(self):
+        batch_service, batch_queue = self.create_service()
+        single_service, single_queue = self.create_service()
+        temperature_key = DatapointKey('temperature', ON_CHANGE_REPORT_STRATEGY)
+        humidity_key = DatapointKey('humidity')
+
+        def create_batch():
+            return [create_data('Device A', telemetry={temperature_key: 21.5, humidity_key: 40},
+                                metadata={'receivedTs': 100}),
+                    create_data('Device B', telemetry={temperature_key: 19.0}, metadata={'receivedTs': 200})]
+
+        for _ in range(2):
+            batch_service.filter_data_batch_and_send(create_batch(), CONNECTOR_NAME, CONNECTOR_ID)
+            for data in create_batch():
+                single_service.filter_data_and_send(data, CONNECTOR_NAME, CONNECTOR_ID)
+
+            batch_sent_data = self.get_sent_data(batch_queue)
+            single_sent_data = self.get_sent_data(single_queue)
+            self.assertEqual(set(batch_sent_data), set(single_sent_data))
+            for device_name, (_, _, batch_data) in batch_sent_data.items():
+                single_data = single_sent_data[device_name][2]
+                self.assertEqual(batch_data.metadata, single_data.metadata)
+                self.assertEqual([list(entry.values.items()) for entry in batch_data.telemetry],
+                                 [list(entry.values.items()) for entry in single_data.telemetry])
+                for entry in batch_data.telemetry:
+                    for key in entry.values:
+                        self.assertIs(key.report_strategy, (temperature_key if key.key == 'temperature'
+                                                            else humidity_key).report_strategy)
+
+        # The temperature key uses its own ON_CHANGE strategy, so only humidity is reported for the second time
+        self.assertEqual(list(batch_sent_data), ['Device A'])
+        self.assertEqual(list(batch_sent_data['Device A'][2].telemetry[0].values), [humidity_key])
+
+    def test_metadata_of_merged_data_is_combined(self):
+        service, send_data_queue = self.create_service()
+        first_metadata = {'receivedTs': 100}
+
+        service.filter_data_batch_and_send([
+            create_data('Device A', telemetry={'temperature': 21.5}, metadata=first_metadata),
+            create_data('Device A', telemetry={'humidity': 40}, metadata={'receivedTs': 200, 'convertedTs': 300})
+        ], CONNECTOR_NAME, CONNECTOR_ID)
+
+        _, _, data = self.get_sent_data(send_data_queue)['Device A']
+        self.assertEqual(data.metadata, {'receivedTs': 200, 'convertedTs': 300})
+        self.assertEqual(first_metadata, {'receivedTs': 100})
+
+
+class TestGatewaySendBatchToStorage(TestCase):
+
+    def setUp(self):
+        self.gateway = TBGatewayService.__new__(TBGatewayService)
+        self.gateway._report_strategy_service = MagicMock()
+        self.gateway._event_storage = MagicMock()
+        self.gateway._event_storage.get_fill_level.return_value = 0
+        self.gateway._TBGatewayService__converted_data_queue = MagicMock()
+        self.gateway._TBGatewayService__device_filter = None
+        self.gateway._TBGatewayService__latency_debug_mode = False
+        self.gateway._TBGatewayService__storage_backpressure = False
+        self.gateway._TBGatewayService__storage_high_watermark = 0.8
+        self.gateway._TBGatewayService__storage_low_watermark = 0.6
+        self.statistics_enabled = StatisticsService.ENABLED
+        log_patcher = patch('thingsboard_gateway.gateway.tb_gateway_service.log')
+        log_patcher.start()
+        self.addCleanup(log_patcher.stop)
+
+    def tearDown(self):
+        StatisticsService.ENABLED = self.statistics_enabled
+
+    def get_filtered_batch(self):
+        self.gateway._report_strategy_service.filter_data_batch_and_send.assert_called_once()
+        data_batch, connector_name, connector_id = \
+            self.gateway._report_strategy_service.filter_data_batch_and_send.call_args.args
+        self.assertEqual((connector_name, connector_id), (CONNECTOR_NAME, CONNECTOR_ID))
+        return data_batch
+
+    def test_forbidden_devices_are_dropped(self):
+        device_filter = DeviceFilter(None)
+        device_filter._config = {'deny': {CONNECTOR_NAME: ['Forbidden.*']}, 'allow': {}}
+        self.gateway._TBGatewayService__device_filter = device_filter
+
+        status = self.gateway.send_to_storage(CONNECTOR_NAME, CONNECTOR_ID, [
+            create_data('Device A', telemetry={'temperature': 21.5}),
+            create_data('Forbidden device', telemetry={'temperature': 19.0})
+        ])
+
+        self.assertEqual(status, Status.SUCCESS)
+        self.assertEqual([data.device_name for data in self.get_filtered_batch()], ['Device A'])
+
+        self.gateway._report_strategy_service.reset_mock()
+        status = self.gateway.send_to_storage(CONNECTOR_NAME, CONNECTOR_ID,
+                                              [create_data('Forbidden device', telemetry={'temperature': 19.0})])
+        self.assertEqual(status, Status.FORBIDDEN_DEVICE)
+        self.gateway._report_strategy_service.filter_data_batch_and_send.assert_not_called()
+
+    def test_metadata_is_added_as_for_single_item(self):
+        StatisticsService.ENABLED = True
+        single_data = create_data('Device A', telemetry={'temperature': 21.5}, metadata={'receivedTs': 100})
+        self.gateway.send_to_storage(CONNECTOR_NAME, CONNECTOR_ID, single_data)
+
+        batch_data = create_data('Device A', telemetry={'temperature': 21.5}, metadata={'receivedTs': 100})
+        dict_data = {'deviceName': 'Device B', 'telemetry': [{'ts': 1000, 'values': {'temperature': 19.0}}]}
+        self.gateway.send_to_storage(CONNECTOR_NAME, CONNECTOR_ID, [batch_data, dict_data])
+
+        self.assertEqual(self.get_filtered_batch(), [batch_data, dict_data])
+        self.assertEqual(set(batch_data.metadata), set(single_data.metadata))
+        self.assertEqual(batch_data.metadata[CONNECTOR_PARAMETER], CONNECTOR_NAME)
+        self.assertIn(SEND_TO_STORAGE_TS_PARAMETER, batch_data.metadata)
+
+
+if __name__ == '__main__':
+    main()
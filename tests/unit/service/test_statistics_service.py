@@ -0,0 +1,70 @@
+from threading import Thread
+from unittest import TestCase, main
+
+from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
+
+
+class TestStatisticsService(TestCase):
+
+    def setUp(self):
+        StatisticsService.merge_counters()
+        StatisticsService.clear_statistics()
+        StatisticsService.enable_statistics()
+
+    def tearDown(self):
+        StatisticsService.disable_statistics()
+        StatisticsService.merge_counters()
+        StatisticsService.clear_statistics()
+
+    def test_counters_from_threads_are_merged(self):
+        def count_messages():
+            for _ in range(1000):
+                StatisticsService.add_count('eventsAdded')
+                StatisticsService.count_connector_message('MQTT Broker Connector', 'convertersMsgProcessed')
+
+        threads = [Thread(target=count_messages) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        StatisticsService.merge_counters()
+
+        self.assertEqual(StatisticsService.STATISTICS_STORAGE['eventsAdded'], 4000)
+        self.assertDictEqual(StatisticsService.CONNECTOR_STATISTICS_STORAGE,
+                             {'MQTT Broker Connector': {'convertersMsgProcessed': 4000}})
+
+    def test_only_new_values_are_merged_after_clear(self):
+        StatisticsService.add_count('eventsProcessed', 5)
+        StatisticsService.merge_counters()
+        StatisticsService.clear_statistics()
+
+        StatisticsService.add_count('eventsProcessed', 2)
+        StatisticsService.merge_counters()
+
+        self.assertEqual(StatisticsService.STATISTICS_STORAGE['eventsProcessed'], 2)
+
+    def test_bytes_count_is_payload_length(self):
+        self.assertEqual(StatisticsService.get_bytes_count(b'\x01\x02\x03'), 3)
+        self.assertEqual(StatisticsService.get_bytes_count('temperature'), 11)
+        self.assertEqual(StatisticsService.get_bytes_count('°C'), 3)
+        self.assertEqual(StatisticsService.get_bytes_count({"temperature": 21.5}), len('{"temperature":21.5}'))
+
+    def test_decorator_does_not_collect_when_disabled(self):
+        class Converter:
+            @CollectStatistics(start_stat_type='receivedBytesFromDevices', end_stat_type='convertedBytesFromDevice')
+            def convert(self, config, data):
+                return data
+
+        StatisticsService.disable_statistics()
+        Converter().convert({}, b'12345')
+        StatisticsService.enable_statistics()
+        Converter().convert({}, b'123')
+        StatisticsService.merge_counters()
+
+        self.assertEqual(StatisticsService.STATISTICS_STORAGE['receivedBytesFromDevices'], 3)
+        self.assertEqual(StatisticsService.STATISTICS_STORAGE['convertedBytesFromDevice'], 3)
+
+
+if __name__ == '__main__':
+    main()
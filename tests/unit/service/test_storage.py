@@ -60,6 +60,19 @@ class TestStorage(TestCase):
 
         stop_event.set()
 
+    def test_memory_storage_fill_level(self):
+        storage = MemoryEventStorage({"type": "memory", "read_records_count": 10, "max_records_count": 10},
+                                     LOG, Event())
+
+        self.assertEqual(storage.get_fill_level(), 0.0)
+        for test_value in range(8):
+            storage.put(test_value)
+        self.assertAlmostEqual(storage.get_fill_level(), 0.8)
+        storage.put(8)
+        storage.put(9)
+        self.assertFalse(storage.put(10))
+        self.assertEqual(storage.get_fill_level(), 1.0)
+
     def test_file_storage(self):
 
         storage_test_config = {
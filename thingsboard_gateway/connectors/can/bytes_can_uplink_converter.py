@@ -23,70 +23,126 @@ from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
+FRAME_DECODER_PARAMETER = "decoder"
+STRICT_EVAL_GLOBALS = {"__builtins__": {}}
 
-class BytesCanUplinkConverter(CanConverter):
-    def __init__(self, logger):
-        self._log = logger
 
-    @CollectStatistics(start_stat_type='receivedBytesFromDevices',
-                       end_stat_type='convertedBytesFromDevice')
-    def convert(self, configs, can_data):
-        device_name = configs.get("deviceName")
-        device_type = configs.get("deviceType")
+class CanValueDecoder:
+    """Reads one value from the CAN frame, the reading function, the struct and the expression are prepared once."""
+
+    __slots__ = ('key', 'type', 'is_ts', 'datapoint_key', 'read', 'error', '__expression', '__expression_globals')
+
+    def __init__(self, config, datapoint_key):
+        self.key = config.get("key")
+        self.type = config.get("type")
+        self.is_ts = config.get("is_ts")
+        self.datapoint_key = datapoint_key
+        self.read = None
+        self.error = None
+        self.__expression = None
+        self.__expression_globals = None
+
+        try:
+            self.read = self.__get_read_function(config)
+            if config.get("expression", ""):
+                self.__expression = compile(config["expression"], '<CAN expression>', 'eval')
+                self.__expression_globals = STRICT_EVAL_GLOBALS if config["strictEval"] else globals()
+        except Exception as e:
+            # The error is reported for every frame, the same as the conversion errors
+            self.read = None
+            self.error = e
+
+    @staticmethod
+    def __get_read_function(config):
+        data_type = config["type"][0]
+        start = config["start"]
+        end = start + config["length"] if config.get("length") is not None and config["length"] != -1 else None
+
+        if data_type == "b":
+            return lambda can_data: bool(can_data[start])
+        elif data_type == "i" or data_type == "l":
+            byteorder = config["byteorder"]
+            signed = config["signed"]
+            return lambda can_data: int.from_bytes(can_data[start:end], byteorder, signed=signed)
+        elif data_type == "f" or data_type == "d":
+            value_struct = struct.Struct((">" if config["byteorder"][0] == "b" else "<") + data_type)
+            return lambda can_data: value_struct.unpack_from(bytes(can_data[start:end]))[0]
+        elif data_type == "s":
+            encoding = config["encoding"]
+            return lambda can_data: can_data[start:end].decode(encoding)
+        elif data_type == "r":
+            return lambda can_data: bytes(can_data[start:end]).hex()
+
+        return None
+
+    def decode(self, can_data):
+        value = self.read(can_data)
+        if self.__expression is not None:
+            value = eval(self.__expression, self.__expression_globals, {"value": value, "can_data": can_data})
+
+        return value
+
 
-        converted_data = ConvertedData(device_name=device_name, device_type=device_type)
+class CanFrameDecoder:
+    """
+    Decoding plan for the frames with one (arbitration id, command id) pair:
+    the report strategy is parsed and the datapoint keys are created once.
+    """
 
+    def __init__(self, configs, logger):
         device_report_strategy = None
         try:
             device_report_strategy = ReportStrategyConfig(configs.get(REPORT_STRATEGY_PARAMETER))
         except ValueError as e:
-            self._log.trace("Report strategy config is not specified for device %s: %s", device_name, e)
+            logger.trace("Report strategy config is not specified for device %s: %s", configs.get("deviceName"), e)
 
+        self.values = []
         for config in configs.get('configs', []):
+            datapoint_key = TBUtility.convert_key_to_datapoint_key(config.get("key"), device_report_strategy,
+                                                                   configs, logger)
+            self.values.append(CanValueDecoder(config, datapoint_key))
+
+
+class BytesCanUplinkConverter(CanConverter):
+    def __init__(self, logger):
+        self._log = logger
+
+    def build_decoder(self, configs) -> CanFrameDecoder:
+        """
+        Builds the decoder for the frames with the parsing configs. The connector builds it once, when the
+        configuration is parsed, and keeps it in the configs, the other configs are decoded without preparation.
+        """
+        return CanFrameDecoder(configs, self._log)
+
+    @CollectStatistics(start_stat_type='receivedBytesFromDevices',
+                       end_stat_type='convertedBytesFromDevice')
+    def convert(self, configs, can_data):
+        converted_data = ConvertedData(device_name=configs.get("deviceName"), device_type=configs.get("deviceType"))
+
+        decoder = configs.get(FRAME_DECODER_PARAMETER)
+        if decoder is None:
+            decoder = self.build_decoder(configs)
+
+        for value_decoder in decoder.values:
             try:
-                tb_key = config["key"]
-                tb_item = "telemetry" if config["is_ts"] else "attributes"
-
-                data_length = config["length"] if config.get("length") is not None and config["length"] != -1 else len(can_data) - config["start"]
-
-                # The 'value' variable is used in eval
-                if config["type"][0] == "b":
-                    value = bool(can_data[config["start"]])
-                elif config["type"][0] == "i" or config["type"][0] == "l":
-                    value = int.from_bytes(can_data[config["start"]:config["start"] + data_length],
-                                           config["byteorder"],
-                                           signed=config["signed"])
-                elif config["type"][0] == "f" or config["type"][0] == "d":
-                    fmt = ">" + config["type"][0] if config["byteorder"][0] == "b" else "<" + config["type"][0]
-                    value = struct.unpack_from(fmt,
-                                               bytes(can_data[config["start"]:config["start"] + data_length]))[0]
-                elif config["type"][0] == "s":
-                    value = can_data[config["start"]:config["start"] + data_length].decode(config["encoding"])
-                elif config["type"][0] == "r":
-                    value = ""
-                    for hex_byte in can_data[config["start"]:config["start"] + data_length]:
-                        value += "%02x" % hex_byte
-                else:
+                if value_decoder.error is not None:
+                    raise value_decoder.error
+
+                if value_decoder.read is None:
                     self._log.error("Failed to convert CAN data to TB %s '%s': unknown data type '%s'",
-                                    "time series key" if config["is_ts"] else "attribute", tb_key, config["type"])
+                                    "time series key" if value_decoder.is_ts else "attribute", value_decoder.key,
+                                    value_decoder.type)
                     continue
 
-                if config.get("expression", ""):
-                    value = eval(config["expression"],
-                                                   {"__builtins__": {}} if config["strictEval"] else globals(),
-                                                   {"value": value, "can_data": can_data})
-
-                datapoint_key = TBUtility.convert_key_to_datapoint_key(tb_key, device_report_strategy,
-                                                                       configs, self._log)
-                if tb_item == "attributes":
-                    converted_data.add_to_attributes(datapoint_key, value)
+                value = value_decoder.decode(can_data)
+                if value_decoder.is_ts:
+                    converted_data.add_to_telemetry(TelemetryEntry({value_decoder.datapoint_key: value}))
                 else:
-                    telemetry_entry = TelemetryEntry({datapoint_key: value})
-                    converted_data.add_to_telemetry(telemetry_entry)
+                    converted_data.add_to_attributes(value_decoder.datapoint_key, value)
             except Exception as e:
                 StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
                 self._log.error("Failed to convert CAN data to TB %s '%s': %s",
-                                "time series key" if config["is_ts"] else "attribute", tb_key, str(e))
+                                "time series key" if value_decoder.is_ts else "attribute", value_decoder.key, str(e))
                 continue
 
         StatisticsService.count_connector_message(self._log.name, 'convertersAttrProduced',
@@ -12,6 +12,7 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import logging
 import re
 import sched
 import time
@@ -34,7 +35,8 @@ except ImportError:
     from can import Notifier, BufferedReader, Message, CanError, ThreadSafeBus
 
 from thingsboard_gateway.connectors.can.bytes_can_downlink_converter import BytesCanDownlinkConverter
-from thingsboard_gateway.connectors.can.bytes_can_uplink_converter import BytesCanUplinkConverter
+from thingsboard_gateway.connectors.can.bytes_can_uplink_converter import BytesCanUplinkConverter, \
+    FRAME_DECODER_PARAMETER
 from thingsboard_gateway.connectors.connector import Connector
 
 
@@ -66,6 +68,8 @@ class CanConnector(Connector, Thread):
 
     DEFAULT_RPC_RESPONSE_SEND_FLAG = False
 
+    DEFAULT_AGGREGATION_WINDOW = 0
+
     def __init__(self, gateway, config, connector_type):
         self.statistics = {'MessagesReceived': 0,
                            'MessagesSent': 0}
@@ -93,6 +97,9 @@ class CanConnector(Connector, Thread):
         self.__rpc_calls = {}
         self.__shared_attributes = {}
         self.__converters = {}
+        self.__aggregation_window = 0
+        self.__aggregated_data = {}
+        self.__aggregation_started = 0
         self.__bus_error = None
         self.__connected = False
         self.__stopped = False
@@ -288,10 +295,12 @@ class CanConnector(Connector, Thread):
                         StatisticsService.count_connector_bytes(self.name, message,
                                                                 stat_parameter_name='connectorBytesReceived')
                         self.__process_message(message)
+                    self.__send_aggregated_data(force=False)
                     self.__check_if_error_happened()
             except Exception as e:
                 self._log.error("[%s] Error on CAN bus: %s", self.get_name(), str(e))
             finally:
+                self.__send_aggregated_data(force=True)
                 try:
                     if poller is not None:
                         poller.stop()
@@ -395,8 +404,9 @@ class CanConnector(Connector, Thread):
             self._log.debug("[%s] Ignoring CAN message. Unknown cmd_id %d", self.get_name(), cmd_id)
             return
 
-        self._log.debug("[%s] Processing CAN message (id=%d,cmd_id=%s): %s",
-                  self.get_name(), message.arbitration_id, cmd_id, message)
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug("[%s] Processing CAN message (id=%d,cmd_id=%s): %s",
+                            self.get_name(), message.arbitration_id, cmd_id, message)
 
         parsing_conf = self.__nodes[message.arbitration_id][cmd_id]
         data: ConvertedData = self.__converters[parsing_conf["deviceName"]]["uplink"].convert(parsing_conf, message.data)
@@ -409,8 +419,30 @@ class CanConnector(Connector, Thread):
 
     def __check_and_send(self, new_data: ConvertedData):
         self.statistics['MessagesReceived'] += 1
-        self.__gateway.send_to_storage(self.get_name(), self.get_id(), new_data)
-        self.statistics['MessagesSent'] += 1
+        if self.__aggregation_window <= 0:
+            self.__gateway.send_to_storage(self.get_name(), self.get_id(), new_data)
+            self.statistics['MessagesSent'] += 1
+            return
+
+        aggregated_data = self.__aggregated_data.get(new_data.device_name)
+        if aggregated_data is None:
+            if not self.__aggregated_data:
+                self.__aggregation_started = time.monotonic()
+            self.__aggregated_data[new_data.device_name] = new_data
+        else:
+            aggregated_data.add_to_attributes(new_data.attributes)
+            aggregated_data.add_to_telemetry(new_data.telemetry)
+
+    def __send_aggregated_data(self, force):
+        if not self.__aggregated_data:
+            return
+        if not force and time.monotonic() - self.__aggregation_started < self.__aggregation_window:
+            return
+
+        aggregated_data, self.__aggregated_data = self.__aggregated_data, {}
+        for data in aggregated_data.values():
+            self.__gateway.send_to_storage(self.get_name(), self.get_id(), data)
+            self.statistics['MessagesSent'] += 1
 
     def __is_reconnect_enabled(self):
         if self.__reconnect_conf["enabled"]:
@@ -429,6 +461,9 @@ class CanConnector(Connector, Thread):
             "maxCount": config.get("reconnectCount", None)
             }
 
+        # Frames of the same device, received during the window (in seconds), are sent to storage as one message
+        self.__aggregation_window = config.get("aggregationWindow", self.DEFAULT_AGGREGATION_WINDOW)
+
         self.__bus_conf = {
             "interface": config.get("interface", "socketcan"),
             "channel": config.get("channel", "vcan0"),
@@ -573,6 +608,13 @@ class CanConnector(Connector, Thread):
                 self._log.warning("[%s] Ignore '%s' device configuration, because it doesn't have attributes,"
                                   "attributeUpdates,timeseries or serverSideRpc", self.get_name(), device_name)
 
+        # Frames with every arbitration id and command id are decoded by the decoder, that is built once
+        for cmd_parsing_confs in self.__nodes.values():
+            for parsing_conf in cmd_parsing_confs.values():
+                uplink_converter = self.__converters[parsing_conf["deviceName"]].get("uplink")
+                if isinstance(uplink_converter, BytesCanUplinkConverter):
+                    parsing_conf[FRAME_DECODER_PARAMETER] = uplink_converter.build_decoder(parsing_conf)
+
     def __parse_value_config(self, config):
         if config is None:
             self._log.warning("[%s] Wrong value configuration: no data", self.get_name())
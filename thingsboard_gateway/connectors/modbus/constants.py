@@ -72,6 +72,10 @@ CONNECT_ATTEMPT_TIME_MS_PARAMETER = "connectAttemptTimeMs"
 WAIT_AFTER_FAILED_ATTEMPTS_MS_PARAMETER = "waitAfterFailedAttemptsMs"
 
 DELAY_BETWEEN_REQUESTS_MS_PARAMETER = "delayBetweenRequestsMs"
+READ_GAP_TOLERANCE_PARAMETER = "readGapTolerance"
+MAX_OBJECTS_PER_READ_PARAMETER = "maxObjectsPerRead"
+PIPELINE_REQUESTS_PARAMETER = "pipelineRequests"
+MAX_INFLIGHT_REQUESTS_PARAMETER = "maxInflightRequests"
 
 FUNCTION_CODE_PARAMETER = "functionCode"
 
@@ -21,6 +21,7 @@ from pymodbus.client.udp import AsyncModbusUdpClient
 from pymodbus.framer.base import FramerType
 
 from thingsboard_gateway.connectors.modbus.entities.clients import AsyncModbusTlsClient
+from thingsboard_gateway.connectors.modbus.entities.pipelined_tcp_client import AsyncModbusPipelinedTcpClient
 from thingsboard_gateway.connectors.modbus.constants import SERIAL_CONNECTION_TYPE_PARAMETER
 
 
@@ -45,6 +46,9 @@ class Master:
         self.client_type = client_type.lower()
         self.__client = client
         self.__previous_request_time = 0
+        # Pipelined client sends requests concurrently, so the slave can read all its blocks at once
+        self.pipelined = isinstance(client, AsyncModbusPipelinedTcpClient)
+        self.max_inflight_requests = client.max_inflight_requests if self.pipelined else None
 
     def get_time_to_pass_delay_between_requests(self, delay_ms) -> int:
         if delay_ms == 0:
@@ -151,6 +155,12 @@ class Master:
                                           timeout=config.timeout,
                                           retries=config.retries,
                                           **config.tls)
+        elif config.type == 'tcp' and getattr(config, 'pipeline_requests', False):
+            master = AsyncModbusPipelinedTcpClient(host=config.host,
+                                                   port=config.port,
+                                                   timeout=config.timeout,
+                                                   retries=config.retries,
+                                                   max_inflight_requests=config.max_inflight_requests)
         elif config.type == 'tcp':
             master = AsyncModbusTcpClient(host=config.host,
                                           port=config.port,
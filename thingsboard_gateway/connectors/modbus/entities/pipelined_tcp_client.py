@@ -0,0 +1,182 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import asyncio
+from logging import getLogger
+from typing import Dict, Tuple
+
+from pymodbus.client.mixin import ModbusClientMixin
+from pymodbus.exceptions import ConnectionException, ModbusIOException
+from pymodbus.framer.socket import FramerSocket
+from pymodbus.pdu import DecodePDU, ExceptionResponse, ModbusPDU
+
+from thingsboard_gateway.connectors.modbus.constants import PymodbusDefaults
+
+MAX_TRANSACTION_ID = 65535
+DEFAULT_MAX_INFLIGHT_REQUESTS = 16
+READ_BUFFER_SIZE = 4096
+
+log = getLogger('connector')
+
+
+class AsyncModbusPipelinedTcpClient(ModbusClientMixin):
+    """
+    Modbus TCP client, that sends requests without waiting for the responses to the previous ones.
+    Responses are matched to the requests by the transaction id of the MBAP header, so devices behind
+    the same host and port (e.g. a Modbus TCP to RTU gateway) are polled concurrently over one connection.
+    The count of requests waiting for the response is limited by max_inflight_requests.
+    """
+
+    def __init__(self, host: str, port: int = PymodbusDefaults.TcpPort, timeout: float = PymodbusDefaults.Timeout,
+                 retries: int = PymodbusDefaults.Retries,
+                 max_inflight_requests: int = DEFAULT_MAX_INFLIGHT_REQUESTS):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.max_inflight_requests = max(1, int(max_inflight_requests))
+
+        self.__framer = FramerSocket(DecodePDU(False))
+        self.__reader = None
+        self.__writer = None
+        self.__read_task = None
+        self.__inflight_requests = None
+        self.__pending_requests: Dict[int, Tuple[int, asyncio.Future]] = {}
+        self.__next_transaction_id = 0
+
+    @property
+    def connected(self) -> bool:
+        return self.__writer is not None and not self.__writer.is_closing()
+
+    @property
+    def inflight_requests_count(self) -> int:
+        return len(self.__pending_requests)
+
+    async def connect(self) -> bool:
+        if self.connected:
+            return True
+
+        try:
+            self.__reader, self.__writer = await asyncio.wait_for(asyncio.open_connection(self.host, self.port),
+                                                                  timeout=self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            log.debug('Failed to connect to %s:%s: %s', self.host, self.port, e)
+            self.__reader = self.__writer = None
+            return False
+
+        self.__inflight_requests = asyncio.Semaphore(self.max_inflight_requests)
+        self.__read_task = asyncio.get_running_loop().create_task(self.__read_responses(self.__reader))
+        return True
+
+    def close(self):
+        if self.__read_task is not None:
+            self.__read_task.cancel()
+            self.__read_task = None
+
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+        self.__reader = None
+
+        self.__fail_pending_requests(ConnectionException('Connection to %s:%s is closed' % (self.host, self.port)))
+
+    async def execute(self, no_response_expected: bool, request: ModbusPDU) -> ModbusPDU:
+        if not self.connected and not await self.connect():
+            raise ConnectionException('Client cannot connect to %s:%s' % (self.host, self.port))
+
+        async with self.__inflight_requests:
+            for _ in range(self.retries + 1):
+                if not self.connected:
+                    raise ConnectionException('Connection to %s:%s is lost' % (self.host, self.port))
+
+                transaction_id = self.__get_next_transaction_id()
+                request.transaction_id = transaction_id
+                future = asyncio.get_running_loop().create_future()
+                self.__pending_requests[transaction_id] = (request.dev_id, future)
+
+                try:
+                    self.__writer.write(self.__framer.buildFrame(request))
+                    if no_response_expected:
+                        return ExceptionResponse(0xff)
+
+                    return await asyncio.wait_for(future, timeout=self.timeout)
+                except asyncio.TimeoutError:
+                    log.debug('No response for transaction %i from %s:%s', transaction_id, self.host, self.port)
+                finally:
+                    self.__pending_requests.pop(transaction_id, None)
+
+        raise ModbusIOException('No response received after %i retries' % self.retries)
+
+    def __get_next_transaction_id(self) -> int:
+        for _ in range(MAX_TRANSACTION_ID):
+            self.__next_transaction_id = self.__next_transaction_id % MAX_TRANSACTION_ID + 1
+            if self.__next_transaction_id not in self.__pending_requests:
+                return self.__next_transaction_id
+
+        raise ModbusIOException('No free transaction id')
+
+    async def __read_responses(self, reader: asyncio.StreamReader):
+        buffer = b''
+        error = None
+
+        try:
+            while True:
+                data = await reader.read(READ_BUFFER_SIZE)
+                if not data:
+                    break
+
+                buffer += data
+                while buffer:
+                    try:
+                        used_length, response = self.__framer.processIncomingFrame(buffer)
+                    except ModbusIOException as e:
+                        log.warning('Dropping invalid data from %s:%s: %s', self.host, self.port, e)
+                        buffer = b''
+                        break
+
+                    if not used_length:
+                        break
+
+                    buffer = buffer[used_length:]
+                    if response is not None:
+                        self.__process_response(response)
+        except asyncio.CancelledError:
+            return
+        except OSError as e:
+            error = e
+
+        log.debug('Connection to %s:%s is lost: %s', self.host, self.port, error)
+        if self.__reader is reader:
+            self.__read_task = None
+            self.close()
+
+    def __process_response(self, response: ModbusPDU):
+        pending_request = self.__pending_requests.get(response.transaction_id)
+        if pending_request is None:
+            log.debug('Received response for unknown transaction %i from %s:%s, ignoring',
+                      response.transaction_id, self.host, self.port)
+            return
+
+        device_id, future = pending_request
+        if response.dev_id != device_id:
+            log.warning('Transaction %i was sent to device %i, but response is from device %i, ignoring',
+                        response.transaction_id, device_id, response.dev_id)
+        elif not future.done():
+            future.set_result(response)
+
+    def __fail_pending_requests(self, exception: Exception):
+        for _, future in self.__pending_requests.values():
+            if not future.done():
+                future.set_exception(exception)
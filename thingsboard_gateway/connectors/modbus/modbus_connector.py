@@ -31,7 +31,9 @@ from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.connectors.connector import Connector
 from thingsboard_gateway.gateway.constants import STATISTIC_MESSAGE_RECEIVED_PARAMETER, \
     STATISTIC_MESSAGE_SENT_PARAMETER, CONNECTOR_PARAMETER, DEVICE_SECTION_PARAMETER, DATA_PARAMETER, \
-    ATTRIBUTE_UPDATE_METHOD_PARAMETER, ATTRIBUTE_UPDATE_PARAMS_PARAMETER, ON_ATTRIBUTE_UPDATE_DEFAULT_TIMEOUT
+    ATTRIBUTE_UPDATE_METHOD_PARAMETER, ATTRIBUTE_UPDATE_PARAMS_PARAMETER, ON_ATTRIBUTE_UPDATE_DEFAULT_TIMEOUT, \
+    BACKPRESSURE_POLL_PERIOD_MULTIPLIER
+from thingsboard_gateway.gateway.constant_enums import Status
 from thingsboard_gateway.tb_utility.tb_logger import init_logger
 
 # Try import Pymodbus library or install it and import
@@ -96,6 +98,7 @@ class AsyncModbusConnector(Connector, Thread):
         self.__id = self.__config.get('id')
         self.__connected = False
         self.__stopped = False
+        self.__storage_backpressure = False
         self.daemon = True
 
         try:
@@ -106,7 +109,7 @@ class AsyncModbusConnector(Connector, Thread):
 
         self.process_device_requests = AsyncQueue(100000)
         self.__data_to_convert = Queue(-1)
-        self.__data_to_save = Queue(-1)
+        self.__data_to_save = AsyncQueue()
 
         self.__server = None
 
@@ -194,6 +197,9 @@ class AsyncModbusConnector(Connector, Thread):
             '127.0.0.1:5021': AsyncClient object (TCP/UDP),
             '/dev/ttyUSB0': AsyncClient object (Serial)
         }
+
+        Connection is shared by all slaves with the same host and port, so the connection settings
+        (e.g. pipelineRequests and maxInflightRequests) are taken from the first added slave.
         """
         if not slave.host:
             master_connection_name = slave.port
@@ -203,9 +209,22 @@ class AsyncModbusConnector(Connector, Thread):
             master_connection = Master.configure_master(slave)
             master = Master(slave.type, master_connection)
             self._master_connections[master_connection_name] = master
+        else:
+            self.__check_shared_master_settings(master_connection_name, slave)
 
         return self._master_connections[master_connection_name]
 
+    def __check_shared_master_settings(self, master_connection_name, slave: Slave):
+        master = self._master_connections[master_connection_name]
+        if slave.pipeline_requests == master.pipelined and (
+                not master.pipelined or max(1, int(slave.max_inflight_requests)) == master.max_inflight_requests):
+            return
+
+        self.__log.warning("Connection %s is shared with other slaves and uses pipelineRequests=%s and "
+                           "maxInflightRequests=%s, different settings of the slave %s are ignored.",
+                           master_connection_name, master.pipelined, master.max_inflight_requests,
+                           slave.device_name)
+
     def __add_slave(self, slave_config):
         try:
             slave = Slave(self, self.__log, slave_config)
@@ -284,26 +303,40 @@ class AsyncModbusConnector(Connector, Thread):
             'attributes': {}
         }
 
-        for config_section in ('attributes', 'telemetry'):
-            for config in getattr(slave.uplink_converter_config, config_section):
+        read_blocks = slave.read_planner.blocks
+        if slave.master.pipelined and len(read_blocks) > 1:
+            responses = await asyncio.gather(*(slave.read(read_block.function_code, read_block.address,
+                                                          read_block.count)
+                                               for read_block in read_blocks),
+                                             return_exceptions=True)
+        else:
+            responses = []
+            for read_block in read_blocks:
                 try:
-                    address_ranges = self.__get_address_ranges(config)
-
-                    for (start_address, objects_count) in address_ranges:
-                        response = await slave.read(config['functionCode'], start_address, objects_count)
+                    responses.append(await slave.read(read_block.function_code, read_block.address,
+                                                      read_block.count))
+                except (asyncio.exceptions.TimeoutError, ValueError) as e:
+                    responses.append(e)
+
+        for read_block, response in zip(read_blocks, responses):
+            if isinstance(response, asyncio.exceptions.TimeoutError):
+                self.__log.error("Timeout error for device %s function code %s address %s, it may be caused by wrong data in server register.",  # noqa
+                                 slave.device_name, read_block.function_code, read_block.address)
+                continue
+            elif isinstance(response, ValueError):
+                self.__log.error("Value error for device %s function code %s address %s: %s", slave.device_name,
+                                 read_block.function_code, read_block.address, response)
+                continue
+            elif isinstance(response, BaseException):
+                raise response
 
-                        if result[config_section].get(config['tag']) is None:
-                            result[config_section][config['tag']] = []
+            if slave.read_planner.isolate_if_rejected(read_block, response):
+                self.__log.warning("Coalesced read of %s objects from address %s with function code %s "
+                                   "was rejected by device %s: %s. Tags of this read will be read separately.",
+                                   read_block.count, read_block.address, read_block.function_code,
+                                   slave.device_name, response)
 
-                        result[config_section][config['tag']].append(response)
-                except asyncio.exceptions.TimeoutError:
-                    self.__log.error("Timeout error for device %s function code %s address %s, it may be caused by wrong data in server register.",  # noqa
-                                     slave.device_name, config['functionCode'], config[ADDRESS_PARAMETER])
-                    continue
-                except ValueError as e:
-                    self.__log.error("Value error for device %s function code %s address %s: %s", slave.device_name,
-                                     config['functionCode'], config[ADDRESS_PARAMETER], e)
-                    continue
+            read_block.slice_response(response, result)
 
         return result
 
@@ -314,17 +347,6 @@ class AsyncModbusConnector(Connector, Thread):
 
         return False
 
-    @staticmethod
-    def __get_address_ranges(config):
-        address_ranges = []
-
-        if not Utils.is_wide_range_request(config['address']):
-            address_ranges.append((config['address'], config['objectsCount']))
-        else:
-            address_ranges.extend(Utils.parse_wide_range_request(config['address'], config['objectsCount']))
-
-        return address_ranges
-
     def __manage_device_connectivity_to_platform(self, slave: Slave):
         if slave.master.connected() and slave.device_name not in self.__gateway.get_devices():
             self.__add_device_to_platform(slave)
@@ -377,16 +399,29 @@ class AsyncModbusConnector(Connector, Thread):
 
     async def __save_data(self):
         while not self.__stopped:
-            if not self.__data_to_save.empty():
+            try:
+                converted_data_batch = [await asyncio.wait_for(self.__data_to_save.get(), 1)]
+            except asyncio.TimeoutError:
+                continue
+
+            while len(converted_data_batch) < 1000:
                 try:
-                    converted_data = self.__data_to_save.get_nowait()
-                    StatisticsService.count_connector_message(self.get_name(), stat_parameter_name='storageMsgPushed')
-                    self.__gateway.send_to_storage(self.get_name(), self.get_id(), converted_data)
-                    self.statistics[STATISTIC_MESSAGE_SENT_PARAMETER] += 1
-                except Empty:
-                    await asyncio.sleep(.001)
-            else:
-                await asyncio.sleep(.001)
+                    converted_data_batch.append(self.__data_to_save.get_nowait())
+                except QueueEmpty:
+                    break
+
+            try:
+                StatisticsService.count_connector_message(self.get_name(), stat_parameter_name='storageMsgPushed',
+                                                          count=len(converted_data_batch))
+                status = self.__gateway.send_to_storage(self.get_name(), self.get_id(), converted_data_batch)
+                self.statistics[STATISTIC_MESSAGE_SENT_PARAMETER] += len(converted_data_batch)
+                if (status == Status.BACKPRESSURE) != self.__storage_backpressure:
+                    self.__storage_backpressure = status == Status.BACKPRESSURE
+                    self.__log.info("Storage backpressure is %s, poll periods are %s",
+                                    "active" if self.__storage_backpressure else "released",
+                                    "stretched" if self.__storage_backpressure else "restored")
+            except Exception as e:
+                self.__log.error('Exception in saving data loop: %s', e)
 
     def get_device_shared_attributes_keys(self, device_name):
         device = self.__get_device_by_name(device_name)
@@ -811,3 +846,6 @@ class AsyncModbusConnector(Connector, Thread):
 
     def is_stopped(self):
         return self.__stopped
+
+    def get_poll_period_multiplier(self):
+        return BACKPRESSURE_POLL_PERIOD_MULTIPLIER if self.__storage_backpressure else 1
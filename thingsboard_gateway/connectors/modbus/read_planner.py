@@ -0,0 +1,210 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from logging import getLogger
+from typing import Dict, List, Tuple
+
+from thingsboard_gateway.connectors.modbus.constants import (
+    ADDRESS_PARAMETER,
+    FUNCTION_CODE_PARAMETER,
+    OBJECTS_COUNT_PARAMETER,
+    TAG_PARAMETER
+)
+from thingsboard_gateway.connectors.modbus.entities.bytes_uplink_converter_config import BytesUplinkConverterConfig
+from thingsboard_gateway.connectors.modbus.utils import Utils
+
+# Protocol limits for the count of objects, that can be read by a single request
+MAX_BITS_PER_READ = 2000
+MAX_REGISTERS_PER_READ = 125
+MAX_OBJECTS_PER_READ = {
+    1: MAX_BITS_PER_READ,
+    2: MAX_BITS_PER_READ,
+    3: MAX_REGISTERS_PER_READ,
+    4: MAX_REGISTERS_PER_READ
+}
+
+CONFIG_SECTIONS = ('attributes', 'telemetry')
+
+
+class PlannedReadResponse:
+    """Part of the response for a coalesced read, that belongs to a single tag."""
+
+    __slots__ = ('registers', 'bits')
+
+    def __init__(self, registers=None, bits=None):
+        self.registers = registers if registers is not None else []
+        self.bits = bits if bits is not None else []
+
+    def __repr__(self):
+        return 'PlannedReadResponse(registers=%r, bits=%r)' % (self.registers, self.bits)
+
+
+class _TagRange:
+    __slots__ = ('section', 'tag', 'function_code', 'address', 'count', 'isolated')
+
+    def __init__(self, section, tag, function_code, address, count):
+        self.section = section
+        self.tag = tag
+        self.function_code = function_code
+        self.address = address
+        self.count = count
+        self.isolated = False
+
+    @property
+    def end(self):
+        return self.address + self.count
+
+
+class ReadBlock:
+    """Single read request, that covers the address ranges of one or several tags."""
+
+    __slots__ = ('function_code', 'address', 'count', 'ranges')
+
+    def __init__(self, function_code, address, count, ranges: List[_TagRange]):
+        self.function_code = function_code
+        self.address = address
+        self.count = count
+        self.ranges = ranges
+
+    @property
+    def is_coalesced(self) -> bool:
+        return len(self.ranges) > 1
+
+    def slice_response(self, response, result: Dict[str, Dict[str, list]]):
+        """Appends the part of the response for every tag range of the block to the result."""
+
+        is_valid_response = Utils.is_encoded_data_valid(response)
+        for tag_range in self.ranges:
+            if not is_valid_response:
+                tag_response = response
+            elif self.function_code in (1, 2):
+                offset = tag_range.address - self.address
+                bits = list(response.bits[offset:offset + tag_range.count])
+                # Keep the padding to the full bytes, like in the response for the separate read
+                bits.extend([False] * (-len(bits) % 8))
+                tag_response = PlannedReadResponse(bits=bits)
+            else:
+                offset = tag_range.address - self.address
+                tag_response = PlannedReadResponse(registers=response.registers[offset:offset + tag_range.count])
+
+            section_result = result[tag_range.section]
+            if section_result.get(tag_range.tag) is None:
+                section_result[tag_range.tag] = []
+            section_result[tag_range.tag].append(tag_response)
+
+    def __repr__(self):
+        return 'ReadBlock(function_code=%s, address=%s, count=%s, tags=%s)' % (
+            self.function_code, self.address, self.count, len(self.ranges))
+
+
+class ModbusReadPlanner:
+    """
+    Plans the reads of the slave tags: address ranges with the same function code (the unit id is the same
+    for all tags of the slave) are merged into the fewest requests within the protocol limits
+    (125 registers or 2000 coils/discrete inputs per request).
+    Ranges are merged if they overlap, are adjacent or the gap between them is not bigger than the gap tolerance,
+    the registers from the gaps are read and dropped.
+    Wide range tags (address "start-end") are split into the ranges, that fit into a single request.
+    """
+
+    def __init__(self, config: BytesUplinkConverterConfig, gap_tolerance=0, max_objects_per_read=None,
+                 logger=None):
+        self._log = logger if logger is not None else getLogger('service')
+        self.__gap_tolerance = max(int(gap_tolerance), 0)
+        self.__max_objects_per_read = max_objects_per_read
+        self.__ranges = self.__parse_ranges(config)
+        self.blocks: Tuple[ReadBlock, ...] = self.__plan()
+
+        self._log.debug('Read plan for device %s: %i requests for %i address ranges',
+                        config.device_name, len(self.blocks), len(self.__ranges))
+
+    def get_max_objects_per_read(self, function_code) -> int:
+        protocol_limit = MAX_OBJECTS_PER_READ.get(function_code, MAX_REGISTERS_PER_READ)
+        if self.__max_objects_per_read is None:
+            return protocol_limit
+
+        return max(1, min(int(self.__max_objects_per_read), protocol_limit))
+
+    def isolate_if_rejected(self, block: ReadBlock, response) -> bool:
+        """
+        Isolates the tag ranges of the coalesced block only if the device answered with the illegal data address
+        exception, other errors (e.g. timeout or CRC error) can be transient and do not disable the coalescing.
+        """
+
+        if not block.is_coalesced or not Utils.is_illegal_address_response(response):
+            return False
+
+        self.isolate(block)
+        return True
+
+    def isolate(self, block: ReadBlock):
+        """
+        Stops merging the tag ranges of the block with other ranges, used if the device rejects the coalesced
+        read (e.g. the gap contains an address, that is not mapped on the device).
+        """
+
+        for tag_range in block.ranges:
+            tag_range.isolated = True
+
+        self.blocks = self.__plan()
+
+    def __parse_ranges(self, config: BytesUplinkConverterConfig) -> List[_TagRange]:
+        ranges = []
+
+        for config_section in CONFIG_SECTIONS:
+            for tag_config in getattr(config, config_section):
+                try:
+                    function_code = tag_config[FUNCTION_CODE_PARAMETER]
+                    objects_count = tag_config.get(OBJECTS_COUNT_PARAMETER, 1)
+                    address = tag_config[ADDRESS_PARAMETER]
+
+                    if Utils.is_wide_range_request(address):
+                        start_address, end_address = (int(part) for part in address.split('-'))
+                        count = end_address - start_address + objects_count
+                        if count <= 0:
+                            raise ValueError('End address must be greater than start address')
+                    else:
+                        start_address, count = int(address), int(objects_count)
+
+                    max_objects_per_read = self.get_max_objects_per_read(function_code)
+                    for chunk_address in range(start_address, start_address + count, max_objects_per_read):
+                        chunk_count = min(max_objects_per_read, start_address + count - chunk_address)
+                        ranges.append(_TagRange(config_section, tag_config[TAG_PARAMETER], function_code,
+                                                chunk_address, chunk_count))
+                except (KeyError, ValueError, TypeError) as e:
+                    self._log.error('Invalid address configuration for tag %s, it will not be read: %s',
+                                    tag_config.get(TAG_PARAMETER), e)
+
+        return ranges
+
+    def __plan(self) -> Tuple[ReadBlock, ...]:
+        blocks = []
+        current_block = None
+
+        # Sorting is stable, so ranges with the same address keep the order from the configuration
+        for tag_range in sorted(self.__ranges, key=lambda item: (str(item.function_code), item.address)):
+            if (current_block is not None
+                    and not tag_range.isolated
+                    and not current_block.ranges[-1].isolated
+                    and tag_range.function_code == current_block.function_code
+                    and tag_range.address <= current_block.address + current_block.count + self.__gap_tolerance
+                    and tag_range.end - current_block.address <= self.get_max_objects_per_read(
+                        tag_range.function_code)):
+                current_block.count = max(current_block.count, tag_range.end - current_block.address)
+                current_block.ranges.append(tag_range)
+            else:
+                current_block = ReadBlock(tag_range.function_code, tag_range.address, tag_range.count, [tag_range])
+                blocks.append(current_block)
+
+        return tuple(blocks)
@@ -0,0 +1,302 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from functools import lru_cache
+from logging import getLogger
+from struct import Struct
+
+from thingsboard_gateway.connectors.modbus.constants import REQUIRED_KEYS_FOR_WIDE_RANGE_TAG_NAME
+from thingsboard_gateway.connectors.modbus.utils import Utils
+from thingsboard_gateway.tb_utility.expression_template import ExpressionTemplate
+
+# Type name: (struct format character, size in bytes, is decoded through the words order)
+NUMERIC_TYPES = {
+    '8int': ('b', 1, False),
+    '8uint': ('B', 1, False),
+    '16int': ('h', 2, False),
+    '16uint': ('H', 2, False),
+    '16float': ('e', 2, True),
+    '32int': ('i', 4, True),
+    '32uint': ('I', 4, True),
+    '32float': ('f', 4, True),
+    '64int': ('q', 8, True),
+    '64uint': ('Q', 8, True),
+    '64float': ('d', 8, True),
+}
+SIZED_TYPES = {
+    'int': 'int',
+    'long': 'int',
+    'integer': 'int',
+    'double': 'float',
+    'float': 'float',
+    'uint': 'uint',
+}
+BITS_TYPES = ('bit', 'bits')
+BYTES_TYPES = ('string', 'bytes')
+
+
+@lru_cache(maxsize=256)
+def get_registers_struct(registers_count: int) -> Struct:
+    return Struct('>%iH' % registers_count)
+
+
+def is_little_endian(order) -> bool:
+    return order == '<' or str(getattr(order, 'name', order)).upper() == 'LITTLE'
+
+
+def coils_to_bytes(coils) -> bytes:
+    """Packs the coils to bytes, the first coil of every 8 is the most significant bit of the byte."""
+
+    if padding := len(coils) % 8:
+        coils = [False] * padding + list(coils)
+
+    payload = bytearray()
+    for chunk_start in range(0, len(coils), 8):
+        byte = 0
+        for bit_index, bit in enumerate(reversed(coils[chunk_start:chunk_start + 8])):
+            if bit:
+                byte |= 1 << bit_index
+        payload.append(byte)
+
+    return bytes(payload)
+
+
+def byte_to_bits(payload: bytes, index: int) -> list:
+    if index >= len(payload):
+        return []
+
+    byte = payload[index]
+    return [bool(byte & (1 << bit_index)) for bit_index in range(8)]
+
+
+class RegisterDecoder:
+    """
+    Decoder of a single tag, compiled once from the tag configuration: the value type is resolved to
+    a struct format with the byte order and the words order applied, the divider or multiplier and the
+    key names of the wide range tags are prepared.
+    Decoded values are the same as from the pymodbus BinaryPayloadDecoder for the same configuration.
+    """
+
+    __slots__ = ('_log', 'config', 'function_code', 'objects_count', 'lower_type', 'start_address', '__kind', '__struct',
+                 '__size', '__reverse_words', '__round', '__scale', '__scale_is_divider', '__variants',
+                 '__key_name_template', '__key_name_info', '__key_names')
+
+    def __init__(self, config: dict, byte_order, word_order, unit_id=None, logger=None):
+        self._log = logger if logger is not None else getLogger('converter')
+        self.config = config
+        self.function_code = config['functionCode']
+        self.objects_count = config.get("objectsCount",
+                                        config.get("registersCount", config.get("registerCount", 1)))
+        self.lower_type = config["type"].lower()
+
+        byte_order_is_little = is_little_endian(byte_order)
+        # Decoder from coils always uses the big endian words order
+        word_order_is_little = is_little_endian(word_order) if self.function_code in (3, 4) else False
+
+        self.__kind = None
+        self.__struct = None
+        self.__size = 0
+        self.__reverse_words = False
+        self.__round = config.get('round', 6)
+        self.__variants = config['variants'] if 'variants' in config else None
+
+        type_name = self.lower_type
+        if type_name in SIZED_TYPES:
+            type_name = str(self.objects_count * 16) + SIZED_TYPES[type_name]
+
+        if self.lower_type in BITS_TYPES or self.lower_type in BYTES_TYPES:
+            self.__kind = self.lower_type
+            self.__size = self.objects_count * 2
+        elif self.lower_type in SIZED_TYPES and type_name not in NUMERIC_TYPES:
+            self.__kind = 'unsupported'
+        elif type_name in NUMERIC_TYPES:
+            struct_format, self.__size, words_ordered = NUMERIC_TYPES[type_name]
+            self.__kind = 'float' if struct_format in 'efd' else 'int'
+            self.__struct = Struct(('<' if byte_order_is_little else '>') + struct_format)
+            # Swapping the bytes in every word and reversing the words order gives the little endian number,
+            # so the words have to be reversed only if the byte order differs from the words order
+            self.__reverse_words = words_ordered and byte_order_is_little != word_order_is_little
+
+        self.__scale = None
+        self.__scale_is_divider = False
+        if self.function_code in (3, 4):
+            if config.get('divider'):
+                self.__scale = float(config['divider'])
+                self.__scale_is_divider = True
+            elif config.get('multiplier'):
+                self.__scale = config['multiplier']
+
+        self.start_address = None
+        self.__key_name_template = None
+        self.__key_name_info = None
+        self.__key_names = {}
+        if Utils.is_wide_range_request(config.get('address')):
+            self.start_address = Utils.get_start_address(config['address'])
+            key_name = config['tag']
+            for required_key in REQUIRED_KEYS_FOR_WIDE_RANGE_TAG_NAME:
+                if required_key not in key_name:
+                    self._log.warning("Tag name '%s' does not contain required key '%s'. "
+                                      "Appending it to the key name.", key_name, required_key)
+                    key_name += f"_${{{required_key}}}"
+            self.__key_name_template = ExpressionTemplate.compile(key_name)
+            self.__key_name_info = {
+                'unitId': unit_id,
+                'address': config['address'],
+                'functionCode': self.function_code,
+                'type': config['type'],
+                'objectsCount': config.get('objectsCount', 1),
+            }
+
+    def get_key_name(self, address=None) -> str:
+        if self.__key_name_template is None or address is None:
+            return self.config['tag']
+
+        key_name = self.__key_names.get(address)
+        if key_name is None:
+            self.__key_name_info['address'] = address
+            key_name = self.__key_name_template.render(self.__key_name_info, expression_instead_none=True)
+            self.__key_names[address] = key_name
+
+        return key_name
+
+    def decode(self, encoded_data):
+        """Decodes the value from the registers or coils, the same as BytesModbusUplinkConverter.decode_data."""
+
+        if self.function_code in (1, 2):
+            decoded = self.__decode_payload(coils_to_bytes(encoded_data))
+        elif self.function_code in (3, 4):
+            if self.__struct is not None:
+                decoded = self.__decode_registers(encoded_data)
+            else:
+                decoded = self.__decode_payload(get_registers_struct(len(encoded_data)).pack(*encoded_data))
+        else:
+            return self.__process_enum_value(None)
+
+        if self.__scale is not None:
+            decoded = self.__apply_scale(decoded)
+
+        return self.__process_enum_value(decoded)
+
+    def decode_block(self, registers) -> list:
+        """
+        Decodes the values of the wide range tag, every value takes objects count of registers.
+        Numeric values, that take the whole objects count, are decoded by a single unpack call.
+        """
+
+        step = self.objects_count if self.objects_count > 0 else 1
+
+        if (self.function_code in (3, 4) and self.__struct is not None and self.__size == step * 2
+                and self.__variants is None and len(registers) >= step):
+            values_count = len(registers) // step
+            used_registers = registers[:values_count * step]
+            if self.__reverse_words:
+                used_registers = [register
+                                  for value_start in range(0, len(used_registers), step)
+                                  for register in reversed(used_registers[value_start:value_start + step])]
+            payload = get_registers_struct(len(used_registers)).pack(*used_registers)
+            decoded_values = [values[0] for values in self.__struct.iter_unpack(payload)]
+
+            if self.__kind == 'float':
+                decoded_values = [float(round(value, self.__round)) for value in decoded_values]
+            if self.__scale is not None:
+                decoded_values = [self.__apply_scale(value) for value in decoded_values]
+
+            if len(registers) > len(used_registers):
+                # Not enough registers for the last value
+                decoded_values.append(None)
+
+            return decoded_values
+
+        decoded_values = []
+        for value_start in range(0, len(registers), step):
+            value_registers = registers[value_start:value_start + step]
+            if self.function_code in (3, 4) and len(value_registers) * 2 < self.__size and self.__struct is not None:
+                decoded_values.append(None)
+            else:
+                decoded_values.append(self.decode(value_registers))
+
+        return decoded_values
+
+    def __decode_registers(self, registers):
+        words_count = (self.__size + 1) // 2
+        if len(registers) < words_count:
+            raise ValueError('Not enough registers to decode %s: %i' % (self.lower_type, len(registers)))
+
+        registers = registers[:words_count]
+        if self.__reverse_words:
+            registers = registers[::-1]
+        decoded = self.__struct.unpack_from(get_registers_struct(words_count).pack(*registers))[0]
+
+        if self.__kind == 'float':
+            return float(round(decoded, self.__round))
+        return decoded
+
+    def __decode_payload(self, payload: bytes):
+        kind = self.__kind
+
+        if kind == 'int' or kind == 'float':
+            if len(payload) < self.__size:
+                raise ValueError('Not enough data to decode %s: %i bytes' % (self.lower_type, len(payload)))
+            handle = payload[:self.__size]
+            if self.__reverse_words:
+                handle = b''.join(handle[word_start:word_start + 2]
+                                  for word_start in range(self.__size - 2, -1, -2))
+            decoded = self.__struct.unpack(handle)[0]
+            if kind == 'float':
+                return float(round(decoded, self.__round))
+            return decoded
+
+        if kind in BITS_TYPES:
+            decoded = byte_to_bits(payload, 0) + byte_to_bits(payload, 1)
+            decoded = decoded[len(decoded) - self.objects_count:]
+            if self.config.get('bit') is not None:
+                return int(decoded[self.config['bit'] if self.config['bit'] < len(decoded) else len(decoded) - 1])
+
+            bit_as_boolean = self.config.get('bitTargetType', 'bool') == 'bool'
+            if self.objects_count == 1:
+                return bool(decoded[-1]) if bit_as_boolean else int(decoded[-1])
+            return [bool(bit) if bit_as_boolean else int(bit) for bit in decoded]
+
+        if kind == 'string':
+            decoded = payload[:self.__size]
+            try:
+                return decoded.decode('UTF-8')
+            except UnicodeDecodeError as e:
+                self._log.error("Error decoding string from bytes, will be saved as hex: %s", decoded, exc_info=e)
+                return decoded.hex()
+
+        if kind == 'bytes':
+            return payload[:self.__size].hex()
+
+        if kind == 'unsupported':
+            raise ValueError('Unsupported objects count %s for type %s' % (self.objects_count, self.lower_type))
+
+        self._log.error("Unknown type: %s", self.lower_type)
+        return None
+
+    def __apply_scale(self, decoded):
+        if self.__scale_is_divider:
+            return float(decoded) / self.__scale
+
+        return decoded * self.__scale
+
+    def __process_enum_value(self, decoded):
+        if self.__variants is None:
+            return decoded
+
+        try:
+            return self.__variants.get(str(decoded), decoded)
+        except Exception as e:
+            self._log.exception(e)
+            return decoded
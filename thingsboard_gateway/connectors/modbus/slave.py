@@ -41,10 +41,16 @@ from thingsboard_gateway.connectors.modbus.constants import (
     WAIT_AFTER_FAILED_ATTEMPTS_MS_PARAMETER,
     WORD_ORDER_PARAMETER,
     DELAY_BETWEEN_REQUESTS_MS_PARAMETER,
-    TAG_PARAMETER
+    TAG_PARAMETER,
+    READ_GAP_TOLERANCE_PARAMETER,
+    MAX_OBJECTS_PER_READ_PARAMETER,
+    PIPELINE_REQUESTS_PARAMETER,
+    MAX_INFLIGHT_REQUESTS_PARAMETER
 )
 from thingsboard_gateway.connectors.modbus.entities.bytes_uplink_converter_config import BytesUplinkConverterConfig
+from thingsboard_gateway.connectors.modbus.entities.pipelined_tcp_client import DEFAULT_MAX_INFLIGHT_REQUESTS
 from thingsboard_gateway.connectors.modbus.modbus_converter import ModbusConverter
+from thingsboard_gateway.connectors.modbus.read_planner import ModbusReadPlanner
 from thingsboard_gateway.gateway.constants import (
     DEVICE_NAME_PARAMETER,
     DEVICE_TYPE_PARAMETER,
@@ -94,6 +100,12 @@ class Slave:
         self.word_order = config.get(WORD_ORDER_PARAMETER, 'LITTLE').upper()
         self.byte_order = config.get(BYTE_ORDER_PARAMETER, 'LITTLE').upper()
         self.handle_local_echo = config.get('handleLocalEcho', False)
+        self.pipeline_requests = config.get(PIPELINE_REQUESTS_PARAMETER, False)
+        self.max_inflight_requests = config.get(MAX_INFLIGHT_REQUESTS_PARAMETER, DEFAULT_MAX_INFLIGHT_REQUESTS)
+        if self.pipeline_requests and (self.type != 'tcp' or self.tls or self.method != 'SOCKET'):
+            self._log.warning('Requests pipelining is supported only for TCP connection with socket method '
+                              'and without TLS, it will be disabled for %s', self.name)
+            self.pipeline_requests = False
 
         self.attributes_updates_config = config.get('attributeUpdates', [])
         self.rpc_requests_config = config.get(RPC_SECTION, [])
@@ -121,6 +133,10 @@ class Slave:
 
         self.uplink_converter_config = BytesUplinkConverterConfig(**config)
         self.uplink_converter = self.__load_uplink_converter(config)
+        self.read_planner = ModbusReadPlanner(self.uplink_converter_config,
+                                              gap_tolerance=config.get(READ_GAP_TOLERANCE_PARAMETER, 0),
+                                              max_objects_per_read=config.get(MAX_OBJECTS_PER_READ_PARAMETER),
+                                              logger=self._log)
 
         self.__master: 'Master' = None
         self.available_functions = None
@@ -138,7 +154,7 @@ class Slave:
                 current_time = monotonic()
                 if current_time >= next_poll_time:
                     self.__send_callback(current_time)
-                    next_poll_time = current_time + self.poll_period
+                    next_poll_time = current_time + self.poll_period * self.connector.get_poll_period_multiplier()
 
                 sleep_time = max(0.0, next_poll_time - monotonic())
                 await asyncio.sleep(sleep_time)
@@ -75,6 +75,11 @@ class Utils:
 
         return not isinstance(encoded_data, ModbusIOException) and not isinstance(encoded_data, ExceptionResponse)
 
+    @staticmethod
+    def is_illegal_address_response(encoded_data):
+        return (isinstance(encoded_data, ExceptionResponse)
+                and encoded_data.exception_code == ExceptionResponse.ILLEGAL_ADDRESS)
+
     @staticmethod
     def get_registers_from_encoded_data(encoded_data, function_code):
         if function_code in (1, 2):
@@ -24,6 +24,7 @@ from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.tb_utility.expression_template import ExpressionTemplate
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 from thingsboard_gateway.connectors.mqtt.utils import Utils
@@ -95,21 +96,12 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
                             telemetry_entry = TelemetryEntry(data, timestamp)
                             converted_data.add_to_telemetry(telemetry_entry)
                     else:
-                        values = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                      expression_instead_none=False)
-                        values_tags = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                           get_tag=True)
-
                         if datatype_config.get("keySource", "message") == "topic":
                             full_key = Utils.get_value_from_topic(topic, datatype_config["key"])
                         else:
                             full_key = self._get_key_from_message(datatype_config["key"], datatype_config["type"], data)
 
-                        full_value = datatype_config["value"]
-                        for (value, value_tag) in zip(values, values_tags):
-                            is_valid_value = "${" in datatype_config["value"] and "}" in datatype_config["value"]
-                            full_value = full_value.replace('${' + str(value_tag) + '}',
-                                                            str(value)) if is_valid_value else value
+                        full_value = ExpressionTemplate.compile(datatype_config["value"]).render(data)
 
                         if full_key != 'None' and full_value != 'None':
                             converted_key = TBUtility.convert_key_to_datapoint_key(full_key,
@@ -141,16 +133,7 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
         return converted_data
 
     def _get_key_from_message(self, key_expression, key_type, data):
-        keys = TBUtility.get_values(key_expression, data, key_type,
-                                    expression_instead_none=False)
-        keys_tags = TBUtility.get_values(key_expression, data, get_tag=True)
-
-        full_key = key_expression
-        for (key, key_tag) in zip(keys, keys_tags):
-            is_valid_key = "${" in key_expression and "}" in key_expression
-            full_key = full_key.replace('${' + str(key_tag) + '}', str(key)) if is_valid_key else key_tag
-
-        return full_key
+        return ExpressionTemplate.compile(key_expression).render(data)
 
     @staticmethod
     def create_data_record(key, value, timestamp):
@@ -174,14 +157,7 @@ class JsonMqttUplinkConverter(MqttUplinkConverter):
 
         try:
             if device_info.get(expression_source) == 'message' or device_info.get(expression_source) == 'constant':
-                result_tags = TBUtility.get_values(expression, data, get_tag=True)
-                result_values = TBUtility.get_values(expression, data, expression_instead_none=True)
-
-                result = expression
-                for (result_tag, result_value) in zip(result_tags, result_values):
-                    is_valid_key = "${" in expression and "}" in expression
-                    result = result.replace('${' + str(result_tag) + '}',
-                                            str(result_value)) if is_valid_key else result_tag
+                result = ExpressionTemplate.compile(expression).render(data, expression_instead_none=True)
             elif device_info.get(expression_source) == 'topic':
                 result = Utils.get_value_from_topic(topic, expression)
                 if result is None:
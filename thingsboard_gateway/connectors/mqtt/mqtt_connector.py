@@ -16,7 +16,6 @@ import random
 import socket
 import ssl
 import string
-from queue import Queue, Empty
 from re import fullmatch, match, search
 from threading import Thread, Event
 from time import sleep, time
@@ -29,9 +28,11 @@ from thingsboard_gateway.connectors.mqtt.backward_compatibility_adapter import B
 from thingsboard_gateway.gateway.constant_enums import Status
 from thingsboard_gateway.connectors.connector import Connector
 from thingsboard_gateway.connectors.mqtt.mqtt_decorators import CustomCollectStatistics
+from thingsboard_gateway.connectors.mqtt.topic_router import TopicRouter
 from thingsboard_gateway.gateway.constants import DATA_RETRIEVING_STARTED, CONVERTED_TS_PARAMETER, RPC_DEFAULT_TIMEOUT
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.statistics.decorators import CollectAllReceivedBytesStatistics
+from thingsboard_gateway.tb_utility.batching_queue import BatchingQueue
 from thingsboard_gateway.tb_utility.tb_loader import TBModuleLoader
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
@@ -190,10 +191,10 @@ class MqttConnector(Connector, Thread):
         self.load_handlers('attributeUpdates', mandatory_keys['attributeUpdates'], self.__attribute_updates)
 
         # Setup topic substitution lists for each class of handlers ----------------------------------------------------
-        self.__mapping_sub_topics = {}
-        self.__connect_requests_sub_topics = {}
-        self.__disconnect_requests_sub_topics = {}
-        self.__attribute_requests_sub_topics = {}
+        self.__mapping_sub_topics = TopicRouter()
+        self.__connect_requests_sub_topics = TopicRouter()
+        self.__disconnect_requests_sub_topics = TopicRouter()
+        self.__attribute_requests_sub_topics = TopicRouter()
 
         # Set up external MQTT broker connection -----------------------------------------------------------------------
         client_id = self.__broker.get("clientId", ''.join(random.choice(string.ascii_lowercase) for _ in range(23)))
@@ -259,12 +260,12 @@ class MqttConnector(Connector, Thread):
         self._client.on_disconnect = self._on_disconnect
         # self._client.on_log = self._on_log
 
-        self.__msg_queue = Queue(self.__broker.get('maxMessageQueue', 1000000000))
+        self.__msg_queue = BatchingQueue(self.__broker.get('maxMessageQueue', 1000000000))
         self.__workers_thread_pool = []
         self.__max_msg_number_for_worker = self.__broker.get('maxMessageNumberPerWorker', 10)
         self.__max_number_of_workers = self.__broker.get('maxNumberOfWorkers', 100)
 
-        self._on_message_queue = Queue(self.__broker.get('maxProcessingMessageQueue', 1000000000))
+        self._on_message_queue = BatchingQueue(self.__broker.get('maxProcessingMessageQueue', 1000000000))
         self._on_message_thread = Thread(name='On Message', target=self._process_on_message, daemon=True)
         self._on_message_thread.start()
 
@@ -416,7 +417,7 @@ class MqttConnector(Connector, Thread):
                              str(flags),
                              extra_params)
 
-            self.__mapping_sub_topics = {}
+            self.__mapping_sub_topics.clear()
 
             # Setup data upload requests handling ----------------------------------------------------------------------
             for mapping in self.__mapping:
@@ -465,14 +466,9 @@ class MqttConnector(Connector, Thread):
                         self.__log.debug('Converter %s for topic %s - found in cache!', converter_class_name,
                                          mapping["topicFilter"])
 
-                    # Setup regexp topic acceptance list ---------------------------------------------------------------
-                    # Check if topic is shared subscription type
-                    # (an exception is aws topics that do not support shared subscription)
-                    regex_topic = mapping["topicFilter"]
-                    if not regex_topic.startswith('$aws') and regex_topic.startswith('$'):
-                        regex_topic = '/'.join(regex_topic.split('/')[2:])
-                    else:
-                        regex_topic = TBUtility.topic_to_regex(regex_topic)
+                    # Setup topic acceptance list ----------------------------------------------------------------------
+                    # Shared subscription prefixes are stripped by the topic router
+                    regex_topic = TBUtility.topic_to_regex(mapping["topicFilter"])
 
                     # There may be more than one converter per topic, so I'm using vectors
                     if not self.__mapping_sub_topics.get(regex_topic):
@@ -548,7 +544,7 @@ class MqttConnector(Connector, Thread):
 
     def _save_converted_msg(self, topic, data):
         data.add_to_metadata({DATA_RETRIEVING_STARTED: int(time() * 1000)})
-        if self.__gateway.send_to_storage(self.name, self.get_id(), data) == Status.SUCCESS:
+        if self.__gateway.send_to_storage(self.name, self.get_id(), data) in (Status.SUCCESS, Status.BACKPRESSURE):
             StatisticsService.count_connector_message(self.name, stat_parameter_name='storageMsgPushed')
             self.statistics['MessagesSent'] += 1
             self.__log.debug("Successfully converted message from topic %s", topic)
@@ -618,14 +614,12 @@ class MqttConnector(Connector, Thread):
 
     def _process_on_message(self):
         while not self.__stopped:
-            if not self._on_message_queue.empty():
-                client, userdata, message = self._on_message_queue.get_nowait()
-
+            for client, userdata, message in self._on_message_queue.get_batch(100, 1):
                 self.statistics['MessagesReceived'] += 1
                 content = None
 
                 # Check if message topic exists in mappings "i.e., I'm posting telemetry/attributes" -------------------
-                topic_handlers = [regex for regex in self.__mapping_sub_topics if fullmatch(regex, message.topic)]
+                topic_handlers = self.__mapping_sub_topics.match(message.topic)
 
                 if topic_handlers:
                     # Note: every topic may be associated to one or more converter.
@@ -695,8 +689,6 @@ class MqttConnector(Connector, Thread):
                 self.__log.debug("Received message to topic \"%s\" with unknown interpreter data: \n\n\"%s\"",
                                  message.topic,
                                  content)
-            else:
-                sleep(.2)
 
     def __process_connect(self, message, content):
         topic_handlers = self.__match_handlers(self.__connect_requests_sub_topics, message.topic)
@@ -827,6 +819,8 @@ class MqttConnector(Connector, Thread):
 
     @staticmethod
     def __match_handlers(sub_topics_dict, topic):
+        if isinstance(sub_topics_dict, TopicRouter):
+            return sub_topics_dict.match(topic)
         return [regex for regex in sub_topics_dict if fullmatch(regex, topic)]
 
     @staticmethod
@@ -1101,23 +1095,11 @@ class MqttConnector(Connector, Thread):
             self.__msg_queue = incoming_queue
             self.__send_result = send_result
             self.__batch_size = batch_size
-            self.__stop_event = Event()
 
         def run(self):
             while not self.stopped:
                 try:
-                    batch = []
-                    for _ in range(self.__batch_size):
-                        try:
-                            batch.append(self.__msg_queue.get_nowait())
-                        except Empty:
-                            break
-
-                    if not batch:
-                        self.__stop_event.wait(0.01)
-                        continue
-
-                    for convert_function, config, incoming_data in batch:
+                    for convert_function, config, incoming_data in self.__msg_queue.get_batch(self.__batch_size, 1):
                         converted_data: Union[ConvertedData, List[ConvertedData]] = convert_function(config,
                                                                                                      incoming_data)
                         if isinstance(converted_data, ConvertedData):
@@ -1137,4 +1119,3 @@ class MqttConnector(Connector, Thread):
 
         def stop(self):
             self.stopped = True
-            self.__stop_event.set()
@@ -1,9 +1,13 @@
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 
 
 class CustomCollectStatistics(CollectStatistics):
     def __call__(self, func):
         def inner(*args, **kwargs):
+            if not StatisticsService.ENABLED:
+                return func(*args, **kwargs)
+
             try:
                 _, __, data, ___ = args
                 self.collect(self.start_stat_type, data)
@@ -0,0 +1,127 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from threading import Lock
+from typing import List
+
+from cachetools import LRUCache
+
+from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+SHARED_SUBSCRIPTION_PREFIX = '$share/'
+QUEUE_SUBSCRIPTION_PREFIX = '$queue/'
+
+
+class _TopicTrieNode:
+    __slots__ = ('children', 'keys', 'multi_level_keys')
+
+    def __init__(self):
+        self.children = {}
+        # keys of the topic filters, that end on this node
+        self.keys = []
+        # keys of the topic filters, that end with "#" right after this node
+        self.multi_level_keys = []
+
+
+class TopicRouter(dict):
+    """
+    Dictionary of the handlers by topic filter regex (the same keys, that are produced by TBUtility.topic_to_regex),
+    that finds the keys of the topic filters matching the topic in O(topic depth) using a trie of the topic levels.
+    Supports "+" and "#" wildcards, "$share/<group>/" and "$queue/" prefixes of the shared subscriptions,
+    wildcards follow the MQTT specification: "a/#" also matches "a", and topics starting with "$" are not matched
+    by the wildcards on the first level. Results are cached for the recently received topics.
+    Keys should be added with the item assignment, other ways of the dictionary modification are not supported.
+    """
+
+    def __init__(self, cache_size=10000):
+        super().__init__()
+        self.__root = _TopicTrieNode()
+        self.__keys_order = {}
+        self.__cache = LRUCache(maxsize=cache_size)
+        self.__lock = Lock()
+
+    def __setitem__(self, key, value):
+        with self.__lock:
+            if key not in self:
+                self.__keys_order[key] = len(self.__keys_order)
+                self.__add_to_trie(key)
+                self.__cache.clear()
+            super().__setitem__(key, value)
+
+    def clear(self):
+        with self.__lock:
+            super().clear()
+            self.__root = _TopicTrieNode()
+            self.__keys_order.clear()
+            self.__cache.clear()
+
+    def match(self, topic: str) -> List[str]:
+        """Returns the keys of the topic filters, that match the topic, in the order the keys were added."""
+        with self.__lock:
+            matched_keys = self.__cache.get(topic)
+            if matched_keys is None:
+                matched_keys = self.__match(topic)
+                self.__cache[topic] = matched_keys
+        return list(matched_keys)
+
+    @staticmethod
+    def get_topic_filter_levels(topic_filter: str) -> List[str]:
+        if topic_filter.startswith(SHARED_SUBSCRIPTION_PREFIX):
+            topic_filter = topic_filter.split('/', 2)[2] if topic_filter.count('/') >= 2 else ''
+        elif topic_filter.startswith(QUEUE_SUBSCRIPTION_PREFIX):
+            topic_filter = topic_filter[len(QUEUE_SUBSCRIPTION_PREFIX):]
+        return topic_filter.split('/')
+
+    def __add_to_trie(self, key):
+        node = self.__root
+        for level in self.get_topic_filter_levels(TBUtility.regex_to_topic(key)):
+            if level == '#':
+                node.multi_level_keys.append(key)
+                return
+            child = node.children.get(level)
+            if child is None:
+                child = _TopicTrieNode()
+                node.children[level] = child
+            node = child
+        node.keys.append(key)
+
+    def __match(self, topic: str) -> tuple:
+        levels = topic.split('/')
+        levels_count = len(levels)
+        is_system_topic = topic.startswith('$')
+        matched_keys = []
+        root = self.__root
+        nodes_to_check = [(root, 0)]
+        while nodes_to_check:
+            node, level_index = nodes_to_check.pop()
+            if node.multi_level_keys and not (node is root and is_system_topic):
+                matched_keys.extend(node.multi_level_keys)
+            if level_index == levels_count:
+                matched_keys.extend(node.keys)
+                continue
+            children = node.children
+            if children:
+                child = children.get(levels[level_index])
+                if child is not None:
+                    nodes_to_check.append((child, level_index + 1))
+                # Topics, that start with "$", are not matched by the wildcards on the first level
+                if node is root and is_system_topic:
+                    continue
+                single_level_wildcard_child = children.get('+')
+                if single_level_wildcard_child is not None:
+                    nodes_to_check.append((single_level_wildcard_child, level_index + 1))
+        if len(matched_keys) > 1:
+            keys_order = self.__keys_order
+            matched_keys = sorted(set(matched_keys), key=keys_order.__getitem__)
+        return tuple(matched_keys)
@@ -38,7 +38,7 @@ except ImportError:
     TBUtility.install_package("pyodbc")
     import pyodbc
 
-from thingsboard_gateway.connectors.odbc.odbc_uplink_converter import OdbcUplinkConverter
+from thingsboard_gateway.connectors.odbc.odbc_uplink_converter import OdbcExpression, OdbcUplinkConverter
 
 from thingsboard_gateway.connectors.connector import Connector
 
@@ -51,6 +51,7 @@ class OdbcConnector(Connector, Thread):
     DEFAULT_ENABLE_UNKNOWN_RPC = False
     DEFAULT_OVERRIDE_RPC_PARAMS = False
     DEFAULT_PROCESS_RPC_RESULT = False
+    DEFAULT_BATCH_SIZE = 1000
 
     def __init__(self, gateway, config, connector_type):
         super().__init__()
@@ -86,9 +87,14 @@ class OdbcConnector(Connector, Thread):
         self.__attribute_columns = []
         self.__timeseries_columns = []
 
-        self.__converter = OdbcUplinkConverter(self._converter_log) if not self.__config.get("converter", "") else \
+        self.__converter = OdbcUplinkConverter(self._converter_log, self.__config["mapping"]) \
+            if not self.__config.get("converter", "") else \
             TBModuleLoader.import_module(self._connector_type, self.__config["converter"])
 
+        self.__batch_size = max(int(self.__config["polling"].get("batchSize", self.DEFAULT_BATCH_SIZE)), 1)
+        self.__device_name_expression = OdbcExpression(self.__config["mapping"]["device"]["name"])
+        self.__device_type_expression = OdbcExpression(self.__config["mapping"]["device"]["type"])
+
         self.__configure_pyodbc()
         self.__parse_rpc_config()
 
@@ -320,7 +326,7 @@ class OdbcConnector(Connector, Thread):
                 self.__rpc_cursor = None
 
     def __poll(self):
-        rows = self.__cursor.execute(self.__config["polling"]["query"], self.__iterator["value"])
+        self.__cursor.execute(self.__config["polling"]["query"], self.__iterator["value"])
 
         if not self.__column_names:
             for column in self.__cursor.description:
@@ -329,45 +335,64 @@ class OdbcConnector(Connector, Thread):
 
         # For some reason pyodbc.Cursor.rowcount may be 0 (sqlite) so use our own row counter
         row_count = 0
-        for row in rows:
-            self._log.debug("[%s] Fetch row: %s", self.get_name(), row)
-            StatisticsService.count_connector_message(self.name, stat_parameter_name='connectorMsgsReceived')
-            StatisticsService.count_connector_bytes(self.name, row,
-                                                    stat_parameter_name='connectorBytesReceived')
+        while not self.__stopped:
+            rows = self.__cursor.fetchmany(self.__batch_size)
+            if not rows:
+                break
 
-            self.__process_row(row)
-            row_count += 1
+            self._log.debug("[%s] Fetched %d row(s)", self.get_name(), len(rows))
+            StatisticsService.count_connector_message(self.name, stat_parameter_name='connectorMsgsReceived',
+                                                      count=len(rows))
+            StatisticsService.count_connector_bytes(self.name, rows, stat_parameter_name='connectorBytesReceived')
+
+            self.__process_rows(rows)
+            row_count += len(rows)
+            self.__iterator["total"] += len(rows)
+
+            # The iterator is saved after every batch, so the sent rows are not read again after restart
+            if self.__config["polling"]["iterator"]["persistent"]:
+                self.__save_iterator_config()
 
-        self.__iterator["total"] += row_count
         self._log.info("[%s] Polling iteration finished. Processed rows: current %d, total %d",
                        self.get_name(), row_count, self.__iterator["total"])
 
-        if self.__config["polling"]["iterator"]["persistent"] and row_count > 0:
-            self.__save_iterator_config()
+    def __process_rows(self, rows):
+        """Converts the batch of rows, the data of every device is merged and sent once."""
 
-    def __process_row(self, row):
-        try:
-            data = self.row_to_dict(row)
+        converted_data_by_device = {}
+        for row in rows:
+            try:
+                data = dict(zip(self.__column_names, row))
 
-            converted_data: ConvertedData = self.__converter.convert(self.__config["mapping"], data)
+                converted_data: ConvertedData = self.__converter.convert(self.__config["mapping"], data)
 
-            StatisticsService.count_connector_message(self._log.name, 'convertersAttrProduced',
-                                                      count=converted_data.attributes_datapoints_count)
-            StatisticsService.count_connector_message(self._log.name, 'convertersTsProduced',
-                                                      count=converted_data.telemetry_datapoints_count)
+                StatisticsService.count_connector_message(self._log.name, 'convertersAttrProduced',
+                                                          count=converted_data.attributes_datapoints_count)
+                StatisticsService.count_connector_message(self._log.name, 'convertersTsProduced',
+                                                          count=converted_data.telemetry_datapoints_count)
 
-            converted_data.device_name = eval(self.__config["mapping"]["device"]["name"], globals(), data)
+                device_name = self.__device_name_expression.evaluate(data)
 
-            device_type = eval(self.__config["mapping"]["device"]["type"], globals(), data)
-            if not device_type:
-                device_type = self.__config["mapping"]["device"].get("type", "default")
-            converted_data.device_type = device_type
+                device_type = self.__device_type_expression.evaluate(data)
+                if not device_type:
+                    device_type = self.__config["mapping"]["device"].get("type", "default")
 
-            if converted_data.telemetry_datapoints_count + converted_data.attributes_datapoints_count > 0:
-                self.__iterator["value"] = getattr(row, self.__iterator["name"])
-                self.__check_and_send(converted_data)
-        except Exception as e:
-            self._log.warning("[%s] Failed to process database row: %s", self.get_name(), str(e))
+                if converted_data.telemetry_datapoints_count + converted_data.attributes_datapoints_count > 0:
+                    self.__iterator["value"] = data[self.__iterator["name"]]
+
+                    device_converted_data = converted_data_by_device.get(device_name)
+                    if device_converted_data is None:
+                        converted_data.device_name = device_name
+                        converted_data.device_type = device_type
+                        converted_data_by_device[device_name] = converted_data
+                    else:
+                        device_converted_data.add_to_attributes(converted_data.attributes)
+                        device_converted_data.add_to_telemetry(converted_data.telemetry)
+            except Exception as e:
+                self._log.warning("[%s] Failed to process database row: %s", self.get_name(), str(e))
+
+        for converted_data in converted_data_by_device.values():
+            self.__check_and_send(converted_data)
 
     @staticmethod
     def row_to_dict(row):
@@ -12,22 +12,104 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+from keyword import iskeyword
+
 from thingsboard_gateway.connectors.odbc.odbc_converter import OdbcConverter
-from thingsboard_gateway.gateway.constants import TIMESERIES_PARAMETER, ATTRIBUTES_PARAMETER
+from thingsboard_gateway.gateway.constants import TIMESERIES_PARAMETER, ATTRIBUTES_PARAMETER, REPORT_STRATEGY_PARAMETER
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
-from thingsboard_gateway.tb_utility.tb_utility import TBUtility
+
+
+class OdbcExpression:
+    """
+    Python expression from the configuration, compiled once to the code object.
+    The expression, that is a plain column name, is read from the row without evaluation.
+    """
+
+    __slots__ = ('source', 'column', '__code')
+
+    def __init__(self, source: str):
+        self.source = source
+        source = source.strip()
+        self.column = source if source.isidentifier() and not iskeyword(source) else None
+        self.__code = compile(source, '<ODBC expression>', 'eval')
+
+    def evaluate(self, data: dict):
+        if self.column is not None and self.column in data:
+            return data[self.column]
+
+        return eval(self.__code, globals(), data)
+
+
+class OdbcConversionPlan:
+    """Mapping configuration, prepared once: report strategies are parsed and expressions are compiled."""
+
+    def __init__(self, config: dict, logger):
+        self.device_report_strategy = None
+        try:
+            self.device_report_strategy = ReportStrategyConfig(config)
+        except ValueError as e:
+            logger.trace("Device report strategy configuration is not provided: %s", str(e))
+
+        # Every item is (datatype, all columns flag, column, value expression, key expression, datapoint key)
+        self.items = []
+        for datatype in OdbcUplinkConverter.DATATYPES:
+            for config_item in config.get(datatype, []):
+                if isinstance(config_item, str):
+                    self.items.append((datatype, True, None, None, None, None))
+                elif isinstance(config_item, dict):
+                    self.items.append((datatype, False, *self.__compile_item(config_item, logger)))
+                else:
+                    self.items.append((datatype, False, None, None, None, None))
+
+        self.__column_keys = {}
+
+    def __compile_item(self, config_item: dict, logger):
+        key_report_strategy = self.device_report_strategy
+        if config_item.get(REPORT_STRATEGY_PARAMETER) is not None:
+            try:
+                key_report_strategy = ReportStrategyConfig(config_item.get(REPORT_STRATEGY_PARAMETER))
+            except ValueError:
+                logger.trace("Report strategy config is not specified for key %s", config_item.get("name"))
+
+        key_expression = None
+        datapoint_key = None
+        if "nameExpression" in config_item:
+            key_expression = (OdbcExpression(config_item["nameExpression"]), key_report_strategy)
+        else:
+            datapoint_key = DatapointKey(config_item.get("name"), key_report_strategy)
+
+        value_expression = OdbcExpression(config_item["value"]) if "value" in config_item else None
+        return config_item.get("column"), value_expression, key_expression, datapoint_key
+
+    def get_column_key(self, column: str) -> DatapointKey:
+        datapoint_key = self.__column_keys.get(column)
+        if datapoint_key is None:
+            datapoint_key = self.__column_keys[column] = DatapointKey(column, self.device_report_strategy)
+
+        return datapoint_key
 
 
 class OdbcUplinkConverter(OdbcConverter):
 
     DATATYPES = (TIMESERIES_PARAMETER, ATTRIBUTES_PARAMETER)
 
-    def __init__(self, logger):
+    def __init__(self, logger, config=None):
         self._log = logger
+        self.__config = config
+        self.__plan = OdbcConversionPlan(config, logger) if isinstance(config, dict) else None
+
+    def get_conversion_plan(self, config: dict) -> OdbcConversionPlan:
+        """Returns the plan, built once for the mapping of the converter, or a new plan for another mapping."""
+
+        if self.__plan is not None and config is self.__config:
+            return self.__plan
+
+        return OdbcConversionPlan(config, self._log)
 
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
@@ -46,70 +128,44 @@ class OdbcUplinkConverter(OdbcConverter):
                 self._log.error("Failed to convert SQL data to TB format: no configuration provided")
                 return ConvertedData(None, None)
 
-        device_report_strategy = None
-        try:
-            device_report_strategy = ReportStrategyConfig(config if isinstance(config, dict) else None)
-        except ValueError as e:
-            self._log.trace("Device report strategy configuration is not provided: %s", str(e))
-
+        plan = self.get_conversion_plan(config)
         converted_data = ConvertedData(None, None)
-        for datatype in self.DATATYPES:
-            for config_item in config.get(datatype, []):
-                try:
-                    full_key = None
-                    value = None
-                    if isinstance(config_item, str):
-                        if isinstance(data, dict):
-                            for key, value in data.items():
-                                full_key = TBUtility.convert_key_to_datapoint_key(key, device_report_strategy, {}, self._log)
-                                if full_key:
-                                    if datatype == TIMESERIES_PARAMETER:
-                                        converted_data.add_to_telemetry(TelemetryEntry({full_key: value}, data.get('ts')))
-                                    elif datatype == ATTRIBUTES_PARAMETER:
-                                        converted_data.add_to_attributes(full_key, value)
-                            continue
-                        elif isinstance(data, list):
-                            for item in data:
-                                for key, value in item.items():
-                                    full_key = TBUtility.convert_key_to_datapoint_key(key, device_report_strategy, {}, self._log)
-                                    if full_key:
-                                        if datatype == TIMESERIES_PARAMETER:
-                                            converted_data.add_to_telemetry(TelemetryEntry({full_key: value}, item.get('ts')))
-                                        elif datatype == ATTRIBUTES_PARAMETER:
-                                            converted_data.add_to_attributes(full_key, value)
-                            continue
-                    elif isinstance(config_item, dict):
-                        if "nameExpression" in config_item:
-                            name = eval(config_item["nameExpression"], globals(), data)
-                        else:
-                            name = config_item["name"]
-                        full_key = TBUtility.convert_key_to_datapoint_key(name, device_report_strategy, config_item, self._log)
-
-                        if "column" in config_item:
-                            value = data[config_item["column"]]
-                        elif "value" in config_item:
-                            value = eval(config_item["value"], globals(), data)
-                        else:
-                            StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
-                            self._log.error("Failed to convert SQL data to TB format: no column/value configuration item")
-                            continue
-
-                    if not full_key:
-                        StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
-                        self._log.error("Failed to convert SQL data to TB format: no full key")
-                        continue
-
-                    if datatype == TIMESERIES_PARAMETER:
-                        converted_data.add_to_telemetry(TelemetryEntry({full_key: value}, data.get('ts')))
-                    elif datatype == ATTRIBUTES_PARAMETER:
-                        converted_data.add_to_attributes(full_key, value)
-
-                    else:
-                        StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
-                        self._log.error("Failed to convert SQL data to TB format: unexpected configuration type '%s'",
-                                  type(config_item))
-                except Exception as e:
+        for datatype, all_columns, column, value_expression, key_expression, datapoint_key in plan.items:
+            try:
+                if all_columns:
+                    for item in (data if isinstance(data, list) else [data]):
+                        for key, value in item.items():
+                            self.__add_datapoint(converted_data, datatype, plan.get_column_key(key), value,
+                                                 item.get('ts'))
+                    continue
+
+                if key_expression is not None:
+                    name_expression, key_report_strategy = key_expression
+                    datapoint_key = DatapointKey(name_expression.evaluate(data), key_report_strategy)
+                elif datapoint_key is None:
                     StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
-                    self._log.error("Failed to convert SQL data to TB format: %s", str(e))
+                    self._log.error("Failed to convert SQL data to TB format: unexpected configuration type")
+                    continue
+
+                if column is not None:
+                    value = data[column]
+                elif value_expression is not None:
+                    value = value_expression.evaluate(data)
+                else:
+                    StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
+                    self._log.error("Failed to convert SQL data to TB format: no column/value configuration item")
+                    continue
+
+                self.__add_datapoint(converted_data, datatype, datapoint_key, value, data.get('ts'))
+            except Exception as e:
+                StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
+                self._log.error("Failed to convert SQL data to TB format: %s", str(e))
 
         return converted_data
+
+    @staticmethod
+    def __add_datapoint(converted_data: ConvertedData, datatype, datapoint_key, value, ts):
+        if datatype == TIMESERIES_PARAMETER:
+            converted_data.add_to_telemetry(TelemetryEntry({datapoint_key: value}, ts))
+        else:
+            converted_data.add_to_attributes(datapoint_key, value)
@@ -0,0 +1,208 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Union
+
+from simplejson import dumps, load
+
+from asyncua import ua
+from asyncua.ua.uaerrors import BadServiceUnsupported
+
+DEFAULT_MAX_PATHS_PER_TRANSLATE = 100
+
+
+class BrowsePathCache:
+    """
+    Resolved browse paths of the configured nodes, saved to the file, so after the gateway restart the nodes
+    are found without browsing the server address space.
+    Every path is stored with the matched chains of nodes, the chain element is either the qualified name
+    or the qualified name with the NodeId of the node.
+    The cache belongs to the server URI and its namespace array, all paths are dropped, when any of them changes.
+    """
+
+    def __init__(self, file_path: str, logger):
+        self._log = logger
+        self.__file_path = Path(file_path)
+        self.__server_uri = None
+        self.__namespace_array = None
+        self.__paths: Dict[str, list] = {}
+        self.__changed = False
+
+    def __len__(self):
+        return len(self.__paths)
+
+    @staticmethod
+    def get_key(path: Union[str, List[str]]) -> str:
+        return path if isinstance(path, str) else '\\.'.join(path)
+
+    def load(self, server_uri: str, namespace_array: List[str]):
+        self.__server_uri = server_uri
+        self.__namespace_array = list(namespace_array)
+        self.__paths = {}
+        self.__changed = False
+
+        if not self.__file_path.exists():
+            return
+
+        try:
+            with self.__file_path.open('r') as cache_file:
+                cache = load(cache_file)
+        except Exception as e:
+            self._log.warning('Failed to load browse paths cache from %s: %s', self.__file_path, e)
+            return
+
+        if cache.get('serverUri') != server_uri or cache.get('namespaceArray') != self.__namespace_array:
+            self._log.info('Server URI or namespaces of the server have been changed, browse paths cache is dropped')
+            self.__changed = True
+            return
+
+        self.__paths = cache.get('paths', {})
+        self._log.info('Loaded %i browse paths from cache', len(self.__paths))
+
+    def save(self):
+        if not self.__changed or self.__server_uri is None:
+            return
+
+        try:
+            self.__file_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.__file_path.open('w') as cache_file:
+                cache_file.write(dumps({
+                    'serverUri': self.__server_uri,
+                    'namespaceArray': self.__namespace_array,
+                    'paths': self.__paths
+                }))
+            self.__changed = False
+            self._log.debug('Saved %i browse paths to %s', len(self.__paths), self.__file_path)
+        except Exception as e:
+            self._log.error('Failed to save browse paths cache to %s: %s', self.__file_path, e)
+
+    def get(self, path, get_node: Callable[[ua.NodeId], object]) -> Optional[list]:
+        """Returns the chains of nodes in the same form as the connector finds them or None if path is not cached."""
+
+        matches = self.__paths.get(self.get_key(path))
+        if matches is None:
+            return None
+
+        return [[element if isinstance(element, str)
+                 else {'path': element[0], 'node': get_node(ua.NodeId.from_string(element[1]))}
+                 for element in match]
+                for match in matches]
+
+    def put(self, path, matches: list):
+        try:
+            serialized_matches = [[element if isinstance(element, str)
+                                   else [element['path'], element['node'].nodeid.to_string()]
+                                   for element in match]
+                                  for match in matches]
+        except (KeyError, AttributeError, TypeError) as e:
+            self._log.debug('Browse path %s is not cached: %s', path, e)
+            return
+
+        # Only the chains, that can be translated from the root folder again, are cached
+        if serialized_matches and all(self.is_qualified_path([element if isinstance(element, str) else element[0]
+                                                              for element in match])
+                                      for match in serialized_matches):
+            self.__paths[self.get_key(path)] = serialized_matches
+            self.__changed = True
+
+    def invalidate(self, path):
+        if self.__paths.pop(self.get_key(path), None) is not None:
+            self.__changed = True
+
+    async def resolve(self, client, paths: List[List[str]],
+                      max_paths_per_translate: int = DEFAULT_MAX_PATHS_PER_TRANSLATE) -> int:
+        """
+        Resolves the not cached paths, that consist of the qualified names only, in bulk with
+        the TranslateBrowsePathsToNodeIds service calls. Returns the count of the resolved paths.
+        """
+
+        paths_to_resolve = {}
+        for path in paths:
+            key = self.get_key(path)
+            if key not in self.__paths and key not in paths_to_resolve and self.is_qualified_path(path):
+                paths_to_resolve[key] = path
+
+        results = await self.__translate(client, [self.make_browse_path(path) for path in paths_to_resolve.values()],
+                                         max_paths_per_translate)
+        resolved_count = 0
+        for (key, path), result in zip(paths_to_resolve.items(), results or []):
+            if result.StatusCode.is_good() and result.Targets:
+                self.__paths[key] = [[*path[:-1], [path[-1], result.Targets[0].TargetId.to_string()]]]
+                self.__changed = True
+                resolved_count += 1
+
+        return resolved_count
+
+    async def refresh(self, client, max_paths_per_translate: int = DEFAULT_MAX_PATHS_PER_TRANSLATE) -> Set[str]:
+        """
+        Resolves the cached paths again and drops the paths, that are resolved to the different nodes
+        or not resolved at all. Returns the dropped paths keys.
+        """
+
+        checked_paths = []
+        browse_paths = []
+        for key, matches in self.__paths.items():
+            for match in matches:
+                if not isinstance(match[-1], str):
+                    checked_paths.append((key, match[-1][1]))
+                    browse_paths.append(self.make_browse_path(match))
+
+        results = await self.__translate(client, browse_paths, max_paths_per_translate)
+        if results is None:
+            self._log.info('Server does not support browse paths translation, cached paths are not refreshed')
+            return set()
+
+        invalidated = set()
+        for (key, node_id), result in zip(checked_paths, results):
+            if (not result.StatusCode.is_good()
+                    or node_id not in [target.TargetId.to_string() for target in result.Targets]):
+                invalidated.add(key)
+
+        for key in invalidated:
+            self.invalidate(key)
+
+        self._log.debug('Refreshed %i browse paths, %i of them are changed', len(browse_paths), len(invalidated))
+        return invalidated
+
+    @staticmethod
+    async def __translate(client, browse_paths: List[ua.BrowsePath], max_paths_per_translate: int) -> Optional[list]:
+        results = []
+        max_paths_per_translate = max(max_paths_per_translate or DEFAULT_MAX_PATHS_PER_TRANSLATE, 1)
+        for batch_start in range(0, len(browse_paths), max_paths_per_translate):
+            try:
+                results.extend(await client.uaclient.translate_browsepaths_to_nodeids(
+                    browse_paths[batch_start:batch_start + max_paths_per_translate]))
+            except BadServiceUnsupported:
+                return None
+
+        return results
+
+    @staticmethod
+    def is_qualified_path(path: List[str]) -> bool:
+        return all(len(element.split(':')) == 2 for element in path)
+
+    @staticmethod
+    def make_browse_path(path: list) -> ua.BrowsePath:
+        """Makes the browse path from the root folder by the qualified names of the path or chain elements."""
+
+        relative_path = ua.RelativePath()
+        for element in path:
+            relative_path.Elements.append(ua.RelativePathElement(
+                ReferenceTypeId=ua.TwoByteNodeId(ua.ObjectIds.HierarchicalReferences),
+                IsInverse=False,
+                IncludeSubtypes=True,
+                TargetName=ua.QualifiedName.from_string(element if isinstance(element, str) else element[0])))
+
+        return ua.BrowsePath(StartingNode=ua.TwoByteNodeId(ua.ObjectIds.RootFolder), RelativePath_=relative_path)
@@ -17,6 +17,8 @@ import logging
 import re
 from asyncio.exceptions import CancelledError
 from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha1
+from pathlib import Path
 from queue import Queue, Empty
 from random import choice
 from string import ascii_lowercase
@@ -28,7 +30,9 @@ from cachetools import TTLCache
 
 from thingsboard_gateway.connectors.connector import Connector
 from thingsboard_gateway.gateway.constants import CONNECTOR_PARAMETER, RECEIVED_TS_PARAMETER, CONVERTED_TS_PARAMETER, \
-    DATA_RETRIEVING_STARTED, REPORT_STRATEGY_PARAMETER, ON_ATTRIBUTE_UPDATE_DEFAULT_TIMEOUT
+    DATA_RETRIEVING_STARTED, REPORT_STRATEGY_PARAMETER, ON_ATTRIBUTE_UPDATE_DEFAULT_TIMEOUT, \
+    BACKPRESSURE_POLL_PERIOD_MULTIPLIER
+from thingsboard_gateway.gateway.constant_enums import Status
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
@@ -68,6 +72,7 @@ from asyncua.crypto.security_policies import SecurityPolicyBasic256Sha256, Secur
 from asyncua.ua.uaerrors import UaStatusCodeError, BadNodeIdUnknown, BadConnectionClosed, \
     BadInvalidState, BadSessionClosed, BadAttributeIdInvalid, BadCommunicationError, BadOutOfService, BadNoMatch, \
     BadUnexpectedError, UaStatusCodeErrors, BadWaitingForInitialData, BadSessionIdInvalid, BadSubscriptionIdInvalid
+from thingsboard_gateway.connectors.opcua.browse_path_cache import BrowsePathCache
 from thingsboard_gateway.connectors.opcua.entities.rpc_request import OpcUaRpcRequest, OpcUaRpcType
 from thingsboard_gateway.connectors.opcua.device import Device
 from thingsboard_gateway.connectors.opcua.backward_compatibility_adapter import BackwardCompatibilityAdapter
@@ -131,6 +136,8 @@ class OpcUaConnector(Connector, Thread):
         self.__server_limits = {}
         self.__max_nodes_per_read = 100
         self.__max_nodes_per_subscribe = 100
+        # Count of the Read service calls, that are sent to the server without waiting for the previous ones
+        self.__max_concurrent_reads = max(self.__server_conf.get('maxConcurrentReads', 4), 1)
 
         if using_old_configuration_format:
             self.__log.warning('Connector configuration has been updated to the new format.')
@@ -155,6 +162,14 @@ class OpcUaConnector(Connector, Thread):
 
         self.__show_map = self.__server_conf.get('showMap', False)
 
+        # Resolved browse paths of the nodes are saved, so the nodes are found without browsing after the restart
+        self.__browse_path_cache = None
+        if self.__server_conf.get('enableBrowsePathCache', True):
+            # The generated connector name changes on every start, so the server url is used when there is no id
+            cache_file_name = 'browse_paths_%s.json' % sha1((self.__id or self.__opcua_url).encode()).hexdigest()
+            self.__browse_path_cache = BrowsePathCache(str(Path(self.__gateway.get_data_folder_path(), 'opcua',
+                                                                cache_file_name)), self.__log)
+
         self.__sub_data_to_convert = Queue(-1)
         self.__data_to_convert = Queue(-1)
 
@@ -180,6 +195,7 @@ class OpcUaConnector(Connector, Thread):
         self.__nodes_config_cache: Dict[NodeId, List[Device]] = {}
         self.__next_poll = 0
         self.__next_scan = 0
+        self.__storage_backpressure = False
         self.__client_recreation_required = True
 
         self.__log.info("OPC-UA Connector has been initialized")
@@ -395,6 +411,11 @@ class OpcUaConnector(Connector, Thread):
                 except Exception as e:
                     self.__log.error("Error on fetching server limitations:\n %s", e)
 
+                try:
+                    await self.__load_browse_path_cache()
+                except Exception as e:
+                    self.__log.error("Error on loading browse paths cache:\n %s", e)
+
                 poll_period = int(self.__server_conf.get('pollPeriodInMillis', 5000) / 1000)
                 scan_period = int(self.__server_conf.get('scanPeriodInMillis', 3600000) / 1000)
 
@@ -412,7 +433,8 @@ class OpcUaConnector(Connector, Thread):
                         await self.__scan_device_nodes()
 
                     if not self.__enable_subscriptions and monotonic() >= self.__next_poll:
-                        self.__next_poll = monotonic() + poll_period
+                        self.__next_poll = monotonic() + poll_period * (BACKPRESSURE_POLL_PERIOD_MULTIPLIER
+                                                                        if self.__storage_backpressure else 1)
                         await self.__poll_nodes()
 
                     current_time = monotonic()
@@ -726,6 +748,13 @@ class OpcUaConnector(Connector, Thread):
         return final
 
     async def find_nodes(self, node_pattern, current_parent_node=None, nodes=None):
+        # Only the paths from the root node are cached
+        use_browse_path_cache = self.__browse_path_cache is not None and current_parent_node is None and not nodes
+        if use_browse_path_cache:
+            cached_nodes = self.__browse_path_cache.get(node_pattern, self.__client.get_node)
+            if cached_nodes is not None:
+                return cached_nodes
+
         if nodes is None:
             nodes = []
         node_list = node_pattern.split('\\.')
@@ -736,12 +765,27 @@ class OpcUaConnector(Connector, Thread):
             if len(node_list) > 0 and node_list[0].lower() == 'root':
                 node_list = node_list[1:]
 
-        return await self.__find_nodes(node_list, current_parent_node, nodes, 'Root')
+        found_nodes = await self.__find_nodes(node_list, current_parent_node, nodes, 'Root')
+        if use_browse_path_cache:
+            self.__browse_path_cache.put(node_pattern, found_nodes)
+        return found_nodes
 
     async def find_node_name_space_index(self, path):
         if isinstance(path, str):
             path = path.split('\\.')
 
+        if self.__browse_path_cache is not None:
+            cached_nodes = self.__browse_path_cache.get(path, self.__client.get_node)
+            if cached_nodes is not None:
+                return cached_nodes
+
+        found_nodes = await self.__find_node_name_space_index(path)
+        if self.__browse_path_cache is not None:
+            self.__browse_path_cache.put(path, found_nodes)
+        return found_nodes
+
+    async def __find_node_name_space_index(self, path):
+
         # find unresolved nodes
         u_node_count = len(tuple(filter(lambda u_node: len(u_node.split(':')) < 2, path)))
 
@@ -817,18 +861,22 @@ class OpcUaConnector(Connector, Thread):
         return [result]
 
     def __convert_sub_data(self):
-        device_converted_data_map = {}
+        device_notifications_map = {}
         sleep_period_after_empty_batch = max(self.__sub_check_period_in_millis / 1000, .02)
 
         while not self.__stopped:
             batch = []
             batch_start_forming_time = time()
+            # Bigger batches are merged into fewer messages per device while the storage is overloaded
+            batch_size_multiplier = BACKPRESSURE_POLL_PERIOD_MULTIPLIER if self.__storage_backpressure else 1
+            max_batch_size = self.__sub_data_max_batch_size * batch_size_multiplier
+            min_batch_creation_time = self.__sub_data_min_batch_creation_time * batch_size_multiplier
             while (not self.__sub_data_to_convert.empty()
-                   and len(batch) < self.__sub_data_max_batch_size
-                   and time() - batch_start_forming_time < self.__sub_data_min_batch_creation_time):
+                   and len(batch) < max_batch_size
+                   and time() - batch_start_forming_time < min_batch_creation_time):
                 try:
                     batch.append(self.__sub_data_to_convert.get_nowait())
-                    if (time() - batch_start_forming_time) >= self.__sub_data_min_batch_creation_time:
+                    if (time() - batch_start_forming_time) >= min_batch_creation_time:
                         break
                 except Empty:
                     break
@@ -842,41 +890,60 @@ class OpcUaConnector(Connector, Thread):
                 self.__log.debug('Data left in queue: %s', self.__sub_data_to_convert.qsize())
 
             for sub_node, data, received_ts in batch:
-                node_configs = self.__nodes_config_cache.get(sub_node.nodeid, [])
-                for device in node_configs:
-                    try:
-                        if sub_node.nodeid not in device.nodes_data_change_subscriptions:
-                            continue
-                        if device not in device_converted_data_map:
-                            device_converted_data_map[device] = ConvertedData(device_name=device.name,
-                                                                              device_type=device.device_profile)
-
-                        nodes_configs = device.nodes_data_change_subscriptions[sub_node.nodeid]['nodes_configs']
-                        nodes_values = [data.monitored_item.Value for _ in range(len(nodes_configs))]
-
-                        converted_data = device.converter_for_sub.convert(nodes_configs, nodes_values)
-
-                        if converted_data:
-                            converted_data.add_to_metadata({
-                                CONNECTOR_PARAMETER: self.get_name(),
-                                RECEIVED_TS_PARAMETER: received_ts,
-                                CONVERTED_TS_PARAMETER: int(time() * 1000)
-                            })
-
-                            for node_config in nodes_configs:
-                                if node_config['section'] == 'attributes':
-                                    device_converted_data_map[device].add_to_attributes(converted_data.attributes)
-                                else:
-                                    device_converted_data_map[device].add_to_telemetry(converted_data.telemetry)
-                    except Exception as e:
-                        self.__log.exception("Error converting data: %s", e)
+                for device in self.__nodes_config_cache.get(sub_node.nodeid, []):
+                    node_subscription = device.nodes_data_change_subscriptions.get(sub_node.nodeid)
+                    if node_subscription is None:
+                        continue
+                    device_notifications = device_notifications_map.get(device)
+                    if device_notifications is None:
+                        device_notifications = device_notifications_map[device] = []
+                    device_notifications.append((node_subscription, data.monitored_item.Value, received_ts))
+
+            converted_data_list = []
+            for device, device_notifications in device_notifications_map.items():
+                try:
+                    converted_data = self.__convert_device_notifications(device, device_notifications)
+                    if converted_data:
+                        converted_data.add_to_metadata({
+                            CONNECTOR_PARAMETER: self.get_name(),
+                            RECEIVED_TS_PARAMETER: device_notifications[0][2],
+                            CONVERTED_TS_PARAMETER: int(time() * 1000)
+                        })
+                        converted_data_list.append(converted_data)
+                except Exception as e:
+                    self.__log.exception("Error converting data: %s", e)
+
+            if converted_data_list:
+                self.__update_storage_backpressure(
+                    self.__gateway.send_to_storage(self.get_name(), self.get_id(), converted_data_list))
+                self.__log.debug('Converted data from %r notifications from server for %r devices',
+                                 len(batch), len(converted_data_list))
 
-            for device, converted_data in device_converted_data_map.items():
-                self.__gateway.send_to_storage(self.get_name(), self.get_id(), converted_data)
-                self.__log.debug('Converted data from %r notifications from server for device %s, using converter: %r',
-                                 len(batch), device.name, device.converter_for_sub.__class__.__name__)
+            device_notifications_map.clear()
 
-            device_converted_data_map.clear()
+    @staticmethod
+    def __convert_device_notifications(device, notifications) -> ConvertedData:
+        converter = device.converter_for_sub
+        if hasattr(converter, 'convert_batch'):
+            batch = []
+            for node_subscription, value, received_ts in notifications:
+                # Conversion plans are prepared once for the subscribed node and reset when its configs are changed
+                plans = node_subscription.get('conversion_plans')
+                if plans is None:
+                    plans = node_subscription['conversion_plans'] = converter.get_conversion_plans(
+                        node_subscription['nodes_configs'])
+                batch.append((plans, value, received_ts))
+            return converter.convert_batch(batch)
+
+        # Custom converters receive the notifications one by one
+        device_converted_data = ConvertedData(device_name=device.name, device_type=device.device_profile)
+        for node_subscription, value, _ in notifications:
+            nodes_configs = node_subscription['nodes_configs']
+            converted_data = converter.convert(nodes_configs, [value] * len(nodes_configs))
+            if converted_data:
+                device_converted_data.add_to_telemetry(converted_data.telemetry)
+                device_converted_data.add_to_attributes(converted_data.attributes)
+        return device_converted_data
 
     async def __build_parent_node_descriptors(self, parent_nodes: List[Node]) -> List[Dict[str, Node]]:
         parent_descriptors: List[Dict[str, Node]] = []
@@ -903,6 +970,68 @@ class OpcUaConnector(Connector, Thread):
     async def __scan_device_nodes(self):
         await self._create_new_devices()
         await self._load_devices_nodes()
+        if self.__browse_path_cache is not None:
+            self.__browse_path_cache.save()
+
+    async def __load_browse_path_cache(self):
+        if self.__browse_path_cache is None:
+            return
+
+        self.__browse_path_cache.load(self.__opcua_url, await self.__client.get_namespace_array())
+        if len(self.__browse_path_cache) > 0:
+            # Cached nodes are used right away and checked against the server address space in the background
+            self.__loop.create_task(self.__refresh_browse_path_cache())
+
+    async def __refresh_browse_path_cache(self):
+        try:
+            invalidated_paths = await self.__browse_path_cache.refresh(self.__client,
+                                                                       self.__get_max_paths_per_translate())
+        except Exception as e:
+            self.__log.warning("Failed to refresh browse paths cache: %s", e)
+            return
+
+        if invalidated_paths:
+            self.__log.info("%i cached browse paths are changed on the server, the nodes will be found again",
+                            len(invalidated_paths))
+            for device in self.__device_nodes:
+                for section in ('attributes', 'timeseries'):
+                    for node in device.values.get(section, []):
+                        if (isinstance(node['path'], list)
+                                and BrowsePathCache.get_key(node['path']) in invalidated_paths):
+                            await self.__unsubscribe_from_node(device, node)
+                            node.pop('qualified_path', None)
+            self.__next_scan = 0
+
+        self.__browse_path_cache.save()
+
+    async def __resolve_qualified_paths_in_bulk(self):
+        qualified_paths = []
+        for device in self.__device_nodes:
+            for section in ('attributes', 'timeseries'):
+                for node in device.values.get(section, []):
+                    path = node.get('qualified_path', node['path'])
+                    if isinstance(path, list) and len(path[-1].split(':')) == 2:
+                        qualified_paths.append(path)
+
+        if qualified_paths:
+            resolved_count = await self.__browse_path_cache.resolve(self.__client, qualified_paths,
+                                                                    self.__get_max_paths_per_translate())
+            self.__log.debug('Resolved %i browse paths in bulk', resolved_count)
+
+    async def __get_node_by_qualified_path(self, path):
+        if self.__browse_path_cache is None:
+            return await self.__client.nodes.root.get_child(path)
+
+        cached_nodes = self.__browse_path_cache.get(path, self.__client.get_node)
+        if cached_nodes:
+            return cached_nodes[0][-1]['node']
+
+        found_node = await self.__client.nodes.root.get_child(path)
+        self.__browse_path_cache.put(path, [[*path[:-1], {'path': path[-1], 'node': found_node}]])
+        return found_node
+
+    def __get_max_paths_per_translate(self):
+        return self.__server_limits.get("OperationLimits.MaxNodesPerTranslateBrowsePathsToNodeIds")
 
     async def __get_device_base_nodes(self, device_node_pattern):
         try:
@@ -995,6 +1124,12 @@ class OpcUaConnector(Connector, Thread):
         self.__log.debug('Device nodes: %s', self.__device_nodes)
 
     async def _load_devices_nodes(self):
+        if self.__browse_path_cache is not None:
+            try:
+                await self.__resolve_qualified_paths_in_bulk()
+            except Exception as e:
+                self.__log.warning('Failed to resolve browse paths in bulk: %s', e)
+
         for device in self.__device_nodes:
             device.nodes = []
             for section in ('attributes', 'timeseries'):
@@ -1044,7 +1179,7 @@ class OpcUaConnector(Connector, Thread):
                             if isinstance(path, Node):
                                 found_node = path
                             else:
-                                found_node = await self.__client.nodes.root.get_child(path)
+                                found_node = await self.__get_node_by_qualified_path(path)
 
                         node_report_strategy = node.get(REPORT_STRATEGY_PARAMETER)
                         if self.__gateway.get_report_strategy_service() is not None:
@@ -1099,6 +1234,7 @@ class OpcUaConnector(Connector, Thread):
 
                                 device.nodes_data_change_subscriptions[found_node.nodeid]['nodes_configs'].append(
                                     node_config)
+                                device.nodes_data_change_subscriptions[found_node.nodeid]['conversion_plans'] = None
 
                                 if device.subscription is None:
                                     device.subscription = await self.__client.create_subscription(
@@ -1117,12 +1253,16 @@ class OpcUaConnector(Connector, Thread):
                     except (BadNodeIdUnknown, BadConnectionClosed, BadInvalidState, BadAttributeIdInvalid,
                             BadCommunicationError, BadOutOfService, BadNoMatch, BadUnexpectedError,
                             UaStatusCodeErrors,
-                            BadWaitingForInitialData):
+                            BadWaitingForInitialData) as e:
                         if node.get('valid', True):
                             self.__log.warning('Node not found (2); device: %s, key: %s, path: %s',
                                                device.name,
                                                node['key'], node['path'])
                             await self.__unsubscribe_from_node(device, node)
+                        if isinstance(e, BadNodeIdUnknown) and self.__browse_path_cache is not None:
+                            # The node is found again on the next scan
+                            self.__browse_path_cache.invalidate(node['path'])
+                            node.pop('qualified_path', None)
                     except UaStatusCodeError as uae:
                         if node.get('valid', True):
                             self.__log.exception('Node status code error: %s', uae)
@@ -1208,21 +1348,25 @@ class OpcUaConnector(Connector, Thread):
 
     async def __poll_nodes(self):
         data_retrieving_started = int(time() * 1000)
-        all_nodes = [node_config['node'] for device in self.__device_nodes for node_config in device.nodes]
+        polled_nodes = [(device, node_config) for device in self.__device_nodes for node_config in device.nodes]
 
-        if len(all_nodes) > 0:
+        if len(polled_nodes) > 0:
             received_ts = int(time() * 1000)
-            for i in range(0, len(all_nodes), self.__max_nodes_per_read):
-                batch = all_nodes[i:i + self.__max_nodes_per_read]
-                try:
-                    values = await self.__client.read_attributes(batch)
-                    self.__data_to_convert.put((values, received_ts, data_retrieving_started))
-                except Exception as e:
-                    self.__log.warning("Failed to read batch from %i to %i: %s", i, i + self.__max_nodes_per_read, e)
-
+            reads_semaphore = asyncio.Semaphore(self.__max_concurrent_reads)
+            await asyncio.gather(*(self.__read_nodes_batch(polled_nodes[i:i + self.__max_nodes_per_read], i,
+                                                           reads_semaphore, received_ts, data_retrieving_started)
+                                   for i in range(0, len(polled_nodes), self.__max_nodes_per_read)))
         else:
             self.__log.info('No nodes to poll')
 
+    async def __read_nodes_batch(self, batch, batch_start, reads_semaphore, received_ts, data_retrieving_started):
+        async with reads_semaphore:
+            try:
+                values = await self.__client.read_attributes([node_config['node'] for _, node_config in batch])
+                self.__data_to_convert.put((batch, values, received_ts, data_retrieving_started))
+            except Exception as e:
+                self.__log.warning("Failed to read batch from %i to %i: %s", batch_start, batch_start + len(batch), e)
+
     def __thread_pool_executor_processor(self):
         pack = 10
         futures = []
@@ -1241,22 +1385,34 @@ class OpcUaConnector(Connector, Thread):
                 self.__log.exception("Error in thread pool executor: %s", e)
 
             try:
-                values, received_ts, data_retrieving_started = self.__data_to_convert.get_nowait()
-                futures.append(self.__thread_pool_executor.submit(self.__convert_retrieved_data, values, received_ts,
-                                                                  data_retrieving_started))
+                batch, values, received_ts, data_retrieving_started = self.__data_to_convert.get_nowait()
+                futures.append(self.__thread_pool_executor.submit(self.__convert_retrieved_data, batch, values,
+                                                                  received_ts, data_retrieving_started))
                 if len(futures) >= pack:
                     continue
             except Empty:
                 sleep(.02)
 
-    def __convert_retrieved_data(self, values, received_ts, data_retrieving_started):
+    @staticmethod
+    def __group_batch_by_device(batch, values):
+        """Groups the read values of the batch by the devices, the batch may contain only a part of device nodes."""
+
+        devices_data = {}
+        for (device, node_config), value in zip(batch, values):
+            device_data = devices_data.get(device)
+            if device_data is None:
+                device_data = devices_data[device] = ([], [])
+            device_data[0].append(node_config)
+            device_data[1].append(value)
+
+        return devices_data
+
+    def __convert_retrieved_data(self, batch, values, received_ts, data_retrieving_started):
         try:
             converted_nodes_count = 0
-            for device in self.__device_nodes:
-                nodes_count = len(device.nodes)
-                device_values = values[converted_nodes_count:converted_nodes_count + nodes_count]
-                converted_nodes_count += nodes_count
-                converted_data: ConvertedData = self.__convert_device_data(device.converter, device.nodes,
+            for device, (device_nodes, device_values) in self.__group_batch_by_device(batch, values).items():
+                converted_nodes_count += len(device_nodes)
+                converted_data: ConvertedData = self.__convert_device_data(device.converter, device_nodes,
                                                                            device_values)
                 converted_data.add_to_metadata({
                     CONNECTOR_PARAMETER: self.get_name(),
@@ -1265,7 +1421,8 @@ class OpcUaConnector(Connector, Thread):
                     DATA_RETRIEVING_STARTED: data_retrieving_started
                 })
                 if converted_data:
-                    self.__gateway.send_to_storage(self.get_name(), self.get_id(), converted_data)
+                    self.__update_storage_backpressure(
+                        self.__gateway.send_to_storage(self.get_name(), self.get_id(), converted_data))
 
                     StatisticsService.count_connector_message(self.name, stat_parameter_name='connectorMsgsReceived')
                     # TODO: Should these counters be here, or on upper level?
@@ -1275,6 +1432,14 @@ class OpcUaConnector(Connector, Thread):
         except Exception as e:
             self.__log.exception("Error converting data: ", exc_info=e)
 
+    def __update_storage_backpressure(self, status):
+        storage_backpressure = status == Status.BACKPRESSURE
+        if storage_backpressure != self.__storage_backpressure:
+            self.__storage_backpressure = storage_backpressure
+            self.__log.info("Storage backpressure is %s, poll period and subscription batches are %s",
+                            "active" if storage_backpressure else "released",
+                            "stretched" if storage_backpressure else "restored")
+
     @staticmethod
     def __convert_device_data(converter, device_nodes, values):
         return converter.convert(device_nodes, values)
@@ -1283,7 +1448,7 @@ class OpcUaConnector(Connector, Thread):
         data.metadata.update({'sendToStorageTs': int(time() * 1000)})
 
         self.statistics['MessagesReceived'] = self.statistics['MessagesReceived'] + 1
-        self.__gateway.send_to_storage(self.get_name(), self.get_id(), data)
+        self.__update_storage_backpressure(self.__gateway.send_to_storage(self.get_name(), self.get_id(), data))
         self.statistics['MessagesSent'] = self.statistics['MessagesSent'] + 1
         self.__log.debug('Count data msg to storage: %s', self.statistics['MessagesSent'])
 
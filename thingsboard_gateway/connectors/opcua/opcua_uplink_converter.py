@@ -14,6 +14,7 @@
 
 from datetime import timezone
 from time import time
+from typing import List
 
 from asyncua.ua.uatypes import VariantType
 
@@ -48,31 +49,61 @@ VARIANT_TYPE_HANDLERS = {
 ERROR_MSG_TEMPLATE = "Bad status code: {} for node: {} with description {}"
 
 
+class NodeConversionPlan:
+    """Conversion settings of a subscribed node, prepared once: the datapoint key, the section and the timestamp source."""
+
+    __slots__ = ('datapoint_key', 'is_telemetry', 'timestamp_location')
+
+    def __init__(self, datapoint_key, is_telemetry: bool, timestamp_location: str):
+        self.datapoint_key = datapoint_key
+        self.is_telemetry = is_telemetry
+        self.timestamp_location = timestamp_location
+
+
 class OpcUaUplinkConverter(OpcUaConverter):
     def __init__(self, config, logger):
         self._log = logger
         self.__config = config
 
-    def process_datapoint(self, config, val, basic_timestamp, device_report_strategy):
+        self.__device_report_strategy = None
         try:
-            error = None
-            data = val.Value.Value
-            if isinstance(data, list):
-                data = [str(item) for item in data]
-            else:
-                handler = VARIANT_TYPE_HANDLERS.get(val.Value.VariantType, lambda d: d if not hasattr(d, 'to_string') else d.to_string())
+            self.__device_report_strategy = ReportStrategyConfig(self.__config.get(REPORT_STRATEGY_PARAMETER))
+        except ValueError as e:
+            self._log.trace("Report strategy config is not specified for device %s: %s",
+                            self.__config.get('device_name'), e)
+
+    @staticmethod
+    def get_value(val):
+        """Returns the value of the DataValue, converted according to its variant type, and the error flag."""
+
+        data = val.Value.Value
+        if isinstance(data, list):
+            data = [str(item) for item in data]
+        else:
+            handler = VARIANT_TYPE_HANDLERS.get(val.Value.VariantType)
+            if handler is not None:
                 data = handler(data)
+            elif hasattr(data, 'to_string'):
+                data = data.to_string()
+
+        if data is None and val.StatusCode.is_bad():
+            return str.format(ERROR_MSG_TEMPLATE, val.StatusCode.name, val.data_type, val.StatusCode.doc), True
+
+        return data, None
 
-            if data is None and val.StatusCode.is_bad():
-                data = str.format(ERROR_MSG_TEMPLATE,val.StatusCode.name, val.data_type, val.StatusCode.doc)
-                error = True
+    @staticmethod
+    def get_timestamp(timestamp_location, val, basic_timestamp):
+        if timestamp_location == 'sourcetimestamp' and val.SourceTimestamp is not None:
+            return val.SourceTimestamp.timestamp() * 1000
+        elif timestamp_location == 'servertimestamp' and val.ServerTimestamp is not None:
+            return val.ServerTimestamp.timestamp() * 1000
 
-            timestamp_location = config.get('timestampLocation', 'gateway').lower()
-            timestamp = basic_timestamp  # Default timestamp
-            if timestamp_location == 'sourcetimestamp' and val.SourceTimestamp is not None:
-                timestamp = val.SourceTimestamp.timestamp() * 1000
-            elif timestamp_location == 'servertimestamp' and val.ServerTimestamp is not None:
-                timestamp = val.ServerTimestamp.timestamp() * 1000
+        return basic_timestamp
+
+    def process_datapoint(self, config, val, basic_timestamp, device_report_strategy):
+        try:
+            data, error = self.get_value(val)
+            timestamp = self.get_timestamp(config.get('timestampLocation', 'gateway').lower(), val, basic_timestamp)
 
             section = DATA_TYPES[config['section']]
             datapoint_key = TBUtility.convert_key_to_datapoint_key(config['key'], device_report_strategy, config, self._log)
@@ -95,17 +126,11 @@ class OpcUaUplinkConverter(OpcUaConverter):
 
             converted_data = ConvertedData(device_name=self.__config['device_name'], device_type=self.__config['device_type'])
 
-            device_report_strategy = None
-            try:
-                device_report_strategy = ReportStrategyConfig(self.__config.get(REPORT_STRATEGY_PARAMETER))
-            except ValueError as e:
-                self._log.trace("Report strategy config is not specified for device %s: %s", self.__config['device_name'], e)
-
             telemetry_batch = []
             attributes_batch = []
 
             for config, val in zip(configs, values):
-                result, error = self.process_datapoint(config, val, basic_timestamp, device_report_strategy)
+                result, error = self.process_datapoint(config, val, basic_timestamp, self.__device_report_strategy)
                 if result is not None:
                     if isinstance(result, TelemetryEntry):
                         telemetry_batch.append(result)
@@ -124,6 +149,56 @@ class OpcUaUplinkConverter(OpcUaConverter):
             self._log.exception("Error occurred while converting data: ", exc_info=e)
             StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
 
+    def get_conversion_plans(self, configs) -> List[NodeConversionPlan]:
+        plans = []
+        for config in configs:
+            try:
+                plans.append(NodeConversionPlan(
+                    TBUtility.convert_key_to_datapoint_key(config['key'], self.__device_report_strategy, config,
+                                                           self._log),
+                    DATA_TYPES[config['section']] == TELEMETRY_PARAMETER,
+                    config.get('timestampLocation', 'gateway').lower()))
+            except Exception as e:
+                self._log.error("Failed to prepare conversion for node config %s: %s", config, e)
+
+        return plans
+
+    def convert_batch(self, notifications) -> ConvertedData:
+        """
+        Converts the data change notifications of the device into a single ConvertedData.
+        Every notification is a tuple of the node conversion plans, the received DataValue and the receiving timestamp,
+        that is used as the timestamp of the values with the gateway timestamp location.
+        """
+
+        StatisticsService.count_connector_message(self._log.name, 'convertersMsgProcessed', count=len(notifications))
+        converted_data = ConvertedData(device_name=self.__config['device_name'], device_type=self.__config['device_type'])
+
+        try:
+            telemetry_values = {}
+            get_timestamp = self.get_timestamp
+            for plans, val, received_ts in notifications:
+                data, _ = self.get_value(val)
+                for plan in plans:
+                    if plan.is_telemetry:
+                        timestamp = get_timestamp(plan.timestamp_location, val, received_ts)
+                        timestamp_values = telemetry_values.get(timestamp)
+                        if timestamp_values is None:
+                            timestamp_values = telemetry_values[timestamp] = {}
+                        timestamp_values[plan.datapoint_key] = data
+                    else:
+                        converted_data.attributes[plan.datapoint_key] = data
+
+            converted_data.add_to_telemetry([TelemetryEntry(values, ts=timestamp)
+                                             for timestamp, values in telemetry_values.items()])
+        except Exception as e:
+            self._log.exception("Error occurred while converting data: ", exc_info=e)
+            StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped', count=len(notifications))
+
+        StatisticsService.count_connector_message(self._log.name, 'convertersAttrProduced', count=converted_data.attributes_datapoints_count)
+        StatisticsService.count_connector_message(self._log.name, 'convertersTsProduced', count=converted_data.telemetry_datapoints_count)
+
+        return converted_data
+
     @staticmethod
     def fill_telemetry(results):
         telemetry_batch = []
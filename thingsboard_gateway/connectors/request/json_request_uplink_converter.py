@@ -21,6 +21,7 @@ from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.tb_utility.expression_template import ExpressionTemplate
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 
@@ -43,32 +44,15 @@ class JsonRequestUplinkConverter(RequestConverter):
 
         try:
             if self.__config['converter'].get("deviceNameJsonExpression") is not None:
-                device_name_tags = TBUtility.get_values(self.__config['converter'].get("deviceNameJsonExpression"),
-                                                        data, get_tag=True)
-                device_name_values = TBUtility.get_values(self.__config['converter'].get("deviceNameJsonExpression"),
-                                                          data, get_tag=False)
-                device_name = self.__config['converter'].get("deviceNameJsonExpression")
-                for (device_name_tag, device_name_value) in zip(device_name_tags, device_name_values):
-                    is_valid_key = "${" in self.__config['converter'].get("deviceNameJsonExpression") and "}" in \
-                                   self.__config['converter'].get("deviceNameJsonExpression")
-                    device_name = device_name.replace('${' + str(device_name_tag) + '}', str(device_name_value)) \
-                        if is_valid_key else device_name
+                device_name = ExpressionTemplate.compile(
+                    self.__config['converter'].get("deviceNameJsonExpression")).render(data)
             else:
                 self.__log.error("The expression for looking \"deviceName\" not found in config %s",
                                  dumps(self.__config['converter']))
             if self.__config['converter'].get("deviceTypeJsonExpression") is not None:
-                device_type_tags = TBUtility.get_values(self.__config['converter'].get("deviceTypeJsonExpression"),
-                                                        data,
-                                                        get_tag=True)
-                device_type_values = TBUtility.get_values(self.__config['converter'].get("deviceTypeJsonExpression"),
-                                                          data,
-                                                          expression_instead_none=True)
-                device_type = self.__config['converter'].get("deviceTypeJsonExpression")
-                for (device_type_tag, device_type_value) in zip(device_type_tags, device_type_values):
-                    is_valid_key = "${" in self.__config['converter'].get("deviceTypeJsonExpression") and "}" in \
-                                   self.__config['converter'].get("deviceTypeJsonExpression")
-                    device_type = device_type.replace('${' + str(device_type_tag) + '}', str(device_type_value)) \
-                        if is_valid_key else device_type_tag
+                device_type = ExpressionTemplate.compile(
+                    self.__config['converter'].get("deviceTypeJsonExpression")).render(data,
+                                                                                       expression_instead_none=True)
             else:
                 self.__log.error("The expression for looking \"deviceType\" not found in config %s",
                                  dumps(self.__config['converter']))
@@ -86,39 +70,18 @@ class JsonRequestUplinkConverter(RequestConverter):
         try:
             for datatype in self.__datatypes:
                 for datatype_object_config in self.__config["converter"].get(datatype, []):
-                    values = TBUtility.get_values(datatype_object_config["value"], data, datatype_object_config["type"],
-                                                  expression_instead_none=True)
-                    values_tags = TBUtility.get_values(datatype_object_config["value"], data,
-                                                       datatype_object_config["type"],
-                                                       get_tag=True)
-
-                    keys = TBUtility.get_values(datatype_object_config["key"], data, datatype_object_config["type"],
-                                                expression_instead_none=True)
-                    keys_tags = TBUtility.get_values(datatype_object_config["key"], data, get_tag=True)
-
-                    full_key = datatype_object_config["key"]
-                    for (key, key_tag) in zip(keys, keys_tags):
-                        is_valid_key = "${" in datatype_object_config["key"] and "}" in \
-                                       datatype_object_config["key"]
-                        full_key = full_key.replace('${' + str(key_tag) + '}',
-                                                    str(key)) if is_valid_key else key_tag
-
-                    raw_value_expression = datatype_object_config["value"]
-                    is_pure_placeholder = (isinstance(raw_value_expression, str)
-                                           and raw_value_expression.strip().startswith("${")
-                                           and raw_value_expression.strip().endswith("}")
-                                           and raw_value_expression.strip().count("${") == 1)
-                    is_not_template = not ("${" in raw_value_expression and "}" in raw_value_expression)
-                    if is_pure_placeholder or is_not_template:
-                        full_value = values[0] if isinstance(values, list) and values else None
-                        self.__log.debug("The converted value is %s with datatype %s", full_value,
-                                         datatype_object_config["type"])
+                    full_key = ExpressionTemplate.compile(datatype_object_config["key"]).render(
+                        data, expression_instead_none=True)
+
+                    value_template = ExpressionTemplate.compile(datatype_object_config["value"])
+                    if value_template.is_single_placeholder or not value_template.has_placeholders:
+                        # Pure placeholder keeps the type of the value from the message
+                        full_value = value_template.get_value(data, datatype_object_config["type"],
+                                                              expression_instead_none=True)
                     else:
-                        full_value = raw_value_expression
-                        for (value, value_tag) in zip(values, values_tags):
-                            full_value = full_value.replace('${' + str(value_tag) + '}', str(value))
-                            self.__log.debug("The converted value is %s with datatype %s", full_value,
-                                             datatype_object_config["type"])
+                        full_value = value_template.render(data, expression_instead_none=True)
+                    self.__log.debug("The converted value is %s with datatype %s", full_value,
+                                     datatype_object_config["type"])
 
                     datapoint_key = TBUtility.convert_key_to_datapoint_key(full_key, device_report_strategy,
                                                                            datatype_object_config, self.__log)
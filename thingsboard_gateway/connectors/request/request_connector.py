@@ -12,14 +12,16 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import asyncio
+from heapq import heapify, heappop, heappush
+from json import loads
 from queue import Queue
 from random import choice
 from re import fullmatch
 from string import ascii_lowercase
 from threading import Thread
-from time import sleep, time
+from time import time
 
-from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 from thingsboard_gateway.tb_utility.tb_loader import TBModuleLoader
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
@@ -32,13 +34,25 @@ except ImportError:
     TBUtility.install_package("requests")
     from requests import Timeout, request
 from requests.auth import HTTPBasicAuth
-from requests.exceptions import RequestException, JSONDecodeError
+from requests.exceptions import RequestException
+
+try:
+    from aiohttp import BasicAuth, ClientError, ClientSession, ClientTimeout, TCPConnector
+except ImportError:
+    print("AIOHTTP library not found - installing...")
+    TBUtility.install_package("aiohttp")
+    from aiohttp import BasicAuth, ClientError, ClientSession, ClientTimeout, TCPConnector
 
 from thingsboard_gateway.connectors.connector import Connector
 from thingsboard_gateway.connectors.request.json_request_uplink_converter import JsonRequestUplinkConverter
 from thingsboard_gateway.connectors.request.json_request_downlink_converter import JsonRequestDownlinkConverter
 
 
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 10
+DEFAULT_CONCURRENT_SUB_REQUESTS = False
+
+
 class RequestConnector(Connector, Thread):
     def __init__(self, gateway, config, connector_type):
         super().__init__()
@@ -64,30 +78,70 @@ class RequestConnector(Connector, Thread):
         else:
             self.__host = "http://" + self.__config["host"]
         self.__ssl_verify = self.__config.get("SSLVerify", False)
+        self.__max_connections = self.__config.get("maxConnections", DEFAULT_MAX_CONNECTIONS)
+        self.__max_connections_per_host = self.__config.get("maxConnectionsPerHost", DEFAULT_MAX_CONNECTIONS_PER_HOST)
+        self.__session = None
         self.daemon = True
         self.__connected = False
         self.__stopped = False
         self.__requests_in_progress = []
-        self.__convert_queue = Queue(1000000)
         self.__attribute_updates = []
         self.__fill_attribute_updates()
         self.__fill_rpc_requests()
         self.__fill_requests()
 
     def run(self):
-        while not self.__stopped:
-            request_sent = False
-            if self.__requests_in_progress:
-                for req in self.__requests_in_progress:
-                    if time() >= req["next_time"]:
-                        thread = Thread(target=self.__send_request, args=(req, self.__convert_queue, self._log),
-                                        daemon=True,
-                                        name="Request to endpoint \'%s\' Thread" % (req["config"].get("url")))
-                        thread.start()
-                        request_sent = True
-            if not request_sent:
-                sleep(.2)
-            self.__process_data()
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.__poll_requests())
+        except Exception as e:
+            self._log.exception(e)
+        finally:
+            loop.close()
+
+    async def __poll_requests(self):
+        """
+        Sends all requests from one event loop. The requests are ordered by the time of the next poll in the heap,
+        connections are kept alive and limited in total and per host by the connection pool of the session.
+        """
+
+        connector = TCPConnector(limit=self.__max_connections, limit_per_host=self.__max_connections_per_host,
+                                 ssl=True if self.__ssl_verify else False)
+        auth = None
+        if self.__security is not None:
+            auth = BasicAuth(self.__security.username, self.__security.password)
+
+        polls = set()
+        deadlines = [(request["next_time"], index) for index, request in enumerate(self.__requests_in_progress)]
+        heapify(deadlines)
+        async with ClientSession(connector=connector, auth=auth) as session:
+            self.__session = session
+            self.__connected = True
+            while not self.__stopped:
+                now = time()
+                while deadlines and deadlines[0][0] <= now:
+                    _, index = heappop(deadlines)
+                    request = self.__requests_in_progress[index]
+                    request["next_time"] = now + request["config"].get("scanPeriod", 10)
+                    heappush(deadlines, (request["next_time"], index))
+
+                    if request.get("inProgress"):
+                        self._log.debug("Previous request to %s is not finished yet, request is skipped",
+                                        request["config"].get("url"))
+                        continue
+
+                    poll = asyncio.create_task(self.__poll_request(request))
+                    polls.add(poll)
+                    poll.add_done_callback(polls.discard)
+
+                await asyncio.sleep(min(deadlines[0][0] - time(), .2) if deadlines else .2)
+
+            for poll in polls:
+                poll.cancel()
+            await asyncio.gather(*polls, return_exceptions=True)
+
+        self.__connected = False
 
     def on_attributes_update(self, content):
         try:
@@ -229,8 +283,7 @@ class RequestConnector(Connector, Thread):
                     converter = JsonRequestUplinkConverter(endpoint, self._log)
                 self.__requests_in_progress.append({"config": endpoint,
                                                     "converter": converter,
-                                                    "next_time": time(),
-                                                    "request": request})
+                                                    "next_time": time()})
             except Exception as e:
                 self._log.exception(e)
 
@@ -256,52 +309,9 @@ class RequestConnector(Connector, Thread):
     def __send_request(self, request, converter_queue, logger):
         url = ""
         try:
-            request["next_time"] = time() + request["config"].get("scanPeriod", 10)
-            if request.get("converter") is None and isinstance(request["config"].get("converter"), dict):
-                logger.error("Converter for request to '%s' endpoint is not defined. Request will be skipped.", request["config"].get("url"))
-                return
-            request_url_from_config = request["config"]["url"]
-            request_url_from_config = (
-                str("/" + request_url_from_config)
-                if not request_url_from_config.startswith("/")
-                   and not request_url_from_config.startswith("http")
-                else request_url_from_config
-            )
-            logger.debug("Obtained request url from config - %s ", request_url_from_config)
-            url, response = self.__execute_request(request, request_url_from_config, logger)
-
-            if request.get('withResponse'):
-                converter_queue.put(response)
-                return
-
-            if response and response.ok:
-                if not converter_queue.full():
-                    config_converter_data = [url, request["converter"]]
-                    try:
-                        json_response = response.json()
-
-                        # Unpack data if dataUnpackExpression is defined in config
-                        # This allows to unpack JSON responses that have final data at a sub key on any level
-                        # {
-                        #   "device": [...]
-                        # }
-                        data_unpack_expression = request["config"].get("dataUnpackExpression")
-                        if data_unpack_expression:
-                            json_response = TBUtility.get_value(data_unpack_expression, json_response, value_type="json")
-
-                        config_converter_data.append(json_response)
-                    except UnicodeDecodeError:
-                        config_converter_data.append(response.content)
-                    except JSONDecodeError:
-                        config_converter_data.append(response.content)
-
-                    if len(config_converter_data) == 3:
-                        # Process sub requests if defined in config
-                        if request["config"].get("subRequests"):
-                            self.__process_sub_requests(request, url, config_converter_data[2], logger)
-                        self.__convert_data(config_converter_data)
-            else:
-                logger.error("Request to URL: %s finished with code: %i", url, response.status_code)
+            url, response = self.__execute_request(request, self.__format_request_url(request["config"]["url"]),
+                                                   logger)
+            converter_queue.put(response)
         except Timeout:
             logger.error("Timeout error on request %s.", url)
         except RequestException as e:
@@ -312,8 +322,57 @@ class RequestConnector(Connector, Thread):
         except Exception as e:
             logger.exception(e)
 
+    async def __poll_request(self, request):
+        url = ""
+        request["inProgress"] = True
+        try:
+            if request.get("converter") is None and isinstance(request["config"].get("converter"), dict):
+                self._log.error("Converter for request to '%s' endpoint is not defined. Request will be skipped.",
+                                request["config"].get("url"))
+                return
+
+            request_url_from_config = self.__format_request_url(request["config"]["url"])
+            self._log.debug("Obtained request url from config - %s ", request_url_from_config)
+            url = self.__get_full_url(request_url_from_config)
+            is_ok, data = await self.__execute_async_request(request, url)
+            if not is_ok:
+                return
+
+            # Unpack data if dataUnpackExpression is defined in config
+            # This allows to unpack JSON responses that have final data at a sub key on any level
+            # {
+            #   "device": [...]
+            # }
+            data_unpack_expression = request["config"].get("dataUnpackExpression")
+            if data_unpack_expression and not isinstance(data, bytes):
+                data = TBUtility.get_value(data_unpack_expression, data, value_type="json")
+
+            # Process sub requests if defined in config
+            if request["config"].get("subRequests") and not isinstance(data, bytes):
+                await self.__process_sub_requests(request, url, data)
+            self.__convert_data([url, request["converter"], data])
+        except asyncio.TimeoutError:
+            self._log.error("Timeout error on request %s.", url)
+        except (ClientError, ConnectionError) as e:
+            self._log.error("Cannot connect to %s. Connection error.", url)
+            self._log.debug(e)
+        except Exception as e:
+            self._log.exception(e)
+        finally:
+            request["inProgress"] = False
+
+    @staticmethod
+    def __format_request_url(request_url):
+        if not request_url.startswith("/") and not request_url.startswith("http"):
+            return "/" + request_url
+
+        return request_url
+
+    def __get_full_url(self, request_url):
+        return self.__host + request_url if not request_url.lower().startswith("http") else request_url
+
     def __execute_request(self, request, request_url, logger):
-        url = self.__host + request_url if not request_url.lower().startswith("http") else request_url
+        url = self.__get_full_url(request_url)
 
         request_timeout = request["config"].get("timeout", 1)
         params = {
@@ -337,6 +396,29 @@ class RequestConnector(Connector, Thread):
 
         return url, response
 
+    async def __execute_async_request(self, request, url):
+        """Returns the flag of the successful response and the parsed JSON or the raw content of the response."""
+
+        data = request["config"].get("data")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        self._log.debug("Request to %s will be sent", url)
+        async with self.__session.request(request["config"].get("httpMethod", "GET"), url,
+                                          timeout=ClientTimeout(total=request["config"].get("timeout", 1)),
+                                          allow_redirects=request["config"].get("allowRedirects", False),
+                                          headers=request["config"].get("httpHeaders"),
+                                          data=data or None) as response:
+            content = await response.read()
+            if not response.ok:
+                self._log.error("Request to URL: %s finished with code: %i", url, response.status)
+                return False, None
+
+        try:
+            return True, loads(content)
+        except (UnicodeDecodeError, ValueError):
+            return True, content
+
     def __convert_data(self, data):
         try:
             url, converter, data = data
@@ -355,7 +437,8 @@ class RequestConnector(Connector, Thread):
                 data_to_send.append(converter.convert(url, data))
 
             for to_send in data_to_send:
-                self.__convert_queue.put(to_send)
+                if to_send and (to_send.attributes_datapoints_count > 0 or to_send.telemetry_datapoints_count > 0):
+                    self.__gateway.send_to_storage(self.get_name(), self.get_id(), to_send)
 
         except Exception as e:
             self._log.exception(e)
@@ -368,16 +451,6 @@ class RequestConnector(Connector, Thread):
             if data.get("ts") is None:
                 data["ts"] = int(time() * 1000)
 
-    def __process_data(self):
-        try:
-            if not self.__convert_queue.empty():
-                data: ConvertedData = self.__convert_queue.get()
-                if data and (data.attributes_datapoints_count > 0 or data.telemetry_datapoints_count > 0):
-                    self.__gateway.send_to_storage(self.get_name(), self.get_id(), data)
-
-        except Exception as e:
-            self._log.exception(e)
-
     def get_id(self):
         return self.__id
 
@@ -399,68 +472,81 @@ class RequestConnector(Connector, Thread):
 
     def close(self):
         self.__stopped = True
+        if self.is_alive():
+            self.join(timeout=5)
         self._log.info("%r has been stopped.", self.name)
         self._log.stop()
 
     def get_config(self):
         return self.__config
 
-    def __process_sub_requests(self, request, url, data, logger):
+    async def __process_sub_requests(self, request, url, data):
         datatypes = {"attributes": "attributes",
                      "telemetry": "telemetry"}
         data = data if isinstance(data, list) else [data]
 
+        sub_requests = []
         for data_item in data:
             for datatype in datatypes:
                 for datatype_object_config in request["config"]["converter"].get(datatype, []):
                     # Check if a sub request for key is needed
                     key = datatype_object_config.get("key")
                     if key in request["config"].get("subRequests", {}):
-                        request_url_from_config = TBUtility.replace_params_tags(request["config"]["subRequests"][key]["url"],
-                                                                                {"data": data_item})
-
-                        if not request_url_from_config.lower().startswith("http"):
-                            if not request_url_from_config.startswith("/"):
-                                request_url_from_config = "/" + request_url_from_config
-                            request_url_from_config = url + request_url_from_config
-                        logger.debug("Sub request needed for key %s with url %s", key, request_url_from_config)
-
-                        response = self.__send_sub_request(request, request_url_from_config, logger)
-                        logger.debug("Sub request response: %s", response)
-
-                        # Only if a response is available, process it
-                        if response:
-                            result = response
-                            # Make processing function available if defined and call it
-                            processing_function = request["config"]["subRequests"][key].get("processingFunction")
-                            if processing_function:
-                                logger.trace("Processing sub request response with function:\n%s", processing_function)
-                                local_scope = {}
-                                exec(processing_function, {}, local_scope)
-                                result = local_scope["process_data"](response, key)
-                            # Update data with result of sub request
-                            data_item.update(result)
-                            logger.debug("Data after sub request processing: %s", data_item)
-
-    def __send_sub_request(self, request, sub_request_url, logger):
-        url = ""
+                        sub_requests.append((data_item, key))
+
+        if request["config"].get("concurrentSubRequests", DEFAULT_CONCURRENT_SUB_REQUESTS):
+            # Sub requests are sent concurrently, results are applied to the data in the order of the configuration
+            responses = await asyncio.gather(*(self.__send_sub_request(request,
+                                                                       self.__get_sub_request_url(request, url,
+                                                                                                  data_item, key))
+                                               for data_item, key in sub_requests))
+            for (data_item, key), response in zip(sub_requests, responses):
+                self.__apply_sub_request_response(request, data_item, key, response)
+        else:
+            # Sub requests are sent one by one, so the url of the sub request can use results of the previous ones
+            for data_item, key in sub_requests:
+                response = await self.__send_sub_request(request,
+                                                         self.__get_sub_request_url(request, url, data_item, key))
+                self.__apply_sub_request_response(request, data_item, key, response)
+
+    def __get_sub_request_url(self, request, url, data_item, key):
+        request_url_from_config = TBUtility.replace_params_tags(request["config"]["subRequests"][key]["url"],
+                                                                {"data": data_item})
+
+        if not request_url_from_config.lower().startswith("http"):
+            if not request_url_from_config.startswith("/"):
+                request_url_from_config = "/" + request_url_from_config
+            request_url_from_config = url + request_url_from_config
+        self._log.debug("Sub request needed for key %s with url %s", key, request_url_from_config)
+        return request_url_from_config
+
+    def __apply_sub_request_response(self, request, data_item, key, response):
+        self._log.debug("Sub request response: %s", response)
+
+        # Only if a response is available, process it
+        if response:
+            result = response
+            # Make processing function available if defined and call it
+            processing_function = request["config"]["subRequests"][key].get("processingFunction")
+            if processing_function:
+                self._log.trace("Processing sub request response with function:\n%s", processing_function)
+                local_scope = {}
+                exec(processing_function, {}, local_scope)
+                result = local_scope["process_data"](response, key)
+            # Update data with result of sub request
+            data_item.update(result)
+            self._log.debug("Data after sub request processing: %s", data_item)
+
+    async def __send_sub_request(self, request, sub_request_url):
+        url = self.__get_full_url(sub_request_url)
         try:
-            url, response = self.__execute_request(request, sub_request_url, logger)
-            if response and response.ok:
-                try:
-                    return response.json()
-                except UnicodeDecodeError:
-                    return response.content
-                except JSONDecodeError:
-                    return response.content
-            else:
-                logger.error("Request to URL: %s finished with code: %i", url, response.status_code)
-        except Timeout:
-            logger.error("Timeout error on request %s.", url)
-        except RequestException as e:
-            logger.error("Cannot connect to %s. Connection error.", url)
-            logger.debug(e)
-        except ConnectionError:
-            logger.error("Cannot connect to %s. Connection error.", url)
+            is_ok, data = await self.__execute_async_request(request, url)
+            if is_ok:
+                return data
+        except asyncio.TimeoutError:
+            self._log.error("Timeout error on request %s.", url)
+        except (ClientError, ConnectionError) as e:
+            self._log.error("Cannot connect to %s. Connection error.", url)
+            self._log.debug(e)
         except Exception as e:
-            logger.exception(e)
+            self._log.exception(e)
@@ -18,9 +18,11 @@ from simplejson import dumps
 from thingsboard_gateway.connectors.rest.rest_converter import RESTConverter
 from thingsboard_gateway.gateway.constants import REPORT_STRATEGY_PARAMETER
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics
+from thingsboard_gateway.tb_utility.expression_template import ExpressionTemplate
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 
@@ -31,49 +33,66 @@ class JsonRESTUplinkConverter(RESTConverter):
         self._log = logger
         self.__config = config
 
+        # Expressions and report strategies are prepared once, the converter is reused for all requests
+        device_info = self.__config.get("deviceInfo") or {}
+        self.__device_name_expression = self.__compile_device_info_expression(device_info, "deviceName")
+        self.__device_profile_expression = self.__compile_device_info_expression(device_info, "deviceProfile")
+        self.__device_report_strategy = None
+        try:
+            self.__device_report_strategy = ReportStrategyConfig(self.__config.get(REPORT_STRATEGY_PARAMETER))
+        except ValueError as e:
+            self._log.trace("Report strategy config is not specified for converter: %s", e)
+        self.__datapoints = [(datatype == 'attributes', datatype_config, *self.__compile_datapoint(datatype_config))
+                             for datatype in ('attributes', 'timeseries')
+                             for datatype_config in self.__config.get(datatype, [])]
+
+    @staticmethod
+    def __compile_device_info_expression(device_info, name):
+        expression = device_info.get(name + "Expression")
+        if expression is None or device_info.get(name + "ExpressionSource") == "constant":
+            return expression
+
+        return ExpressionTemplate.compile(expression)
+
+    def __compile_datapoint(self, datatype_config):
+        key_report_strategy = self.__device_report_strategy
+        if datatype_config.get(REPORT_STRATEGY_PARAMETER) is not None:
+            try:
+                key_report_strategy = ReportStrategyConfig(datatype_config.get(REPORT_STRATEGY_PARAMETER))
+            except ValueError:
+                self._log.trace("Report strategy config is not specified for key %s", datatype_config['key'])
+
+        key_template = ExpressionTemplate.compile(datatype_config['key'])
+        constant_datapoint_key = None
+        if not key_template.has_placeholders:
+            constant_datapoint_key = DatapointKey(key_template.expression, key_report_strategy)
+
+        return (key_template, ExpressionTemplate.compile(datatype_config['value']), key_report_strategy,
+                constant_datapoint_key)
+
+    @staticmethod
+    def __render_device_info_expression(expression, data):
+        if expression is None or isinstance(expression, str):
+            return expression
+
+        return expression.render(data, expression_instead_none=True)
+
     @CollectStatistics(start_stat_type='receivedBytesFromDevices',
                        end_stat_type='convertedBytesFromDevice')
     def convert(self, config, data):
-        datatypes = {"attributes": "attributes",
-                     "timeseries": "telemetry"}
         device_name = None
         device_type = None
 
         try:
             device_info = self.__config.get("deviceInfo")
             if device_info.get("deviceNameExpression") is not None:
-                if device_info.get("deviceNameExpressionSource") == "constant":
-                    device_name = device_info.get("deviceNameExpression")
-                else:
-                    device_name_tags = TBUtility.get_values(device_info.get("deviceNameExpression"), data, get_tag=True)
-                    device_name_values = TBUtility.get_values(device_info.get("deviceNameExpression"), data,
-                                                              expression_instead_none=True)
-                    device_name = device_info.get("deviceNameExpression")
-                    for (device_name_tag, device_name_value) in zip(device_name_tags, device_name_values):
-                        is_valid_key = "${" in device_info.get("deviceNameExpression") and "}" in \
-                                       device_info.get("deviceNameExpression")
-                        device_name = device_name.replace('${' + str(device_name_tag) + '}',
-                                                          str(device_name_value)) \
-                            if is_valid_key else device_name_tag
+                device_name = self.__render_device_info_expression(self.__device_name_expression, data)
             else:
                 self._log.error("The expression for looking \"device name\" not found in config %s",
                                 dumps(device_info))
 
             if device_info.get("deviceProfileExpression") is not None:
-                if device_info.get("deviceProfileExpressionSource") == "constant":
-                    device_type = device_info.get("deviceProfileExpression")
-                else:
-                    device_profile_tags = TBUtility.get_values(device_info.get("deviceProfileExpression"), data,
-                                                               get_tag=True)
-                    device_profile_values = TBUtility.get_values(device_info.get("deviceProfileExpression"), data,
-                                                                 expression_instead_none=True)
-                    device_type = device_info.get("deviceProfileExpression")
-                    for (device_profile_tag, device_profile_value) in zip(device_profile_tags, device_profile_values):
-                        is_valid_key = "${" in device_info.get("deviceProfileExpression") and "}" in \
-                                       device_info.get("deviceProfileExpression")
-                        device_type = device_type.replace('${' + str(device_profile_tag) + '}',
-                                                          str(device_profile_value)) \
-                            if is_valid_key else device_profile_tag
+                device_type = self.__render_device_info_expression(self.__device_profile_expression, data)
             else:
                 self._log.error("The expression for looking \"device profile\" not found in config %s",
                                 dumps(device_info))
@@ -83,48 +102,21 @@ class JsonRESTUplinkConverter(RESTConverter):
                             e)
 
         converted_data = ConvertedData(device_name=device_name, device_type=device_type)
-        device_report_strategy = None
-        try:
-            device_report_strategy = ReportStrategyConfig(self.__config.get(REPORT_STRATEGY_PARAMETER))
-        except ValueError as e:
-            self._log.trace("Report strategy config is not specified for device %s: %s", device_name, e)
 
         try:
-            for datatype in datatypes:
-                for datatype_config in self.__config.get(datatype, []):
-                    values = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                  expression_instead_none=False)
-                    values_tags = TBUtility.get_values(datatype_config["value"], data, datatype_config["type"],
-                                                       get_tag=True)
-
-                    keys = TBUtility.get_values(datatype_config["key"], data, datatype_config["type"],
-                                                expression_instead_none=False)
-                    keys_tags = TBUtility.get_values(datatype_config["key"], data, get_tag=True)
-
-                    full_key = datatype_config['key']
-                    for (key_tag, key) in zip(keys_tags, keys):
-                        is_valid_key = "${" in datatype_config["key"] and "}" in \
-                                       datatype_config["key"]
-                        full_key = full_key.replace('${' + str(key_tag) + '}',
-                                                    str(key)) if is_valid_key else key
-
-                    full_value = datatype_config['value']
-                    for (value_tag, value) in zip(values_tags, values):
-                        is_valid_value = "${" in datatype_config["value"] and "}" in \
-                                         datatype_config["value"]
-
-                        full_value = full_value.replace('${' + str(value_tag) + '}',
-                                                        str(value)) if is_valid_value else value
-
-                    if full_key != 'None' and full_value != 'None':
-                        datapoint_key = TBUtility.convert_key_to_datapoint_key(full_key, device_report_strategy,
-                                                                               datatype_config, self._log)
-                        if datatype == 'attributes':
-                            converted_data.add_to_attributes(datapoint_key, full_value)
-                        else:
-                            ts = TBUtility.resolve_different_ts_formats(data=data, config=datatype_config, logger=self._log)
-                            telemetry_entry = TelemetryEntry({datapoint_key: full_value}, ts)
-                            converted_data.add_to_telemetry(telemetry_entry)
+            for (is_attribute, datatype_config, key_template, value_template, key_report_strategy,
+                 constant_datapoint_key) in self.__datapoints:
+                full_key = key_template.render(data)
+                full_value = value_template.render(data)
+
+                if full_key != 'None' and full_value != 'None':
+                    datapoint_key = constant_datapoint_key or DatapointKey(full_key, key_report_strategy)
+                    if is_attribute:
+                        converted_data.add_to_attributes(datapoint_key, full_value)
+                    else:
+                        ts = TBUtility.resolve_different_ts_formats(data=data, config=datatype_config, logger=self._log)
+                        telemetry_entry = TelemetryEntry({datapoint_key: full_value}, ts)
+                        converted_data.add_to_telemetry(telemetry_entry)
         except Exception as e:
             StatisticsService.count_connector_message(self._log.name, 'convertersMsgDropped')
             self._log.error('Error in converter, for config: \n%s\n and message: \n%s\n %s', dumps(self.__config),
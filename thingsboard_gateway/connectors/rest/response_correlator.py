@@ -0,0 +1,104 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+import asyncio
+from itertools import count
+from typing import Dict, Optional, Tuple
+
+
+class ResponseCorrelator:
+    """
+    Passes the responses from ThingsBoard to the HTTP requests, that wait for them.
+    Every waiting request has its own future, keyed by the device name, the response key and the request id.
+    Futures are created and awaited in the event loop of the server, the responses, received in the other threads,
+    are passed to the event loop with call_soon_threadsafe.
+    """
+
+    def __init__(self, logger):
+        self._log = logger
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__request_ids = count()
+        self.__pending: Dict[Tuple[str, str], Dict[int, asyncio.Future]] = {}
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(futures) for futures in self.__pending.values())
+
+    def set_loop(self, loop: asyncio.AbstractEventLoop):
+        self.__loop = loop
+
+    def register(self, device_name: str, key: str) -> int:
+        """Creates the future for the request, must be called in the event loop. Returns the request id."""
+
+        request_id = next(self.__request_ids)
+        self.__pending.setdefault((device_name, key), {})[request_id] = self.__loop.create_future()
+        return request_id
+
+    async def wait(self, device_name: str, key: str, request_id: int, timeout: float):
+        """Returns the response for the request or raises asyncio.TimeoutError."""
+
+        future = self.__pending.get((device_name, key), {}).get(request_id)
+        if future is None:
+            raise KeyError('Request %i for device %s is not registered' % (request_id, device_name))
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.discard(device_name, key, request_id)
+
+    def discard(self, device_name: str, key: str, request_id: int):
+        futures = self.__pending.get((device_name, key))
+        if futures is None:
+            return
+
+        future = futures.pop(request_id, None)
+        if future is not None and not future.done():
+            future.cancel()
+        if not futures:
+            del self.__pending[(device_name, key)]
+
+    def complete(self, device_name: str, key: str, result, request_id: Optional[int] = None):
+        """
+        Passes the result to the request with the request id or to the oldest request, that waits for the key
+        of the device, if the request id is not known. Can be called from any thread.
+        """
+
+        self.__call_in_loop(self.__set_result, device_name, key, request_id, result, None)
+
+    def fail(self, device_name: str, key: str, request_id: int, exception: BaseException):
+        self.__call_in_loop(self.__set_result, device_name, key, request_id, None, exception)
+
+    def __call_in_loop(self, callback, *args):
+        if self.__loop is None or self.__loop.is_closed():
+            self._log.debug('Response for %s is skipped, server is not running', args[0])
+            return
+
+        self.__loop.call_soon_threadsafe(callback, *args)
+
+    def __set_result(self, device_name, key, request_id, result, exception):
+        futures = self.__pending.get((device_name, key), {})
+        if request_id is None:
+            # Futures are kept in the order of the requests, so the oldest not completed one gets the response
+            future = next((future for future in futures.values() if not future.done()), None)
+        else:
+            future = futures.get(request_id)
+
+        if future is None or future.done():
+            self._log.debug('No requests wait for response "%s" of device %s', key, device_name)
+            return
+
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
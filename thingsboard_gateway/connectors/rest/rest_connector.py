@@ -14,6 +14,7 @@
 
 import asyncio
 import json
+from functools import partial
 from queue import Queue
 from random import choice
 from re import fullmatch
@@ -28,6 +29,7 @@ from requests.auth import HTTPBasicAuth as HTTPBasicAuthRequest
 from requests.exceptions import RequestException, JSONDecodeError
 
 from thingsboard_gateway.connectors.rest.backward_compatibility_adapter import BackwardCompatibilityAdapter
+from thingsboard_gateway.connectors.rest.response_correlator import ResponseCorrelator
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 from thingsboard_gateway.tb_utility.tb_loader import TBModuleLoader
@@ -97,6 +99,10 @@ class RESTConnector(Connector, Thread):
         self.__attribute_type = {}
         self.__rpc_requests = []
         self.__attribute_updates = []
+        self.__response_correlator = ResponseCorrelator(self.__log)
+        self.__response_attributes = {endpoint['response']['responseAttribute']
+                                      for endpoint in self.__config.get('mapping', [])
+                                      if endpoint.get('response', {}).get('responseAttribute')}
         self.__fill_requests_from_TB()
 
     def load_endpoints(self):
@@ -150,7 +156,8 @@ class RESTConnector(Connector, Thread):
                 for http_method in mapping['HTTPMethods']:
                     handler = data_handlers[security_type](self.collect_statistic_and_send, self.get_name(),
                                                            self.get_id(), self.endpoints[mapping["endpoint"]],
-                                                           self.__converter_log, provider=self.__event_provider)
+                                                           self.__converter_log, provider=self.__event_provider,
+                                                           response_correlator=self.__response_correlator)
                     handlers.append(web.route(http_method, mapping['endpoint'], handler))
             except Exception as e:
                 self.__log.error("Error on creating handlers - %s", str(e))
@@ -207,6 +214,7 @@ class RESTConnector(Connector, Thread):
 
         self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
+        self.__response_correlator.set_loop(self._loop)
         self._loop.run_until_complete(self.__run_server())
         try:
             self._loop.run_forever()
@@ -271,11 +279,10 @@ class RESTConnector(Connector, Thread):
                     del response_queue
 
             # ONLY if initialized "response" section for endpoint
-            # check if attribute update relates to some responseAttribute
-            for endpoint in self.__config['mapping']:
-                response_attribute = endpoint.get('response', {}).get('responseAttribute')
-                if list(content['data'].keys())[0] == response_attribute:
-                    BaseDataHandler.responses_queue.put(content['data'][response_attribute])
+            # pass the response attribute to the request of the device, that waits for it
+            for response_attribute in self.__response_attributes.intersection(content['data']):
+                self.__response_correlator.complete(content['device'], response_attribute,
+                                                    content['data'][response_attribute])
         except Exception as e:
             self.__log.exception(e)
 
@@ -553,20 +560,33 @@ class RESTConnector(Connector, Thread):
 
 
 class BaseDataHandler:
-    responses_queue = Queue()
-    response_attribute_request = Queue()
+    ATTRIBUTE_REQUEST_RESPONSE_KEY = 'attributeRequest'
+    NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
 
-    def __init__(self, send_to_storage, name, id, endpoint, logger, provider=None):
+    def __init__(self, send_to_storage, name, id, endpoint, logger, provider=None, response_correlator=None):
         self.log = logger
         self.send_to_storage = send_to_storage
         self.connector_id = id
         self.__name = name
         self.__endpoint = endpoint
         self.__provider = provider
+        self.__response_correlator = response_correlator
 
         self.success_response = self.__endpoint['config'].get('response', {}).get('successResponse')
         self.unsuccessful_response = self.__endpoint['config'].get('response', {}).get('unsuccessfulResponse')
         self.response_expected = self.__endpoint['config'].get('response', {}).get('responseExpected', False)
+        self.response_attribute = self.__endpoint['config'].get('response', {}).get('responseAttribute')
+        self.response_timeout = self.__endpoint['config'].get('response', {}).get('timeout', 120)
+
+        # The converter is created once for the endpoint, the configuration of the endpoint is not changed
+        self.converter_config = None
+        self.converter = None
+        if self.__endpoint.get('converter') is not None:
+            self.converter_config = {**self.__endpoint['config']['converter'],
+                                     'reportStrategy': self.__endpoint['config'].get('reportStrategy')}
+            self.converter = self.__endpoint['converter'](self.converter_config, self.log)
+            self.log.debug("Converter config for endpoint %s: %r", self.__endpoint['config'].get('endpoint'),
+                           self.converter_config)
 
     @property
     def name(self):
@@ -617,28 +637,66 @@ class BaseDataHandler:
         return result
 
     async def _convert_data_from_request(self, request):
+        """
+        Returns the list of messages from the request. JSON array and NDJSON bodies contain several messages,
+        every message is completed with the path and the query parameters of the request.
+        """
+
         result = dict(request.match_info)
         result.update(dict(request.query))
 
         if request.content_type == "multipart/form-data":
             multipart_result = await self._handle_multipart_data(request, result)
-            return multipart_result
+            multipart_result.update(dict(request.query))
+            return [multipart_result]
+
+        if request.method == "GET":
+            return [result] if result else []
 
-        if request.method != "GET":
+        if request.content_type in self.NDJSON_CONTENT_TYPES:
+            messages = []
+            for line in (await request.text()).splitlines():
+                if line.strip():
+                    try:
+                        messages.append(json.loads(line))
+                    except json.decoder.JSONDecodeError as e:
+                        self.log.warning("Failed to parse NDJSON line %r: %s", line, e)
+        else:
             try:
                 json_data = await request.json()
-                if isinstance(json_data, list):
-                    json_data = json_data[0]
+                messages = json_data if isinstance(json_data, list) else [json_data]
             except json.decoder.JSONDecodeError:
                 data = await request.post()
                 if len(data):
-                    json_data = dict(data)
+                    messages = [dict(data)]
                 else:
-                    json_data = {"text": await request.text()}
+                    messages = [{"text": await request.text()}]
 
-            result.update(json_data)
+        return [{**result, **message, **request.query} for message in messages if isinstance(message, dict)]
 
-        return result
+    def convert_messages(self, messages):
+        """Converts all messages of the request in one pass, the data of the same device is merged."""
+
+        converted_data_by_device = {}
+        converted_data_list = []
+        for message in messages:
+            converted_data = self.converter.convert(config=self.converter_config, data=message)
+            if not converted_data:
+                continue
+
+            if not isinstance(converted_data, ConvertedData):
+                converted_data_list.append(converted_data)
+                continue
+
+            device_converted_data = converted_data_by_device.get(converted_data.device_name)
+            if device_converted_data is None:
+                converted_data_by_device[converted_data.device_name] = converted_data
+                converted_data_list.append(converted_data)
+            else:
+                device_converted_data.add_to_attributes(converted_data.attributes)
+                device_converted_data.add_to_telemetry(converted_data.telemetry)
+
+        return converted_data_list
 
     @staticmethod
     def modify_data_for_remote_response(data, modify):
@@ -649,36 +707,71 @@ class BaseDataHandler:
             else:
                 data['attributes'].append({'responseExpected': True})
 
-    def get_response(self):
+    @staticmethod
+    def get_device_name(converted_data):
+        if isinstance(converted_data, ConvertedData):
+            return converted_data.device_name
+
+        return converted_data.get('deviceName')
+
+    async def send_and_get_response(self, converted_data_list):
+        request_id = None
+        device_name = self.get_device_name(converted_data_list[0]) if converted_data_list else None
         if self.response_expected:
-            time_point = time()
-            while not time() - time_point >= self.endpoint['config'].get('response', {}).get('timeout', 120):
-                if not BaseDataHandler.responses_queue.empty():
-                    response = BaseDataHandler.responses_queue.get()
-                    return web.Response(body=str(response), status=200)
+            # The future is registered before sending, so the response can't come earlier than it is awaited.
+            # For the requests with several messages the response for the first device is awaited.
+            request_id = self.__response_correlator.register(device_name, self.response_attribute)
 
-                sleep(.2)
+        try:
+            for converted_data in converted_data_list:
+                self.modify_data_for_remote_response(converted_data, self.response_expected)
+                if (converted_data.attributes_datapoints_count > 0 or
+                        converted_data.telemetry_datapoints_count > 0):
+                    self.send_to_storage(self.name, self.connector_id, converted_data)
+                    self.log.debug("CONVERTED_DATA: %r", converted_data)
+        except Exception:
+            if request_id is not None:
+                self.__response_correlator.discard(device_name, self.response_attribute, request_id)
+            raise
 
-            return web.Response(body=str(self.unsuccessful_response) if self.unsuccessful_response else None,
-                                status=408)
+        return await self.get_response(device_name, request_id)
 
-        return web.Response(body=str(self.success_response) if self.success_response else None, status=200)
+    async def get_response(self, device_name=None, request_id=None):
+        if self.response_expected:
+            try:
+                response = await self.__response_correlator.wait(device_name, self.response_attribute, request_id,
+                                                                 self.response_timeout)
+                return web.Response(body=str(response), status=200)
+            except asyncio.TimeoutError:
+                return web.Response(body=str(self.unsuccessful_response) if self.unsuccessful_response else None,
+                                    status=408)
 
-    def process_attribute_request(self, data):
-        if self.processed_attribute_request(data):
-            time_point = time()
-            while not time() - time_point >= self.endpoint['config']['timeout']:
-                if not BaseDataHandler.response_attribute_request.empty():
-                    self.__provider('STATISTICS_MESSAGE_SEND')
-                    return web.Response(body=BaseDataHandler.response_attribute_request.get())
+        return web.Response(body=str(self.success_response) if self.success_response else None, status=200)
 
-                sleep(.2)
+    async def process_attribute_request(self, data):
+        attribute_request = self.processed_attribute_request(data)
+        if attribute_request is None:
+            return None
 
+        device_name, request_id = attribute_request
+        try:
+            response = await self.__response_correlator.wait(device_name, self.ATTRIBUTE_REQUEST_RESPONSE_KEY,
+                                                             request_id, self.__endpoint['config']['timeout'])
+        except asyncio.TimeoutError:
+            return web.Response(status=408)
+        except Exception as e:
+            self.log.error("Attribute request for device %s failed: %s", device_name, e)
             return web.Response(status=408)
 
-    @staticmethod
-    def attribute_request_callback(content, _):
-        BaseDataHandler.response_attribute_request.put(dumps(content))
+        self.__provider('STATISTICS_MESSAGE_SEND')
+        return web.Response(body=response)
+
+    def attribute_request_callback(self, device_name, request_id, content, error):
+        if error is not None:
+            self.__response_correlator.fail(device_name, self.ATTRIBUTE_REQUEST_RESPONSE_KEY, request_id, error)
+        else:
+            self.__response_correlator.complete(device_name, self.ATTRIBUTE_REQUEST_RESPONSE_KEY, dumps(content),
+                                                request_id=request_id)
 
     def processed_attribute_request(self, data):
         if self.__endpoint.get('type') == 'attributeRequest':
@@ -696,7 +789,7 @@ class BaseDataHandler:
                     if is_valid_key else device_name_tag
 
             if not device_name or device_name == '':
-                return False
+                return None
 
             found_attribute_names = list(filter(lambda x: x is not None,
                                                 TBUtility.get_values(
@@ -704,20 +797,26 @@ class BaseDataHandler:
                                                     data)))
 
             if found_attribute_names is None:
-                return False
+                return None
 
-            self.__endpoint['function'](device_name, found_attribute_names, self.attribute_request_callback)
+            request_id = self.__response_correlator.register(device_name, self.ATTRIBUTE_REQUEST_RESPONSE_KEY)
+            try:
+                self.__endpoint['function'](device_name, found_attribute_names,
+                                            partial(self.attribute_request_callback, device_name, request_id))
+            except Exception:
+                self.__response_correlator.discard(device_name, self.ATTRIBUTE_REQUEST_RESPONSE_KEY, request_id)
+                raise
             self.__provider('STATISTICS_MESSAGE_RECEIVED')
-            return True
+            return device_name, request_id
 
-        return False
+        return None
 
 
 class AnonymousDataHandler(BaseDataHandler):
     async def __call__(self, request: web.Request):
-        json_data = await self._convert_data_from_request(request)
+        messages = await self._convert_data_from_request(request)
 
-        if not json_data and not len(request.query):
+        if not messages and not len(request.query):
             return web.Response(body=str(self.unsuccessful_response) if self.unsuccessful_response else None,
                                 status=415)
 
@@ -726,29 +825,13 @@ class AnonymousDataHandler(BaseDataHandler):
             return web.Response(body=str(self.unsuccessful_response) if self.unsuccessful_response else None,
                                 status=405)
 
-        json_data.update(dict(request.query))
-        data = json_data
-
         # check if request is Attribute Request type
-        result = self.process_attribute_request(data)
+        result = await self.process_attribute_request(messages[0] if messages else dict(request.query))
         if isinstance(result, web.Response):
             return result
 
         try:
-            self.log.info("CONVERTER CONFIG: %r", endpoint_config['converter'])
-            converted_config = endpoint_config['converter']
-            converted_config.update({'reportStrategy': endpoint_config.get('reportStrategy')})
-            converter = self.endpoint['converter'](converted_config, self.log)
-            converted_data: ConvertedData = converter.convert(config=endpoint_config['converter'], data=data)
-
-            self.modify_data_for_remote_response(converted_data, self.response_expected)
-
-            if (converted_data and
-                    (converted_data.attributes_datapoints_count > 0 or
-                     converted_data.telemetry_datapoints_count > 0)):
-                self.send_to_storage(self.name, self.connector_id, converted_data)
-                self.log.info("CONVERTED_DATA: %r", converted_data)
-            return self.get_response()
+            return await self.send_and_get_response(self.convert_messages(messages))
         except Exception as e:
             self.log.exception("Error while post to anonymous handler: %s", e)
             return web.Response(body=str(self.success_response) if self.success_response else None, status=500)
@@ -767,9 +850,9 @@ class BasicDataHandler(BaseDataHandler):
 
         auth = BasicAuth.decode(request.headers['Authorization'])
         if self.verify(auth.login, auth.password):
-            json_data = await self._convert_data_from_request(request)
+            messages = await self._convert_data_from_request(request)
 
-            if not json_data:
+            if not messages:
                 return web.Response(body=str(self.unsuccessful_response) if self.unsuccessful_response else None,
                                     status=415)
 
@@ -779,35 +862,18 @@ class BasicDataHandler(BaseDataHandler):
                 return web.Response(body=str(self.unsuccessful_response) if self.unsuccessful_response else None,
                                     status=405)
 
-            json_data.update(dict(request.query))
-            data = json_data
-
             # check if request is Attribute Request type
-            result = self.process_attribute_request(data)
+            result = await self.process_attribute_request(messages[0])
             if isinstance(result, web.Response):
                 return result
 
             try:
-                StatisticsService.count_connector_message(self.name, stat_parameter_name='connectorMsgsReceived')
-                StatisticsService.count_connector_bytes(self.name, data, stat_parameter_name='connectorBytesReceived')
-
-                self.log.info("CONVERTER CONFIG: %r", endpoint_config['converter'])
-
-                converter_config = endpoint_config['converter']
-                converter_config.update({'reportStrategy': endpoint_config.get('reportStrategy')})
-
-                converter = self.endpoint['converter'](converter_config, self.log)
-                converted_data: ConvertedData = converter.convert(config=endpoint_config['converter'], data=data)
-
-                self.modify_data_for_remote_response(converted_data, self.response_expected)
-
-                if (converted_data and
-                        (converted_data.attributes_datapoints_count > 0 or
-                         converted_data.telemetry_datapoints_count > 0)):
-                    self.send_to_storage(self.name, self.connector_id, converted_data)
-                    self.log.info("CONVERTED_DATA: %r", converted_data)
+                StatisticsService.count_connector_message(self.name, stat_parameter_name='connectorMsgsReceived',
+                                                          count=len(messages))
+                StatisticsService.count_connector_bytes(self.name, messages,
+                                                        stat_parameter_name='connectorBytesReceived')
 
-                return self.get_response()
+                return await self.send_and_get_response(self.convert_messages(messages))
             except Exception as e:
                 self.log.exception("Error while post to basic handler: %s", e)
                 return web.Response(body=str(self.unsuccessful_response) if self.unsuccessful_response else None,
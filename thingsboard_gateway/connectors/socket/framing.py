@@ -0,0 +1,134 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from typing import List
+
+DEFAULT_MAX_FRAME_SIZE = 65536
+
+
+class FrameDecoder:
+    """
+    Splits the stream of bytes, received from one connection, into the messages.
+    The base decoder treats every received chunk of data as a message.
+    """
+
+    def __init__(self, config: dict):
+        self._max_frame_size = config.get('maxFrameSize', DEFAULT_MAX_FRAME_SIZE)
+
+    def feed(self, data: bytes) -> List[bytes]:
+        return [data] if data else []
+
+    def reset(self):
+        pass
+
+
+class DelimiterFrameDecoder(FrameDecoder):
+    """Messages are separated by the delimiter, the delimiter is not included into the message."""
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        delimiter = config.get('delimiter', '\n')
+        self.__delimiter = delimiter.encode('utf-8') if isinstance(delimiter, str) else bytes(delimiter)
+        if not self.__delimiter:
+            raise ValueError('Delimiter of the frames cannot be empty')
+        self.__buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        self.__buffer += data
+        frames = self.__buffer.split(self.__delimiter)
+        self.__buffer = bytearray(frames.pop())
+        if len(self.__buffer) > self._max_frame_size:
+            raise ValueError('Frame exceeds maximum size of %i bytes' % self._max_frame_size)
+
+        return [bytes(frame) for frame in frames if frame]
+
+    def reset(self):
+        self.__buffer = bytearray()
+
+
+class FixedLengthFrameDecoder(FrameDecoder):
+    """Every message has the same configured length."""
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self.__length = int(config['length'])
+        if self.__length <= 0:
+            raise ValueError('Length of the frames must be positive')
+        self.__buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        self.__buffer += data
+        frames_length = len(self.__buffer) - len(self.__buffer) % self.__length
+        frames = [bytes(self.__buffer[frame_start:frame_start + self.__length])
+                  for frame_start in range(0, frames_length, self.__length)]
+        del self.__buffer[:frames_length]
+        return frames
+
+    def reset(self):
+        self.__buffer = bytearray()
+
+
+class LengthPrefixFrameDecoder(FrameDecoder):
+    """
+    Every message starts with the length field of lengthFieldSize bytes, the length counts the payload only
+    or the payload with the length field, if lengthIncludesHeader is set. Only the payload is passed to the converter.
+    """
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self.__length_field_size = int(config.get('lengthFieldSize', 2))
+        if self.__length_field_size not in (1, 2, 4, 8):
+            raise ValueError('Length field size must be 1, 2, 4 or 8 bytes')
+        self.__byte_order = config.get('byteOrder', 'big').lower()
+        self.__length_includes_header = config.get('lengthIncludesHeader', False)
+        self.__buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        self.__buffer += data
+        frames = []
+        frame_start = 0
+        buffer_length = len(self.__buffer)
+        while buffer_length - frame_start >= self.__length_field_size:
+            length = int.from_bytes(self.__buffer[frame_start:frame_start + self.__length_field_size],
+                                    self.__byte_order)
+            frame_length = length if self.__length_includes_header else length + self.__length_field_size
+            if frame_length < self.__length_field_size or frame_length > self._max_frame_size:
+                raise ValueError('Invalid frame length %i' % length)
+            if buffer_length - frame_start < frame_length:
+                break
+
+            frames.append(bytes(self.__buffer[frame_start + self.__length_field_size:frame_start + frame_length]))
+            frame_start += frame_length
+
+        del self.__buffer[:frame_start]
+        return frames
+
+    def reset(self):
+        self.__buffer = bytearray()
+
+
+FRAME_DECODERS = {
+    'none': FrameDecoder,
+    'delimiter': DelimiterFrameDecoder,
+    'fixedlength': FixedLengthFrameDecoder,
+    'lengthprefix': LengthPrefixFrameDecoder,
+}
+
+
+def get_frame_decoder_class(config: dict):
+    framing_type = config.get('type', 'none').lower()
+    try:
+        return FRAME_DECODERS[framing_type]
+    except KeyError:
+        raise ValueError('Unknown framing type: %s' % config.get('type'))
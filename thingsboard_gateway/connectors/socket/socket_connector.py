@@ -12,8 +12,9 @@
 #     See the License for the specific language governing permissions and
 #     limitations under the License.
 
+import asyncio
 import socket
-from queue import Queue
+from queue import Empty, Queue
 from random import choice
 from re import findall, compile, fullmatch
 from string import ascii_lowercase
@@ -24,6 +25,7 @@ from simplejson import dumps
 
 from thingsboard_gateway.connectors.connector import Connector
 from thingsboard_gateway.connectors.socket.backward_compatibility_adapter import BackwardCompatibilityAdapter
+from thingsboard_gateway.connectors.socket.framing import get_frame_decoder_class
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.statistics.decorators import CollectStatistics, CollectAllReceivedBytesStatistics
 from thingsboard_gateway.tb_utility.tb_loader import TBModuleLoader
@@ -36,6 +38,8 @@ SOCKET_TYPE = {
     'UDP': socket.SOCK_DGRAM
 }
 DEFAULT_UPLINK_CONVERTER = 'BytesSocketUplinkConverter'
+DEFAULT_BACKLOG = 100
+MAX_CACHED_CLIENT_ADDRESSES = 10000
 
 
 class SocketConnector(Connector, Thread):
@@ -69,17 +73,27 @@ class SocketConnector(Connector, Thread):
         self._connected = False
         self.__bind = False
 
-        self.__socket_type = self.__config.get('socket', {}).get('type', 'TCP').upper()
-        self.__socket_address = self.__config.get('socket', {}).get('address', '127.0.0.1')
-        self.__socket_port = self.__config.get('socket', {}).get('port', 50000)
-        self.__socket_buff_size = self.__config.get('socket', {}).get('buffer_size', 1024)
-
-        self.__socket = socket.socket(socket.AF_INET, SOCKET_TYPE[self.__socket_type])
-        self.__socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        socket_config = self.__config.get('socket', {})
+        self.__socket_type = socket_config.get('type', 'TCP').upper()
+        if self.__socket_type not in SOCKET_TYPE:
+            raise ValueError('Unsupported socket type: %s' % self.__socket_type)
+        self.__socket_address = socket_config.get('address', '127.0.0.1')
+        self.__socket_port = socket_config.get('port', 50000)
+        self.__backlog = socket_config.get('backlog', DEFAULT_BACKLOG)
+        # Splitting of the TCP stream into the messages, by default every received chunk of data is a message
+        self.__framing_config = socket_config.get('framing', {})
+        self.__frame_decoder_class = get_frame_decoder_class(self.__framing_config)
+
+        self.__loop = None
+        self.__server = None
         self.__converting_requests = Queue(-1)
 
         self.__devices = {}
         self.__device_converters = {}
+        self.__device_converter_configs = {}
+        self.__exact_device_addresses = {}
+        self.__device_address_patterns = []
+        self.__client_device_addresses = {}
         self.__connections = {}
 
     def __convert_devices_list(self):
@@ -100,11 +114,23 @@ class SocketConnector(Connector, Thread):
             except Exception as e:
                 self.__log.debug("Cannot compile device address with regex! %r", e)
 
+            # Addresses without wildcards are found by the dictionary lookup, not matched with every message
+            if address_key is address or fullmatch(r'[\w.:\-]+', address):
+                self.__exact_device_addresses.setdefault(address, []).append(address_key)
+            else:
+                self.__device_address_patterns.append(address_key)
+
             module = self.__load_converter(device)
             converter = module(
                 {'deviceName': device['deviceName'],
                  'deviceType': device.get('deviceType', 'default')}, self.__converter_log) if module else None
             converters_for_devices[address_key] = converter
+            self.__device_converter_configs[address_key] = {
+                'encoding': device.get('encoding', 'utf-8').lower(),
+                'telemetry': device.get('telemetry', []),
+                'attributes': device.get('attributes', []),
+                'reportStrategy': device.get('reportStrategy')
+            }
 
             # validate attributeRequests requestExpression
             attr_requests = device.get('attributeRequests', [])
@@ -184,112 +210,107 @@ class SocketConnector(Connector, Thread):
         converting_thread = Thread(target=self.__process_data, daemon=True, name='Converter Thread')
         converting_thread.start()
 
+        self.__loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.__loop)
+        try:
+            self.__loop.run_until_complete(self.__serve())
+        finally:
+            self.__loop.close()
+
+    async def __serve(self):
         while not self.__bind and not self.__stopped:
             try:
-                self.__socket.bind((self.__socket_address, self.__socket_port))
+                await self.__start_server()
             except OSError as e:
                 self.__log.error('Error binding socket: %s', e)
-                sleep(3)
+                await asyncio.sleep(3)
             else:
                 self.__bind = True
 
         if self.__stopped:
-             return
-
-        if self.__socket_type == 'TCP':
-            self.__socket.listen(5)
+            return
 
         self.__log.info('%s socket is up', self.__socket_type)
 
+        # All the connections are served by the event loop of the connector thread
         while not self.__stopped:
-            try:
-                if self.__socket_type == 'TCP':
-                    try:
-                        if self.__socket.fileno() != -1:  # Check if the socket is open
-                            conn, address = self.__socket.accept()
-                            self.__connections[address] = conn
-
-                            self.__log.debug('New connection %s established', address)
-                            thread = Thread(target=self.__process_tcp_connection, daemon=True,
-                                            name=f'Processing {address} connection',
-                                            args=(conn, address))
-                            thread.start()
-                    except OSError as e:
-                        if self.__stopped:
-                            break
-                        self.__log.error('Error accepting connection: %s', e)
-                else:
-                    data, client_address = self.__socket.recvfrom(self.__socket_buff_size)
-                    self.__converting_requests.put((client_address, data))
-            except ConnectionAbortedError:
-                self.__socket.close()
+            await asyncio.sleep(.2)
 
-    def __process_tcp_connection(self, connection, address):
-        while not self.__stopped:
-            data = connection.recv(self.__socket_buff_size)
+        self.__server.close()
+        for transport in list(self.__connections.values()):
+            transport.close()
+        self.__connections.clear()
 
-            if data:
-                self.__converting_requests.put((address, data))
-            else:
-                break
+    async def __start_server(self):
+        if self.__socket_type == 'TCP':
+            self.__server = await self.__loop.create_server(
+                lambda: TcpConnectionProtocol(self.__connections, self.__converting_requests,
+                                              self.__frame_decoder_class(self.__framing_config), self.__log),
+                self.__socket_address, self.__socket_port, family=socket.AF_INET, reuse_address=True,
+                backlog=self.__backlog)
+        else:
+            self.__server, _ = await self.__loop.create_datagram_endpoint(
+                lambda: UdpServerProtocol(self.__converting_requests, self.__log),
+                local_addr=(self.__socket_address, self.__socket_port), family=socket.AF_INET)
 
-        connection.close()
-        self.__connections.pop(address)
-        self.__log.debug('Connection %s closed', address)
+    def __get_device_addresses(self, client_address):
+        device_addresses = self.__client_device_addresses.get(client_address)
+        if device_addresses is None:
+            device_addresses = self.__exact_device_addresses.get(client_address, []) + [
+                address_pattern for address_pattern in self.__device_address_patterns
+                if address_pattern.fullmatch(client_address)]
+
+            if len(self.__client_device_addresses) >= MAX_CACHED_CLIENT_ADDRESSES:
+                self.__client_device_addresses.clear()
+            self.__client_device_addresses[client_address] = device_addresses
+
+        return device_addresses
 
     def __process_data(self):
         while not self.__stopped:
-            if not self.__converting_requests.empty():
-                (address, port), data = self.__converting_requests.get()
-                for conf_device_address in self.__devices:
-                    client_address = f"{address}:{port}"
-                    if client_address != conf_device_address and not fullmatch(conf_device_address, client_address):
+            try:
+                (address, port), data = self.__converting_requests.get(timeout=.2)
+            except Empty:
+                continue
+
+            client_address = f"{address}:{port}"
+            for conf_device_address in self.__get_device_addresses(client_address):
+                device = self.__devices.get(conf_device_address)
+                device['address'] = client_address
+
+                # check data for attribute requests
+                is_attribute_request = False
+                attr_requests = device.get('attributeRequests', [])
+                if len(attr_requests):
+                    for attr in attr_requests:
+                        equal = data
+                        if attr['haveIndex']:
+                            if attr.get('requestIndexFrom') and attr.get('requestIndexTo'):
+                                index_from = int(attr['requestIndexFrom']) if attr['requestIndexFrom'] != '' else None
+                                index_to = int(attr['requestIndexTo']) if attr['requestIndexTo'] != '' else None
+                                equal = data[index_from:index_to]
+                            else:
+                                equal = data[int(attr['requestIndex'])]
+
+                        if attr['requestEqual'] == equal.decode('utf-8'):
+                            is_attribute_request = True
+                            self.__process_attribute_request(device['deviceName'], attr, data)
+
+                    if is_attribute_request:
                         continue
-                    device = self.__devices.get(conf_device_address)
-                    device['address'] = client_address
-
-                    # check data for attribute requests
-                    is_attribute_request = False
-                    attr_requests = device.get('attributeRequests', [])
-                    if len(attr_requests):
-                        for attr in attr_requests:
-                            equal = data
-                            if attr['haveIndex']:
-                                if attr.get('requestIndexFrom') and attr.get('requestIndexTo'):
-                                    index_from = int(attr['requestIndexFrom']) if attr['requestIndexFrom'] != '' else None
-                                    index_to = int(attr['requestIndexTo']) if attr['requestIndexTo'] != '' else None
-                                    equal = data[index_from:index_to]
-                                else:
-                                    equal = data[int(attr['requestIndex'])]
-    
-                            if attr['requestEqual'] == equal.decode('utf-8'):
-                                is_attribute_request = True
-                                self.__process_attribute_request(device['deviceName'], attr, data)
-    
-                        if is_attribute_request:
-                            continue
-
-                    StatisticsService.count_connector_message(self.name, stat_parameter_name='connectorMsgsReceived')
-                    StatisticsService.count_connector_bytes(self.name, data,
-                                                            stat_parameter_name='connectorBytesReceived')
-                    converter = self.__device_converters.get(conf_device_address)
-                    self.__convert_data(device, data, converter)
-
-            sleep(.2)
-
-    def __convert_data(self, device, data, converter):
-        address, port = device['address'].split(':')
+
+                StatisticsService.count_connector_message(self.name, stat_parameter_name='connectorMsgsReceived')
+                StatisticsService.count_connector_bytes(self.name, data,
+                                                        stat_parameter_name='connectorBytesReceived')
+                converter = self.__device_converters.get(conf_device_address)
+                self.__convert_data(device, data, converter, self.__device_converter_configs[conf_device_address])
+
+    def __convert_data(self, device, data, converter, device_config):
         if not converter:
-            self.__log.error('Converter not found for %s:%s', address, port)
+            self.__log.error('Converter not found for %s', device['address'])
             return
 
         try:
-            device_config = {
-                'encoding': device.get('encoding', 'utf-8').lower(),
-                'telemetry': device.get('telemetry', []),
-                'attributes': device.get('attributes', []),
-                'reportStrategy': device.get('reportStrategy')
-            }
             converted_data: ConvertedData = converter.convert(device_config, data)
 
             self.statistics['MessagesReceived'] = self.statistics['MessagesReceived'] + 1
@@ -347,15 +368,10 @@ class SocketConnector(Connector, Thread):
     def close(self):
         self.__stopped = True
         self._connected = False
+        if self.is_alive():
+            self.join(timeout=5)
         self.__log.info('%s connector has been stopped.', self.get_name())
         self.__connections = {}
-        while self.__socket.fileno() != -1:
-            try:
-                self.__socket.shutdown(socket.SHUT_RDWR)
-            except OSError:
-                pass  # Ignore errors when socket is already closed
-            self.__socket.close()
-            sleep(0.01)
         self.__log.stop()
 
     def get_name(self):
@@ -378,8 +394,12 @@ class SocketConnector(Connector, Thread):
 
     @CustomCollectStatistics(start_stat_type='allBytesSentToDevices')
     def __write_value_via_tcp(self, address, port, value):
+        if isinstance(value, str):
+            value = bytes(value, encoding='utf-8')
+
         try:
-            self.__connections[(address, int(port))].sendall(bytes(value, encoding='utf-8'))
+            transport = self.__connections[(address, int(port))]
+            self.__loop.call_soon_threadsafe(transport.write, value)
             return 'ok'
         except KeyError:
             try:
@@ -487,3 +507,47 @@ class SocketConnector(Connector, Thread):
             self.__log.error('Device not found')
         except Exception as e:
             self.__log.exception(e)
+
+
+class TcpConnectionProtocol(asyncio.Protocol):
+    def __init__(self, connections, converting_requests, frame_decoder, logger):
+        self.__connections = connections
+        self.__converting_requests = converting_requests
+        self.__frame_decoder = frame_decoder
+        self.__log = logger
+        self.__transport = None
+        self.__address = None
+
+    def connection_made(self, transport):
+        self.__transport = transport
+        self.__address = transport.get_extra_info('peername')[:2]
+        self.__connections[self.__address] = transport
+        self.__log.debug('New connection %s established', self.__address)
+
+    def data_received(self, data):
+        try:
+            frames = self.__frame_decoder.feed(data)
+        except ValueError as e:
+            self.__log.error('Invalid data received from %s, connection will be closed: %s', self.__address, e)
+            self.__transport.close()
+            return
+
+        for frame in frames:
+            self.__converting_requests.put((self.__address, frame))
+
+    def connection_lost(self, exc):
+        if self.__connections.get(self.__address) is self.__transport:
+            self.__connections.pop(self.__address)
+        self.__log.debug('Connection %s closed', self.__address)
+
+
+class UdpServerProtocol(asyncio.DatagramProtocol):
+    def __init__(self, converting_requests, logger):
+        self.__converting_requests = converting_requests
+        self.__log = logger
+
+    def datagram_received(self, data, address):
+        self.__converting_requests.put((address[:2], data))
+
+    def error_received(self, exc):
+        self.__log.debug('UDP socket error: %s', exc)
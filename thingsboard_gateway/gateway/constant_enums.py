@@ -37,3 +37,5 @@ class Status(Enum):
     SUCCESS = 3,
     NO_NEW_DATA = 4
     FORBIDDEN_DEVICE = 5
+    # Data is accepted, but the storage fill level is above the high watermark, connector should slow down
+    BACKPRESSURE = 6
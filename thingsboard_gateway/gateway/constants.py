@@ -26,6 +26,9 @@ TB_GW_DEV_DEBUG_SERVER_PORT = 5678
 STATISTIC_MESSAGE_RECEIVED_PARAMETER = "MessagesReceived"
 STATISTIC_MESSAGE_SENT_PARAMETER = "MessagesSent"
 
+# Poll period of the polling connectors is multiplied by this value while the storage backpressure is active
+BACKPRESSURE_POLL_PERIOD_MULTIPLIER = 2
+
 CONNECTOR_PARAMETER = "connector"
 CONVERTER_PARAMETER = "converter"
 UPLINK_PREFIX = "uplink_"
@@ -61,11 +64,24 @@ TELEMETRY_TIMESTAMP_PARAMETER = "ts"
 TELEMETRY_VALUES_PARAMETER = "values"
 METADATA_PARAMETER = "metadata"
 
+GATEWAY_TELEMETRY_TOPIC = "v1/gateway/telemetry"
+
 # Messages metadata constants
 RECEIVED_TS_PARAMETER = "receivedTs"
 CONVERTED_TS_PARAMETER = "convertedTs"
 SEND_TO_STORAGE_TS_PARAMETER = "sendToStorageTs"
 DATA_RETRIEVING_STARTED = "dataRetrieveStartedTs"
+PUT_TO_STORAGE_TS_PARAMETER = "putToStorageTs"
+
+# Pipeline stages for the latency statistics
+LATENCY_STAGE_RECEIVE_TO_CONVERT = "receiveToConvert"
+LATENCY_STAGE_CONVERT_TO_QUEUE = "convertToQueue"
+LATENCY_STAGE_QUEUE_TO_STORAGE = "queueToStorage"
+# Collected only in the latency debug mode, other events are stored without the storage timestamp
+LATENCY_STAGE_STORAGE_TO_PUBLISH = "storageToPublish"
+LATENCY_STAGE_PUBLISH_TO_ACK = "publishToAck"
+# Statistics key for the stages, that are measured for the whole event pack and not per connector
+GATEWAY_LATENCY_STATISTICS_KEY = "gateway"
 
 # Size of metadata that will be added to messages in debug mode
 # Connector name length should be added to the size of the metadata
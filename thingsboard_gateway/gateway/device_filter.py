@@ -2,6 +2,8 @@ import re
 
 import simplejson
 
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+
 
 class DeviceFilter:
     def __init__(self, config_path):
@@ -15,17 +17,25 @@ class DeviceFilter:
 
         return {'deny': {}, 'allow': {}}
 
+    @staticmethod
+    def get_device_name(data):
+        if isinstance(data, ConvertedData):
+            return data.device_name
+
+        return data['deviceName']
+
     def validate_device(self, connector_name, data):
+        device_name = self.get_device_name(data)
         for con_name, device_list in self._config['deny'].items():
             if con_name == connector_name:
                 for device in device_list:
-                    if re.fullmatch(device, data['deviceName']):
+                    if re.fullmatch(device, device_name):
                         return False
 
         for con_name, device_list in self._config['allow'].items():
             if con_name == connector_name:
                 for device in device_list:
-                    if re.fullmatch(device, data['deviceName']):
+                    if re.fullmatch(device, device_name):
                         return True
 
         return True
@@ -14,6 +14,8 @@
 
 from typing import List, Union
 
+from orjson import dumps, OPT_NON_STR_KEYS
+
 from thingsboard_gateway.gateway.constants import ATTRIBUTES_PARAMETER, TELEMETRY_PARAMETER, TIMESERIES_PARAMETER, \
     METADATA_PARAMETER
 from thingsboard_gateway.gateway.entities.attributes import Attributes
@@ -22,37 +24,41 @@ from thingsboard_gateway.gateway.entities.telemetry_entry import TelemetryEntry
 from thingsboard_gateway.tb_utility.tb_utility import TBUtility
 
 
-def split_large_entries(entries: dict, first_item_max_data_size: int, max_data_size: int, ts=None, ts_size=None):
+def get_entries_sizes(entries: dict) -> List[int]:
+    """Returns the sizes of the entries, each one is measured as a separate JSON object with a comma: {"key":value},"""
+    get_key_data_size = TBUtility.get_key_data_size
+    return [(original_key.get_data_size() if original_key.__class__ is DatapointKey
+             else get_key_data_size(original_key)) + len(dumps(value, option=OPT_NON_STR_KEYS)) + 4
+            for original_key, value in entries.items()]
+
+
+def split_large_entries(entries: dict, first_item_max_data_size: int, max_data_size: int, ts=None, ts_size=None,
+                        entries_sizes: List[int] = None):
     split_chunks = []
     split_chunk_sizes = []
-    current_chunk = {}
-    current_size = 0
-    ts_check = False
-
-    for original_key, value in entries.items():
-        entry_size = TBUtility.get_data_size({original_key.key: value}) + 1
-        if ts is not None and not ts_check:
-            entry_size += ts_size
-            ts_check = True
-
-        # Recalculate size after each addition and check if it exceeds the max size
-        if current_size + entry_size >= (first_item_max_data_size if not split_chunks else max_data_size):
-            # Append current chunk if it exceeds the max size
-            if current_chunk:
-                split_chunks.append(current_chunk)
-                split_chunk_sizes.append(current_size)
-                ts_check = False
-            # Start a new chunk
-            current_chunk = {original_key: value}  # New dict is created to avoid modifying the original dict
-            current_size = entry_size
-        else:
-            # Add to current chunk
-            current_chunk[original_key] = value
-            current_size += entry_size
+    chunk_overhead_size = ts_size if ts is not None else 0
+
+    entries_items = list(entries.items())
+    if entries_sizes is None:
+        entries_sizes = get_entries_sizes(entries)
+
+    current_chunk_start = 0
+    current_size = chunk_overhead_size
+    current_max_data_size = first_item_max_data_size
+    for index, entry_size in enumerate(entries_sizes):
+        # Close the current chunk if the entry does not fit into it, a single entry is never split
+        if current_size + entry_size >= current_max_data_size and index > current_chunk_start:
+            # New dict is created to avoid modifying the original dict
+            split_chunks.append(dict(entries_items[current_chunk_start:index]))
+            split_chunk_sizes.append(current_size)
+            current_chunk_start = index
+            current_size = chunk_overhead_size
+            current_max_data_size = max_data_size
+        current_size += entry_size
 
     # Add the last chunk if any
-    if current_chunk:
-        split_chunks.append(current_chunk)
+    if current_chunk_start < len(entries_items):
+        split_chunks.append(dict(entries_items[current_chunk_start:]))
         split_chunk_sizes.append(current_size)
 
     return zip(split_chunks, split_chunk_sizes)
@@ -190,14 +196,14 @@ class ConvertedData:
         current_data = ConvertedData(self.device_name, self.device_type, self.metadata)
         current_data_size = general_info_bytes_size
 
-        attributes_dict = self.attributes.to_dict()
-        if attributes_dict:
-            attributes_bytes_size = TBUtility.get_data_size(attributes_dict)
+        attributes_values = self.attributes.values
+        if attributes_values:
+            attributes_bytes_size = TBUtility.get_entries_data_size(attributes_values)
             if current_data_size + attributes_bytes_size <= max_data_size:
-                current_data.add_to_attributes(attributes_dict)
+                current_data.add_to_attributes(attributes_values)
                 current_data_size += attributes_bytes_size
             else:
-                split_attributes_and_sizes = split_large_entries(attributes_dict,
+                split_attributes_and_sizes = split_large_entries(attributes_values,
                                                                  max_data_size - current_data_size,
                                                                  available_data_size)
                 for data_chunk, chunk_size in split_attributes_and_sizes:
@@ -210,10 +216,12 @@ class ConvertedData:
 
         for telemetry_entry in self.telemetry:
             telemetry_values = telemetry_entry.values
-            ts_data_size = TBUtility.get_data_size({"ts": telemetry_entry.ts}) + 1
+            ts_data_size = TBUtility.get_entries_data_size({"ts": telemetry_entry.ts}) + 1
 
-            telemetry_obj_size = TBUtility.get_data_size(
-                {datapoint_key.key: value for datapoint_key, value in telemetry_values.items()}) + ts_data_size
+            telemetry_values_sizes = get_entries_sizes(telemetry_values)
+            # {"key":value,...}
+            telemetry_obj_size = (sum(telemetry_values_sizes) - 2 * len(telemetry_values_sizes) + 1
+                                  if telemetry_values_sizes else 2) + ts_data_size
 
             if telemetry_obj_size <= max_data_size - current_data_size:
                 current_data.add_to_telemetry(telemetry_entry)
@@ -223,7 +231,8 @@ class ConvertedData:
                                                                 max_data_size - current_data_size,
                                                                 available_data_size,
                                                                 telemetry_entry.ts,
-                                                                ts_data_size)
+                                                                ts_data_size,
+                                                                telemetry_values_sizes)
                 for telemetry_chunk, chunk_size in split_telemetry_and_sizes:
 
                     if current_data_size + chunk_size > max_data_size:
@@ -15,6 +15,8 @@
 #
 # ------------------------------------------------------------------------------
 
+from orjson import dumps
+
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 
 
@@ -22,6 +24,8 @@ class DatapointKey:
     def __init__(self, key, report_strategy: ReportStrategyConfig = None):
         self.key = key
         self.report_strategy = report_strategy
+        self.__hash = hash((key, report_strategy))
+        self.__data_size = None
 
     def __str__(self):
         return f"DatapointKey(key={self.key}, report_strategy={self.report_strategy})"
@@ -29,8 +33,14 @@ class DatapointKey:
     def __repr__(self):
         return self.__str__()
 
+    def get_data_size(self):
+        """Returns the length of the key name encoded as a JSON string, the value is computed once."""
+        if self.__data_size is None:
+            self.__data_size = len(dumps(self.key if isinstance(self.key, str) else str(self.key)))
+        return self.__data_size
+
     def __hash__(self):
-        return hash((self.key, self.report_strategy))
+        return self.__hash
 
     def __eq__(self, other):
         if isinstance(other, DatapointKey):
@@ -31,7 +31,11 @@ class TelemetryEntry:
         self.ts = ts
         self.metadata = {}
         self.values: Dict[DatapointKey, Any] = values
-        self.data_size = TBUtility.get_data_size(self.to_dict())
+
+    @property
+    def data_size(self):
+        # {"ts":ts,"values":{...}}
+        return TBUtility.get_data_size(self.ts) + TBUtility.get_entries_data_size(self.values) + 17
 
     def __str__(self):
         return f"TelemetryEntry(ts={self.ts}, metadata={self.metadata}, values={self.values})"
@@ -11,15 +11,25 @@
 #      WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #      See the License for the specific language governing permissions and
 #      limitations under the License.
+import logging
 from time import time
 from typing import Union
 
 from simplejson import dumps
 
-from thingsboard_gateway.connectors.converter import Converter, log
-from thingsboard_gateway.gateway.constant_enums import DownlinkMessageType
+from thingsboard_gateway.connectors.converter import Converter
+from thingsboard_gateway.gateway.constant_enums import DownlinkMessageType, Status
 from thingsboard_gateway.gateway.proto.messages_pb2 import *
 
+log = logging.getLogger('grpc')
+
+# Gateway statuses, that are not present in ResponseStatus of the protocol
+RESPONSE_STATUS_NAMES = {
+    Status.BACKPRESSURE: "SUCCESS",
+    Status.NO_NEW_DATA: "SUCCESS",
+    Status.FORBIDDEN_DEVICE: "FAILURE"
+}
+
 
 class GrpcDownlinkConverter(Converter):
     def __init__(self):
@@ -56,7 +66,7 @@ class GrpcDownlinkConverter(Converter):
                 additional_message.gatewayAttributesMsg.MergeFrom(GatewayAttributesMsg())
             else:
                 basic_msg.response.connectorMessage.MergeFrom(additional_message)
-        basic_msg.response.status = ResponseStatus.Value(msg.name)
+        basic_msg.response.status = ResponseStatus.Value(RESPONSE_STATUS_NAMES.get(msg, msg.name))
 
     @staticmethod
     def __convert_connector_configuration_msg(basic_msg, msg, additional_data=None):
@@ -12,10 +12,14 @@
 #      See the License for the specific language governing permissions and
 #      limitations under the License.
 
-from thingsboard_gateway.connectors.converter import Converter, log
+import logging
+
+from thingsboard_gateway.connectors.converter import Converter
 from thingsboard_gateway.gateway.proto.messages_pb2 import ConnectMsg, DisconnectMsg, GatewayAttributesMsg, GatewayAttributesRequestMsg, GatewayClaimMsg, \
     GatewayRpcResponseMsg, GatewayTelemetryMsg, KeyValueProto, KeyValueType, Response
 
+log = logging.getLogger('grpc')
+
 
 class GrpcUplinkConverter(Converter):
     def __init__(self):
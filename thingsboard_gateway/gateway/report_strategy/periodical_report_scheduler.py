@@ -0,0 +1,93 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from heapq import heappush, heappop, heapify
+from itertools import count
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+
+class PeriodicalReportScheduler:
+    """
+    Deadline ordered queue of the report strategy cache keys, which should be reported periodically.
+    Keys are stored in a heap ordered by the next report time, so every tick touches only the keys that are due.
+    Rescheduling or removing a key does not touch the heap, the outdated heap entries are skipped when popped.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[int, int, Tuple]] = []
+        self._scheduled: Dict[Tuple, int] = {}
+        self._sequence = count()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._scheduled)
+
+    def __contains__(self, key):
+        return key in self._scheduled
+
+    def schedule(self, key: Tuple, deadline: int):
+        with self._lock:
+            entry_id = next(self._sequence)
+            self._scheduled[key] = entry_id
+            heappush(self._heap, (deadline, entry_id, key))
+
+    def schedule_many(self, keys_with_deadlines: List[Tuple[Tuple, int]]):
+        with self._lock:
+            sequence = self._sequence
+            scheduled = self._scheduled
+            heap = self._heap
+            for key, deadline in keys_with_deadlines:
+                entry_id = next(sequence)
+                scheduled[key] = entry_id
+                heappush(heap, (deadline, entry_id, key))
+
+    def pop_due(self, current_time: int) -> List[Tuple]:
+        due_keys = []
+        with self._lock:
+            heap = self._heap
+            scheduled = self._scheduled
+            while heap and heap[0][0] <= current_time:
+                _, entry_id, key = heappop(heap)
+                if scheduled.get(key) == entry_id:
+                    del scheduled[key]
+                    due_keys.append(key)
+        return due_keys
+
+    def next_deadline(self) -> Optional[int]:
+        with self._lock:
+            while self._heap and self._scheduled.get(self._heap[0][2]) != self._heap[0][1]:
+                heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def remove(self, key: Tuple):
+        with self._lock:
+            self._scheduled.pop(key, None)
+
+    def remove_by_connector_id(self, connector_id):
+        with self._lock:
+            keys_to_remove = [key for key in self._scheduled if key[2] == connector_id]
+            for key in keys_to_remove:
+                del self._scheduled[key]
+            self.__compact()
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+            self._scheduled.clear()
+
+    def __compact(self):
+        if len(self._heap) > 2 * len(self._scheduled) + 1024:
+            self._heap = [entry for entry in self._heap if self._scheduled.get(entry[2]) == entry[1]]
+            heapify(self._heap)
@@ -14,12 +14,15 @@
 
 from time import monotonic
 from threading import Thread, Event, Lock
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List
 
 from thingsboard_gateway.gateway.constants import ReportStrategy, STRATEGIES_WITH_REPORT_PERIOD
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
 from thingsboard_gateway.gateway.entities.report_strategy_config import ReportStrategyConfig
 
+REPORT_STRATEGIES_WITH_VALUE_UPDATE = (ReportStrategy.ON_CHANGE, ReportStrategy.ON_REPORT_PERIOD,
+                                       ReportStrategy.ON_CHANGE_OR_REPORT_PERIOD)
+
 
 class ReportStrategyDataRecord:
     __slots__ = ["_value", "_device_name", "_device_type", "_connector_name",
@@ -69,6 +72,13 @@ class ReportStrategyDataRecord:
         else:
             return False
 
+    def next_report_time(self):
+        if self._report_strategy.report_strategy not in STRATEGIES_WITH_REPORT_PERIOD:
+            return None
+        if self._last_report_time is None:
+            return 0
+        return self._last_report_time + self._report_strategy.report_period - 50
+
     def to_send_format(self):
         return (self._connector_name, self._connector_id, self._device_name, self._device_type), self._value
 
@@ -77,75 +87,156 @@ class ReportStrategyDataRecord:
         return self._report_strategy
 
 
+def is_equal_values(old_value, new_value):
+    if isinstance(old_value, float) and isinstance(new_value, float):
+        return abs(old_value - new_value) < 0.001
+    else:
+        return old_value == new_value
+
+
 class ReportStrategyDataCache:
+    """
+    Cache is split into shards by device name, every shard has its own lock,
+    so connectors, that send data for different devices, do not wait for each other.
+    """
+
+    DEFAULT_SHARDS_COUNT = 16
+
     def __init__(self, config, logger):
         self._config = config
-        self._data_cache: Dict[Tuple, Tuple[ReportStrategyDataRecord, float]] = {}
-        self._lock = Lock()
+        shards_count = max(int(self._config.get("reportStrategyDataCacheShards", self.DEFAULT_SHARDS_COUNT)), 1)
+        # Shards count is rounded up to the power of two to select the shard by bit mask
+        shards_count = 1 << (shards_count - 1).bit_length()
+        self._shard_mask = shards_count - 1
+        self._shards: List[Dict[Tuple, Tuple[ReportStrategyDataRecord, float]]] = [{} for _ in range(shards_count)]
+        self._locks: List[Lock] = [Lock() for _ in range(shards_count)]
         self._cleanup_interval = self._config.get("reportStrategyDataCacheCleanupInterval", 3600)
         self._stop_event = Event()
-        self._cleanup_thread = Thread(target=self._cleanup_loop, daemon=True,
-                                      name="Reporting strategy data cache cleanup thread")
-        self._cleanup_thread.start()
         current_time = monotonic()
         self.__previous_cleanup_time = current_time
         self.__data_cache_current_ts = current_time
         self.__logger = logger
+        self._cleanup_thread = Thread(target=self._cleanup_loop, daemon=True,
+                                      name="Reporting strategy data cache cleanup thread")
+        self._cleanup_thread.start()
+
+    def __get_shard_index(self, device_name):
+        return hash(device_name) & self._shard_mask
+
+    def __get_expire_ts(self, report_strategy: ReportStrategyConfig):
+        return self.__data_cache_current_ts + report_strategy.ttl if report_strategy.ttl else 0
 
     def put(self, datapoint_key: DatapointKey, data: str, device_name,
             device_type, connector_name, connector_id, report_strategy,
             is_telemetry):
         key = (datapoint_key, device_name, connector_id)
-        expire_ts = self.__data_cache_current_ts + report_strategy.ttl if report_strategy.ttl else 0
+        expire_ts = self.__get_expire_ts(report_strategy)
         record = ReportStrategyDataRecord(
             data, device_name, device_type, connector_name,
             connector_id, report_strategy, is_telemetry
         )
-        with self._lock:
-            self._data_cache[key] = (record, expire_ts)
+        shard_index = self.__get_shard_index(device_name)
+        with self._locks[shard_index]:
+            self._shards[shard_index][key] = (record, expire_ts)
 
     def get(self, datapoint_key: DatapointKey, device_name, connector_id) -> Optional[ReportStrategyDataRecord]:
         key = (datapoint_key, device_name, connector_id)
-        with self._lock:
-            item = self._data_cache.get(key)
+        shard_index = self.__get_shard_index(device_name)
+        shard = self._shards[shard_index]
+        with self._locks[shard_index]:
+            item = shard.get(key)
             if not item:
                 return None
             record, expire_ts = item
             if 0 < expire_ts < self.__data_cache_current_ts:
-                del self._data_cache[key]
+                del shard[key]
                 return None
             return record
 
+    def filter_and_update(self, datapoint_key: DatapointKey, value, ts, device_name, device_type,
+                          connector_name, connector_id, report_strategy: ReportStrategyConfig,
+                          is_telemetry: bool, current_time: int) -> Tuple[bool, bool]:
+        """
+        Looks up the record for the datapoint, compares it with the received value and updates it
+        under a single shard lock acquisition.
+        Returns a tuple of flags: whether the datapoint should be reported and whether a new record was created.
+        """
+        key = (datapoint_key, device_name, connector_id)
+        shard_index = self.__get_shard_index(device_name)
+        shard = self._shards[shard_index]
+        strategy = report_strategy.report_strategy
+        with self._locks[shard_index]:
+            item = shard.get(key)
+            if item is not None:
+                record, expire_ts = item
+                if 0 < expire_ts < self.__data_cache_current_ts:
+                    item = None
+
+            if item is None:
+                record = ReportStrategyDataRecord(value, device_name, device_type, connector_name,
+                                                  connector_id, report_strategy, is_telemetry)
+                if strategy in STRATEGIES_WITH_REPORT_PERIOD:
+                    record._last_report_time = current_time
+                if is_telemetry:
+                    record._ts = ts
+                shard[key] = (record, self.__get_expire_ts(report_strategy))
+                return True, True
+
+            if strategy == ReportStrategy.ON_RECEIVED:
+                if is_telemetry:
+                    record._ts = ts
+                    shard[key] = (record, self.__get_expire_ts(record._report_strategy))
+                return True, False
+
+            if strategy not in REPORT_STRATEGIES_WITH_VALUE_UPDATE or is_equal_values(record._value, value):
+                return False, False
+
+            record._value = value
+            if is_telemetry:
+                record._ts = ts
+            shard[key] = (record, self.__get_expire_ts(record._report_strategy))
+            return strategy != ReportStrategy.ON_REPORT_PERIOD, False
+
     def update_last_report_time(self, datapoint_key: DatapointKey, device_name, connector_id, update_time):
         record = self.get(datapoint_key, device_name, connector_id)
         if record:
             record.update_last_report_time(update_time)
 
     def update_key_value(self, datapoint_key: DatapointKey, device_name, connector_id, value):
-        record = self.get(datapoint_key, device_name, connector_id)
-        if record:
-            record.update_value(value)
-            with self._lock:
-                expire_ts = self.__data_cache_current_ts + record.report_strategy.ttl if record.report_strategy.ttl else 0
-                self._data_cache[(datapoint_key, device_name, connector_id)] = (record, expire_ts)
+        self.__update_record(datapoint_key, device_name, connector_id, ReportStrategyDataRecord.update_value, value)
 
     def update_ts(self, datapoint_key: DatapointKey, device_name, connector_id, ts):
-        record = self.get(datapoint_key, device_name, connector_id)
-        if record:
-            record.update_ts(ts)
-            with self._lock:
-                expire_ts = self.__data_cache_current_ts + record.report_strategy.ttl if record.report_strategy.ttl else 0
-                self._data_cache[(datapoint_key, device_name, connector_id)] = (record, expire_ts)
+        self.__update_record(datapoint_key, device_name, connector_id, ReportStrategyDataRecord.update_ts, ts)
+
+    def __update_record(self, datapoint_key: DatapointKey, device_name, connector_id, update_method, value):
+        key = (datapoint_key, device_name, connector_id)
+        shard_index = self.__get_shard_index(device_name)
+        shard = self._shards[shard_index]
+        with self._locks[shard_index]:
+            item = shard.get(key)
+            if not item:
+                return
+            record, expire_ts = item
+            if 0 < expire_ts < self.__data_cache_current_ts:
+                del shard[key]
+                return
+            update_method(record, value)
+            shard[key] = (record, self.__get_expire_ts(record.report_strategy))
 
     def delete_all_records_for_connector_by_connector_id(self, connector_id):
-        with self._lock:
-            keys_to_delete = [key for key in self._data_cache if key[2] == connector_id]
-            for key in keys_to_delete:
-                del self._data_cache[key]
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                keys_to_delete = [key for key in shard if key[2] == connector_id]
+                for key in keys_to_delete:
+                    del shard[key]
 
     def clear(self):
-        with self._lock:
-            self._data_cache.clear()
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+
+    def __len__(self):
+        return sum(len(shard) for shard in self._shards)
 
     def stop(self):
         self._stop_event.set()
@@ -154,15 +245,15 @@ class ReportStrategyDataCache:
     def _cleanup_loop(self):
         while not self._stop_event.wait(1):
             self.__data_cache_current_ts = monotonic()
-            if self.__previous_cleanup_time - self.__data_cache_current_ts >= self._cleanup_interval:
+            if self.__data_cache_current_ts - self.__previous_cleanup_time >= self._cleanup_interval:
                 self.__previous_cleanup_time = monotonic()
-                with self._lock:
-
-                    keys_to_delete = []
-                    for key, (report_data_record, expire_ts) in self._data_cache.items():
-                        if report_data_record.report_strategy.report_strategy != ReportStrategy.ON_RECEIVED and \
-                                0 < expire_ts < self.__data_cache_current_ts:
-                            keys_to_delete.append(key)
-                    for key in keys_to_delete:
-                        del self._data_cache[key]
-                        self.__logger.debug("Removed expired record from cache: %s", key)
+                for shard, lock in zip(self._shards, self._locks):
+                    with lock:
+                        keys_to_delete = []
+                        for key, (report_data_record, expire_ts) in shard.items():
+                            if report_data_record.report_strategy.report_strategy != ReportStrategy.ON_RECEIVED and \
+                                    0 < expire_ts < self.__data_cache_current_ts:
+                                keys_to_delete.append(key)
+                        for key in keys_to_delete:
+                            del shard[key]
+                            self.__logger.debug("Removed expired record from cache: %s", key)
@@ -22,6 +22,9 @@ class CollectStatistics:
 
     def __call__(self, func):
         def inner(*args, **kwargs):
+            if not StatisticsService.ENABLED:
+                return func(*args, **kwargs)
+
             try:
                 _, __, data = args
                 self.collect(self.start_stat_type, data)
@@ -38,13 +41,15 @@ class CollectStatistics:
 
     @staticmethod
     def collect(stat_type, data):
-        bytes_count = str(data).__sizeof__()
-        StatisticsService.add_bytes(stat_type, bytes_count)
+        StatisticsService.add_count(stat_type, StatisticsService.get_bytes_count(data))
 
 
 class CollectAllReceivedBytesStatistics(CollectStatistics):
     def __call__(self, func):
         def inner(*args, **kwargs):
+            if not StatisticsService.ENABLED:
+                return func(*args, **kwargs)
+
             try:
                 _, data = args
                 self.collect(self.start_stat_type, data)
@@ -66,7 +71,7 @@ class CollectRPCReplyStatistics(CollectStatistics):
     def __call__(self, func):
         def inner(*args, **kwargs):
             data = kwargs.get('content')
-            if data:
+            if data and StatisticsService.ENABLED:
                 self.collect(self.start_stat_type, data)
 
             func(*args, **kwargs)
@@ -77,13 +82,14 @@ class CollectRPCReplyStatistics(CollectStatistics):
 class CollectStorageEventsStatistics(CollectStatistics):
     def __call__(self, func):
         def inner(*args, **kwargs):
-            try:
-                data = args[1]
-                connector_name = args[2]
-                if data:
-                    StatisticsService.count_connector_message(connector_name, self.start_stat_type)
-            except IndexError:
-                pass
+            if StatisticsService.ENABLED:
+                try:
+                    data = args[1]
+                    connector_name = args[2]
+                    if data:
+                        StatisticsService.count_connector_message(connector_name, self.start_stat_type)
+                except IndexError:
+                    pass
 
             func(*args, **kwargs)
 
@@ -93,7 +99,8 @@ class CollectStorageEventsStatistics(CollectStatistics):
 class CountMessage(CollectStatistics):
     def __call__(self, func):
         def inner(*args, **kwargs):
-            StatisticsService.add_count(self.start_stat_type)
+            if StatisticsService.ENABLED:
+                StatisticsService.add_count(self.start_stat_type)
             result = func(*args, **kwargs)
             return result
 
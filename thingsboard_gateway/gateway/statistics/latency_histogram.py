@@ -0,0 +1,98 @@
+#      Copyright 2026. ThingsBoard
+#  #
+#      Licensed under the Apache License, Version 2.0 (the "License");
+#      you may not use this file except in compliance with the License.
+#      You may obtain a copy of the License at
+#  #
+#          http://www.apache.org/licenses/LICENSE-2.0
+#  #
+#      Unless required by applicable law or agreed to in writing, software
+#      distributed under the License is distributed on an "AS IS" BASIS,
+#      WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#      See the License for the specific language governing permissions and
+#      limitations under the License.
+
+from threading import Lock
+
+# Values below 2 ** SUB_BUCKET_BITS milliseconds are counted exactly, every next power of two range
+# is split into 2 ** (SUB_BUCKET_BITS - 1) buckets, so the relative error of the percentiles is below 6.25%
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS_COUNT = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS_COUNT = SUB_BUCKETS_COUNT >> 1
+MAX_TRACKABLE_LATENCY_MS = (1 << 32) - 1
+BUCKETS_COUNT = SUB_BUCKETS_COUNT + (MAX_TRACKABLE_LATENCY_MS.bit_length() - SUB_BUCKET_BITS) * HALF_SUB_BUCKETS_COUNT
+DEFAULT_PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """
+    Histogram of latencies in milliseconds with the logarithmic buckets (like HDR histogram)
+    and fixed memory usage, latencies above ~50 days are counted in the last bucket.
+    """
+
+    __slots__ = ('__counts', '__total_count', '__max_latency', '__lock')
+
+    def __init__(self):
+        self.__counts = [0] * BUCKETS_COUNT
+        self.__total_count = 0
+        self.__max_latency = 0
+        self.__lock = Lock()
+
+    @property
+    def total_count(self) -> int:
+        return self.__total_count
+
+    def record(self, latency_ms):
+        latency_ms = min(max(int(latency_ms), 0), MAX_TRACKABLE_LATENCY_MS)
+        index = self.get_bucket_index(latency_ms)
+        with self.__lock:
+            self.__counts[index] += 1
+            self.__total_count += 1
+            if latency_ms > self.__max_latency:
+                self.__max_latency = latency_ms
+
+    @staticmethod
+    def get_bucket_index(latency_ms: int) -> int:
+        if latency_ms < SUB_BUCKETS_COUNT:
+            return latency_ms
+        shift = latency_ms.bit_length() - SUB_BUCKET_BITS
+        return SUB_BUCKETS_COUNT + (shift - 1) * HALF_SUB_BUCKETS_COUNT + (latency_ms >> shift) - HALF_SUB_BUCKETS_COUNT
+
+    @staticmethod
+    def get_bucket_highest_value(index: int) -> int:
+        if index < SUB_BUCKETS_COUNT:
+            return index
+        shift, sub_bucket = divmod(index - SUB_BUCKETS_COUNT, HALF_SUB_BUCKETS_COUNT)
+        shift += 1
+        return ((sub_bucket + HALF_SUB_BUCKETS_COUNT + 1) << shift) - 1
+
+    def get_percentile(self, percentile: float) -> int:
+        """Returns the highest latency of the bucket, that contains the percentile, but not more than maximal one."""
+        with self.__lock:
+            counts = list(self.__counts)
+            total_count = self.__total_count
+            max_latency = self.__max_latency
+        return self.__get_percentile(counts, total_count, max_latency, percentile)
+
+    def get_statistics(self, percentiles=DEFAULT_PERCENTILES) -> dict:
+        with self.__lock:
+            counts = list(self.__counts)
+            total_count = self.__total_count
+            max_latency = self.__max_latency
+        statistics = {"count": total_count}
+        for percentile in percentiles:
+            statistics["p" + ("%g" % percentile)] = self.__get_percentile(counts, total_count, max_latency, percentile)
+        statistics["max"] = max_latency
+        return statistics
+
+    @staticmethod
+    def __get_percentile(counts, total_count, max_latency, percentile) -> int:
+        if not total_count:
+            return 0
+        target_count = max(1, -(-total_count * percentile // 100))
+        cumulative_count = 0
+        for index, count in enumerate(counts):
+            cumulative_count += count
+            if cumulative_count >= target_count:
+                return min(LatencyHistogram.get_bucket_highest_value(index), max_latency)
+        return max_latency
@@ -14,14 +14,31 @@
 
 import datetime
 import subprocess
-from threading import Thread, RLock, Event
+from threading import Thread, RLock, Event, local, current_thread
 from time import monotonic, sleep
 from platform import system as platform_system
 
 import simplejson
+from orjson import dumps, OPT_NON_STR_KEYS
 
 from thingsboard_gateway.gateway.statistics.configs import ONCE_SEND_STATISTICS_CONFIG, SERVICE_STATS_CONFIG, \
     MACHINE_STATS_CONFIG
+from thingsboard_gateway.gateway.statistics.latency_histogram import LatencyHistogram
+
+
+class _CountersSlot:
+    """
+    Counters of a single thread. Only the owner thread writes the counters, they are never reset,
+    so the statistics thread merges the difference with the values it merged last time without any locks.
+    Keys are statistic names for the general statistics and (connector name, statistic name) tuples
+    for the connector statistics.
+    """
+    __slots__ = ('thread', 'counters', 'merged_counters')
+
+    def __init__(self, thread):
+        self.thread = thread
+        self.counters = {}
+        self.merged_counters = {}
 
 
 class StatisticsService(Thread):
@@ -54,7 +71,12 @@ class StatisticsService(Thread):
     #     }
     # }
     CONNECTOR_STATISTICS_STORAGE = {}
+
+    # Latency histograms by connector name (or "gateway" for the stages after the storage) and pipeline stage
+    LATENCY_HISTOGRAMS = {}
     __LOCK = RLock()
+    __THREAD_COUNTERS = local()
+    __COUNTERS_SLOTS = []
 
     def __init__(self, statistics_configuration, gateway, log, config_path=None):
         stats_send_period_in_seconds = statistics_configuration['statsSendPeriodInSeconds']
@@ -118,15 +140,45 @@ class StatisticsService(Thread):
     def add_count(cls, stat_key, count=1, stat_parameter_name=None, statistics_type='STATISTICS_STORAGE'):
         if StatisticsService.ENABLED:
             if statistics_type == 'CONNECTOR_STATISTICS_STORAGE':
-                try:
-                    if cls.CONNECTOR_STATISTICS_STORAGE.get(stat_key) is None:
-                        cls.CONNECTOR_STATISTICS_STORAGE[stat_key] = {}
+                stat_key = (stat_key, stat_parameter_name)
+            counters = cls.get_thread_counters()
+            counters[stat_key] = counters.get(stat_key, 0) + count
 
-                    cls.CONNECTOR_STATISTICS_STORAGE[stat_key][stat_parameter_name] += count
-                except KeyError:
-                    cls.CONNECTOR_STATISTICS_STORAGE[stat_key].update({stat_parameter_name: count})
-            else:
-                cls.STATISTICS_STORAGE[stat_key] += count
+    @classmethod
+    def get_thread_counters(cls) -> dict:
+        try:
+            return cls.__THREAD_COUNTERS.slot.counters
+        except AttributeError:
+            slot = _CountersSlot(current_thread())
+            with cls.__LOCK:
+                cls.__COUNTERS_SLOTS.append(slot)
+            cls.__THREAD_COUNTERS.slot = slot
+            return slot.counters
+
+    @classmethod
+    def merge_counters(cls):
+        """Adds the values, counted by the threads since the previous merge, to the statistics storages."""
+        with cls.__LOCK:
+            statistics_storage = cls.STATISTICS_STORAGE
+            connector_statistics_storage = cls.CONNECTOR_STATISTICS_STORAGE
+            for slot in tuple(cls.__COUNTERS_SLOTS):
+                is_thread_alive = slot.thread.is_alive()
+                counters = slot.counters.copy()
+                merged_counters = slot.merged_counters
+                for stat_key, count in counters.items():
+                    count -= merged_counters.get(stat_key, 0)
+                    if not count:
+                        continue
+                    if stat_key.__class__ is tuple:
+                        connector_name, stat_parameter_name = stat_key
+                        connector_statistics = connector_statistics_storage.setdefault(connector_name, {})
+                        connector_statistics[stat_parameter_name] = connector_statistics.get(stat_parameter_name,
+                                                                                             0) + count
+                    else:
+                        statistics_storage[stat_key] = statistics_storage.get(stat_key, 0) + count
+                slot.merged_counters = counters
+                if not is_thread_alive:
+                    cls.__COUNTERS_SLOTS.remove(slot)
 
     @classmethod
     def clear_statistics(cls):
@@ -134,19 +186,55 @@ class StatisticsService(Thread):
             for key in cls.STATISTICS_STORAGE:
                 cls.STATISTICS_STORAGE[key] = 0
             cls.CONNECTOR_STATISTICS_STORAGE = {}
+            cls.LATENCY_HISTOGRAMS = {}
+
+    @staticmethod
+    def record_latency(connector_name, stage, latency_ms):
+        if StatisticsService.ENABLED:
+            connector_histograms = StatisticsService.LATENCY_HISTOGRAMS.get(connector_name)
+            if connector_histograms is None:
+                connector_histograms = StatisticsService.LATENCY_HISTOGRAMS.setdefault(connector_name, {})
+            histogram = connector_histograms.get(stage)
+            if histogram is None:
+                histogram = connector_histograms.setdefault(stage, LatencyHistogram())
+            histogram.record(latency_ms)
+
+    @classmethod
+    def get_latency_statistics(cls) -> dict:
+        """Returns latency percentiles in milliseconds: {connector name: {stage: {"count": ..., "p50": ...}}}."""
+        return {connector_name: {stage: histogram.get_statistics()
+                                 for stage, histogram in tuple(connector_histograms.items())}
+                for connector_name, connector_histograms in tuple(cls.LATENCY_HISTOGRAMS.items())}
 
     @staticmethod
     def count_connector_message(connector_name, stat_parameter_name, count=1):
         if StatisticsService.ENABLED:
-            StatisticsService.add_count(connector_name, stat_parameter_name=stat_parameter_name,
-                                        statistics_type='CONNECTOR_STATISTICS_STORAGE', count=count)
+            stat_key = (connector_name, stat_parameter_name)
+            counters = StatisticsService.get_thread_counters()
+            counters[stat_key] = counters.get(stat_key, 0) + count
 
     @staticmethod
     def count_connector_bytes(connector_name, msg, stat_parameter_name):
         if StatisticsService.ENABLED:
-            bytes_count = str(msg).__sizeof__()
-            StatisticsService.add_bytes(connector_name, bytes_count, stat_parameter_name,
-                                        statistics_type='CONNECTOR_STATISTICS_STORAGE')
+            StatisticsService.count_connector_message(connector_name, stat_parameter_name,
+                                                      StatisticsService.get_bytes_count(msg))
+
+    @staticmethod
+    def get_bytes_count(data) -> int:
+        """Returns the length of the payload or of its JSON representation for the other objects."""
+        if isinstance(data, (bytes, bytearray)):
+            return len(data)
+        if isinstance(data, str):
+            return len(data) if data.isascii() else len(data.encode('utf-8'))
+        if isinstance(data, (list, tuple)) and data and hasattr(data[0], 'get_size'):
+            return sum(item.get_size() for item in data)
+        if hasattr(data, 'get_size'):
+            # Converted data
+            return data.get_size()
+        try:
+            return len(dumps(data, option=OPT_NON_STR_KEYS))
+        except TypeError:
+            return len(str(data))
 
     def __install_required_tools(self):
         if self._custom_command_config:
@@ -228,9 +316,13 @@ class StatisticsService(Thread):
                 self._gateway.send_telemetry(custom_command_statistics_message)
 
     def __send_statistics(self):
+        self.merge_counters()
         statistics_message = {'machineStats': self.__collect_statistics_from_config(MACHINE_STATS_CONFIG),
                               'serviceStats': self.__collect_service_statistics(),
                               'connectorsStats': self.CONNECTOR_STATISTICS_STORAGE}
+        latency_statistics = self.get_latency_statistics()
+        if latency_statistics:
+            statistics_message['latencyStats'] = latency_statistics
         self._log.info('Collected regular statistics: %s', statistics_message)
         if StatisticsService.ENABLED:
             self._gateway.send_telemetry(statistics_message)
@@ -362,6 +362,34 @@ class TBClient(threading.Thread):
     def is_connected(self):
         return self.__is_connected and self.client.rate_limits_received
 
+    def get_max_datapoints_per_message(self):
+        """Returns the maximal count of datapoints in one telemetry message of the devices, 0 if it is not limited."""
+        dp_rate_limit = getattr(self.client, '_devices_connected_through_gateway_telemetry_datapoints_rate_limit', None)
+        return int(dp_rate_limit.get_minimal_limit()) if dp_rate_limit is not None else 0
+
+    def publish_pre_rendered(self, topic, payload: bytes, datapoints_count, quality_of_service):
+        """
+        Publishes already serialized telemetry of the devices. The payload is not split by the client,
+        so it should be prepared with respect to the maximal payload size and datapoints count in one message.
+        Rate limits of the devices, connected through the gateway, are applied the same way as by the client.
+        """
+        # pylint: disable=protected-access
+        msg_rate_limit = getattr(self.client, '_devices_connected_through_gateway_telemetry_messages_rate_limit', None)
+        dp_rate_limit = getattr(self.client, '_devices_connected_through_gateway_telemetry_datapoints_rate_limit', None)
+        if (msg_rate_limit is not None and dp_rate_limit is not None
+                and (msg_rate_limit.has_limit() or dp_rate_limit.has_limit())):
+            dp_rate_limit.increase_rate_limit_counter(datapoints_count)
+            rate_limited = self.client._wait_for_rate_limit_released(tb_device_mqtt.DEFAULT_TIMEOUT,  # noqa
+                                                                     message_rate_limit=msg_rate_limit,
+                                                                     dp_rate_limit=dp_rate_limit,
+                                                                     amount=datapoints_count)
+            if rate_limited:
+                return rate_limited
+            msg_rate_limit.increase_rate_limit_counter()
+            self.client._wait_until_current_queued_messages_processed()  # noqa
+
+        return tb_device_mqtt.TBPublishInfo(self.client._client.publish(topic, payload, qos=quality_of_service))  # noqa
+
     def _on_connect(self, client, userdata, flags, result_code, parameters, *extra_params):
         self.__logger.info('MQTT client connected to platform %s: %s', self.__host, self.__port)
         self.__logger.debug('MQTT client %r connected to platform', str(client))
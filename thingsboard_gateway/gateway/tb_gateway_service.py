@@ -20,6 +20,7 @@ import multiprocessing.managers
 import os.path
 import subprocess
 from copy import deepcopy
+from itertools import repeat
 from os import execv, listdir, path, pathsep, stat, system
 from platform import system as platform_system
 from queue import SimpleQueue, Empty
@@ -27,7 +28,7 @@ from random import choice
 from signal import signal, SIGINT
 from string import ascii_lowercase, hexdigits
 from sys import argv, executable, stdin, stdout, stderr
-from threading import RLock, Thread, main_thread, current_thread, Event
+from threading import Lock, RLock, Thread, main_thread, current_thread, Event
 from time import sleep, time, monotonic
 from typing import Union, List
 from importlib.util import spec_from_file_location, module_from_spec
@@ -41,7 +42,10 @@ from thingsboard_gateway.gateway.constants import DEFAULT_CONNECTORS, CONNECTED_
     CONNECTOR_ID_PARAMETER, ATTRIBUTES_FOR_REQUEST, CONFIG_VERSION_PARAMETER, CONFIG_SECTION_PARAMETER, \
     DEBUG_METADATA_TEMPLATE_SIZE, SEND_TO_STORAGE_TS_PARAMETER, DATA_RETRIEVING_STARTED, ReportStrategy, \
     REPORT_STRATEGY_PARAMETER, DEFAULT_STATISTIC, DEFAULT_DEVICE_FILTER, CUSTOM_RPC_DIR, DISCONNECTED_PARAMETER, \
-    PROVISIONED_CREDENTIALS_FILENAME
+    PROVISIONED_CREDENTIALS_FILENAME, GATEWAY_TELEMETRY_TOPIC, RECEIVED_TS_PARAMETER, CONVERTED_TS_PARAMETER, \
+    PUT_TO_STORAGE_TS_PARAMETER, METADATA_PARAMETER, TELEMETRY_PARAMETER, LATENCY_STAGE_RECEIVE_TO_CONVERT, \
+    LATENCY_STAGE_CONVERT_TO_QUEUE, LATENCY_STAGE_QUEUE_TO_STORAGE, LATENCY_STAGE_STORAGE_TO_PUBLISH, \
+    LATENCY_STAGE_PUBLISH_TO_ACK, GATEWAY_LATENCY_STATISTICS_KEY
 from thingsboard_gateway.gateway.device_filter import DeviceFilter
 from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
 from thingsboard_gateway.gateway.entities.datapoint_key import DatapointKey
@@ -52,9 +56,11 @@ from thingsboard_gateway.gateway.statistics.decorators import CountMessage, Coll
     CollectAllSentTBBytesStatistics, CollectRPCReplyStatistics
 from thingsboard_gateway.gateway.statistics.statistics_service import StatisticsService
 from thingsboard_gateway.gateway.tb_client import TBClient
+from thingsboard_gateway.storage.event_codec import EventCodec, EVENT_FORMAT_BINARY
 from thingsboard_gateway.storage.file.file_event_storage import FileEventStorage
 from thingsboard_gateway.storage.memory.memory_event_storage import MemoryEventStorage
 from thingsboard_gateway.storage.sqlite.sqlite_event_storage import SQLiteEventStorage
+from thingsboard_gateway.tb_utility.batching_queue import BatchingQueue, ShardedBatchingQueue
 from thingsboard_gateway.tb_utility.tb_gateway_remote_configurator import RemoteConfigurator
 from thingsboard_gateway.tb_utility.tb_handler import TBRemoteLoggerHandler
 from thingsboard_gateway.tb_utility.tb_loader import TBModuleLoader
@@ -157,6 +163,20 @@ class TBGatewayService:
         self._event_storage = self._event_storage_types[self.__config["storage"]["type"]](self.__config["storage"],
                                                                                           storage_log,
                                                                                           self.stop_event)
+        self.__event_format = self.__config["storage"].get("event_format", EVENT_FORMAT_BINARY)
+        # Telemetry-only binary events are sent to the platform without decoding,
+        # client side rate limits are not applied to such messages
+        self.__send_pre_rendered_telemetry = (self.__event_format == EVENT_FORMAT_BINARY
+                                              and self.__config["storage"].get("pre_rendered_telemetry", False))
+        # Connectors are asked to slow down while the storage fill level is between the watermarks
+        self.__storage_high_watermark = self.__config["storage"].get("backpressure_high_watermark", 0.8)
+        self.__storage_low_watermark = self.__config["storage"].get("backpressure_low_watermark", 0.6)
+        self.__storage_backpressure = False
+        # Converted data is processed by several storage fill lanes, data of the same device is always
+        # processed by the same lane to keep the order
+        self.__storage_fill_lanes_count = max(1, self.__config["storage"].get("fill_lanes", 1))
+        self.__converted_data_queue = ShardedBatchingQueue(self.__storage_fill_lanes_count,
+                                                           self.__get_converted_data_device_name)
         if self.__config['thingsboard'].get('reportStrategy', {}).get('type') != "DISABLED":
             self._report_strategy_service = ReportStrategyService(self.__config['thingsboard'],
                                                                   self,
@@ -201,9 +221,12 @@ class TBGatewayService:
 
         self.__debug_log_enabled = log.isEnabledFor(10)
         self.update_loggers()
-        self.__save_converted_data_thread = Thread(name="Storage fill thread", daemon=True,
-                                                   target=self.__send_to_storage)
-        self.__save_converted_data_thread.start()
+        self.__save_converted_data_threads = []
+        for lane_index, lane_queue in enumerate(self.__converted_data_queue.shards):
+            save_converted_data_thread = Thread(name="Storage fill thread %i" % lane_index, daemon=True,
+                                                target=self.__send_to_storage, args=(lane_queue,))
+            save_converted_data_thread.start()
+            self.__save_converted_data_threads.append(save_converted_data_thread)
 
         self.init_remote_shell(self.__config["thingsboard"].get("remoteShell"))
         self.__rpc_processing_thread = Thread(target=self.__send_rpc_reply_processing, daemon=True,
@@ -318,6 +341,7 @@ class TBGatewayService:
         self.available_connectors_by_id: dict[str, Connector] = {}
         self.__devices_shared_attributes = {}
         self.__connector_incoming_messages = {}
+        self.__connector_incoming_messages_lock = Lock()
         self.__connected_devices = {}
         self.__renamed_devices = {}
         self.__saved_devices = {}
@@ -332,7 +356,6 @@ class TBGatewayService:
         self.__rpc_to_devices_queue = SimpleQueue()
         self.__async_device_actions_queue = SimpleQueue()
         self.__rpc_register_queue = SimpleQueue()
-        self.__converted_data_queue = SimpleQueue()
         self.__sync_device_shared_attrs_queue = SimpleQueue()
 
         self.__messages_confirmation_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4) # noqa
@@ -786,6 +809,12 @@ class TBGatewayService:
     def get_config_path(self):
         return self._config_dir
 
+    def get_data_folder_path(self):
+        storage_config = self.__config["storage"]
+        if storage_config["type"] == "sqlite":
+            return path.dirname(storage_config.get("data_file_path", "./")) or "./"
+        return storage_config.get("data_folder_path", "./data/")
+
     def subscribe_to_required_topics(self):
         if not self.__subscribed_to_rpc_topics and self.tb_client.is_connected():
             self.tb_client.client.clean_device_sub_dict()
@@ -1141,16 +1170,20 @@ class TBGatewayService:
             if self.__remote_configurator is not None:
                 self.__remote_configurator.send_current_configuration()
 
-    def send_to_storage(self, connector_name, connector_id, data: Union[dict, ConvertedData] = None):
+    def send_to_storage(self, connector_name, connector_id,
+                        data: Union[dict, ConvertedData, List[ConvertedData]] = None):
         if data is None:
             log.error("[%r]Data is empty from connector %r!", connector_id, connector_name)
         try:
+            if isinstance(data, list):
+                return self.__send_batch_to_storage(connector_name, connector_id, data)
+
             device_valid = True
             if self.__device_filter:
                 device_valid = self.__device_filter.validate_device(connector_name, data)
 
             if not device_valid:
-                log.warning('Device %s forbidden', data['deviceName'])
+                log.warning('Device %s forbidden', DeviceFilter.get_device_name(data))
                 return Status.FORBIDDEN_DEVICE
 
             # Duplicate detector is deprecated!
@@ -1160,8 +1193,10 @@ class TBGatewayService:
             # else:
             #     filtered_data = data
             if isinstance(data, ConvertedData):
-                if data.metadata and self.__latency_debug_mode:
-                    data.add_to_metadata({SEND_TO_STORAGE_TS_PARAMETER: int(time() * 1000),
+                if data.metadata and (self.__latency_debug_mode or StatisticsService.ENABLED):
+                    send_to_storage_ts = int(time() * 1000)
+                    self.__record_conversion_latency(connector_name, data, send_to_storage_ts)
+                    data.add_to_metadata({SEND_TO_STORAGE_TS_PARAMETER: send_to_storage_ts,
                                           CONNECTOR_PARAMETER: connector_name})
             filtration_start = time() * 1000
             if self._report_strategy_service is not None:
@@ -1171,28 +1206,97 @@ class TBGatewayService:
             filtration_end = time() * 1000
             if self.__latency_debug_mode:
                 log.debug("Data filtration took %r ms", filtration_end - filtration_start)
-            return Status.SUCCESS
+            return self.__get_storage_status()
         except Exception as e:
             log.error("Cannot put converted data!", exc_info=e)
             return Status.FAILURE
 
-    def __send_to_storage(self):
+    def __send_batch_to_storage(self, connector_name, connector_id, data_batch: List[ConvertedData]):
+        if self.__device_filter:
+            allowed_data_batch = []
+            for data in data_batch:
+                if self.__device_filter.validate_device(connector_name, data):
+                    allowed_data_batch.append(data)
+                else:
+                    log.warning('Device %s forbidden', DeviceFilter.get_device_name(data))
+            if not allowed_data_batch:
+                return Status.FORBIDDEN_DEVICE
+            data_batch = allowed_data_batch
+
+        if self.__latency_debug_mode or StatisticsService.ENABLED:
+            send_to_storage_ts = int(time() * 1000)
+            for data in data_batch:
+                if isinstance(data, ConvertedData) and data.metadata:
+                    self.__record_conversion_latency(connector_name, data, send_to_storage_ts)
+                    data.add_to_metadata({SEND_TO_STORAGE_TS_PARAMETER: send_to_storage_ts,
+                                          CONNECTOR_PARAMETER: connector_name})
+
+        filtration_start = time() * 1000
+        if self._report_strategy_service is not None:
+            self._report_strategy_service.filter_data_batch_and_send(data_batch, connector_name, connector_id)
+        else:
+            for data in data_batch:
+                self.__converted_data_queue.put((connector_name, connector_id, data))
+        filtration_end = time() * 1000
+        if self.__latency_debug_mode:
+            log.debug("Batch of %r data objects filtration took %r ms", len(data_batch),
+                      filtration_end - filtration_start)
+        return self.__get_storage_status()
+
+    def __get_storage_status(self):
+        fill_level = self._event_storage.get_fill_level()
+        if self.__storage_backpressure:
+            if fill_level < self.__storage_low_watermark:
+                self.__storage_backpressure = False
+                log.info("Storage fill level is %.2f, backpressure is released", fill_level)
+        elif fill_level >= self.__storage_high_watermark:
+            self.__storage_backpressure = True
+            log.warning("Storage fill level is %.2f, connectors are asked to slow down", fill_level)
+        return Status.BACKPRESSURE if self.__storage_backpressure else Status.SUCCESS
+
+    def is_storage_backpressure_active(self):
+        return self.__storage_backpressure
+
+    @staticmethod
+    def __record_conversion_latency(connector_name, data: ConvertedData, send_to_storage_ts):
+        if not StatisticsService.ENABLED:
+            return
+        converted_ts = data.metadata.get(CONVERTED_TS_PARAMETER)
+        if converted_ts is None:
+            return
+        received_ts = data.metadata.get(RECEIVED_TS_PARAMETER)
+        if received_ts is not None:
+            StatisticsService.record_latency(connector_name, LATENCY_STAGE_RECEIVE_TO_CONVERT,
+                                             converted_ts - received_ts)
+        StatisticsService.record_latency(connector_name, LATENCY_STAGE_CONVERT_TO_QUEUE,
+                                         send_to_storage_ts - converted_ts)
+
+    def __record_storage_to_publish_latency(self, devices_data_in_event_pack):
+        # Storage timestamp is kept in the events only in the latency debug mode,
+        # so the stage is not reported in the latency statistics otherwise
+        if not StatisticsService.ENABLED or not self.__latency_debug_mode:
+            return
+        current_ts = int(time() * 1000)
+        for device_data in devices_data_in_event_pack.values():
+            for telemetry_entry in device_data.get(TELEMETRY_PARAMETER, ()):
+                metadata = telemetry_entry.get(METADATA_PARAMETER)
+                if metadata and metadata.get(PUT_TO_STORAGE_TS_PARAMETER) is not None:
+                    StatisticsService.record_latency(metadata.get(CONNECTOR_PARAMETER, GATEWAY_LATENCY_STATISTICS_KEY),
+                                                     LATENCY_STAGE_STORAGE_TO_PUBLISH,
+                                                     current_ts - metadata[PUT_TO_STORAGE_TS_PARAMETER])
+
+    @staticmethod
+    def __get_converted_data_device_name(task):
+        data = task[2]
+        if isinstance(data, ConvertedData):
+            return data.device_name
+        return data.get("deviceName") if isinstance(data, dict) else None
+
+    def __send_to_storage(self, lane_queue: BatchingQueue):
         while not self.stopped:
             try:
-                tasks = []
-                collecting_start = int(monotonic() * 1000)
-                batch_size = 1000
-                while not self.__converted_data_queue.empty():
-                    connector_name, connector_id, event = self.__converted_data_queue.get_nowait()
-                    tasks.append((connector_name, connector_id, event))
-                    if len(tasks) >= batch_size or int(monotonic() * 1000) - collecting_start > 500:
-                        break
-
-                if tasks:
-                    for task in tasks:
-                        self.__process_event(task)
-                else:
-                    self.stop_event.wait(0.01)
+                for task in lane_queue.get_batch(1000, 1):
+                    self.__process_event(task)
             except Exception as e:
                 log.error("Error while sending data to storage!", exc_info=e)
 
@@ -1201,12 +1305,16 @@ class TBGatewayService:
         converted_data_format = isinstance(event, ConvertedData)
         data_array = event if isinstance(event, list) else [event]
         if converted_data_format:
+            send_to_storage_ts = event.metadata.get(SEND_TO_STORAGE_TS_PARAMETER)
             if self.__latency_debug_mode:
                 event.add_to_metadata({"getFromConvertedDataQueueTs": int(time() * 1000),
                                        "connector": connector_name})
             self.__send_to_storage_new_formatted_data(connector_name, connector_id, data_array)
             log.debug("Data from %s connector was sent to storage: %r", connector_name, data_array)
             current_time = int(time() * 1000)
+            if send_to_storage_ts is not None and StatisticsService.ENABLED:
+                StatisticsService.record_latency(connector_name, LATENCY_STAGE_QUEUE_TO_STORAGE,
+                                                 current_time - send_to_storage_ts)
             if self.__latency_debug_mode and event.metadata.get(SEND_TO_STORAGE_TS_PARAMETER):
                 log.debug("Event was in queue for %r ms",
                           current_time - event.metadata.get(SEND_TO_STORAGE_TS_PARAMETER))
@@ -1245,10 +1353,7 @@ class TBGatewayService:
                         log.trace("Connector %s is not available, probably it was disabled, skipping data...", connector_name)
                         continue
 
-                if not self.__connector_incoming_messages.get(connector_id):
-                    self.__connector_incoming_messages[connector_id] = 0
-                else:
-                    self.__connector_incoming_messages[connector_id] += 1
+                self.__count_connector_incoming_message(connector_id)
 
                 if hasattr(self, "__check_devices_idle") and self.__check_devices_idle:
                     self.__connected_devices[data['deviceName']]['last_receiving_data'] = time()
@@ -1269,6 +1374,14 @@ class TBGatewayService:
                 for adopted_data_entry in adopted_data:
                     self.__send_data_pack_to_storage(adopted_data_entry, connector_name, connector_id)
 
+    def __count_connector_incoming_message(self, connector_id):
+        # Messages are counted by several storage fill lanes
+        with self.__connector_incoming_messages_lock:
+            if not self.__connector_incoming_messages.get(connector_id):
+                self.__connector_incoming_messages[connector_id] = 0
+            else:
+                self.__connector_incoming_messages[connector_id] += 1
+
     def __send_to_storage_old_formatted_data(self, connector_name, connector_id, data_array):
         max_data_size = self.get_max_payload_size_bytes()
         for data in data_array:
@@ -1298,10 +1411,7 @@ class TBGatewayService:
                     else:
                         log.error("Connector %s is not available!", connector_name)
 
-                if not self.__connector_incoming_messages.get(connector_id):
-                    self.__connector_incoming_messages[connector_id] = 0
-                else:
-                    self.__connector_incoming_messages[connector_id] += 1
+                self.__count_connector_incoming_message(connector_id)
             else:
                 data["deviceName"] = "currentThingsBoardGateway"
                 data['deviceType'] = "gateway"
@@ -1398,19 +1508,14 @@ class TBGatewayService:
     def __send_data_pack_to_storage(self, data, connector_name, connector_id=None):
         if isinstance(data, ConvertedData):
             if self.__latency_debug_mode:
-                data.add_to_metadata({"putToStorageTs": int(time() * 1000)})
-            json_data = dumps(data.to_dict(self.__latency_debug_mode),
-                              separators=(',', ':'),
-                              skipkeys=True,
-                              ignore_nan=True)
-        else:
-            json_data = dumps(data, separators=(',', ':'), skipkeys=True, ignore_nan=True)
-        save_result = self._event_storage.put(json_data)
+                data.add_to_metadata({PUT_TO_STORAGE_TS_PARAMETER: int(time() * 1000)})
+        event = EventCodec.encode(data, self.__latency_debug_mode, self.__event_format)
+        save_result = self._event_storage.put(event)
         tries = 4
         current_try = 0
         while not save_result and current_try < tries:
             sleep(0.1)
-            save_result = self._event_storage.put(json_data)
+            save_result = self._event_storage.put(event)
             current_try += 1
         if not save_result:
             log.error('%rData from the device "%s" cannot be saved, connector name is %s.',
@@ -1434,6 +1539,8 @@ class TBGatewayService:
 
     def __read_data_from_storage(self):
         devices_data_in_event_pack = {}
+        telemetry_fragments_in_event_pack = {}
+        gateway_device_names = (self.name, "currentThingsBoardGateway")
         global log
         log.debug("Send data Thread has been started successfully.")
         log.debug("Maximal size of the client message queue is: %r",
@@ -1456,67 +1563,24 @@ class TBGatewayService:
                         events_len = len(events)
                         StatisticsService.add_count('storageMsgPulled', count=events_len)
 
-                        # telemetry_dp_count and attribute_dp_count using only for statistics
-                        telemetry_dp_count = 0
-                        attribute_dp_count = 0
-
                         if self.__latency_debug_mode and events_len > 100:
                             log.debug("Retrieved %r events from the storage.", events_len)
                         start_pack_processing = time()
-                        for event in events:
-                            try:
-                                current_event = loads(event)
-                            except Exception as e:
-                                log.error("Error while processing event from the storage, it will be skipped.",
-                                          exc_info=e)
-                                continue
-
-                            if not devices_data_in_event_pack.get(current_event["deviceName"]): # noqa
-                                devices_data_in_event_pack[current_event["deviceName"]] = {"telemetry": [],
-                                                                                           "attributes": {}}
-                            # start_processing_telemetry_in_event = time()
-                            has_metadata = False
-                            if current_event.get('metadata'):
-                                has_metadata = True
-                            if current_event.get("telemetry"):
-                                if isinstance(current_event["telemetry"], list):
-                                    for item in current_event["telemetry"]:
-                                        if has_metadata and item.get('ts'):
-                                            item.update({'metadata': current_event.get('metadata')})
-                                        # current_event_pack_data_size = self.check_size(devices_data_in_event_pack,
-                                        #                                                current_event_pack_data_size,
-                                        #                                                TBUtility.get_data_size(item))
-                                        devices_data_in_event_pack[current_event["deviceName"]]["telemetry"].append(item) # noqa
-                                        telemetry_dp_count += len(item.get('values', []))
-                                else:
-                                    if has_metadata and current_event["telemetry"].get('ts'):
-                                        current_event["telemetry"].update({'metadata': current_event.get('metadata')})
-                                    # current_event_pack_data_size = self.check_size(devices_data_in_event_pack,
-                                    #                                                current_event_pack_data_size,
-                                    #                                                TBUtility.get_data_size(current_event["telemetry"])) # noqa
-                                    devices_data_in_event_pack[current_event["deviceName"]]["telemetry"].append(current_event["telemetry"]) # noqa
-                                    telemetry_dp_count += len(current_event["telemetry"].get('values', []))
-                            # log.debug("Processing telemetry in event took %r seconds.", time() - start_processing_telemetry_in_event) # noqa
-                            # start_processing_attributes_in_event = time()
-                            if current_event.get("attributes"):
-                                if isinstance(current_event["attributes"], list):
-                                    for item in current_event["attributes"]:
-                                        # current_event_pack_data_size = self.check_size(devices_data_in_event_pack,
-                                        #                                                current_event_pack_data_size,
-                                        #                                                TBUtility.get_data_size(item))
-                                        devices_data_in_event_pack[current_event["deviceName"]]["attributes"].update(item.items()) # noqa
-                                        attribute_dp_count += 1
-                                else:
-                                    # current_event_pack_data_size = self.check_size(devices_data_in_event_pack,
-                                    #                                                current_event_pack_data_size,
-                                    #                                                TBUtility.get_data_size(current_event["attributes"])) # noqa
-                                    devices_data_in_event_pack[current_event["deviceName"]]["attributes"].update(current_event["attributes"].items()) # noqa
-                                    attribute_dp_count += 1
-
-                            # log.debug("Processing attributes in event took %r seconds.", time() - start_processing_attributes_in_event) # noqa
+                        published_ts = None
+                        events_to_decode = events
+                        pre_rendered_telemetry_dp_count = 0
+                        if self.__send_pre_rendered_telemetry:
+                            telemetry_fragments_in_event_pack.clear()
+                            events_to_decode, pre_rendered_telemetry_dp_count = \
+                                EventCodec.split_pre_rendered_telemetry(events, telemetry_fragments_in_event_pack,
+                                                                        gateway_device_names)
+                        # telemetry_dp_count and attribute_dp_count using only for statistics
+                        telemetry_dp_count, attribute_dp_count = EventCodec.merge_events_by_device(
+                            events_to_decode, devices_data_in_event_pack, log)
+                        telemetry_dp_count += pre_rendered_telemetry_dp_count
                         log.debug("Telemetry dp count: %r and attributes dp count: %r. Counting took: %r milliseconds.",  # noqa
                                   telemetry_dp_count, attribute_dp_count, int((time() - start_pack_processing)*1000))  # noqa
-                        if devices_data_in_event_pack:
+                        if devices_data_in_event_pack or telemetry_fragments_in_event_pack:
                             if not self.tb_client.is_connected():
                                 continue
                             while self.__rpc_reply_sent:
@@ -1533,13 +1597,18 @@ class TBGatewayService:
                                           pack_processing_time,
                                           average_event_processing_time_str) # noqa
 
+                            self.__record_storage_to_publish_latency(devices_data_in_event_pack)
                             self.__send_data(devices_data_in_event_pack) # noqa
+                            if telemetry_fragments_in_event_pack:
+                                self.__send_pre_rendered_telemetry_data(telemetry_fragments_in_event_pack)
+                            # Rate limit waits and splitting in the client are not included into the publish to ack
+                            published_ts = monotonic()
                             current_event_pack_data_size = 0
 
                         if self.tb_client.is_connected() and (
                                 self.__remote_configurator is None or not self.__remote_configurator.in_process):
 
-                            success = self.__handle_published_events()
+                            success = self.__handle_published_events(published_ts)
 
                             if success and self.tb_client.is_connected():
                                 self._event_storage.event_pack_processing_done()
@@ -1559,7 +1628,7 @@ class TBGatewayService:
                 self.stop_event.wait(1)
         log.info("Send data Thread has been stopped successfully.")
 
-    def __handle_published_events(self):
+    def __handle_published_events(self, published_ts=None):
         events = []
 
         while not self._published_events.empty() and not self.stopped:
@@ -1577,7 +1646,10 @@ class TBGatewayService:
                                                   not self.__remote_configurator.in_process):
                 qos = self.tb_client.client.quality_of_service
                 if qos == 1:
-                    futures = list(self.__messages_confirmation_executor.map(self.__process_published_event, events))
+                    if not StatisticsService.ENABLED:
+                        published_ts = None
+                    futures = list(self.__messages_confirmation_executor.map(self.__process_published_event, events,
+                                                                             repeat(published_ts)))
 
             event_num = 0
             for success in futures:
@@ -1593,9 +1665,13 @@ class TBGatewayService:
             return False
 
     @staticmethod
-    def __process_published_event(event):
+    def __process_published_event(event, published_ts=None):
         try:
-            return event.get() == event.TB_ERR_SUCCESS
+            success = event.get() == event.TB_ERR_SUCCESS
+            if published_ts is not None:
+                StatisticsService.record_latency(GATEWAY_LATENCY_STATISTICS_KEY, LATENCY_STAGE_PUBLISH_TO_ACK,
+                                                 (monotonic() - published_ts) * 1000)
+            return success
         except RuntimeError as e:
             log.error("Error while sending data to ThingsBoard, it will be resent.", exc_info=e)
             return False
@@ -1603,6 +1679,42 @@ class TBGatewayService:
             log.error("Error while sending data to ThingsBoard, it will be resent.", exc_info=e)
             return False
 
+    def __send_pre_rendered_telemetry_data(self, telemetry_fragments_in_event_pack):
+        max_payload_size = self.get_max_payload_size_bytes()
+        max_datapoints_count = self.tb_client.get_max_datapoints_per_message()
+        try:
+            for device, fragments in telemetry_fragments_in_event_pack.items():
+                final_device_name = self.__renamed_devices.get(device, device)
+                payload_prefix = b'{' + dumps(final_device_name).encode('utf-8') + b':['
+                empty_payload_size = len(payload_prefix) + 2
+                payload_fragments = []
+                payload_size = empty_payload_size
+                payload_datapoints_count = 0
+                for fragment, fragment_datapoints_count in fragments:
+                    if (empty_payload_size + len(fragment) > max_payload_size
+                            or 0 < max_datapoints_count < fragment_datapoints_count):
+                        # Fragment does not fit into one message, it is sent by the client, that splits it
+                        self._published_events.put(self.gw_send_telemetry(final_device_name,
+                                                                          loads(b'[' + fragment + b']')))
+                        continue
+                    if payload_fragments and (payload_size + len(fragment) + 1 > max_payload_size
+                                              or 0 < max_datapoints_count < payload_datapoints_count
+                                              + fragment_datapoints_count):
+                        self._published_events.put(self.gw_send_pre_rendered_telemetry(
+                            payload_prefix + b','.join(payload_fragments) + b']}', payload_datapoints_count))
+                        payload_fragments = []
+                        payload_size = empty_payload_size
+                        payload_datapoints_count = 0
+                    payload_fragments.append(fragment)
+                    payload_size += len(fragment) + 1
+                    payload_datapoints_count += fragment_datapoints_count
+                if payload_fragments:
+                    self._published_events.put(self.gw_send_pre_rendered_telemetry(
+                        payload_prefix + b','.join(payload_fragments) + b']}', payload_datapoints_count))
+            telemetry_fragments_in_event_pack.clear()
+        except Exception as e:
+            log.error("Error while sending data to ThingsBoard, it will be resent.", exc_info=e)
+
     @CollectAllSentTBBytesStatistics(start_stat_type='allBytesSentToTB')
     def __send_data(self, devices_data_in_event_pack):
         try:
@@ -2238,6 +2350,12 @@ class TBGatewayService:
                                                        telemetry,
                                                        quality_of_service=self.quality_of_service)
 
+    @CountMessage('msgsSentToPlatform')
+    def gw_send_pre_rendered_telemetry(self, payload: bytes, datapoints_count):
+        StatisticsService.add_bytes('allBytesSentToTB', len(payload))
+        return self.tb_client.publish_pre_rendered(GATEWAY_TELEMETRY_TOPIC, payload, datapoints_count,
+                                                   self.quality_of_service)
+
     @CountMessage('msgsSentToPlatform')
     def send_attributes(self, attributes):
         return self.tb_client.client.send_attributes(attributes,
@@ -0,0 +1,257 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from decimal import Decimal
+from struct import Struct
+from typing import Union, Dict, Tuple, Iterable, List
+
+from orjson import dumps, loads, OPT_NON_STR_KEYS
+from simplejson import dumps as simplejson_dumps, loads as simplejson_loads
+
+from thingsboard_gateway.gateway.constants import DEVICE_NAME_PARAMETER, DEVICE_TYPE_PARAMETER, \
+    TELEMETRY_PARAMETER, ATTRIBUTES_PARAMETER, METADATA_PARAMETER, TELEMETRY_TIMESTAMP_PARAMETER, \
+    TELEMETRY_VALUES_PARAMETER
+from thingsboard_gateway.gateway.entities.converted_data import ConvertedData
+
+EVENT_FORMAT_BINARY = "binary"
+EVENT_FORMAT_JSON = "json"
+
+EVENT_RECORD_MAGIC = 0xFE
+EVENT_RECORD_VERSION = 2
+
+# magic, version, device name length, device type length,
+# telemetry length, attributes length, metadata length, telemetry datapoints count, flags
+EVENT_RECORD_HEADER = Struct('>BBHHIIIIB')
+
+# Flags of the sections, encoded with simplejson, because orjson does not support some of their values
+TELEMETRY_SIMPLEJSON_FLAG = 0x01
+ATTRIBUTES_SIMPLEJSON_FLAG = 0x02
+METADATA_SIMPLEJSON_FLAG = 0x04
+
+_EMPTY_LIST = b'[]'
+_EMPTY_DICT = b'{}'
+
+
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError
+
+
+def _dumps(obj, empty_value: bytes, simplejson_flag: int) -> Tuple[bytes, int]:
+    """Returns the encoded section and the flag of the section, if it is encoded with simplejson."""
+    if not obj:
+        return empty_value, 0
+    try:
+        return dumps(obj, default=_default, option=OPT_NON_STR_KEYS), 0
+    except TypeError:
+        # orjson does not support some values (e.g. integers larger than 64 bit),
+        # orjson.loads would turn them into floats, so the section is decoded with simplejson as well
+        return (simplejson_dumps(obj, separators=(',', ':'), skipkeys=True, ignore_nan=True).encode('utf-8'),
+                simplejson_flag)
+
+
+def _loads(section: memoryview, flags: int, simplejson_flag: int):
+    if flags & simplejson_flag:
+        return simplejson_loads(str(section, 'utf-8'))
+    return loads(section)
+
+
+class EventCodec:
+    """
+    Encodes events to the versioned binary records, saved into the event storage, and decodes them back.
+
+    Record layout (version 2), all lengths are in bytes:
+        header (EVENT_RECORD_HEADER)
+        device name (UTF-8)
+        device type (UTF-8)
+        telemetry (JSON list of {"ts": ..., "values": {...}} objects, exactly as it is sent to the platform)
+        attributes (JSON object, exactly as it is sent to the platform)
+        metadata (JSON object, may be empty)
+
+    Telemetry datapoints count is stored in the header, so statistics can be collected
+    and the telemetry section can be sent to the platform without parsing it.
+    Sections with the values, that orjson does not support, are encoded with simplejson
+    and marked by the flags in the header, so they are decoded with simplejson too.
+
+    Events, saved in the JSON text format by the previous versions, are decoded as well.
+    """
+
+    @staticmethod
+    def encode(data: Union[ConvertedData, dict], with_metadata=False, event_format=EVENT_FORMAT_BINARY):
+        if isinstance(data, ConvertedData):
+            if event_format == EVENT_FORMAT_JSON:
+                return simplejson_dumps(data.to_dict(with_metadata), separators=(',', ':'),
+                                        skipkeys=True, ignore_nan=True)
+            device_name = data.device_name
+            device_type = data.device_type
+            telemetry = [telemetry_entry.to_dict() for telemetry_entry in data.telemetry]
+            telemetry_dp_count = data.telemetry_datapoints_count
+            attributes = data.attributes.to_dict()
+            metadata = data.metadata if with_metadata else None
+        else:
+            if event_format == EVENT_FORMAT_JSON:
+                return simplejson_dumps(data, separators=(',', ':'), skipkeys=True, ignore_nan=True)
+            device_name = data[DEVICE_NAME_PARAMETER]
+            device_type = data.get(DEVICE_TYPE_PARAMETER, 'default')
+            telemetry = data.get(TELEMETRY_PARAMETER)
+            if isinstance(telemetry, dict):
+                telemetry = [telemetry] if telemetry else []
+            telemetry_dp_count = sum(len(item.get(TELEMETRY_VALUES_PARAMETER, ())) for item in telemetry or ())
+            attributes = data.get(ATTRIBUTES_PARAMETER)
+            if isinstance(attributes, list):
+                merged_attributes = {}
+                for attributes_entry in attributes:
+                    merged_attributes.update(attributes_entry)
+                attributes = merged_attributes
+            metadata = data.get(METADATA_PARAMETER)
+
+        telemetry, telemetry_flag = _dumps(telemetry, _EMPTY_LIST, TELEMETRY_SIMPLEJSON_FLAG)
+        attributes, attributes_flag = _dumps(attributes, _EMPTY_DICT, ATTRIBUTES_SIMPLEJSON_FLAG)
+        metadata, metadata_flag = _dumps(metadata, b'', METADATA_SIMPLEJSON_FLAG)
+        return EventCodec.encode_record(device_name, device_type, telemetry, attributes, metadata,
+                                        telemetry_dp_count, telemetry_flag | attributes_flag | metadata_flag)
+
+    @staticmethod
+    def encode_record(device_name: str, device_type: str, telemetry: bytes, attributes: bytes,
+                      metadata: bytes = b'', telemetry_dp_count: int = 0, flags: int = 0) -> bytes:
+        device_name_bytes = str(device_name).encode('utf-8')
+        device_type_bytes = str(device_type or 'default').encode('utf-8')
+        return b''.join((EVENT_RECORD_HEADER.pack(EVENT_RECORD_MAGIC, EVENT_RECORD_VERSION,
+                                                  len(device_name_bytes), len(device_type_bytes),
+                                                  len(telemetry), len(attributes), len(metadata),
+                                                  telemetry_dp_count, flags),
+                         device_name_bytes, device_type_bytes, telemetry, attributes, metadata))
+
+    @staticmethod
+    def is_binary(event) -> bool:
+        return isinstance(event, (bytes, bytearray, memoryview)) and len(event) > 0 \
+            and event[0] == EVENT_RECORD_MAGIC
+
+    @staticmethod
+    def decode_record(event: bytes) -> Tuple[str, str, memoryview, memoryview, memoryview, int, int]:
+        """
+        Splits the binary record into device name, device type, JSON encoded sections,
+        telemetry datapoints count and flags of the sections without parsing the sections.
+        """
+        if event[1] != EVENT_RECORD_VERSION:
+            raise ValueError("Unsupported event record version: %r" % event[1])
+        (_, _, device_name_length, device_type_length, telemetry_length,
+         attributes_length, metadata_length, telemetry_dp_count, flags) = EVENT_RECORD_HEADER.unpack_from(event)
+        offset = EVENT_RECORD_HEADER.size
+        view = memoryview(event)
+        device_name = str(view[offset:offset + device_name_length], 'utf-8')
+        offset += device_name_length
+        device_type = str(view[offset:offset + device_type_length], 'utf-8')
+        offset += device_type_length
+        telemetry = view[offset:offset + telemetry_length]
+        offset += telemetry_length
+        attributes = view[offset:offset + attributes_length]
+        offset += attributes_length
+        metadata = view[offset:offset + metadata_length]
+        return device_name, device_type, telemetry, attributes, metadata, telemetry_dp_count, flags
+
+    @staticmethod
+    def decode(event) -> dict:
+        if not EventCodec.is_binary(event):
+            if isinstance(event, (bytes, bytearray)):
+                event = event.decode('utf-8')
+            return simplejson_loads(event)
+        device_name, device_type, telemetry, attributes, metadata, _, flags = EventCodec.decode_record(event)
+        decoded_event = {
+            DEVICE_NAME_PARAMETER: device_name,
+            DEVICE_TYPE_PARAMETER: device_type,
+            TELEMETRY_PARAMETER: _loads(telemetry, flags, TELEMETRY_SIMPLEJSON_FLAG),
+            ATTRIBUTES_PARAMETER: _loads(attributes, flags, ATTRIBUTES_SIMPLEJSON_FLAG)
+        }
+        if metadata:
+            decoded_event[METADATA_PARAMETER] = _loads(metadata, flags, METADATA_SIMPLEJSON_FLAG)
+        return decoded_event
+
+    @staticmethod
+    def split_pre_rendered_telemetry(events: Iterable, telemetry_fragments: Dict[str, List[Tuple[memoryview, int]]],
+                                     excluded_devices=()) -> Tuple[list, int]:
+        """
+        Collects telemetry sections of the binary records, that contain only telemetry of a single device
+        (no attributes and metadata), into per device lists of JSON fragments - the content of the
+        telemetry list without the brackets - with their datapoints counts.
+        Fragments can be joined with a comma and sent as is.
+        Returns the events, that should be decoded, and the count of the collected telemetry datapoints.
+        """
+        events_to_decode = []
+        telemetry_dp_count = 0
+        for event in events:
+            if not EventCodec.is_binary(event):
+                events_to_decode.append(event)
+                continue
+            try:
+                device_name, _, telemetry, attributes, metadata, event_dp_count, _ = EventCodec.decode_record(event)
+            except Exception:
+                events_to_decode.append(event)
+                continue
+            if metadata or attributes != _EMPTY_DICT or device_name in excluded_devices:
+                events_to_decode.append(event)
+                continue
+            if len(telemetry) <= 2:
+                continue
+            device_fragments = telemetry_fragments.get(device_name)
+            if device_fragments is None:
+                device_fragments = []
+                telemetry_fragments[device_name] = device_fragments
+            device_fragments.append((telemetry[1:-1], event_dp_count))
+            telemetry_dp_count += event_dp_count
+        return events_to_decode, telemetry_dp_count
+
+    @staticmethod
+    def merge_events_by_device(events: Iterable, devices_data: Dict[str, dict], logger) -> Tuple[int, int]:
+        """
+        Decodes events and merges them into per device payloads, ready to be sent to the platform:
+        {device name: {"telemetry": [...], "attributes": {...}}}.
+        Returns the count of telemetry and attributes datapoints.
+        """
+        telemetry_dp_count = 0
+        attribute_dp_count = 0
+        for event in events:
+            try:
+                current_event = EventCodec.decode(event)
+            except Exception as e:
+                logger.error("Error while processing event from the storage, it will be skipped.", exc_info=e)
+                continue
+
+            device_data = devices_data.get(current_event[DEVICE_NAME_PARAMETER])
+            if not device_data:
+                device_data = {TELEMETRY_PARAMETER: [], ATTRIBUTES_PARAMETER: {}}
+                devices_data[current_event[DEVICE_NAME_PARAMETER]] = device_data
+
+            metadata = current_event.get(METADATA_PARAMETER)
+            telemetry = current_event.get(TELEMETRY_PARAMETER)
+            if telemetry:
+                if not isinstance(telemetry, list):
+                    telemetry = [telemetry]
+                for item in telemetry:
+                    if metadata and item.get(TELEMETRY_TIMESTAMP_PARAMETER):
+                        item[METADATA_PARAMETER] = metadata
+                    device_data[TELEMETRY_PARAMETER].append(item)
+                    telemetry_dp_count += len(item.get(TELEMETRY_VALUES_PARAMETER, []))
+
+            attributes = current_event.get(ATTRIBUTES_PARAMETER)
+            if attributes:
+                if isinstance(attributes, list):
+                    for item in attributes:
+                        device_data[ATTRIBUTES_PARAMETER].update(item.items())
+                        attribute_dp_count += 1
+                else:
+                    device_data[ATTRIBUTES_PARAMETER].update(attributes.items())
+                    attribute_dp_count += 1
+        return telemetry_dp_count, attribute_dp_count
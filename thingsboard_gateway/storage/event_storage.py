@@ -48,5 +48,9 @@ class EventStorage(ABC):
     def update_logger(self):
         pass
 
+    def get_fill_level(self) -> float:
+        # Returns the used part of the storage capacity, from 0.0 (empty) to 1.0 (full)
+        return 0.0
+
     def get_configuration(self):
         return self._config
@@ -19,6 +19,7 @@ from os.path import exists
 
 from simplejson import JSONDecodeError, dumps, load
 
+from thingsboard_gateway.storage.event_codec import EventCodec
 from thingsboard_gateway.storage.file.event_storage_files import EventStorageFiles
 from thingsboard_gateway.storage.file.event_storage_reader_pointer import EventStorageReaderPointer
 from thingsboard_gateway.storage.file.file_event_storage_settings import FileEventStorageSettings
@@ -54,7 +55,9 @@ class EventStorageReader:
                     line = self.buffered_reader.readline()
                     while line != b'':
                         try:
-                            self.current_batch.append(b64decode(line).decode("utf-8"))
+                            record = b64decode(line)
+                            self.current_batch.append(record if EventCodec.is_binary(record)
+                                                      else record.decode("utf-8"))
                             records_to_read -= 1
                         except IOError as e:
                             self.__log.warning("Could not parse line [%s] to uplink message! %s", line, e)
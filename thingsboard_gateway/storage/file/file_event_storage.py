@@ -17,6 +17,7 @@ import time
 
 from simplejson import dump
 from logging import getLogger
+from threading import Lock
 
 from thingsboard_gateway.storage.event_storage import EventStorage
 from thingsboard_gateway.storage.file.event_storage_files import EventStorageFiles
@@ -36,13 +37,15 @@ class FileEventStorage(EventStorage):
         self.state_file = self.event_storage_files.get_state_file()
         self.__writer = EventStorageWriter(self.event_storage_files, self.settings, self.__log)
         self.__reader = EventStorageReader(self.event_storage_files, self.settings, self.__log)
+        self.__write_lock = Lock()
         self.__stopped = False
 
     def put(self, event):
         success = False
         if not self.__stopped:
             try:
-                self.__writer.write(event)
+                with self.__write_lock:
+                    self.__writer.write(event)
             except DataFileCountError as e:
                 self.__log.error("Failed to write event to storage! Error: %s", e)
             except Exception as e:
@@ -107,6 +110,9 @@ class FileEventStorage(EventStorage):
     def len(self):
         return len(self.__writer.files.data_files)
 
+    def get_fill_level(self) -> float:
+        return min(1.0, len(self.__writer.files.data_files) / max(1, self.settings.get_max_files_count()))
+
     def update_logger(self):
         self.__log = getLogger("storage")
         self.__writer.update_logger(self.__log)
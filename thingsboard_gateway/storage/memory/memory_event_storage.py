@@ -60,5 +60,10 @@ class MemoryEventStorage(EventStorage):
     def len(self):
         return self.__events_queue.qsize()
 
+    def get_fill_level(self) -> float:
+        if self.__queue_len <= 0:
+            return 0.0
+        return min(1.0, self.__events_queue.qsize() / self.__queue_len)
+
     def update_logger(self):
         self.__log = getLogger("storage")
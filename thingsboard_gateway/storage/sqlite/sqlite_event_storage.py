@@ -413,6 +413,11 @@ class SQLiteEventStorage(EventStorage):
         except Exception as e:
             self.__log.exception("Failed to put message, %s", e)
 
+    def get_fill_level(self) -> float:
+        if self.__is_max_db_amount_reached:
+            return 1.0
+        return min(1.0, len(self._database_files) / max(1, self.__settings.max_db_amount))
+
     def stop(self):
         self.stopped.set()
         self.__read_database.close_db()
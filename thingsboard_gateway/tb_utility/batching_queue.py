@@ -0,0 +1,150 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from collections import deque
+from queue import Empty, Full
+from threading import Lock, Condition
+from time import monotonic
+from typing import List
+
+
+class BatchingQueue:
+    """
+    Thread-safe FIFO queue, that allows consumers to take all available items at once.
+    get_batch blocks until at least one item arrives (or the timeout elapses), so the consumer loops
+    do not poll the queue with sleeps.
+    The interface is compatible with queue.Queue for put/get/qsize/empty/full calls.
+    maxsize <= 0 means the queue is unbounded.
+    """
+
+    def __init__(self, maxsize: int = 0):
+        self.maxsize = maxsize
+        self.__items = deque()
+        self.__lock = Lock()
+        self.__not_empty = Condition(self.__lock)
+        self.__not_full = Condition(self.__lock)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def qsize(self):
+        return len(self.__items)
+
+    def empty(self):
+        return not self.__items
+
+    def full(self):
+        return 0 < self.maxsize <= len(self.__items)
+
+    def put(self, item, block=True, timeout=None):
+        with self.__not_full:
+            if 0 < self.maxsize <= len(self.__items):
+                if not block:
+                    raise Full
+                if timeout is None:
+                    while len(self.__items) >= self.maxsize:
+                        self.__not_full.wait()
+                else:
+                    deadline = monotonic() + timeout
+                    while len(self.__items) >= self.maxsize:
+                        remaining = deadline - monotonic()
+                        if remaining <= 0:
+                            raise Full
+                        self.__not_full.wait(remaining)
+            self.__items.append(item)
+            self.__not_empty.notify()
+
+    def put_nowait(self, item):
+        self.put(item, block=False)
+
+    def get(self, block=True, timeout=None):
+        with self.__not_empty:
+            if not self.__items:
+                if not block:
+                    raise Empty
+                if not self.__wait_for_items(timeout):
+                    raise Empty
+            item = self.__items.popleft()
+            if self.maxsize > 0:
+                self.__not_full.notify()
+            return item
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def get_batch(self, max_items: int, max_wait: float = None) -> List:
+        """
+        Returns up to max_items items in FIFO order.
+        If the queue is empty - waits up to max_wait seconds (forever if None) for the first item
+        and returns an empty list if nothing arrived.
+        """
+        with self.__not_empty:
+            if not self.__items and not self.__wait_for_items(max_wait):
+                return []
+            items = self.__items
+            if len(items) <= max_items:
+                batch = list(items)
+                items.clear()
+            else:
+                popleft = items.popleft
+                batch = [popleft() for _ in range(max_items)]
+            if self.maxsize > 0:
+                self.__not_full.notify(len(batch))
+            return batch
+
+    def __wait_for_items(self, timeout) -> bool:
+        if timeout is None:
+            while not self.__items:
+                self.__not_empty.wait()
+            return True
+        deadline = monotonic() + timeout
+        while not self.__items:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return False
+            self.__not_empty.wait(remaining)
+        return True
+
+
+class ShardedBatchingQueue:
+    """
+    Set of BatchingQueue shards, items are routed to the shard by the hash of the key, returned by key_function.
+    Items with the same key always get into the same shard, so they are consumed in the order they were put,
+    if every shard has a single consumer.
+    """
+
+    def __init__(self, shards_count: int, key_function, maxsize: int = 0):
+        self.shards = [BatchingQueue(maxsize) for _ in range(max(1, shards_count))]
+        self.__key_function = key_function
+
+    def __len__(self):
+        return self.qsize()
+
+    def qsize(self):
+        return sum(shard.qsize() for shard in self.shards)
+
+    def empty(self):
+        return all(shard.empty() for shard in self.shards)
+
+    def get_shard(self, item) -> BatchingQueue:
+        shards = self.shards
+        if len(shards) == 1:
+            return shards[0]
+        return shards[hash(self.__key_function(item)) % len(shards)]
+
+    def put(self, item, block=True, timeout=None):
+        self.get_shard(item).put(item, block, timeout)
+
+    def put_nowait(self, item):
+        self.get_shard(item).put(item, block=False)
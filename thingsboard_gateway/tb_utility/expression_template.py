@@ -0,0 +1,135 @@
+#     Copyright 2026. ThingsBoard
+#
+#     Licensed under the Apache License, Version 2.0 (the "License");
+#     you may not use this file except in compliance with the License.
+#     You may obtain a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#     Unless required by applicable law or agreed to in writing, software
+#     distributed under the License is distributed on an "AS IS" BASIS,
+#     WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#     See the License for the specific language governing permissions and
+#     limitations under the License.
+
+from functools import lru_cache
+from logging import getLogger
+from re import compile as compile_regex
+
+from jsonpath_rw import parse
+from orjson import loads
+
+log = getLogger("service")
+
+# The same placeholders, that are found by TBUtility.get_values
+PLACEHOLDER_PATTERN = compile_regex(r'\$\{[${A-Za-z0-9. ^\]\[*_:"-]*\}')
+EXPRESSION_TEMPLATES_CACHE_SIZE = 4096
+
+
+class _ExpressionPlaceholder:
+    __slots__ = ('placeholder', 'key', 'jsonpath_expression')
+
+    def __init__(self, placeholder: str):
+        self.placeholder = placeholder
+        tag = placeholder[2:-1]
+        tag_parts = tag.split()
+        self.key = tag_parts[0] if tag_parts else None
+        self.jsonpath_expression = None
+        try:
+            if " " in tag:
+                tag = '.'.join('"' + section_key + '"' if " " in section_key else section_key
+                               for section_key in tag.split('.'))
+            self.jsonpath_expression = parse(tag)
+        except Exception as e:
+            log.debug("Cannot parse JSONPath expression %s: %s", tag, e)
+
+    def get_value(self, body, value_type="string", expression_instead_none=False):
+        if isinstance(body, dict) and self.key in body:
+            value = body[self.key]
+            if value_type.lower() == "string":
+                return str(value)
+        else:
+            value = None
+            if isinstance(body, (dict, list)) and self.jsonpath_expression is not None:
+                try:
+                    jsonpath_match = self.jsonpath_expression.find(body)
+                    if jsonpath_match:
+                        value = jsonpath_match[0].value
+                except Exception as e:
+                    log.debug(e)
+        if value is None and expression_instead_none:
+            return self.placeholder
+        return value
+
+
+class ExpressionTemplate:
+    """
+    Expression with ${...} placeholders, parsed once into literal segments and placeholders with prepared
+    accessors (a direct dictionary key and a parsed JSONPath expression).
+    Rendering gives the same result, as substituting every tag from TBUtility.get_values(..., get_tag=True)
+    with the corresponding value from TBUtility.get_values, but takes a single pass over the segments.
+    Use ExpressionTemplate.compile to get a cached template for the expression from the configuration.
+    """
+
+    __slots__ = ('expression', '__segments', '__placeholders')
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        segments = []
+        placeholders = []
+        position = 0
+        for placeholder_match in PLACEHOLDER_PATTERN.finditer(expression):
+            start, end = placeholder_match.span()
+            if start > position:
+                segments.append(expression[position:start])
+            placeholder = _ExpressionPlaceholder(placeholder_match.group())
+            segments.append(placeholder)
+            placeholders.append(placeholder)
+            position = end
+        if position < len(expression):
+            segments.append(expression[position:])
+        self.__segments = tuple(segments)
+        self.__placeholders = tuple(placeholders)
+
+    @staticmethod
+    @lru_cache(maxsize=EXPRESSION_TEMPLATES_CACHE_SIZE)
+    def compile(expression: str) -> 'ExpressionTemplate':
+        return ExpressionTemplate(expression)
+
+    @property
+    def has_placeholders(self) -> bool:
+        return bool(self.__placeholders)
+
+    @property
+    def is_single_placeholder(self) -> bool:
+        """True if the expression is a single placeholder, probably surrounded by whitespaces."""
+        return len(self.__placeholders) == 1 and self.expression.strip() == self.__placeholders[0].placeholder
+
+    def render(self, body, expression_instead_none=False) -> str:
+        """
+        Returns the expression with placeholders replaced by the values from the body.
+        Missing values are rendered as "None" or left as placeholders if expression_instead_none is True.
+        """
+        placeholders = self.__placeholders
+        if not placeholders:
+            return self.expression
+        if isinstance(body, str):
+            body = loads(body)
+        segments = self.__segments
+        if len(segments) == 1:
+            return str(placeholders[0].get_value(body, expression_instead_none=expression_instead_none))
+        return ''.join(segment if segment.__class__ is str
+                       else str(segment.get_value(body, expression_instead_none=expression_instead_none))
+                       for segment in segments)
+
+    def get_value(self, body, value_type="string", expression_instead_none=False):
+        """
+        Returns the value of the first placeholder, converted to string for the "string" value type only,
+        or the expression itself if it has no placeholders (same as the first item from TBUtility.get_values).
+        """
+        placeholders = self.__placeholders
+        if not placeholders:
+            return self.expression
+        if isinstance(body, str):
+            body = loads(body)
+        return placeholders[0].get_value(body, value_type, expression_instead_none)
@@ -357,6 +357,33 @@ class TBUtility:
     def get_data_size(data):
         return len(dumps(data, option=OPT_NON_STR_KEYS))
 
+    @staticmethod
+    def get_key_data_size(key):
+        """Returns the length of the JSON encoded object key (with quotes), sizes of DatapointKey are cached."""
+        if key.__class__ is DatapointKey:
+            return key.get_data_size()
+        if key.__class__ is str:
+            return len(dumps(key))
+        # {key:null}
+        return len(dumps({key: None}, option=OPT_NON_STR_KEYS)) - 7
+
+    @staticmethod
+    def get_entries_data_size(entries: dict):
+        """
+        Returns the length of the JSON encoded dictionary, the same as TBUtility.get_data_size,
+        but DatapointKey keys are not converted to the new dictionary and their sizes are cached.
+        """
+        if not entries:
+            return 2
+        size = 1 + 2 * len(entries)
+        get_key_data_size = TBUtility.get_key_data_size
+        for key, value in entries.items():
+            if key.__class__ is DatapointKey:
+                size += key.get_data_size() + len(dumps(value, option=OPT_NON_STR_KEYS))
+            else:
+                size += get_key_data_size(key) + len(dumps(value, option=OPT_NON_STR_KEYS))
+        return size
+
     @staticmethod
     def update_main_config_with_env_variables(config):
         env_variables = TBUtility.get_service_environmental_variables()